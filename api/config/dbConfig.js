@@ -1,15 +1,33 @@
 const { Sequelize } = require("sequelize");
 require("dotenv").config(); // Load environment variables
 
-// Remote MySQL database connection
+const envInt = (name, fallback) => parseInt(process.env[name] || String(fallback), 10);
+
+// Remote MySQL database connection. DB_DIALECT=sqlite with DB_STORAGE=<file>
+// gives a local stand-in (e.g. for scripts/seed.js); install its driver with
+// `npm run sqlite:install`.
+//
+// The connection pool is per process (per worker in cluster mode):
+// DB_POOL_MAX connections at most, DB_POOL_MIN kept open, idle ones closed
+// after DB_POOL_IDLE_MS (checked every DB_POOL_EVICT_MS), and a query waits
+// up to DB_POOL_ACQUIRE_MS for a free connection before failing.
+// utils/dbPool.js reports how busy it is.
 const sequelize = new Sequelize(
   process.env.DB_NAME, // Database name
   process.env.DB_USERNAME, // Database username
   process.env.DB_PASSWORD, // Database password
   {
     host: process.env.DB_HOST, // Database host
-    dialect: "mysql",
+    dialect: process.env.DB_DIALECT || "mysql",
+    storage: process.env.DB_STORAGE, // SQLite only
+    pool: {
+      max: envInt("DB_POOL_MAX", 10),
+      min: envInt("DB_POOL_MIN", 0),
+      idle: envInt("DB_POOL_IDLE_MS", 10000),
+      acquire: envInt("DB_POOL_ACQUIRE_MS", 30000),
+      evict: envInt("DB_POOL_EVICT_MS", 1000),
+    },
   }
 );
 
-module.exports = sequelize;
\ No newline at end of file
+module.exports = sequelize;
@@ -1,7 +1,16 @@
-const swaggerJsDoc = require("swagger-jsdoc");
+const fs = require("fs");
+const path = require("path");
 const swaggerUi = require("swagger-ui-express");
+const logger = require("../utils/logger");
 require("dotenv").config();
 
+// The OpenAPI document is built from the @swagger JSDoc of the controllers by
+// `npm run build:openapi` (scripts/buildOpenApi.js) into OPENAPI_SPEC
+// (default build/openapi.json), so the server does not parse the controllers
+// when it starts. /api-docs loads the file on its first request; without one,
+// swagger-jsdoc runs once at that point instead.
+const SPEC_PATH = process.env.OPENAPI_SPEC || path.join(__dirname, "..", "build", "openapi.json");
+
 const options = {
   definition: {
     openapi: "3.0.0",
@@ -10,11 +19,6 @@ const options = {
       version: "1.0.0",
       description: "API for the GYM Management System",
     },
-    servers: [
-      {
-        url: "http://localhost:" + process.env.PORT || 3000,
-      },
-    ],
     components: {
       securitySchemes: {
         bearerAuth: {
@@ -30,11 +34,32 @@ const options = {
       },
     ],
   },
-  apis: ["./controllers/*.js"],
+  apis: [path.join(__dirname, "..", "controllers", "*.js")],
 };
 
-const specs = swaggerJsDoc(options);
+// Parses every controller; only the build script and the fallback call it
+const buildSpec = () => require("swagger-jsdoc")(options);
+
+let spec = null;
+
+const loadSpec = () => {
+  if (!spec) {
+    if (fs.existsSync(SPEC_PATH)) {
+      spec = JSON.parse(fs.readFileSync(SPEC_PATH, "utf8"));
+    } else {
+      logger.warn(`${SPEC_PATH} not found, building the OpenAPI spec from the controllers; run npm run build:openapi`);
+      spec = buildSpec();
+    }
+    // This process' port, not the one of the machine that built the file
+    spec.servers = [{ url: "http://localhost:" + (process.env.PORT || 3000) }];
+  }
+  return spec;
+};
 
 module.exports = (app) => {
-  app.use("/api-docs", swaggerUi.serve, swaggerUi.setup(specs));
+  app.get("/api-docs/openapi.json", (req, res) => res.json(loadSpec()));
+  app.use("/api-docs", swaggerUi.serve, swaggerUi.setup(null, { swaggerOptions: { url: "/api-docs/openapi.json" } }));
 };
+
+module.exports.SPEC_PATH = SPEC_PATH;
+module.exports.buildSpec = buildSpec;
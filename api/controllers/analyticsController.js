@@ -0,0 +1,199 @@
+const logger = require("../utils/logger");
+const rollups = require("../utils/rollups");
+
+/**
+ * @swagger
+ * tags:
+ *   name: Analytics
+ *   description: Dashboard figures served from the rollup tables
+ */
+
+const MONTH = /^\d{4}-(0[1-9]|1[0-2])$/;
+
+// Gym the request is about: { gymId } (null = every gym) or { error }
+const analyticsGym = (user, gymId) => {
+  if (user.type === "gym_admin") {
+    return { gymId: user.gym_id };
+  }
+  if (gymId === undefined || gymId === "") {
+    return { gymId: null };
+  }
+  return isNaN(parseInt(gymId, 10)) ? { error: "Invalid gymId." } : { gymId: parseInt(gymId, 10) };
+};
+
+/**
+ * @swagger
+ * /api/analytics/revenue:
+ *   get:
+ *     summary: Revenue per gym and month
+ *     tags: [Analytics]
+ *     description: Number and total amount of the payments per gym and calendar month (UTC) of payment_date, oldest first. A payment counts for the gym of its membership plan. Admins see every gym unless they pass gymId; gym admins see their own gym.
+ *     parameters:
+ *       - in: query
+ *         name: gymId
+ *         schema:
+ *           type: integer
+ *         description: Only this gym (admin only)
+ *       - in: query
+ *         name: from
+ *         schema:
+ *           type: string
+ *           example: 2024-01
+ *         description: First month, YYYY-MM
+ *       - in: query
+ *         name: to
+ *         schema:
+ *           type: string
+ *           example: 2024-12
+ *         description: Last month, YYYY-MM
+ *     responses:
+ *       200:
+ *         description: One entry per gym and month with payments
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 data:
+ *                   type: array
+ *                   items:
+ *                     type: object
+ *                     properties:
+ *                       gym_id:
+ *                         type: integer
+ *                       month:
+ *                         type: string
+ *                         example: 2024-05
+ *                       payments:
+ *                         type: integer
+ *                       revenue:
+ *                         type: string
+ *                         example: "1250.00"
+ *       400:
+ *         description: Invalid gymId or month
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.getRevenue = async (req, res) => {
+  if (req.user.type !== "admin" && req.user.type !== "gym_admin") {
+    return res.status(401).json({ error: "Unauthorized." });
+  }
+  const { gymId, error } = analyticsGym(req.user, req.query.gymId);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+  const { from, to } = req.query;
+  if ((from !== undefined && !MONTH.test(from)) || (to !== undefined && !MONTH.test(to))) {
+    return res.status(400).json({ error: "Months must be given as YYYY-MM." });
+  }
+
+  try {
+    const data = await rollups.revenueByMonth({ gymId, from, to });
+    res.status(200).json({ data });
+  } catch (error) {
+    logger.error(`Error fetching revenue analytics: ${error.message}`);
+    res.status(500).json({ error: "Internal server error." });
+  }
+};
+
+/**
+ * @swagger
+ * /api/analytics/activeMembers:
+ *   get:
+ *     summary: Active memberships per plan
+ *     tags: [Analytics]
+ *     description: Number of memberships running today (started on or before today and ending after it) per gym and plan. Admins see every gym unless they pass gymId; gym admins see their own gym.
+ *     parameters:
+ *       - in: query
+ *         name: gymId
+ *         schema:
+ *           type: integer
+ *         description: Only this gym (admin only)
+ *     responses:
+ *       200:
+ *         description: One entry per plan with running memberships, busiest first within a gym
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 data:
+ *                   type: array
+ *                   items:
+ *                     type: object
+ *                     properties:
+ *                       gym_id:
+ *                         type: integer
+ *                       membership_plan_id:
+ *                         type: integer
+ *                       plan_name:
+ *                         type: string
+ *                       active:
+ *                         type: integer
+ *       400:
+ *         description: Invalid gymId
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.getActiveMembers = async (req, res) => {
+  if (req.user.type !== "admin" && req.user.type !== "gym_admin") {
+    return res.status(401).json({ error: "Unauthorized." });
+  }
+  const { gymId, error } = analyticsGym(req.user, req.query.gymId);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+
+  try {
+    const data = await rollups.activeMembersByPlan({ gymId });
+    res.status(200).json({ data });
+  } catch (error) {
+    logger.error(`Error fetching active member analytics: ${error.message}`);
+    res.status(500).json({ error: "Internal server error." });
+  }
+};
+
+/**
+ * @swagger
+ * /api/analytics/rebuild:
+ *   post:
+ *     summary: Recompute the rollup tables
+ *     tags: [Analytics]
+ *     description: Admin only. Recomputes the rollups from every payment and membership, e.g. after loading data directly into the database. Writes made while it runs may be missed; `npm run rollups:rebuild` does the same offline.
+ *     responses:
+ *       200:
+ *         description: Rollups rebuilt
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 rows:
+ *                   type: integer
+ *                   description: Rollup rows written
+ *                 durationMs:
+ *                   type: integer
+ *       403:
+ *         description: Forbidden, only admin users can rebuild
+ *       500:
+ *         description: Internal server error
+ */
+exports.rebuildRollups = async (req, res) => {
+  if (req.user.type !== "admin") {
+    return res.status(403).json({ error: "Forbidden, only admin users can rebuild the rollups." });
+  }
+
+  try {
+    const started = Date.now();
+    const rows = await rollups.rebuild();
+    logger.info(`Rebuilt analytics rollups: ${rows} rows`);
+    res.status(200).json({ rows, durationMs: Date.now() - started });
+  } catch (error) {
+    logger.error(`Error rebuilding analytics rollups: ${error.message}`);
+    res.status(500).json({ error: "Internal server error." });
+  }
+};
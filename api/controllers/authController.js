@@ -1,17 +1,27 @@
 const dotenv = require("dotenv");
-const bcrypt = require("bcryptjs");
 const jwt = require("jsonwebtoken");
 const User = require("../models/user");
 const GymAndGymMember = require("../models/gymAndGymMember");
 const GymAndGymAdmin = require("../models/gymAndGymAdmin");
 const Gym = require("../models/gym");
 const logger = require("../utils/logger");
+const passwordHasher = require("../utils/passwordHasher");
+const userContextCache = require("../utils/userContextCache");
+const countCache = require("../utils/countCache");
+const responseCache = require("../utils/responseCache");
+const priceIndex = require("../utils/priceIndex");
+const expiryBuckets = require("../utils/expiryBuckets");
+const rollups = require("../utils/rollups");
+const { readBatch, createBatch, commitValid, sendBatchResults } = require("../utils/batch");
 const MembershipPlan = require("../models/gymMembershipPlan");
 const MembersMembership = require("../models/membersMembership");
 const MembershipPlansPrice = require("../models/membershipPlansPrice");
 
 dotenv.config(); // Load environment variables
 
+// The password hashing queue is full; the client should retry shortly
+const serverBusy = (res) => res.status(503).set("Retry-After", "1").json({ error: "Server busy, please retry." });
+
 /**
  * @swagger
  * tags:
@@ -68,6 +78,8 @@ dotenv.config(); // Load environment variables
  *               properties:
  *                 error:
  *                   type: string
+ *       503:
+ *         description: Password hashing is saturated; retry after the Retry-After delay
  *       500:
  *         description: Internal server error
  *         content:
@@ -102,10 +114,11 @@ exports.signupAdmin = async (req, res) => {
 
     user = await User.create({
       username,
-      password: await bcrypt.hash(password, 10),
+      password: await passwordHasher.hash(password),
       firstName: "Admin",
       type: "admin",
     });
+    countCache.invalidate("Users");
 
     const response = {
       message: "Admin user created successfully",
@@ -117,6 +130,9 @@ exports.signupAdmin = async (req, res) => {
 
     res.status(200).json(response);
   } catch (error) {
+    if (passwordHasher.isBusy(error)) {
+      return serverBusy(res);
+    }
     logger.error(`Error in signupAdmin: ${error.message}`);
     res.status(500).json({ error: "Internal server error" });
   }
@@ -220,6 +236,8 @@ exports.signupAdmin = async (req, res) => {
  *                 error:
  *                   type: string
  *                   example: Forbidden, only admin user can create gym admin user
+ *       503:
+ *         description: Password hashing is saturated; retry after the Retry-After delay
  *       500:
  *         description: Internal server error
  *         content:
@@ -294,7 +312,7 @@ exports.signupGymAdmin = async (req, res) => {
 
     user = await User.create({
       username,
-      password: await bcrypt.hash(password, 10),
+      password: await passwordHasher.hash(password),
       type: "gym_admin",
       firstName,
       lastName,
@@ -313,6 +331,7 @@ exports.signupGymAdmin = async (req, res) => {
       emergencyContactPhone,
       emergencyContactEmail,
     });
+    countCache.invalidate("Users");
 
     const response = {
       message: "Gym admin user created successfully",
@@ -324,11 +343,52 @@ exports.signupGymAdmin = async (req, res) => {
 
     res.status(200).json(response);
   } catch (error) {
+    if (passwordHasher.isBusy(error)) {
+      return serverBusy(res);
+    }
     logger.error(`Error in signupGymAdmin: ${error.message}`);
     res.status(500).json({ error: "Internal server error" });
   }
 };
 
+// Field checks shared by the single and batch gym member signups
+const gymMemberSignupError = ({ username, password, firstName, gymId, phone, email }) => {
+  if (!username || !password || !firstName || !gymId) {
+    return "Username, password, first name, and gym ID are required.";
+  }
+  if (password.length < 8) {
+    return "Password must be at least 8 characters long.";
+  }
+  if (phone && !/^\d{10}$/.test(phone)) {
+    return "Phone number should be 10 digits long.";
+  }
+  if (email && !/^\S+@\S+\.\S+$/.test(email)) {
+    return "Invalid email format.";
+  }
+  return null;
+};
+
+// Profile columns stored for a new gym member, shared by the single and batch signups
+const gymMemberFields = (item) => ({
+  type: "gym_member",
+  firstName: item.firstName,
+  lastName: item.lastName,
+  email: item.email,
+  phone: item.phone,
+  address: item.address,
+  city: item.city,
+  state: item.state,
+  pincode: item.pincode,
+  country: item.country,
+  dateOfBirth: item.dateOfBirth,
+  gender: item.gender,
+  profilePicture: item.profilePicture,
+  emergencyContactName: item.emergencyContactName,
+  emergencyContactRelationship: item.emergencyContactRelationship,
+  emergencyContactPhone: item.emergencyContactPhone,
+  emergencyContactEmail: item.emergencyContactEmail,
+});
+
 /**
  * @swagger
  * /api/signup/gymmember:
@@ -420,6 +480,8 @@ exports.signupGymAdmin = async (req, res) => {
  *                 error:
  *                   type: string
  *                   example: Username, password, first name, and gym ID are required.
+ *       503:
+ *         description: Password hashing is saturated; retry after the Retry-After delay
  *       500:
  *         description: Internal server error
  *         content:
@@ -433,50 +495,11 @@ exports.signupGymAdmin = async (req, res) => {
  */
 exports.signupGymMember = async (req, res) => {
   try {
-    const {
-      username,
-      password,
-      firstName,
-      lastName,
-      email,
-      phone,
-      address,
-      city,
-      state,
-      pincode,
-      country,
-      dateOfBirth,
-      gender,
-      profilePicture,
-      emergencyContactName,
-      emergencyContactRelationship,
-      emergencyContactPhone,
-      emergencyContactEmail,
-      gymId,
-    } = req.body;
+    const { username, password, gymId } = req.body;
 
-    if (!username || !password || !firstName || !gymId) {
-      return res
-        .status(400)
-        .json({
-          error: "Username, password, first name, and gym ID are required.",
-        });
-    }
-
-    if (password.length < 8) {
-      return res
-        .status(400)
-        .json({ error: "Password must be at least 8 characters long." });
-    }
-
-    if (phone && !/^\d{10}$/.test(phone)) {
-      return res
-        .status(400)
-        .json({ error: "Phone number should be 10 digits long." });
-    }
-
-    if (email && !/^\S+@\S+\.\S+$/.test(email)) {
-      return res.status(400).json({ error: "Invalid email format." });
+    const invalid = gymMemberSignupError(req.body);
+    if (invalid) {
+      return res.status(400).json({ error: invalid });
     }
 
     // Check if the gymId exists in the Gym table
@@ -492,28 +515,13 @@ exports.signupGymMember = async (req, res) => {
 
     user = await User.create({
       username,
-      password: await bcrypt.hash(password, 10),
-      type: "gym_member",
-      firstName,
-      lastName,
-      email,
-      phone,
-      address,
-      city,
-      state,
-      pincode,
-      country,
-      dateOfBirth,
-      gender,
-      profilePicture,
-      emergencyContactName,
-      emergencyContactRelationship,
-      emergencyContactPhone,
-      emergencyContactEmail,
+      password: await passwordHasher.hash(password),
+      ...gymMemberFields(req.body),
     });
 
     // Update the GymAndGymMember table
     await GymAndGymMember.create({ gymId, memberId: user.id });
+    countCache.invalidate("Users", "GymAndGymMembers");
 
     const response = {
       message: "Gym member user created successfully",
@@ -525,11 +533,200 @@ exports.signupGymMember = async (req, res) => {
 
     res.status(200).json(response);
   } catch (error) {
+    if (passwordHasher.isBusy(error)) {
+      return serverBusy(res);
+    }
     logger.error(`Error in signupGymMember: ${error.message}`);
     res.status(500).json({ error: "Internal server error" });
   }
 };
 
+/**
+ * @swagger
+ * components:
+ *   schemas:
+ *     BatchResults:
+ *       type: object
+ *       description: Outcome of a batch create. Status 201 when every item was created, 207 when some were rejected and 400 when none was created.
+ *       properties:
+ *         created:
+ *           type: integer
+ *         failed:
+ *           type: integer
+ *         results:
+ *           type: array
+ *           items:
+ *             type: object
+ *             properties:
+ *               index:
+ *                 type: integer
+ *                 description: Position of the item in the request
+ *               status:
+ *                 type: integer
+ *                 description: 201 created, 400 rejected, 424 valid but not created because the atomic batch had rejected items
+ *               id:
+ *                 type: integer
+ *               error:
+ *                 type: string
+ */
+
+/**
+ * @swagger
+ * /api/signup/gymmember/batch:
+ *   post:
+ *     summary: Sign up many gym members in one request
+ *     tags: [Auth]
+ *     security:
+ *       - bearerAuth: []
+ *     description: Only admin and gym_admin users can sign up members in batch. Every item takes the fields of /api/signup/gymmember; gym admins may omit gymId and can only add members to their own gym. Valid items are created in one transaction.
+ *     parameters:
+ *       - in: query
+ *         name: atomic
+ *         schema:
+ *           type: boolean
+ *         description: Create nothing unless every item is valid
+ *     requestBody:
+ *       required: true
+ *       content:
+ *         application/json:
+ *           schema:
+ *             type: object
+ *             properties:
+ *               items:
+ *                 type: array
+ *                 items:
+ *                   type: object
+ *     responses:
+ *       201:
+ *         description: All members were created
+ *         content:
+ *           application/json:
+ *             schema:
+ *               $ref: '#/components/schemas/BatchResults'
+ *       207:
+ *         description: Some members were rejected
+ *         content:
+ *           application/json:
+ *             schema:
+ *               $ref: '#/components/schemas/BatchResults'
+ *       400:
+ *         description: Malformed batch, or no member was created
+ *       401:
+ *         description: Unauthorized
+ *       503:
+ *         description: Password hashing is saturated; retry after the Retry-After delay
+ *       500:
+ *         description: Internal server error
+ */
+exports.signupGymMembersBatch = async (req, res) => {
+  const currentUser = req.user;
+  if (currentUser.type !== "admin" && currentUser.type !== "gym_admin") {
+    return res.status(401).json({
+      error: "Unauthorized, only admin and gym_admin users can sign up members in batch",
+    });
+  }
+
+  const { items, atomic, error } = readBatch(req);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+
+  try {
+    const members = items.map((item) => ({
+      ...item,
+      gymId: item.gymId || (currentUser.type === "gym_admin" ? currentUser.gym_id : undefined),
+    }));
+    const batch = createBatch(members);
+
+    members.forEach((member, index) => {
+      const invalid = gymMemberSignupError(member);
+      if (invalid) {
+        batch.fail(index, invalid);
+      } else if (currentUser.type === "gym_admin" && Number(member.gymId) !== currentUser.gym_id) {
+        batch.fail(index, "Unauthorized for this gym.");
+      }
+    });
+
+    // Model validators (phone, pincode, gender, ...) without touching the database
+    for (const { item, index } of batch.valid()) {
+      try {
+        await User.build({ ...item, type: "gym_member" }).validate();
+      } catch (validationError) {
+        batch.fail(index, validationError.errors ? validationError.errors[0].message : validationError.message);
+      }
+    }
+
+    // One query each for the gyms, the usernames and the emails of the batch
+    const gymIds = [...new Set(batch.valid().map(({ item }) => Number(item.gymId)))];
+    const gyms = new Set(
+      (await Gym.findAll({ where: { id: gymIds }, attributes: ["id"] })).map((gym) => gym.id)
+    );
+    const usernames = batch.valid().map(({ item }) => item.username);
+    const takenUsernames = new Set(
+      (await User.findAll({ where: { username: usernames }, attributes: ["username"] })).map((user) => user.username)
+    );
+    const emails = batch.valid().map(({ item }) => item.email).filter(Boolean);
+    const takenEmails = new Set(
+      emails.length
+        ? (await User.findAll({ where: { email: emails }, attributes: ["email"] })).map((user) => user.email)
+        : []
+    );
+
+    const seenUsernames = new Set();
+    const seenEmails = new Set();
+    for (const { item, index } of batch.valid()) {
+      if (!gyms.has(Number(item.gymId))) {
+        batch.fail(index, "Gym does not exist.");
+      } else if (takenUsernames.has(item.username)) {
+        batch.fail(index, "User already exists.");
+      } else if (seenUsernames.has(item.username)) {
+        batch.fail(index, "Duplicate username in batch.");
+      } else if (item.email && (takenEmails.has(item.email) || seenEmails.has(item.email))) {
+        batch.fail(index, "Email already in use.");
+      }
+      seenUsernames.add(item.username);
+      if (item.email) seenEmails.add(item.email);
+    }
+
+    // Hash before opening the transaction so it does not hold a connection meanwhile
+    const pending = batch.valid();
+    if (!atomic || pending.length === members.length) {
+      const hashes = await Promise.all(pending.map(({ item }) => passwordHasher.hash(item.password)));
+      pending.forEach(({ item }, i) => {
+        item.passwordHash = hashes[i];
+      });
+    }
+
+    const created = await commitValid(batch, atomic, async (valid, transaction) => {
+      const users = await User.bulkCreate(
+        valid.map((item) => ({
+          username: item.username,
+          password: item.passwordHash,
+          ...gymMemberFields(item),
+        })),
+        { transaction }
+      );
+      await GymAndGymMember.bulkCreate(
+        users.map((user, i) => ({ gymId: valid[i].gymId, memberId: user.id })),
+        { transaction }
+      );
+      return users.map((user) => user.id);
+    });
+    if (created.size > 0) {
+      countCache.invalidate("Users", "GymAndGymMembers");
+    }
+
+    logger.info(`Batch signup created ${created.size} of ${items.length} gym members`);
+    sendBatchResults(res, batch, created);
+  } catch (error) {
+    if (passwordHasher.isBusy(error)) {
+      return serverBusy(res);
+    }
+    logger.error(`Error in signupGymMembersBatch: ${error.message}`);
+    res.status(500).json({ error: "Internal server error" });
+  }
+};
+
 /**
  * @swagger
  * /api/login:
@@ -574,6 +771,8 @@ exports.signupGymMember = async (req, res) => {
  *                 error:
  *                   type: string
  *                   example: Invalid username or password.
+ *       503:
+ *         description: Password hashing is saturated; retry after the Retry-After delay
  *       500:
  *         description: Internal server error
  *         content:
@@ -594,7 +793,7 @@ exports.login = async (req, res) => {
       return res.status(400).json({ error: "Invalid username or password." });
     }
 
-    const validPassword = await bcrypt.compare(password, user.password);
+    const validPassword = await passwordHasher.compare(password, user.password);
     if (!validPassword) {
       return res.status(400).json({ error: "Invalid username or password." });
     }
@@ -604,6 +803,9 @@ exports.login = async (req, res) => {
     });
     res.json({ token });
   } catch (error) {
+    if (passwordHasher.isBusy(error)) {
+      return serverBusy(res);
+    }
     logger.error(`Error in login: ${error.message}`);
     res.status(500).json({ error: "Internal server error" });
   }
@@ -741,6 +943,7 @@ exports.deleteAll = async (req, res) => {
     if (currentUser.type !== "admin") {
       return res.status(403).json({ error: "Forbidden, only admin user can delete all data" });
     }
+    await rollups.clear();
     await MembershipPlansPrice.destroy({ where: {} });
     await MembersMembership.destroy({ where: {} });
     await MembershipPlan.destroy({ where: {} });
@@ -748,6 +951,11 @@ exports.deleteAll = async (req, res) => {
     await GymAndGymAdmin.destroy({ where: {} });
     await Gym.destroy({ where: {} });
     await User.destroy({ where: {} });
+    userContextCache.clear();
+    countCache.clear();
+    responseCache.clear();
+    priceIndex.clear();
+    expiryBuckets.invalidate();
 
 
     res.json({ message: "All data deleted successfully" });
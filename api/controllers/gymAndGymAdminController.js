@@ -3,6 +3,10 @@ const GymAndGymAdmin = require("../models/gymAndGymAdmin");
 const User = require("../models/user");
 const Gym = require("../models/gym");
 const logger = require("../utils/logger");
+const userContextCache = require("../utils/userContextCache");
+const countCache = require("../utils/countCache");
+const { isCursorRequest, parseCursor, findPage, cursorResponse } = require("../utils/cursorPagination");
+const { project } = require("../utils/projection");
 
 
 /**
@@ -159,6 +163,8 @@ exports.createGymAndGymAdmin = async (req, res) => {
 
     // Create the relationship
     const relationship = await GymAndGymAdmin.create({ gymAdminId, gymId });
+    userContextCache.invalidateUser(gymAdminId);
+    countCache.invalidate("GymAndGymAdmins");
 
     // Fetch associated gym admin and gym details
     const response = await GymAndGymAdmin.findByPk(relationship.id, {
@@ -241,6 +247,8 @@ exports.deleteGymAndGymAdmin = async (req, res) => {
 
     // Delete the GymAndGymAdmin record
     await GymAndGymAdmin.destroy({ where: { id } });
+    userContextCache.invalidateUser(relationship.gymAdminId);
+    countCache.invalidate("GymAndGymAdmins");
 
     // Log success and return 204 indicating successful deletion
     logger.info(`Relationship deleted successfully: ${id}`);
@@ -291,6 +299,21 @@ exports.deleteGymAndGymAdmin = async (req, res) => {
  *         name: order[0][dir]
  *         schema:
  *           type: string
+ *       - in: query
+ *         name: cursor
+ *         description: Opt in to cursor (keyset) paging. Empty for the first page, then nextCursor or prevCursor from the previous response; start is ignored.
+ *         schema:
+ *           type: string
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated columns to return, e.g. "gymAdmin.username,gym.name,gym.city"; the id and the sort column are always returned
+ *       - in: query
+ *         name: raw
+ *         schema:
+ *           type: boolean
+ *         description: Skip building model instances
  *     responses:
  *       200:
  *         description: GymAndGymAdmin relationships retrieved successfully
@@ -305,10 +328,20 @@ exports.deleteGymAndGymAdmin = async (req, res) => {
  *                   type: integer
  *                 recordsFiltered:
  *                   type: integer
+ *                 nextCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the following page (cursor mode only)
+ *                 prevCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the preceding page (cursor mode only)
  *                 data:
  *                   type: array
  *                   items:
  *                     $ref: '#/components/schemas/GymAndGymAdmin'
+ *       400:
+ *         description: Invalid cursor, or fields names a column the listing does not return
  *       401:
  *         description: Unauthorized, only admin user can fetch the relationships
  *       500:
@@ -346,37 +379,76 @@ exports.getAllGymAndGymAdmins = async (req, res) => {
         }
       : {};
 
+    const scopeCondition = {};
+    let scope = "all";
     if (currentUser.type === "gym_admin") {
+      scopeCondition.gymAdminId = currentUser.id;
       whereClause.gymAdminId = currentUser.id;
+      scope = `gymAdmin:${currentUser.id}`;
+    }
+
+    const include = [
+      {
+        model: User,
+        as: "gymAdmin",
+        where: { type: "gym_admin" },
+        attributes: { exclude: ["password"] },
+      },
+      {
+        model: Gym,
+        as: "gym",
+      },
+    ];
+
+    const count = () =>
+      countCache.counts("GymAndGymAdmins", {
+        scope,
+        filter: searchValue ? { search: searchValue } : null,
+        total: () => GymAndGymAdmin.count({ where: scopeCondition, include, distinct: true }),
+        filtered: () => GymAndGymAdmin.count({ where: whereClause, include, distinct: true }),
+      });
+
+    const options = project(GymAndGymAdmin, req.query, { where: whereClause, include }, [sortField]);
+    if (!options) {
+      return res.status(400).json({ error: "Unknown column in fields." });
+    }
+
+    if (isCursorRequest(req.query)) {
+      const cursor = parseCursor(req.query.cursor, sortField, orderDirection);
+      if (!cursor) {
+        return res.status(400).json({ error: "Invalid cursor." });
+      }
+      const page = await findPage(GymAndGymAdmin, {
+        ...options,
+        field: sortField,
+        dir: orderDirection,
+        limit,
+        cursor,
+        count,
+      });
+      return res.status(200).json(cursorResponse(draw, page));
     }
 
     // Fetch GymAndGymAdmin relationships
-    const relationships = await GymAndGymAdmin.findAndCountAll({
-      where: whereClause,
-      include: [
-        {
-          model: User,
-          as: "gymAdmin",
-          where: { type: "gym_admin" },
-          attributes: { exclude: ["password"] },
-        },
-        {
-          model: Gym,
-          as: "gym",
-        },
-      ],
-      offset: start,
-      limit: limit,
-      order: [[sortField, orderDirection.toUpperCase()]],
-    });
+    const [rows, { recordsTotal, recordsFiltered }] = await Promise.all([
+      GymAndGymAdmin.findAll({
+        ...options,
+        offset: start,
+        limit: limit,
+        order: [[sortField, orderDirection.toUpperCase()]],
+      }),
+      count(),
+    ]);
 
     // Log success and return JSON response
-    logger.info(`Fetched ${relationships.count} gymAndGymAdmin relationships`);
+    logger.info(`Fetched ${rows.length} of ${recordsFiltered} gymAndGymAdmin relationships`, {
+      sample: "gymAdmins.list",
+    });
     res.status(200).json({
       draw: parseInt(draw),
-      recordsTotal: relationships.count,
-      recordsFiltered: relationships.count,
-      data: relationships.rows,
+      recordsTotal,
+      recordsFiltered,
+      data: rows,
     });
   } catch (error) {
     // Log error and return JSON response
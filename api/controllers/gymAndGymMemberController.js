@@ -3,6 +3,12 @@ const GymAndGymMember = require("../models/gymAndGymMember");
 const Gym = require("../models/gym");
 const User = require("../models/user");
 const logger = require("../utils/logger");
+const userContextCache = require("../utils/userContextCache");
+const countCache = require("../utils/countCache");
+const expiryBuckets = require("../utils/expiryBuckets");
+const { exportFormat, parseDateRange, streamExport } = require("../utils/exportStream");
+const { isCursorRequest, parseCursor, findPage, cursorResponse } = require("../utils/cursorPagination");
+const { project } = require("../utils/projection");
 
 /**
  * @swagger
@@ -174,6 +180,10 @@ exports.createGymAndGymMember = async (req, res) => {
     }
 
     const relationship = await GymAndGymMember.create({ memberId, gymId });
+    userContextCache.invalidateUser(memberId);
+    countCache.invalidate("GymAndGymMembers", "Users", "MembersMemberships", "Payments");
+    // The member's memberships change gym
+    expiryBuckets.invalidate();
 
     // Create a response object including gym and member details
     const response = {
@@ -250,6 +260,10 @@ exports.deleteGymAndGymMember = async (req, res) => {
 
     // Delete the GymAndGymMember record
     await GymAndGymMember.destroy({ where: { id } });
+    userContextCache.invalidateUser(relationship.memberId);
+    countCache.invalidate("GymAndGymMembers", "Users", "MembersMemberships", "Payments");
+    // The member's memberships change gym
+    expiryBuckets.invalidate();
 
     // Log success and respond with 204 indicating successful deletion
     logger.info(`Deleted gymAndGymMember relationship with id ${id}`);
@@ -302,6 +316,21 @@ exports.deleteGymAndGymMember = async (req, res) => {
  *         name: order[0][dir]
  *         schema:
  *           type: string
+ *       - in: query
+ *         name: cursor
+ *         description: Opt in to cursor (keyset) paging. Empty for the first page, then nextCursor or prevCursor from the previous response; start is ignored.
+ *         schema:
+ *           type: string
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated columns to return, e.g. "gymId,member.username,gym.name"; the id and the sort column are always returned
+ *       - in: query
+ *         name: raw
+ *         schema:
+ *           type: boolean
+ *         description: Skip building model instances
  *     responses:
  *       200:
  *         description: GymAndGymMember relationships retrieved successfully
@@ -316,10 +345,20 @@ exports.deleteGymAndGymMember = async (req, res) => {
  *                   type: integer
  *                 recordsFiltered:
  *                   type: integer
+ *                 nextCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the following page (cursor mode only)
+ *                 prevCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the preceding page (cursor mode only)
  *                 data:
  *                   type: array
  *                   items:
  *                     $ref: '#/components/schemas/GymAndGymMember'
+ *       400:
+ *         description: Invalid cursor, or fields names a column the listing does not return
  *       401:
  *         description: Unauthorized, only admin user can fetch the relationships
  *       500:
@@ -357,34 +396,67 @@ exports.getAllGymAndGymMembers = async (req, res) => {
         }
       : {};
 
-    const relationships = await GymAndGymMember.findAndCountAll({
-      where: whereClause,
-      include: [
-        {
-          model: User,
-          as: "member",
-          where: { type: "gym_member" },
-          attributes: { exclude: ["password"] },
-        },
-        {
-          model: Gym,
-          as: "gym",
-        },
-      ],
-      offset: start,
-      limit: limit,
-      order: [[sortField, orderDirection.toUpperCase()]],
-    });
+    const include = [
+      {
+        model: User,
+        as: "member",
+        where: { type: "gym_member" },
+        attributes: { exclude: ["password"] },
+      },
+      {
+        model: Gym,
+        as: "gym",
+      },
+    ];
+
+    const count = () =>
+      countCache.counts("GymAndGymMembers", {
+        filter: searchValue ? { search: searchValue } : null,
+        total: () => GymAndGymMember.count({ include, distinct: true }),
+        filtered: () => GymAndGymMember.count({ where: whereClause, include, distinct: true }),
+      });
+
+    const options = project(GymAndGymMember, req.query, { where: whereClause, include }, [sortField]);
+    if (!options) {
+      return res.status(400).json({ error: "Unknown column in fields." });
+    }
+
+    if (isCursorRequest(req.query)) {
+      const cursor = parseCursor(req.query.cursor, sortField, orderDirection);
+      if (!cursor) {
+        return res.status(400).json({ error: "Invalid cursor." });
+      }
+      const page = await findPage(GymAndGymMember, {
+        ...options,
+        field: sortField,
+        dir: orderDirection,
+        limit,
+        cursor,
+        count,
+      });
+      return res.status(200).json(cursorResponse(draw, page));
+    }
+
+    const [rows, { recordsTotal, recordsFiltered }] = await Promise.all([
+      GymAndGymMember.findAll({
+        ...options,
+        offset: start,
+        limit: limit,
+        order: [[sortField, orderDirection.toUpperCase()]],
+      }),
+      count(),
+    ]);
 
     // Log success and return JSON response
     logger.info(
-      `Retrieved ${relationships.count} gymAndGymMember relationships`
+      `Retrieved ${rows.length} of ${recordsFiltered} gymAndGymMember relationships`,
+      { sample: "gymMembers.list" }
     );
     res.status(200).json({
       draw: parseInt(draw),
-      recordsTotal: relationships.count,
-      recordsFiltered: relationships.count,
-      data: relationships.rows,
+      recordsTotal,
+      recordsFiltered,
+      data: rows,
     });
   } catch (error) {
     // Log error and return JSON response
@@ -478,7 +550,7 @@ exports.getMembersOfGym = async (req, res) => {
     const members = relationships.map((relationship) => relationship.member);
 
     // Log success and return JSON response
-    logger.info(`Retrieved ${members.length} members for gymId ${gymId}`);
+    logger.info(`Retrieved ${members.length} members for gymId ${gymId}`, { sample: "gymMembers.byGym" });
     res.status(200).json(members);
   } catch (error) {
     // Log error and return JSON response
@@ -562,7 +634,7 @@ exports.getGymsOfMember = async (req, res) => {
     const gyms = relationships.map((relationship) => relationship.gym);
 
     // Log success and return JSON response
-    logger.info(`Retrieved ${gyms.length} gyms for memberId ${memberId}`);
+    logger.info(`Retrieved ${gyms.length} gyms for memberId ${memberId}`, { sample: "gymMembers.byMember" });
     res.status(200).json(gyms);
   } catch (error) {
     // Log error and return JSON response
@@ -573,3 +645,124 @@ exports.getGymsOfMember = async (req, res) => {
     });
   }
 };
+
+/**
+ * @swagger
+ * /api/gymAndGymMember/export:
+ *   get:
+ *     summary: Export gym members as NDJSON or CSV
+ *     tags: [GymAndGymMembers]
+ *     description: Stream every matching gym member link with the member's details in one response, without paging. Only admin and gym_admin users can export; gym admins only export their own gym.
+ *     parameters:
+ *       - in: query
+ *         name: format
+ *         schema:
+ *           type: string
+ *           enum: [ndjson, csv]
+ *           default: ndjson
+ *       - in: query
+ *         name: from
+ *         schema:
+ *           type: string
+ *           format: date
+ *         description: Only members who joined on or after this date
+ *       - in: query
+ *         name: to
+ *         schema:
+ *           type: string
+ *           format: date
+ *         description: Only members who joined on or before this date
+ *       - in: query
+ *         name: gymId
+ *         schema:
+ *           type: integer
+ *         description: Only members of this gym (admin only)
+ *     responses:
+ *       200:
+ *         description: One member per line (NDJSON) or row (CSV)
+ *         content:
+ *           application/x-ndjson:
+ *             schema:
+ *               type: string
+ *           text/csv:
+ *             schema:
+ *               type: string
+ *       400:
+ *         description: Invalid format, date range or gymId
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.exportGymAndGymMembers = async (req, res) => {
+  const currentUser = req.user;
+  const format = exportFormat(req.query);
+  const range = parseDateRange(req.query);
+  const { gymId } = req.query;
+
+  if (currentUser.type !== "admin" && currentUser.type !== "gym_admin") {
+    return res.status(401).json({
+      error: "Unauthorized, only admin and gym_admin users can export gym members",
+    });
+  }
+  if (!format) {
+    return res.status(400).json({ error: "Unsupported export format." });
+  }
+  if (!range) {
+    return res.status(400).json({ error: "Invalid date range." });
+  }
+  if (gymId !== undefined && isNaN(parseInt(gymId, 10))) {
+    return res.status(400).json({ error: "Invalid gymId." });
+  }
+
+  try {
+    const where = {};
+    if (currentUser.type === "gym_admin") {
+      where.gymId = currentUser.gym_id;
+    } else if (gymId !== undefined) {
+      where.gymId = parseInt(gymId, 10);
+    }
+    if (range.from || range.to) {
+      where.createdAt = {};
+      if (range.from) where.createdAt[Op.gte] = range.from;
+      if (range.to) where.createdAt[Op.lte] = range.to;
+    }
+
+    await streamExport(res, {
+      Model: GymAndGymMember,
+      where,
+      include: [
+        {
+          model: User,
+          as: "member",
+          attributes: ["username", "email", "firstName", "lastName", "phone", "status"],
+        },
+        { model: Gym, as: "gym", attributes: ["name"] },
+      ],
+      columns: [
+        ["id", "id"],
+        ["gymId", "gymId"],
+        ["gym_name", "gym.name"],
+        ["memberId", "memberId"],
+        ["username", "member.username"],
+        ["email", "member.email"],
+        ["firstName", "member.firstName"],
+        ["lastName", "member.lastName"],
+        ["phone", "member.phone"],
+        ["status", "member.status"],
+        ["joinedAt", "createdAt"],
+      ],
+      format,
+      filename: "gym-members",
+    });
+  } catch (error) {
+    logger.error(`Error exporting gym members: ${error.message}`);
+    if (res.headersSent) {
+      return res.destroy(error);
+    }
+    res.status(500).json({
+      error: "Internal server error",
+      details: [error.message],
+    });
+  }
+};
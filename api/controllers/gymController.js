@@ -1,6 +1,12 @@
 const { Op } = require("sequelize");
 const logger = require("../utils/logger"); // Assuming logger setup in utils/logger.js
 const Gym = require("../models/gym");
+const { searchCondition } = require("../utils/search");
+const countCache = require("../utils/countCache");
+const responseCache = require("../utils/responseCache");
+const priceIndex = require("../utils/priceIndex");
+const expiryBuckets = require("../utils/expiryBuckets");
+const rollups = require("../utils/rollups");
 const GymAndGymAdmin = require("../models/gymAndGymAdmin");
 
 /**
@@ -240,6 +246,8 @@ exports.createGym = async (req, res) => {
     }
 
     const gym = await Gym.create(req.body);
+    countCache.invalidate("Gyms");
+    responseCache.invalidate("Gyms");
 
     logger.info(`New gym created successfully with ID: ${gym.id}`);
 
@@ -295,7 +303,7 @@ exports.createGym = async (req, res) => {
  *         name: search
  *         schema:
  *           type: string
- *         description: Search term to filter gyms by name, address, city, state, country, phone_number, email, or contact_person
+ *         description: Words matched as prefixes against gym name, city and contact_person (full-text)
  *       - in: query
  *         name: address
  *         schema:
@@ -385,7 +393,7 @@ exports.getAllGyms = async (req, res) => {
   const currentUser = req.user;
 
   try {
-    logger.info(`Fetching list of gyms by user ID: ${currentUser.id}`);
+    logger.info(`Fetching list of gyms by user ID: ${currentUser.id}`, { sample: "gyms.list" });
 
     const {
       page = 1,
@@ -416,35 +424,38 @@ exports.getAllGyms = async (req, res) => {
       where: {},
     };
 
-    if (search) {
-      options.where[Op.or] = [
-        { name: { [Op.like]: `%${search}%` } },
-        { address: { [Op.like]: `%${search}%` } },
-        { city: { [Op.like]: `%${search}%` } },
-        { state: { [Op.like]: `%${search}%` } },
-        { country: { [Op.like]: `%${search}%` } },
-        { phone_number: { [Op.like]: `%${search}%` } },
-        { email: { [Op.like]: `%${search}%` } },
-        { contact_person: { [Op.like]: `%${search}%` } },
-      ];
+    const searchWhere = searchCondition(Gym, search);
+    if (searchWhere) {
+      Object.assign(options.where, searchWhere);
     }
 
+    let scope = "all";
     if (currentUser.type === "gym_admin" || currentUser.type === "gym_member") {
-      const gymId = currentUser.gymId;
+      const gymId = currentUser.gym_id;
       options.where.id = gymId;
+      scope = `gym:${gymId}`;
     }
 
-    const gyms = await Gym.findAndCountAll(options);
-    const totalPages = Math.ceil(gyms.count / limit);
+    const [rows, { recordsFiltered: totalItems }] = await Promise.all([
+      Gym.findAll(options),
+      countCache.counts("Gyms", {
+        scope,
+        filter: searchWhere ? { search } : null,
+        total: () => Gym.count({ where: scope === "all" ? {} : { id: options.where.id } }),
+        filtered: () => Gym.count({ where: options.where }),
+      }),
+    ]);
+    const totalPages = Math.ceil(totalItems / limit);
 
     logger.info(
-      `Successfully fetched list of gyms by user ID: ${currentUser.id}`
+      `Successfully fetched list of gyms by user ID: ${currentUser.id}`,
+      { sample: "gyms.list" }
     );
 
     const response = {
-      data: gyms.rows,
+      data: rows,
       meta: {
-        totalItems: gyms.count,
+        totalItems,
         totalPages: totalPages,
         currentPage: +page,
       },
@@ -482,6 +493,8 @@ exports.getAllGyms = async (req, res) => {
  *           application/json:
  *             schema:
  *               $ref: '#/components/schemas/Gym'
+ *       304:
+ *         description: Not modified; the If-None-Match header matched the ETag of the cached response
  *       404:
  *         description: Gym not found
  *         content:
@@ -523,13 +536,13 @@ exports.getGymById = async (req, res) => {
 
   try {
     logger.info(
-      `Fetching gym by ID: ${req.params.id} by user ID: ${currentUser.id}`
+      `Fetching gym by ID: ${req.params.id} by user ID: ${currentUser.id}`,
+      { sample: "gyms.get" }
     );
 
     if (currentUser.type === "gym_admin" || currentUser.type === "gym_member") {
-      gymId = currentUser.gymId;
       // Check if user requested id is same as gym id
-      if (gymId != req.params.id) {
+      if (currentUser.gym_id != req.params.id) {
         logger.warn(
           `Unauthorized attempt to fetch gym by ID: ${req.params.id} by user ID: ${currentUser.id}`
         );
@@ -550,7 +563,8 @@ exports.getGymById = async (req, res) => {
     }
 
     logger.info(
-      `Successfully fetched gym by ID: ${id} by user ID: ${currentUser.id}`
+      `Successfully fetched gym by ID: ${id} by user ID: ${currentUser.id}`,
+      { sample: "gyms.get" }
     );
 
     res.status(200).json(gym);
@@ -641,6 +655,8 @@ exports.updateGymById = async (req, res) => {
     }
 
     await gym.update(req.body);
+    countCache.invalidate("Gyms");
+    responseCache.invalidate("Gyms");
 
     logger.info(
       `Successfully updated gym by ID: ${id} by user ID: ${currentUser.id}`
@@ -756,6 +772,11 @@ exports.deleteGymById = async (req, res) => {
     }
 
     await gym.destroy();
+    countCache.invalidate("Gyms");
+    responseCache.invalidate("Gyms", "MembershipPlans", "MembershipPlansPrices");
+    priceIndex.clear();
+    expiryBuckets.invalidate();
+    await rollups.removeGym(gym.id);
 
     logger.info(
       `Successfully deleted gym by ID: ${id} by user ID: ${currentUser.id}`
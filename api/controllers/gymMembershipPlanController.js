@@ -1,6 +1,12 @@
 const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
 const MembershipPlan = require("../models/gymMembershipPlan");
 const logger = require("../utils/logger");
+const countCache = require("../utils/countCache");
+const responseCache = require("../utils/responseCache");
+const priceIndex = require("../utils/priceIndex");
+const rollups = require("../utils/rollups");
+const { isCursorRequest, parseCursor, findPage, cursorResponse } = require("../utils/cursorPagination");
 
 /**
  * @swagger
@@ -77,7 +83,7 @@ exports.getMembershipPlanById = async (req, res) => {
     }
 
     // Log success and send the plan details in the response
-    logger.info(`Retrieved membership plan with ID ${planId}`);
+    logger.info(`Retrieved membership plan with ID ${planId}`, { sample: "plans.get" });
     res.status(200).json(plan);
   } catch (error) {
     // Log error and handle errors
@@ -154,6 +160,8 @@ exports.createGymMembershipPlan = async (req, res) => {
       duration_value,
       category,
     });
+    countCache.invalidate("MembershipPlans");
+    responseCache.invalidate("MembershipPlans");
 
     // Log success and send the created plan details in the response
     logger.info(`Created new membership plan with ID ${newPlan.id}`);
@@ -188,6 +196,8 @@ exports.createGymMembershipPlan = async (req, res) => {
  *               type: array
  *               items:
  *                 $ref: '#/components/schemas/MembershipPlan'
+ *       304:
+ *         description: Not modified; the If-None-Match header matched the ETag of the cached response
  *       404:
  *         description: Gym not found
  *       500:
@@ -199,7 +209,8 @@ exports.getMembershipPlansByGymId = async (req, res) => {
 
   // if user is gym_admin or gym_member, they can only fetch their gym's plans
   if (req.user.type === "gym_admin" || req.user.type === "gym_member") {
-    if (req.user.gym_id !== gymId) {
+    // gymId comes from the URL as a string
+    if (req.user.gym_id != gymId) {
       return res.status(401).json({ error: "Unauthorized" });
     }
   }
@@ -313,8 +324,17 @@ exports.updateMembershipPlanById = async (req, res) => {
       updatedData.gym_id = gym_id;
     }
 
-    // Update the plan in the database
-    await plan.update(updatedData);
+    // Update the plan in the database; its rollups follow it to a new gym
+    const previousGymId = plan.gym_id;
+    await sequelize.transaction(async (transaction) => {
+      await plan.update(updatedData, { transaction });
+      if (plan.gym_id !== previousGymId) {
+        await rollups.movePlan(plan.id, plan.gym_id, transaction);
+      }
+    });
+    countCache.invalidate("MembershipPlans");
+    responseCache.invalidate("MembershipPlans");
+    priceIndex.invalidate(plan.id);
 
     // Log success and send the updated plan details in the response
     logger.info(`Updated membership plan with ID ${planId}`);
@@ -380,6 +400,9 @@ exports.deleteMembershipPlanById = async (req, res) => {
 
     // Delete the plan from the database
     await plan.destroy();
+    countCache.invalidate("MembershipPlans");
+    responseCache.invalidate("MembershipPlans");
+    priceIndex.invalidate(plan.id);
 
     // Log success and send a success response
     logger.info(`Deleted membership plan with ID ${planId}`);
@@ -429,6 +452,11 @@ exports.deleteMembershipPlanById = async (req, res) => {
  *         description: Ordering direction for the specified column (asc/desc).
  *         schema:
  *           type: string
+ *       - in: query
+ *         name: cursor
+ *         description: Opt in to cursor (keyset) paging. Empty for the first page, then nextCursor or prevCursor from the previous response; start is ignored.
+ *         schema:
+ *           type: string
  *     responses:
  *       200:
  *         description: An object with DataTables-compatible data structure.
@@ -443,6 +471,14 @@ exports.deleteMembershipPlanById = async (req, res) => {
  *                   type: integer
  *                 recordsFiltered:
  *                   type: integer
+ *                 nextCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the following page (cursor mode only)
+ *                 prevCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the preceding page (cursor mode only)
  *                 data:
  *                   type: array
  *                   items:
@@ -514,24 +550,42 @@ exports.getAllMembershipPlans = async (req, res) => {
       }
     }
 
-    // Fetch total records count (for pagination)
-    const recordsTotal = await MembershipPlan.count();
-
     // for gym_admin and gym_member, fetch plans of their gym only
+    let filterKey = search && search.value ? { search: search.value } : null;
     if (req.user.type === "gym_admin" || req.user.type === "gym_member") {
       options.where = { gym_id: req.user.gym_id };
+      filterKey = { gym_id: req.user.gym_id };
     }
 
-    // Fetch filtered records count (for search)
-    let recordsFiltered = recordsTotal;
-    if (options.where) {
-      options.attributes = ["id"];
-      recordsFiltered = await MembershipPlan.count(options);
-      options.attributes = undefined; // Reset attributes for actual data fetch
+    const count = () =>
+      countCache.counts("MembershipPlans", {
+        filter: filterKey,
+        total: () => MembershipPlan.count(),
+        filtered: () => MembershipPlan.count({ where: options.where }),
+      });
+
+    if (isCursorRequest(req.query)) {
+      const [field, dir] = options.order[0] || ["id", "ASC"];
+      const cursor = parseCursor(req.query.cursor, field, dir);
+      if (!cursor) {
+        return res.status(400).json({ error: "Invalid cursor." });
+      }
+      const page = await findPage(MembershipPlan, {
+        where: options.where,
+        field,
+        dir,
+        limit: pageSize,
+        cursor,
+        count
+      });
+      return res.status(200).json(cursorResponse(draw, page));
     }
 
-    // Fetch membership plans
-    const plans = await MembershipPlan.findAll(options);
+    // Fetch membership plans along with the (cached) total and filtered counts
+    const [plans, { recordsTotal, recordsFiltered }] = await Promise.all([
+      MembershipPlan.findAll(options),
+      count(),
+    ]);
 
     // Respond with DataTables-compatible structure
     res.status(200).json({
@@ -0,0 +1,85 @@
+const { localHealth, clusterHealth } = require("../utils/cluster");
+
+/**
+ * @swagger
+ * tags:
+ *   name: Health
+ *   description: Process health
+ */
+
+/**
+ * @swagger
+ * /api/health:
+ *   get:
+ *     summary: Liveness of the process that served the request
+ *     tags: [Health]
+ *     security: []
+ *     description: Public, so it reports nothing but liveness; the process and cluster statistics are at /api/internal/health.
+ *     responses:
+ *       200:
+ *         description: The process is up
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 status:
+ *                   type: string
+ *                   example: ok
+ */
+exports.getHealth = (req, res) => {
+  res.set("Cache-Control", "no-store");
+  res.json({ status: "ok" });
+};
+
+/**
+ * @swagger
+ * /api/internal/health:
+ *   get:
+ *     summary: Health report of the process that served the request
+ *     tags: [Health]
+ *     security: []
+ *     description: Internal only (X-Metrics-Token, or a request from the local machine without METRICS_TOKEN). In cluster mode `cluster` lists the latest report of every worker, as collected by the primary; otherwise it is null.
+ *     responses:
+ *       200:
+ *         description: The process is up
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 status:
+ *                   type: string
+ *                   example: ok
+ *                 process:
+ *                   type: object
+ *                   properties:
+ *                     pid:
+ *                       type: integer
+ *                     worker:
+ *                       type: integer
+ *                       nullable: true
+ *                     uptimeS:
+ *                       type: integer
+ *                     rssMb:
+ *                       type: integer
+ *                     heapUsedMb:
+ *                       type: integer
+ *                     eventLoopDelayP99Ms:
+ *                       type: number
+ *                     requestsServed:
+ *                       type: integer
+ *                     requestsActive:
+ *                       type: integer
+ *                 cluster:
+ *                   type: array
+ *                   nullable: true
+ *                   items:
+ *                     type: object
+ *       403:
+ *         description: Not an internal request
+ */
+exports.getInternalHealth = (req, res) => {
+  res.set("Cache-Control", "no-store");
+  res.json({ status: "ok", process: localHealth(), cluster: clusterHealth() });
+};
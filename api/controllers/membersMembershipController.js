@@ -1,8 +1,19 @@
 const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
 const MembersMembership = require("../models/membersMembership");
 const User = require("../models/user");
 const MembershipPlan = require("../models/gymMembershipPlan");
 const logger = require("../utils/logger");
+const { searchCondition } = require("../utils/search");
+const countCache = require("../utils/countCache");
+const expiryBuckets = require("../utils/expiryBuckets");
+const rollups = require("../utils/rollups");
+const { renewExpiring } = require("../utils/membershipRenewals");
+const { memberScope } = require("../utils/tenantScope");
+const { project } = require("../utils/projection");
+const { exportFormat, parseDateRange, streamExport } = require("../utils/exportStream");
+const { readBatch, createBatch, commitValid, sendBatchResults } = require("../utils/batch");
+const { isCursorRequest, parseCursor, findPage, cursorResponse } = require("../utils/cursorPagination");
 const GymAndGymMember = require("../models/gymAndGymMember");
 
 /**
@@ -84,7 +95,7 @@ exports.createMembersMembership = async (req, res) => {
       const membershipPlanGymId = await MembershipPlan.findByPk(
         membership_plan_id
       ).then((result) => {
-        return result.gymId;
+        return result.gym_id;
       });
 
       if (membershipPlanGymId !== req.user.gym_id) {
@@ -131,12 +142,22 @@ exports.createMembersMembership = async (req, res) => {
     }
 
     // Create the new members membership
-    const newMembership = await MembersMembership.create({
-      gym_member_id,
-      membership_plan_id,
-      start_date,
-      end_date,
+    // The membership rollup changes in the same transaction
+    const newMembership = await sequelize.transaction(async (transaction) => {
+      const membership = await MembersMembership.create(
+        {
+          gym_member_id,
+          membership_plan_id,
+          start_date,
+          end_date,
+        },
+        { transaction }
+      );
+      await rollups.recordMemberships([], [membership], transaction);
+      return membership;
     });
+    countCache.invalidate("MembersMemberships");
+    await expiryBuckets.track([newMembership]);
 
     // Log success and send the created membership details in the response
     logger.info(`Created new membership with ID ${newMembership.id}`);
@@ -148,6 +169,169 @@ exports.createMembersMembership = async (req, res) => {
   }
 };
 
+/**
+ * @swagger
+ * /api/membersMemberships/batch:
+ *   post:
+ *     summary: Create many members memberships in one request
+ *     tags: [MembersMemberships]
+ *     description: Only admin and gym_admin can create memberships. Every item takes the fields of POST /api/membersMemberships. Items are rejected when they overlap an existing membership or an earlier item of the batch for the same member. Valid items are created in one transaction.
+ *     parameters:
+ *       - in: query
+ *         name: atomic
+ *         schema:
+ *           type: boolean
+ *         description: Create nothing unless every item is valid
+ *     requestBody:
+ *       required: true
+ *       content:
+ *         application/json:
+ *           schema:
+ *             type: object
+ *             properties:
+ *               items:
+ *                 type: array
+ *                 items:
+ *                   $ref: '#/components/schemas/MembersMembership'
+ *     responses:
+ *       201:
+ *         description: All memberships were created
+ *         content:
+ *           application/json:
+ *             schema:
+ *               $ref: '#/components/schemas/BatchResults'
+ *       207:
+ *         description: Some memberships were rejected
+ *         content:
+ *           application/json:
+ *             schema:
+ *               $ref: '#/components/schemas/BatchResults'
+ *       400:
+ *         description: Malformed batch, or no membership was created
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.createMembersMembershipsBatch = async (req, res) => {
+  const currentUser = req.user;
+  if (currentUser.type !== "admin" && currentUser.type !== "gym_admin") {
+    return res.status(401).json({ error: "Unauthorized." });
+  }
+
+  const { items, atomic, error } = readBatch(req);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+
+  try {
+    const memberships = items.map(item => ({
+      gym_member_id: parseInt(item.gym_member_id, 10),
+      membership_plan_id: parseInt(item.membership_plan_id, 10),
+      start_date: new Date(item.start_date),
+      end_date: new Date(item.end_date)
+    }));
+    const batch = createBatch(memberships);
+
+    memberships.forEach((membership, index) => {
+      const { gym_member_id, membership_plan_id, start_date, end_date } = membership;
+      if (!gym_member_id || !membership_plan_id || isNaN(start_date) || isNaN(end_date)) {
+        batch.fail(index, "Invalid or missing fields.");
+      } else if (start_date >= end_date) {
+        batch.fail(index, "Start date must be before end date.");
+      }
+    });
+
+    // One query each for the members, their gyms and the plans of the batch
+    const memberIds = [...new Set(batch.valid().map(({ item }) => item.gym_member_id))];
+    const planIds = [...new Set(batch.valid().map(({ item }) => item.membership_plan_id))];
+    const members = new Set(
+      (await User.findAll({ where: { id: memberIds, type: "gym_member" }, attributes: ["id"] })).map(user => user.id)
+    );
+    const plans = new Map(
+      (await MembershipPlan.findAll({ where: { id: planIds }, attributes: ["id", "gym_id"] })).map(plan => [
+        plan.id,
+        plan.gym_id
+      ])
+    );
+    const memberGyms = new Map();
+    if (currentUser.type === "gym_admin") {
+      const links = await GymAndGymMember.findAll({
+        where: { memberId: memberIds, gymId: currentUser.gym_id },
+        attributes: ["memberId", "gymId"]
+      });
+      links.forEach(link => memberGyms.set(link.memberId, link.gymId));
+    }
+
+    for (const { item, index } of batch.valid()) {
+      if (!members.has(item.gym_member_id)) {
+        batch.fail(index, "Gym member does not exist.");
+      } else if (!plans.has(item.membership_plan_id)) {
+        batch.fail(index, "Membership plan does not exist.");
+      } else if (
+        currentUser.type === "gym_admin" &&
+        (memberGyms.get(item.gym_member_id) !== currentUser.gym_id ||
+          plans.get(item.membership_plan_id) !== currentUser.gym_id)
+      ) {
+        batch.fail(index, "Unauthorized.");
+      }
+    }
+
+    // Overlap check for the whole batch in a single query: every existing
+    // membership of these members within the batch's overall period
+    const pending = batch.valid();
+    const existing = pending.length
+      ? await MembersMembership.findAll({
+          where: {
+            gym_member_id: [...new Set(pending.map(({ item }) => item.gym_member_id))],
+            start_date: { [Op.lt]: new Date(Math.max(...pending.map(({ item }) => item.end_date))) },
+            end_date: { [Op.gt]: new Date(Math.min(...pending.map(({ item }) => item.start_date))) }
+          },
+          attributes: ["gym_member_id", "start_date", "end_date"]
+        })
+      : [];
+    const periods = new Map();
+    existing.forEach(row => {
+      if (!periods.has(row.gym_member_id)) periods.set(row.gym_member_id, []);
+      periods.get(row.gym_member_id).push({ start: new Date(row.start_date), end: new Date(row.end_date) });
+    });
+
+    for (const { item, index } of pending) {
+      const taken = periods.get(item.gym_member_id) || [];
+      const overlap = taken.find(period => period.start < item.end_date && period.end > item.start_date);
+      if (overlap) {
+        batch.fail(
+          index,
+          overlap.inBatch
+            ? "Membership period overlaps with an earlier item of the batch."
+            : "Membership period overlaps with an existing membership."
+        );
+        continue;
+      }
+      // Later items of the batch must not overlap earlier accepted ones either
+      taken.push({ start: item.start_date, end: item.end_date, inBatch: true });
+      periods.set(item.gym_member_id, taken);
+    }
+
+    let createdRows = [];
+    const created = await commitValid(batch, atomic, async (valid, transaction) => {
+      createdRows = await MembersMembership.bulkCreate(valid, { transaction });
+      await rollups.recordMemberships([], createdRows, transaction);
+      return createdRows.map(row => row.id);
+    });
+    if (created.size > 0) {
+      countCache.invalidate("MembersMemberships");
+      await expiryBuckets.track(createdRows);
+    }
+
+    logger.info(`Batch created ${created.size} of ${items.length} members memberships`);
+    sendBatchResults(res, batch, created);
+  } catch (error) {
+    logger.error(`Error creating members memberships in batch: ${error.message}`);
+    res.status(500).json({ error: "Internal server error." });
+  }
+};
+
 /**
  * @swagger
  * /api/membersMemberships/{membershipId}:
@@ -239,7 +423,7 @@ exports.getMembersMembershipById = async (req, res) => {
         membership.membership_plan_id
       );
 
-      if (!membershipPlan || membershipPlan.gymId !== req.user.gym_id) {
+      if (!membershipPlan || membershipPlan.gym_id !== req.user.gym_id) {
         return res.status(401).json({ error: "Unauthorized." });
       }
     } else if (req.user.type === "gym_member") {
@@ -350,6 +534,8 @@ exports.updateMembersMembershipById = async (req, res) => {
       }
     }
 
+    const previous = membershipToUpdate.get({ plain: true });
+
     // Update the membership object with the provided data
     if (gym_member_id !== undefined) {
       membershipToUpdate.gym_member_id = gym_member_id;
@@ -380,7 +566,7 @@ exports.updateMembersMembershipById = async (req, res) => {
         membershipToUpdate.membership_plan_id
       );
 
-      if (!membershipPlan || membershipPlan.gymId !== req.user.gym_id) {
+      if (!membershipPlan || membershipPlan.gym_id !== req.user.gym_id) {
         return res.status(401).json({ error: "Unauthorized." });
       }
     } else if (req.user.type === "gym_member") {
@@ -391,7 +577,13 @@ exports.updateMembersMembershipById = async (req, res) => {
     }
 
     // Save the updated membership
-    membershipToUpdate = await membershipToUpdate.save();
+    membershipToUpdate = await sequelize.transaction(async (transaction) => {
+      const saved = await membershipToUpdate.save({ transaction });
+      await rollups.recordMemberships([previous], [saved], transaction);
+      return saved;
+    });
+    countCache.invalidate("MembersMemberships");
+    await expiryBuckets.track([membershipToUpdate]);
 
     // Log success and send the updated membership details in the response
     logger.info(`Updated membership with ID ${membershipId}`);
@@ -455,7 +647,7 @@ exports.deleteMembersMembershipById = async (req, res) => {
         membershipToDelete.membership_plan_id
       );
 
-      if (!membershipPlan || membershipPlan.gymId !== req.user.gym_id) {
+      if (!membershipPlan || membershipPlan.gym_id !== req.user.gym_id) {
         return res.status(401).json({ error: "Unauthorized." });
       }
     } else if (req.user.type === "gym_member") {
@@ -464,7 +656,12 @@ exports.deleteMembersMembershipById = async (req, res) => {
     }
 
     // Delete the membership from the database
-    await membershipToDelete.destroy();
+    await sequelize.transaction(async (transaction) => {
+      await membershipToDelete.destroy({ transaction });
+      await rollups.recordMemberships([membershipToDelete], [], transaction);
+    });
+    countCache.invalidate("MembersMemberships");
+    expiryBuckets.untrack([membershipToDelete.id]);
 
     // Log success and send a success response
     logger.info(`Deleted membership with ID ${membershipId}`);
@@ -506,7 +703,7 @@ exports.deleteMembersMembershipById = async (req, res) => {
  *           properties:
  *             value:
  *               type: string
- *               description: Global search value
+ *               description: A membership/member/plan id, or words matched as prefixes against the member's username and email
  *       - in: query
  *         name: order
  *         schema:
@@ -521,6 +718,21 @@ exports.deleteMembersMembershipById = async (req, res) => {
  *                 type: string
  *                 enum: [asc, desc]
  *                 description: Ordering direction for this column
+ *       - in: query
+ *         name: cursor
+ *         description: Opt in to cursor (keyset) paging. Empty for the first page, then nextCursor or prevCursor from the previous response; start is ignored.
+ *         schema:
+ *           type: string
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated columns to return, e.g. "end_date,User.username,MembershipPlan.plan_name"; the id and the sort column are always returned
+ *       - in: query
+ *         name: raw
+ *         schema:
+ *           type: boolean
+ *         description: Skip building model instances
  *     responses:
  *       200:
  *         description: An array of memberships
@@ -538,10 +750,20 @@ exports.deleteMembersMembershipById = async (req, res) => {
  *                 recordsFiltered:
  *                   type: integer
  *                   description: Total number of memberships after filtering
+ *                 nextCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the following page (cursor mode only)
+ *                 prevCursor:
+ *                   type: string
+ *                   nullable: true
+ *                   description: Cursor of the preceding page (cursor mode only)
  *                 data:
  *                   type: array
  *                   items:
  *                     $ref: '#/components/schemas/MembersMembership'
+ *       400:
+ *         description: Invalid cursor, or fields names a column the listing does not return
  *       401:
  *         description: Unauthorized. Only admin or authorized users can fetch memberships.
  *       500:
@@ -588,59 +810,87 @@ exports.getAllMembersMemberships = async (req, res) => {
   }, {});
 
   try {
-    let whereCondition = {
-      [Op.or]: validColumns.map(col => ({
-        [col]: { [Op.like]: `%${searchValue}%` }
-      }))
-    };
-
-    if (currentUser.type === "gym_admin") {
-      // Add additional conditions for gym_admin role
-      const gymMembers = await GymAndGymMember.findAll({
-        where: {
-          gymId: currentUser.gym_id
-        },
-        attributes: ["memberId"]
-      });
-      const memberIds = gymMembers.map(member => member.memberId);
+    // Numbers match the id columns exactly; anything else searches the
+    // member's username/email. An empty search adds no predicate.
+    const searchTerm = String(searchValue).trim();
+    let whereCondition = {};
+    let memberSearch = null;
+    if (/^\d+$/.test(searchTerm)) {
       whereCondition = {
-        ...whereCondition,
-        gym_member_id: { [Op.in]: memberIds }
-        // Add more conditions specific to gym_admin as needed
-      };
-    } else if (currentUser.type === "gym_member") {
-      // Add conditions for gym_member role
-      whereCondition = {
-        ...whereCondition,
-        gym_member_id: currentUser.id
-        // Add more conditions specific to gym_member as needed
+        [Op.or]: ["id", "gym_member_id", "membership_plan_id"].map(col => ({
+          [col]: parseInt(searchTerm, 10)
+        }))
       };
+    } else {
+      memberSearch = searchCondition(User, searchTerm);
     }
 
-    const { count, rows } = await MembersMembership.findAndCountAll({
-      where: {
-        ...filterConditions,
-        ...whereCondition
+    // Rows the current user may see at all; recordsTotal counts these
+    const { where: scopeCondition, key: scope } = memberScope(currentUser);
+
+    const where = {
+      ...filterConditions,
+      ...whereCondition,
+      ...scopeCondition
+    };
+    const include = [
+      {
+        model: User,
+        attributes: ["id", "username", "email", "firstName", "lastName"],
+        ...(memberSearch && { where: memberSearch, required: true })
       },
-      include: [
-        {
-          model: User,
-          attributes: ["id", "username", "email", "firstName", "lastName"]
-        },
-        {
-          model: MembershipPlan,
-          attributes: ["id", "plan_name", "plan_description", "category"]
-        }
-      ],
-      order: orderCondition,
-      limit: limitNumber,
-      offset: startIndex
-    });
+      {
+        model: MembershipPlan,
+        attributes: ["id", "plan_name", "plan_description", "category"]
+      }
+    ];
+
+    // Page turns of the same search share one cached filtered count
+    const filterKey = Object.keys(filterConditions).sort().map(key => [key, filters[key]]);
+    const hasFilter = searchTerm !== "" || filterKey.length > 0;
+    const count = () =>
+      countCache.counts("MembersMemberships", {
+        scope,
+        filter: hasFilter ? { search: searchTerm, filters: filterKey } : null,
+        total: () => MembersMembership.count({ where: scopeCondition }),
+        filtered: () => MembersMembership.count({ where, include, distinct: true })
+      });
+
+    const options = project(MembersMembership, req.query, { where, include }, [sanitizedSortBy]);
+    if (!options) {
+      return res.status(400).json({ error: "Unknown column in fields." });
+    }
+
+    if (isCursorRequest(req.query)) {
+      const cursor = parseCursor(req.query.cursor, sanitizedSortBy, orderDir);
+      if (!cursor) {
+        return res.status(400).json({ error: "Invalid cursor." });
+      }
+      const page = await findPage(MembersMembership, {
+        ...options,
+        field: sanitizedSortBy,
+        dir: orderDir,
+        limit: limitNumber,
+        cursor,
+        count
+      });
+      return res.status(200).json(cursorResponse(drawNumber, page));
+    }
+
+    const [rows, { recordsTotal, recordsFiltered }] = await Promise.all([
+      MembersMembership.findAll({
+        ...options,
+        order: orderCondition,
+        limit: limitNumber,
+        offset: startIndex
+      }),
+      count()
+    ]);
 
     res.status(200).json({
       draw: drawNumber,
-      recordsTotal: count,
-      recordsFiltered: count,
+      recordsTotal,
+      recordsFiltered,
       data: rows
     });
   } catch (error) {
@@ -650,3 +900,283 @@ exports.getAllMembersMemberships = async (req, res) => {
     });
   }
 };
+
+/**
+ * @swagger
+ * /api/membersMemberships/export:
+ *   get:
+ *     summary: Export members memberships as NDJSON or CSV
+ *     tags: [MembersMemberships]
+ *     description: Stream every matching membership in one response, without paging. Gym admins only export their gym's memberships and gym members only their own.
+ *     parameters:
+ *       - in: query
+ *         name: format
+ *         schema:
+ *           type: string
+ *           enum: [ndjson, csv]
+ *           default: ndjson
+ *       - in: query
+ *         name: from
+ *         schema:
+ *           type: string
+ *           format: date
+ *         description: Only memberships still running on or after this date
+ *       - in: query
+ *         name: to
+ *         schema:
+ *           type: string
+ *           format: date
+ *         description: Only memberships starting on or before this date
+ *       - in: query
+ *         name: gymId
+ *         schema:
+ *           type: integer
+ *         description: Only memberships of this gym's members (admin only)
+ *     responses:
+ *       200:
+ *         description: One membership per line (NDJSON) or row (CSV)
+ *         content:
+ *           application/x-ndjson:
+ *             schema:
+ *               type: string
+ *           text/csv:
+ *             schema:
+ *               type: string
+ *       400:
+ *         description: Invalid format, date range or gymId
+ *       500:
+ *         description: Internal server error
+ */
+exports.exportMembersMemberships = async (req, res) => {
+  const format = exportFormat(req.query);
+  const range = parseDateRange(req.query);
+  const { gymId } = req.query;
+
+  if (!format) {
+    return res.status(400).json({ error: "Unsupported export format." });
+  }
+  if (!range) {
+    return res.status(400).json({ error: "Invalid date range." });
+  }
+  if (gymId !== undefined && isNaN(parseInt(gymId, 10))) {
+    return res.status(400).json({ error: "Invalid gymId." });
+  }
+
+  try {
+    const { where: scopeCondition } = memberScope(
+      req.user,
+      "gym_member_id",
+      gymId === undefined ? null : parseInt(gymId, 10)
+    );
+
+    // Memberships overlapping the requested period
+    const where = { ...scopeCondition };
+    if (range.to) where.start_date = { [Op.lte]: range.to };
+    if (range.from) where.end_date = { [Op.gte]: range.from };
+
+    await streamExport(res, {
+      Model: MembersMembership,
+      where,
+      include: [
+        { model: User, attributes: ["username", "email"] },
+        { model: MembershipPlan, attributes: ["plan_name"] }
+      ],
+      columns: [
+        ["id", "id"],
+        ["gym_member_id", "gym_member_id"],
+        ["username", "User.username"],
+        ["email", "User.email"],
+        ["membership_plan_id", "membership_plan_id"],
+        ["plan_name", "MembershipPlan.plan_name"],
+        ["start_date", "start_date"],
+        ["end_date", "end_date"],
+        ["createdAt", "createdAt"]
+      ],
+      format,
+      filename: "members-memberships"
+    });
+  } catch (error) {
+    logger.error(`Error exporting members memberships: ${error.message}`);
+    if (res.headersSent) {
+      return res.destroy(error);
+    }
+    res.status(500).json({ error: "Internal server error" });
+  }
+};
+
+// Shared by the expiring and renewals endpoints: { days, gymId } or { error }
+const expiryWindow = (user, days, gymId) => {
+  const windowDays = days === undefined ? 7 : parseInt(days, 10);
+  if (isNaN(windowDays) || windowDays < 1 || windowDays > expiryBuckets.HORIZON_DAYS) {
+    return { error: `days must be between 1 and ${expiryBuckets.HORIZON_DAYS}.` };
+  }
+  if (user.type === "gym_admin") {
+    return { days: windowDays, gymId: user.gym_id };
+  }
+  if (gymId !== undefined && gymId !== null && isNaN(parseInt(gymId, 10))) {
+    return { error: "Invalid gymId." };
+  }
+  return { days: windowDays, gymId: gymId === undefined || gymId === null ? null : parseInt(gymId, 10) };
+};
+
+/**
+ * @swagger
+ * /api/membersMemberships/expiring:
+ *   get:
+ *     summary: Memberships expiring soon
+ *     tags: [MembersMemberships]
+ *     description: Memberships ending between today and `days - 1` days from now, sorted by end date, with a count per day. Served from per-gym expiry buckets kept in memory. Admins see every gym unless they pass gymId; gym admins see their own gym.
+ *     parameters:
+ *       - in: query
+ *         name: days
+ *         schema:
+ *           type: integer
+ *           default: 7
+ *         description: Size of the window in days, at most EXPIRY_HORIZON_DAYS (60 by default)
+ *       - in: query
+ *         name: gymId
+ *         schema:
+ *           type: integer
+ *         description: Only memberships of this gym's members (admin only)
+ *     responses:
+ *       200:
+ *         description: The expiring memberships
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 from:
+ *                   type: string
+ *                   format: date
+ *                 to:
+ *                   type: string
+ *                   format: date
+ *                 days:
+ *                   type: array
+ *                   items:
+ *                     type: object
+ *                     properties:
+ *                       date:
+ *                         type: string
+ *                         format: date
+ *                       count:
+ *                         type: integer
+ *                 data:
+ *                   type: array
+ *                   items:
+ *                     $ref: '#/components/schemas/MembersMembership'
+ *       400:
+ *         description: Invalid days or gymId
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.getExpiringMemberships = async (req, res) => {
+  if (req.user.type !== "admin" && req.user.type !== "gym_admin") {
+    return res.status(401).json({ error: "Unauthorized." });
+  }
+  const { days, gymId, error } = expiryWindow(req.user, req.query.days, req.query.gymId);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+
+  try {
+    const { from, to, days: perDay, data } = await expiryBuckets.expiring(gymId, days);
+    res.status(200).json({
+      from,
+      to,
+      days: perDay,
+      data: data.map(({ id, gym_member_id, membership_plan_id, start_date, end_date }) => ({
+        id,
+        gym_member_id,
+        membership_plan_id,
+        start_date,
+        end_date
+      }))
+    });
+  } catch (error) {
+    logger.error(`Error fetching expiring memberships: ${error.message}`);
+    res.status(500).json({ error: "Internal server error." });
+  }
+};
+
+/**
+ * @swagger
+ * /api/membersMemberships/renewals:
+ *   post:
+ *     summary: Renew the memberships expiring soon
+ *     tags: [MembersMemberships]
+ *     description: Renews every membership ending within `days` days on the same plan, starting when it ends, in one transaction. Members who already have a membership starting at or after that end are skipped (409). Admins renew every gym unless they pass gymId; gym admins renew their own gym.
+ *     requestBody:
+ *       content:
+ *         application/json:
+ *           schema:
+ *             type: object
+ *             properties:
+ *               days:
+ *                 type: integer
+ *                 default: 7
+ *               gymId:
+ *                 type: integer
+ *                 description: Admin only
+ *               dryRun:
+ *                 type: boolean
+ *                 description: Report what would be renewed without creating anything
+ *     responses:
+ *       200:
+ *         description: One result per expiring membership
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 candidates:
+ *                   type: integer
+ *                 renewed:
+ *                   type: integer
+ *                 skipped:
+ *                   type: integer
+ *                 results:
+ *                   type: array
+ *                   items:
+ *                     type: object
+ *                     properties:
+ *                       membership_id:
+ *                         type: integer
+ *                       status:
+ *                         type: integer
+ *                       renewal_id:
+ *                         type: integer
+ *                       error:
+ *                         type: string
+ *       400:
+ *         description: Invalid days or gymId
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.renewExpiringMemberships = async (req, res) => {
+  if (req.user.type !== "admin" && req.user.type !== "gym_admin") {
+    return res.status(401).json({ error: "Unauthorized." });
+  }
+  const body = req.body || {};
+  const { days, gymId, error } = expiryWindow(req.user, body.days, body.gymId);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+
+  try {
+    const dryRun = body.dryRun === true || body.dryRun === "true";
+    const result = await renewExpiring({ gymId, days, dryRun });
+    logger.info(
+      `${dryRun ? "Dry run: would renew" : "Renewed"} ${result.renewed} of ${result.candidates} expiring memberships`
+    );
+    res.status(200).json(result);
+  } catch (error) {
+    logger.error(`Error renewing expiring memberships: ${error.message}`);
+    res.status(500).json({ error: "Internal server error." });
+  }
+};
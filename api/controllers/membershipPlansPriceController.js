@@ -2,6 +2,10 @@ const { Op } = require("sequelize");
 const MembershipPlansPrice = require("../models/membershipPlansPrice");
 const MembershipPlan = require("../models/gymMembershipPlan");
 const logger = require("../utils/logger");
+const countCache = require("../utils/countCache");
+const responseCache = require("../utils/responseCache");
+const priceIndex = require("../utils/priceIndex");
+const { readBatch } = require("../utils/batch");
 
 /**
  * @swagger
@@ -54,6 +58,8 @@ const logger = require("../utils/logger");
  *           application/json:
  *             schema:
  *               $ref: '#/components/schemas/MembershipPlansPrice'
+ *       304:
+ *         description: Not modified; the If-None-Match header matched the ETag of the cached response
  *       401:
  *         description: Unauthorized. Only admin or authorized users can fetch membership plan price details.
  *       404:
@@ -79,15 +85,8 @@ exports.getMembershipPlanPriceById = async (req, res) => {
     }
 
     if (req.user.type !== "admin") {
-      gym_id = req.user.gym_id;
-      membership_plan_ids = await MembershipPlan.findAll({
-        where: { gym_id },
-        attributes: ["id"],
-      }).map((plan) => plan.id);
-
-      const membership_plan_id = price.membership_plan_id;
-      // Check if the requested id is in membership_plan_ids
-      if (!membership_plan_ids.includes(membership_plan_id)) {
+      // The included plan tells which gym the price belongs to
+      if (!price.MembershipPlan || price.MembershipPlan.gym_id != req.user.gym_id) {
         return res.status(401).json({
           error: "Unauthorized to access this membership plan price",
         });
@@ -95,7 +94,7 @@ exports.getMembershipPlanPriceById = async (req, res) => {
     }
 
     // Log success and send the price details in the response
-    logger.info(`Retrieved membership plan price with ID ${priceId}`);
+    logger.info(`Retrieved membership plan price with ID ${priceId}`, { sample: "prices.get" });
     res.status(200).json(price);
   } catch (error) {
     // Log error and handle errors
@@ -106,6 +105,131 @@ exports.getMembershipPlanPriceById = async (req, res) => {
   }
 };
 
+/**
+ * @swagger
+ * components:
+ *   schemas:
+ *     PriceQuote:
+ *       type: object
+ *       properties:
+ *         index:
+ *           type: integer
+ *         status:
+ *           type: integer
+ *           description: 200 when a price is in force, 404 when none is (or the plan is not visible), 400 for a malformed item
+ *         membership_plan_id:
+ *           type: integer
+ *         date:
+ *           type: string
+ *         price_id:
+ *           type: integer
+ *         price:
+ *           type: number
+ *           format: float
+ *         validity_start_date:
+ *           type: string
+ *           format: date-time
+ *         validity_end_date:
+ *           type: string
+ *           format: date-time
+ *         error:
+ *           type: string
+ */
+
+/**
+ * @swagger
+ * /api/membershipPlansPrices/quote:
+ *   post:
+ *     summary: Resolve the prices in force for many plans and dates
+ *     tags: [MembershipPlansPrices]
+ *     description: Returns, for every (membership_plan_id, date) item, the price whose validity window contains the date. Gym admins and members can only quote their gym's plans. Lookups are served from an in-memory index of each plan's validity windows.
+ *     requestBody:
+ *       required: true
+ *       content:
+ *         application/json:
+ *           schema:
+ *             type: object
+ *             properties:
+ *               items:
+ *                 type: array
+ *                 items:
+ *                   type: object
+ *                   properties:
+ *                     membership_plan_id:
+ *                       type: integer
+ *                     date:
+ *                       type: string
+ *                       format: date
+ *     responses:
+ *       200:
+ *         description: One result per item, in order
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 resolved:
+ *                   type: integer
+ *                 unresolved:
+ *                   type: integer
+ *                 results:
+ *                   type: array
+ *                   items:
+ *                     $ref: '#/components/schemas/PriceQuote'
+ *       400:
+ *         description: Malformed batch
+ *       500:
+ *         description: Internal server error
+ */
+exports.quoteMembershipPlanPrices = async (req, res) => {
+  const { items, error } = readBatch(req);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+
+  try {
+    const queries = items.map((item) => ({
+      planId: parseInt(item.membership_plan_id, 10),
+      time: new Date(item.date).getTime(),
+    }));
+    const planIds = queries.filter((q) => !isNaN(q.planId)).map((q) => q.planId);
+    const plans = await priceIndex.getPlans(planIds);
+
+    let resolved = 0;
+    const results = items.map((item, index) => {
+      const { planId, time } = queries[index];
+      const result = { index, membership_plan_id: item.membership_plan_id, date: item.date };
+      if (isNaN(planId) || !item.date || isNaN(time)) {
+        return { ...result, status: 400, error: "membership_plan_id and a valid date are required" };
+      }
+      const plan = plans.get(planId);
+      // Plans of other gyms look the same as missing ones
+      if (!plan || (req.user.type !== "admin" && plan.gymId != req.user.gym_id)) {
+        return { ...result, status: 404, error: "Membership plan not found" };
+      }
+      const window = priceIndex.activeWindow(plan, time);
+      if (!window) {
+        return { ...result, status: 404, error: "No price in force on this date" };
+      }
+      resolved++;
+      return {
+        ...result,
+        status: 200,
+        price_id: window.id,
+        price: window.price,
+        validity_start_date: window.validity_start_date,
+        validity_end_date: window.validity_end_date,
+      };
+    });
+
+    logger.info(`Quoted ${resolved} of ${items.length} membership plan prices`, { sample: "prices.quote" });
+    res.status(200).json({ resolved, unresolved: items.length - resolved, results });
+  } catch (error) {
+    logger.error(`Error quoting membership plan prices: ${error.message}`);
+    res.status(500).json({ error: "Internal server error" });
+  }
+};
+
 /**
  * @swagger
  * /api/membershipPlansPrices:
@@ -206,6 +330,9 @@ exports.createMembershipPlanPrice = async (req, res) => {
       validity_end_date,
       comments,
     });
+    countCache.invalidate("MembershipPlansPrices");
+    responseCache.invalidate("MembershipPlansPrices");
+    priceIndex.invalidate(newPrice.membership_plan_id);
 
     // Log success and send the created price details in the response
     logger.info(`Created new membership plan price with ID ${newPrice.id}`);
@@ -290,6 +417,7 @@ exports.updateMembershipPlanPriceById = async (req, res) => {
     if (!priceToUpdate) {
       return res.status(404).json({ error: "Membership plan price not found" });
     }
+    const previousPlanId = priceToUpdate.membership_plan_id;
 
     // Check for date order and overlapping validity periods for the same membership_plan_id
     if (
@@ -369,6 +497,9 @@ exports.updateMembershipPlanPriceById = async (req, res) => {
 
     // Save the updated price
     priceToUpdate = await priceToUpdate.save();
+    countCache.invalidate("MembershipPlansPrices");
+    responseCache.invalidate("MembershipPlansPrices");
+    priceIndex.invalidate(previousPlanId, priceToUpdate.membership_plan_id);
 
     // Log success and send the updated price details in the response
     logger.info(`Updated membership plan price with ID ${priceId}`);
@@ -435,6 +566,9 @@ exports.deleteMembershipPlanPriceById = async (req, res) => {
 
     // Delete the price from the database
     await priceToDelete.destroy();
+    countCache.invalidate("MembershipPlansPrices");
+    responseCache.invalidate("MembershipPlansPrices");
+    priceIndex.invalidate(membership_plan_id);
 
     // Log success and send a success response
     logger.info(`Deleted membership plan price with ID ${priceId}`);
@@ -512,6 +646,8 @@ exports.deleteMembershipPlanPriceById = async (req, res) => {
  *                   type: array
  *                   items:
  *                     $ref: '#/components/schemas/MembershipPlansPrice'
+ *       304:
+ *         description: Not modified; the If-None-Match header matched the ETag of the cached response
  *       401:
  *         description: Unauthorized. Only admin or authorized users can fetch membership plan prices.
  *       500:
@@ -551,40 +687,51 @@ exports.getAllMembershipPlanPrices = async (req, res) => {
   const orderCondition = [[sanitizedSortBy, orderDir]];
 
   try {
-    let whereCondition = {
-      [Op.or]: validColumns.map(col => ({
-        [col]: { [Op.like]: `%${searchValue}%` }
-      }))
-    };
-
+    let whereCondition = searchValue
+      ? {
+          [Op.or]: validColumns.map(col => ({
+            [col]: { [Op.like]: `%${searchValue}%` }
+          }))
+        }
+      : {};
+
+    let scopeCondition = {};
+    let scope = "all";
     if (currentUser.type !== "admin") {
-      gym_id = req.user.gym_id;
-      const membershipPlanIds = await MembershipPlan.findAll({
+      const gym_id = req.user.gym_id;
+      const plans = await MembershipPlan.findAll({
         where: { gym_id },
         attributes: ["id"]
-      }).map(plan => plan.id);
+      });
 
-      whereCondition = {
-        ...whereCondition,
-        membership_plan_id: { [Op.in]: membershipPlanIds }
-      };
+      scopeCondition = { membership_plan_id: { [Op.in]: plans.map(plan => plan.id) } };
+      scope = `gym:${gym_id}`;
     }
-
-    const { count, rows } = await MembershipPlansPrice.findAndCountAll({
-      where: whereCondition,
-      include: {
-        model: MembershipPlan,
-        attributes: ["id", "plan_name", "gym_id"]
-      },
-      order: orderCondition,
-      limit: limitNumber,
-      offset: startIndex
-    });
+    whereCondition = { ...whereCondition, ...scopeCondition };
+
+    const [rows, { recordsTotal, recordsFiltered }] = await Promise.all([
+      MembershipPlansPrice.findAll({
+        where: whereCondition,
+        include: {
+          model: MembershipPlan,
+          attributes: ["id", "plan_name", "gym_id"]
+        },
+        order: orderCondition,
+        limit: limitNumber,
+        offset: startIndex
+      }),
+      countCache.counts("MembershipPlansPrices", {
+        scope,
+        filter: searchValue ? { search: searchValue } : null,
+        total: () => MembershipPlansPrice.count({ where: scopeCondition }),
+        filtered: () => MembershipPlansPrice.count({ where: whereCondition })
+      })
+    ]);
 
     res.status(200).json({
       draw: drawNumber,
-      recordsTotal: count,
-      recordsFiltered: count,
+      recordsTotal,
+      recordsFiltered,
       data: rows
     });
   } catch (error) {
@@ -0,0 +1,23 @@
+const cluster = require("cluster");
+const dbPool = require("../utils/dbPool");
+const metrics = require("../utils/runtimeMetrics");
+
+// Internal endpoint, deliberately left out of the Swagger docs.
+// GET /api/internal/metrics: connection pool saturation of the process that
+// served the request (each cluster worker has its own pool).
+exports.getMetrics = (req, res) => {
+  res.set("Cache-Control", "no-store");
+  res.json({
+    pid: process.pid,
+    worker: cluster.isWorker ? cluster.worker.id : null,
+    timestamp: Date.now(),
+    dbPool: dbPool.getStats(),
+  });
+};
+
+// GET /api/internal/prometheus: request, query, pool and runtime metrics of
+// this process in the Prometheus text format.
+exports.getPrometheus = (req, res) => {
+  res.set("Cache-Control", "no-store");
+  res.type("text/plain; version=0.0.4").send(metrics.render());
+};
@@ -1,6 +1,15 @@
+const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
 const Payments = require("../models/payments");
 const User = require("../models/user");
 const MembershipPlan = require("../models/gymMembershipPlan");
+const GymAndGymMember = require("../models/gymAndGymMember");
+const countCache = require("../utils/countCache");
+const rollups = require("../utils/rollups");
+const { memberScope } = require("../utils/tenantScope");
+const { project } = require("../utils/projection");
+const { exportFormat, parseDateRange, streamExport } = require("../utils/exportStream");
+const { readBatch, createBatch, commitValid, sendBatchResults } = require("../utils/batch");
 
 /**
  * @swagger
@@ -113,7 +122,7 @@ exports.getPaymentById = async (req, res) => {
  *   get:
  *     summary: Get all payments with pagination, sorting, and filtering
  *     tags: [Payments]
- *     description: Retrieve a list of all payments with pagination, sorting, and filtering.
+ *     description: Retrieve a list of payments with pagination, sorting, and filtering. Gym admins only see payments of their gym's members and gym members only their own.
  *     parameters:
  *       - in: query
  *         name: page
@@ -135,6 +144,16 @@ exports.getPaymentById = async (req, res) => {
  *         schema:
  *           type: string
  *         description: Filter criteria
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated columns to return, e.g. "id,total_amount,User.username,MembershipPlan.plan_name" (the id is always returned)
+ *       - in: query
+ *         name: raw
+ *         schema:
+ *           type: boolean
+ *         description: Skip building model instances; a payment without a matching include gets an object of nulls
  *     responses:
  *       200:
  *         description: A list of payments
@@ -144,6 +163,8 @@ exports.getPaymentById = async (req, res) => {
  *               type: array
  *               items:
  *                 $ref: '#/components/schemas/Payments'
+ *       400:
+ *         description: fields names a column the listing does not return
  *       401:
  *         description: Unauthorized. Only authorized users can fetch payments.
  *       500:
@@ -155,9 +176,11 @@ exports.getAllPayments = async (req, res) => {
   try {
     const offset = (page - 1) * size;
     const order = sort.split(",").map((s) => s.trim());
-    const where = filter ? JSON.parse(filter) : {};
+    // gym_admins see their gym's payments and gym_members their own
+    const { where: scopeCondition, key: scope } = memberScope(req.user);
+    const where = { ...(filter ? JSON.parse(filter) : {}), ...scopeCondition };
 
-    const { count, rows } = await Payments.findAndCountAll({
+    const options = project(Payments, req.query, {
       where,
       limit: parseInt(size),
       offset: parseInt(offset),
@@ -167,6 +190,19 @@ exports.getAllPayments = async (req, res) => {
         { model: MembershipPlan, attributes: ["id", "plan_name"] },
       ],
     });
+    if (!options) {
+      return res.status(400).send("Unknown column in fields.");
+    }
+
+    const [rows, { recordsFiltered: count }] = await Promise.all([
+      Payments.findAll(options),
+      countCache.counts("Payments", {
+        scope,
+        filter: filter ? { filter } : null,
+        total: () => Payments.count({ where: scopeCondition }),
+        filtered: () => Payments.count({ where }),
+      }),
+    ]);
 
     res.status(200).json({
       totalItems: count,
@@ -180,6 +216,113 @@ exports.getAllPayments = async (req, res) => {
   }
 };
 
+/**
+ * @swagger
+ * /api/payments/export:
+ *   get:
+ *     summary: Export payments as NDJSON or CSV
+ *     tags: [Payments]
+ *     description: Stream every matching payment in one response, without paging. Gym admins only export payments of their gym's members and gym members only their own.
+ *     parameters:
+ *       - in: query
+ *         name: format
+ *         schema:
+ *           type: string
+ *           enum: [ndjson, csv]
+ *           default: ndjson
+ *       - in: query
+ *         name: from
+ *         schema:
+ *           type: string
+ *           format: date
+ *         description: Only payments made on or after this date
+ *       - in: query
+ *         name: to
+ *         schema:
+ *           type: string
+ *           format: date
+ *         description: Only payments made on or before this date
+ *       - in: query
+ *         name: gymId
+ *         schema:
+ *           type: integer
+ *         description: Only payments of this gym's members (admin only)
+ *     responses:
+ *       200:
+ *         description: One payment per line (NDJSON) or row (CSV)
+ *         content:
+ *           application/x-ndjson:
+ *             schema:
+ *               type: string
+ *           text/csv:
+ *             schema:
+ *               type: string
+ *       400:
+ *         description: Invalid format, date range or gymId
+ *       500:
+ *         description: Internal server error
+ */
+exports.exportPayments = async (req, res) => {
+  const format = exportFormat(req.query);
+  const range = parseDateRange(req.query);
+  const { gymId } = req.query;
+
+  if (!format) {
+    return res.status(400).send("Unsupported export format.");
+  }
+  if (!range) {
+    return res.status(400).send("Invalid date range.");
+  }
+  if (gymId !== undefined && isNaN(parseInt(gymId, 10))) {
+    return res.status(400).send("Invalid gymId.");
+  }
+
+  try {
+    const { where: scopeCondition } = memberScope(
+      req.user,
+      "gym_member_id",
+      gymId === undefined ? null : parseInt(gymId, 10)
+    );
+    const paymentDate = {};
+    if (range.from) paymentDate[Op.gte] = range.from;
+    if (range.to) paymentDate[Op.lte] = range.to;
+
+    await streamExport(res, {
+      Model: Payments,
+      where: {
+        ...scopeCondition,
+        ...((range.from || range.to) && { payment_date: paymentDate }),
+      },
+      include: [
+        { model: User, attributes: ["username"] },
+        { model: MembershipPlan, attributes: ["plan_name"] },
+      ],
+      columns: [
+        ["id", "id"],
+        ["gym_member_id", "gym_member_id"],
+        ["username", "User.username"],
+        ["membership_plan_id", "membership_plan_id"],
+        ["plan_name", "MembershipPlan.plan_name"],
+        ["start_date", "start_date"],
+        ["end_date", "end_date"],
+        ["payment_date", "payment_date"],
+        ["payment_type", "payment_type"],
+        ["payment_method", "payment_method"],
+        ["total_amount", "total_amount"],
+        ["comments", "comments"],
+      ],
+      format,
+      filename: "payments",
+    });
+  } catch (error) {
+    console.error("Error exporting payments:", error);
+    if (res.headersSent) {
+      return res.destroy(error);
+    }
+    res.status(500).send("Internal server error.");
+  }
+};
+
 /**
  * @swagger
  * /api/payments:
@@ -222,18 +365,27 @@ exports.createPayment = async (req, res) => {
   } = req.body;
 
   try {
-    const newPayment = await Payments.create({
-      gym_member_id,
-      membership_plan_id,
-      start_date,
-      end_date,
-      payment_date,
-      payment_type,
-      payment_method,
-      calculation_breakup,
-      total_amount,
-      comments,
+    // The revenue rollup changes in the same transaction
+    const newPayment = await sequelize.transaction(async (transaction) => {
+      const payment = await Payments.create(
+        {
+          gym_member_id,
+          membership_plan_id,
+          start_date,
+          end_date,
+          payment_date,
+          payment_type,
+          payment_method,
+          calculation_breakup,
+          total_amount,
+          comments,
+        },
+        { transaction }
+      );
+      await rollups.recordPayments([], [payment], transaction);
+      return payment;
     });
+    countCache.invalidate("Payments");
 
     res.status(201).json(newPayment);
   } catch (error) {
@@ -242,6 +394,139 @@ exports.createPayment = async (req, res) => {
   }
 };
 
+/**
+ * @swagger
+ * /api/payments/batch:
+ *   post:
+ *     summary: Create many payments in one request
+ *     tags: [Payments]
+ *     description: Only admin and gym_admin can create payments; gym admins only for their gym's members and plans. Every item takes the fields of POST /api/payments. Valid items are created in one transaction.
+ *     parameters:
+ *       - in: query
+ *         name: atomic
+ *         schema:
+ *           type: boolean
+ *         description: Create nothing unless every item is valid
+ *     requestBody:
+ *       required: true
+ *       content:
+ *         application/json:
+ *           schema:
+ *             type: object
+ *             properties:
+ *               items:
+ *                 type: array
+ *                 items:
+ *                   $ref: '#/components/schemas/Payments'
+ *     responses:
+ *       201:
+ *         description: All payments were created
+ *         content:
+ *           application/json:
+ *             schema:
+ *               $ref: '#/components/schemas/BatchResults'
+ *       207:
+ *         description: Some payments were rejected
+ *         content:
+ *           application/json:
+ *             schema:
+ *               $ref: '#/components/schemas/BatchResults'
+ *       400:
+ *         description: Malformed batch, or no payment was created
+ *       401:
+ *         description: Unauthorized
+ *       500:
+ *         description: Internal server error
+ */
+exports.createPaymentsBatch = async (req, res) => {
+  const currentUser = req.user;
+  if (currentUser.type !== "admin" && currentUser.type !== "gym_admin") {
+    return res.status(401).send("Unauthorized.");
+  }
+
+  const { items, atomic, error } = readBatch(req);
+  if (error) {
+    return res.status(400).send(error);
+  }
+
+  try {
+    const payments = items.map((item) => ({
+      gym_member_id: parseInt(item.gym_member_id, 10),
+      membership_plan_id: parseInt(item.membership_plan_id, 10),
+      start_date: item.start_date,
+      end_date: item.end_date,
+      payment_date: item.payment_date,
+      payment_type: item.payment_type,
+      payment_method: item.payment_method,
+      calculation_breakup: item.calculation_breakup,
+      total_amount: item.total_amount,
+      comments: item.comments,
+    }));
+    const batch = createBatch(payments);
+
+    for (const [index, payment] of payments.entries()) {
+      const dates = [payment.start_date, payment.end_date, payment.payment_date];
+      if (
+        !payment.gym_member_id ||
+        !payment.membership_plan_id ||
+        !payment.payment_method ||
+        dates.some((date) => !date || isNaN(new Date(date)))
+      ) {
+        batch.fail(index, "Invalid or missing fields.");
+      } else if (isNaN(parseFloat(payment.total_amount)) || parseFloat(payment.total_amount) < 0) {
+        batch.fail(index, "Total amount must be a non-negative number.");
+      } else {
+        try {
+          await Payments.build(payment).validate();
+        } catch (validationError) {
+          batch.fail(index, validationError.errors ? validationError.errors[0].message : validationError.message);
+        }
+      }
+    }
+
+    // One query each for the members and plans of the batch
+    const memberIds = [...new Set(batch.valid().map(({ item }) => item.gym_member_id))];
+    const planIds = [...new Set(batch.valid().map(({ item }) => item.membership_plan_id))];
+    const members = new Set(
+      (
+        await (currentUser.type === "gym_admin"
+          ? GymAndGymMember.findAll({ where: { memberId: memberIds, gymId: currentUser.gym_id }, attributes: ["memberId"] })
+          : User.findAll({ where: { id: memberIds, type: "gym_member" }, attributes: ["id"] }))
+      ).map((row) => row.memberId || row.id)
+    );
+    const plans = new Map(
+      (await MembershipPlan.findAll({ where: { id: planIds }, attributes: ["id", "gym_id"] })).map((plan) => [
+        plan.id,
+        plan.gym_id,
+      ])
+    );
+
+    for (const { item, index } of batch.valid()) {
+      if (!members.has(item.gym_member_id)) {
+        batch.fail(index, currentUser.type === "gym_admin" ? "Unauthorized." : "Gym member does not exist.");
+      } else if (!plans.has(item.membership_plan_id)) {
+        batch.fail(index, "Membership plan does not exist.");
+      } else if (currentUser.type === "gym_admin" && plans.get(item.membership_plan_id) !== currentUser.gym_id) {
+        batch.fail(index, "Unauthorized.");
+      }
+    }
+
+    const created = await commitValid(batch, atomic, async (valid, transaction) => {
+      const rows = await Payments.bulkCreate(valid, { transaction });
+      await rollups.recordPayments([], rows, transaction);
+      return rows.map((row) => row.id);
+    });
+    if (created.size > 0) {
+      countCache.invalidate("Payments");
+    }
+
+    sendBatchResults(res, batch, created);
+  } catch (error) {
+    console.error("Error creating payments in batch:", error);
+    res.status(500).send("Internal server error.");
+  }
+};
+
 /**
  * @swagger
  * /api/payments/{paymentId}:
@@ -299,6 +584,7 @@ exports.updatePaymentById = async (req, res) => {
     if (!paymentToUpdate) {
       return res.status(404).send("Payment not found.");
     }
+    const previous = paymentToUpdate.get({ plain: true });
 
     if (gym_member_id !== undefined)
       paymentToUpdate.gym_member_id = gym_member_id;
@@ -315,7 +601,11 @@ exports.updatePaymentById = async (req, res) => {
     if (total_amount !== undefined) paymentToUpdate.total_amount = total_amount;
     if (comments !== undefined) paymentToUpdate.comments = comments;
 
-    await paymentToUpdate.save();
+    await sequelize.transaction(async (transaction) => {
+      await paymentToUpdate.save({ transaction });
+      await rollups.recordPayments([previous], [paymentToUpdate], transaction);
+    });
+    countCache.invalidate("Payments");
     res.status(200).json(paymentToUpdate);
   } catch (error) {
     console.error("Error updating payment:", error);
@@ -357,7 +647,11 @@ exports.deletePaymentById = async (req, res) => {
       return res.status(404).send("Payment not found.");
     }
 
-    await paymentToDelete.destroy();
+    await sequelize.transaction(async (transaction) => {
+      await paymentToDelete.destroy({ transaction });
+      await rollups.recordPayments([paymentToDelete], [], transaction);
+    });
+    countCache.invalidate("Payments");
     res.status(200).send("Payment deleted successfully.");
   } catch (error) {
     console.error("Error deleting payment:", error);
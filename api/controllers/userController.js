@@ -1,6 +1,15 @@
 const { Op } = require("sequelize");
 const User = require("../models/user");
+const GymAndGymMember = require("../models/gymAndGymMember");
+const GymAndGymAdmin = require("../models/gymAndGymAdmin");
+const MembersMembership = require("../models/membersMembership");
+const Payments = require("../models/payments");
 const logger = require("../utils/logger");
+const { searchCondition } = require("../utils/search");
+const userContextCache = require("../utils/userContextCache");
+const countCache = require("../utils/countCache");
+const { memberScope } = require("../utils/tenantScope");
+const { project } = require("../utils/projection");
 
 /**
  * @swagger
@@ -213,7 +222,17 @@ const logger = require("../utils/logger");
  *         name: search
  *         schema:
  *           type: string
- *         description: Search term to filter users by username, firstName, lastName, email, etc.
+ *         description: Words matched as prefixes against username and email (full-text)
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated columns to return, e.g. "username,firstName,lastName" (the id is always returned)
+ *       - in: query
+ *         name: raw
+ *         schema:
+ *           type: boolean
+ *         description: Skip building model instances
  *     responses:
  *       200:
  *         description: List of users
@@ -238,6 +257,8 @@ const logger = require("../utils/logger");
  *                     currentPage:
  *                       type: integer
  *                       example: 1
+ *       400:
+ *         description: fields names a column the listing does not return
  *       401:
  *         description: Unauthorized, user does not have permission
  *       500:
@@ -301,43 +322,41 @@ exports.getAllUsers = async (req, res) => {
   );
 
   try {
-    let whereCondition = {
-      [Op.or]: validColumns.map((col) => ({
-        [col]: { [Op.like]: `%${search}%` },
-      })),
-    };
-
+    // No predicate at all for an empty search box
+    let whereCondition = searchCondition(User, search) || {};
+    const { where: scopeCondition, key: scope } = memberScope(currentUser, "id");
     if (currentUser.type === "gym_admin") {
-      const gymMembers = await GymAndGymMember.findAll({
-        where: {
-          gymId: currentUser.gym_id,
-        },
-        attributes: ["memberId"],
-      });
-
-      const memberIds = gymMembers.map((member) => member.memberId);
-      whereCondition = {
-        ...whereCondition,
-        id: { [Op.in]: memberIds },
-        type: "gym_member",
-      };
-    } else if (currentUser.type === "gym_member") {
-      whereCondition = {
-        ...whereCondition,
-        id: currentUser.id,
-      };
+      scopeCondition.type = "gym_member";
     }
 
-    const { count, rows } = await User.findAndCountAll({
-      where: {
-        ...filterConditions,
-        ...whereCondition,
-      },
+    const where = {
+      ...filterConditions,
+      ...whereCondition,
+      ...scopeCondition,
+    };
+    const filterKey = Object.keys(filterConditions).sort().map((key) => [key, filters[key]]);
+    const hasFilter = String(search).trim() !== "" || filterKey.length > 0;
+
+    const options = project(User, req.query, {
+      where,
       attributes: { exclude: ["password"] },
       order: orderCondition,
       limit: limitNumber,
       offset,
     });
+    if (!options) {
+      return res.status(400).json({ error: "Unknown column in fields." });
+    }
+
+    const [rows, { recordsFiltered: count }] = await Promise.all([
+      User.findAll(options),
+      countCache.counts("Users", {
+        scope,
+        filter: hasFilter ? { search, filters: filterKey } : null,
+        total: () => User.count({ where: scopeCondition }),
+        filtered: () => User.count({ where }),
+      }),
+    ]);
 
     res.status(200).json({
       data: rows,
@@ -541,6 +560,8 @@ exports.updateUser = async (req, res) => {
     }
 
     await user.update(updateUserRequest);
+    userContextCache.invalidateUser(user.id);
+    countCache.invalidate("Users");
     user.password = undefined;
 
     res.status(200).json(user);
@@ -575,6 +596,8 @@ exports.updateUser = async (req, res) => {
  *         description: Unauthorized - User doesn't have permission to delete users
  *       404:
  *         description: User not found
+ *       409:
+ *         description: The user still has memberships, payments or gym links
  *       500:
  *         description: Internal server error
  */
@@ -598,7 +621,22 @@ exports.deleteUser = async (req, res) => {
       });
     }
 
+    // Nothing cascades: rows that reference the user must be deleted first
+    const dependents = await Promise.all([
+      MembersMembership.count({ where: { gym_member_id: user.id } }),
+      Payments.count({ where: { gym_member_id: user.id } }),
+      GymAndGymMember.count({ where: { memberId: user.id } }),
+      GymAndGymAdmin.count({ where: { gymAdminId: user.id } }),
+    ]);
+    if (dependents.some((count) => count > 0)) {
+      return res.status(409).json({
+        message: "User still has memberships, payments or gym links",
+      });
+    }
+
     await user.destroy();
+    userContextCache.invalidateUser(user.id);
+    countCache.invalidate("Users");
 
     res.status(200).json({
       message: "User deleted successfully",
@@ -1,6 +1,9 @@
 require("dotenv").config(); // Load environment variables
 const jwt = require("jsonwebtoken");
 const User = require("../models/user"); // Assuming you have a User model
+const GymAndGymAdmin = require("../models/gymAndGymAdmin");
+const GymAndGymMember = require("../models/gymAndGymMember");
+const userContextCache = require("../utils/userContextCache");
 
 const logger = require("../utils/logger"); // Assuming you have a logger utility
 
@@ -25,6 +28,13 @@ module.exports = async (req, res, next) => {
     // Verify the token
     const decoded = jwt.verify(token, process.env.JWT_SECRET);
 
+    // Reuse the context resolved for this user and token if still cached
+    const cached = userContextCache.get(decoded.id, token);
+    if (cached) {
+      req.user = { ...cached };
+      return next();
+    }
+
     // Fetch the user from the database based on the decoded id
     const user = await User.findByPk(decoded.id);
     if (!user) {
@@ -57,24 +67,35 @@ module.exports = async (req, res, next) => {
 
     // Attach gym_id based on user type
     if (user.type === "gym_admin") {
-      // Assuming a direct association between GymAndGymAdmin and User
-      const gymAdminAssociation = await user.getGymAndGymAdmin();
+      const gymAdminAssociation = await GymAndGymAdmin.findOne({
+        where: { gymAdminId: user.id },
+        attributes: ["gymId"],
+      });
       if (gymAdminAssociation && gymAdminAssociation.gymId) {
         userInfo.gym_id = gymAdminAssociation.gymId;
       }
     } else if (user.type === "gym_member") {
-      // Assuming a direct association between GymAndGymMember and User
-      const gymMemberAssociation = await user.getGymAndGymMember();
+      const gymMemberAssociation = await GymAndGymMember.findOne({
+        where: { memberId: user.id },
+        attributes: ["gymId"],
+      });
       if (gymMemberAssociation && gymMemberAssociation.gymId) {
         userInfo.gym_id = gymMemberAssociation.gymId;
       }
     }
 
+    userContextCache.set(
+      decoded.id,
+      token,
+      userInfo,
+      decoded.exp ? decoded.exp * 1000 : Infinity
+    );
+
     // Attach user information to the request object
     req.user = userInfo;
 
     // Log successful authentication
-    logger.info(`User authenticated: ${user.username} (${user.type})`);
+    logger.info(`User authenticated: ${user.username} (${user.type})`, { sample: "auth.success" });
 
     // Call the next middleware or route handler
     next();
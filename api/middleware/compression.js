@@ -0,0 +1,84 @@
+// Compresses response bodies with brotli or gzip, whichever the client
+// prefers in Accept-Encoding. Covers bodies of res.send/res.json with a JSON
+// or text content type and at least COMPRESSION_MIN_BYTES (default 1024)
+// bytes; streamed exports are left alone. Compression runs on the libuv
+// thread pool, off the event loop, at brotli quality
+// COMPRESSION_BROTLI_QUALITY (default 4) or gzip level COMPRESSION_GZIP_LEVEL
+// (default 6), far cheaper than the maximum settings for a little size.
+// COMPRESSION=off turns it off.
+//
+// A strong ETag gets the encoding appended ("<hash>-br"), the bytes being
+// different from the uncompressed ones; a request whose validator still
+// matches is answered 304 by Express before anything is compressed.
+
+const zlib = require("zlib");
+
+const envInt = (name, fallback) => parseInt(process.env[name] || String(fallback), 10);
+
+const ENABLED = process.env.COMPRESSION !== "off";
+const MIN_BYTES = envInt("COMPRESSION_MIN_BYTES", 1024);
+const BROTLI_QUALITY = envInt("COMPRESSION_BROTLI_QUALITY", 4);
+const GZIP_LEVEL = envInt("COMPRESSION_GZIP_LEVEL", 6);
+const COMPRESSIBLE = /json|text|csv/i;
+
+const encoders = {
+  br: (buffer, callback) =>
+    zlib.brotliCompress(
+      buffer,
+      {
+        params: {
+          [zlib.constants.BROTLI_PARAM_QUALITY]: BROTLI_QUALITY,
+          [zlib.constants.BROTLI_PARAM_SIZE_HINT]: buffer.length,
+        },
+      },
+      callback
+    ),
+  gzip: (buffer, callback) => zlib.gzip(buffer, { level: GZIP_LEVEL }, callback),
+};
+
+const stats = { responses: 0, bytesIn: 0, bytesOut: 0, errors: 0 };
+
+const compressible = (res, body) =>
+  (typeof body === "string" || Buffer.isBuffer(body)) &&
+  COMPRESSIBLE.test(res.get("Content-Type") || "") &&
+  !res.get("Content-Encoding") &&
+  res.statusCode !== 204 &&
+  res.statusCode !== 304;
+
+const compression = (req, res, next) => {
+  if (!ENABLED || req.method === "HEAD") return next();
+
+  const send = res.send;
+  res.send = function (body) {
+    if (!compressible(res, body)) return send.call(this, body);
+    res.vary("Accept-Encoding");
+    const buffer = Buffer.isBuffer(body) ? body : Buffer.from(body, "utf8");
+    const encoding = req.get("Accept-Encoding") ? req.acceptsEncodings("br", "gzip") : false;
+    if (!encoding || buffer.length < MIN_BYTES) return send.call(this, body);
+
+    const etag = res.get("ETag");
+    if (etag && !etag.startsWith("W/")) res.set("ETag", etag.replace(/"$/, `-${encoding}"`));
+    if (req.fresh) return send.call(this, body);
+
+    encoders[encoding](buffer, (error, compressed) => {
+      if (error) {
+        stats.errors++;
+        if (etag) res.set("ETag", etag);
+        send.call(this, body);
+        return;
+      }
+      stats.responses++;
+      stats.bytesIn += buffer.length;
+      stats.bytesOut += compressed.length;
+      res.set("Content-Encoding", encoding);
+      send.call(this, compressed);
+    });
+    return this;
+  };
+  next();
+};
+
+const getStats = () => ({ enabled: ENABLED, minBytes: MIN_BYTES, ...stats });
+
+module.exports = compression;
+module.exports.getStats = getStats;
@@ -0,0 +1,14 @@
+// Guards internal endpoints (metrics, health reports). With METRICS_TOKEN set, a request must
+// carry it in the X-Metrics-Token header; without it only requests from the
+// local machine are allowed.
+
+const LOOPBACK = new Set(["127.0.0.1", "::1", "::ffff:127.0.0.1"]);
+
+module.exports = (req, res, next) => {
+  const token = process.env.METRICS_TOKEN;
+  const allowed = token ? req.header("X-Metrics-Token") === token : LOOPBACK.has(req.socket.remoteAddress);
+  if (!allowed) {
+    return res.status(403).json({ error: "Forbidden." });
+  }
+  next();
+};
@@ -0,0 +1,48 @@
+// Records the latency of every request by route template (e.g.
+// /api/gym/:id) together with the number of SQL statements it ran and their
+// total time. Runs the rest of the chain inside utils/requestContext.js so
+// utils/queryMetrics.js can attribute queries to the request.
+
+const metrics = require("../utils/metrics");
+const requestContext = require("../utils/requestContext");
+require("../utils/queryMetrics");
+
+const requestDuration = metrics.histogram(
+  "http_request_duration_seconds",
+  "Latency of HTTP requests by route template.",
+  [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+  ["method", "route", "status"]
+);
+const queriesPerRequest = metrics.histogram(
+  "http_request_db_queries",
+  "SQL statements run per HTTP request.",
+  [0, 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 20, 30, 50, 100],
+  ["method", "route"]
+);
+const queryTimePerRequest = metrics.histogram(
+  "http_request_db_seconds",
+  "Total SQL time per HTTP request.",
+  [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+  ["method", "route"]
+);
+
+// The matched route as a template; requests no route handled share one label
+const routeTemplate = (req) => {
+  if (!req.route) return "unmatched";
+  const path = `${req.baseUrl}${req.route.path}`;
+  return path.length > 1 ? path.replace(/\/$/, "") : path;
+};
+
+module.exports = (req, res, next) => {
+  const started = process.hrtime.bigint();
+  const context = { queries: 0, queryMs: 0, route: () => routeTemplate(req) };
+
+  res.on("close", () => {
+    const labels = { method: req.method, route: routeTemplate(req) };
+    requestDuration.observe({ ...labels, status: res.statusCode }, Number(process.hrtime.bigint() - started) / 1e9);
+    queriesPerRequest.observe(labels, context.queries);
+    queryTimePerRequest.observe(labels, context.queryMs / 1000);
+  });
+
+  requestContext.storage.run(context, next);
+};
@@ -0,0 +1,175 @@
+// The schema sequelize.sync() created from the models before migrations were
+// introduced. Tables are created only when missing and indexes only when
+// their name is not there yet, so databases that sync() built take it as
+// already applied.
+
+const { addMissingIndexes } = require("../utils/indexes");
+
+const TABLES = [
+  "Users",
+  "Gyms",
+  "GymAndGymAdmins",
+  "GymAndGymMembers",
+  "MembershipPlans",
+  "MembershipPlansPrices",
+  "MembersMemberships",
+  "Payments",
+];
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    // Fresh attribute objects per table: createTable normalizes them in place
+    const id = () => ({ type: Sequelize.INTEGER, autoIncrement: true, primaryKey: true });
+    const reference = (table) => ({
+      type: Sequelize.INTEGER,
+      allowNull: false,
+      references: { model: table, key: "id" },
+      onUpdate: "CASCADE",
+    });
+    const timestamps = () => ({
+      createdAt: { type: Sequelize.DATE, allowNull: false },
+      updatedAt: { type: Sequelize.DATE, allowNull: false },
+    });
+    // Set by the models (defaultValue NOW), not by the database
+    const optionalTimestamps = () => ({
+      createdAt: { type: Sequelize.DATE },
+      updatedAt: { type: Sequelize.DATE },
+    });
+
+    await queryInterface.createTable("Users", {
+      id: id(),
+      username: { type: Sequelize.STRING, allowNull: false, unique: true },
+      password: { type: Sequelize.STRING, allowNull: false },
+      type: { type: Sequelize.ENUM("admin", "gym_admin", "gym_member"), allowNull: false, defaultValue: "gym_member" },
+      email: { type: Sequelize.STRING, unique: true },
+      phone: { type: Sequelize.STRING },
+      firstName: { type: Sequelize.STRING, allowNull: false },
+      lastName: { type: Sequelize.STRING },
+      address: { type: Sequelize.STRING },
+      city: { type: Sequelize.STRING },
+      state: { type: Sequelize.STRING },
+      pincode: { type: Sequelize.STRING },
+      country: { type: Sequelize.STRING },
+      dateOfBirth: { type: Sequelize.DATEONLY },
+      gender: { type: Sequelize.ENUM("male", "female", "other") },
+      profilePicture: { type: Sequelize.STRING },
+      emergencyContactName: { type: Sequelize.STRING },
+      emergencyContactPhone: { type: Sequelize.STRING },
+      emergencyContactRelation: { type: Sequelize.STRING },
+      status: { type: Sequelize.ENUM("active", "inactive"), allowNull: false, defaultValue: "active" },
+      ...timestamps(),
+    });
+    await addMissingIndexes("Users", [
+      { name: "users_search_fulltext", type: "FULLTEXT", fields: ["username", "email"] },
+    ]);
+
+    await queryInterface.createTable("Gyms", {
+      id: id(),
+      name: { type: Sequelize.STRING, allowNull: false },
+      address: { type: Sequelize.STRING, allowNull: false },
+      city: { type: Sequelize.STRING, allowNull: false },
+      state: { type: Sequelize.STRING, allowNull: false },
+      country: { type: Sequelize.STRING, allowNull: false },
+      pincode: { type: Sequelize.STRING, allowNull: false },
+      phone_number: { type: Sequelize.STRING, allowNull: false },
+      email: { type: Sequelize.STRING, unique: true },
+      website: { type: Sequelize.STRING },
+      contact_person: { type: Sequelize.STRING, allowNull: false },
+      currency: { type: Sequelize.STRING, allowNull: false, defaultValue: "INR" },
+      latitude: { type: Sequelize.FLOAT, allowNull: false },
+      longitude: { type: Sequelize.FLOAT, allowNull: false },
+      status: { type: Sequelize.ENUM("active", "inactive"), allowNull: false, defaultValue: "active" },
+      ...timestamps(),
+    });
+    await addMissingIndexes("Gyms", [
+      { name: "gyms_search_fulltext", type: "FULLTEXT", fields: ["name", "city", "contact_person"] },
+    ]);
+
+    await queryInterface.createTable("GymAndGymAdmins", {
+      id: id(),
+      gymAdminId: reference("Users"),
+      gymId: { ...reference("Gyms"), unique: true },
+      ...timestamps(),
+    });
+    await addMissingIndexes("GymAndGymAdmins", [
+      { name: "gym_and_gym_admins_admin_gym", fields: ["gymAdminId", "gymId"] },
+    ]);
+
+    await queryInterface.createTable("GymAndGymMembers", {
+      id: id(),
+      gymId: reference("Gyms"),
+      memberId: reference("Users"),
+      ...timestamps(),
+    });
+    await addMissingIndexes("GymAndGymMembers", [
+      { name: "gym_and_gym_members_gym_member", fields: ["gymId", "memberId"] },
+      { name: "gym_and_gym_members_member_gym", fields: ["memberId", "gymId"] },
+    ]);
+
+    await queryInterface.createTable("MembershipPlans", {
+      id: id(),
+      gym_id: reference("Gyms"),
+      plan_name: { type: Sequelize.STRING, allowNull: false },
+      plan_description: { type: Sequelize.TEXT },
+      duration_type: { type: Sequelize.ENUM("days", "months", "years"), allowNull: false },
+      duration_value: { type: Sequelize.INTEGER, allowNull: false },
+      category: { type: Sequelize.STRING, allowNull: false },
+      ...timestamps(),
+    });
+
+    await queryInterface.createTable("MembershipPlansPrices", {
+      id: id(),
+      membership_plan_id: reference("MembershipPlans"),
+      price: { type: Sequelize.DECIMAL(10, 2), allowNull: false },
+      validity_start_date: { type: Sequelize.DATE, allowNull: false },
+      validity_end_date: { type: Sequelize.DATE, allowNull: false },
+      comments: { type: Sequelize.TEXT },
+      ...optionalTimestamps(),
+    });
+    await addMissingIndexes("MembershipPlansPrices", [
+      {
+        name: "membership_plans_prices_plan_validity",
+        fields: ["membership_plan_id", "validity_start_date", "validity_end_date"],
+      },
+    ]);
+
+    await queryInterface.createTable("MembersMemberships", {
+      id: id(),
+      gym_member_id: reference("Users"),
+      membership_plan_id: reference("MembershipPlans"),
+      start_date: { type: Sequelize.DATE, allowNull: false },
+      end_date: { type: Sequelize.DATE, allowNull: false },
+      ...optionalTimestamps(),
+    });
+    await addMissingIndexes("MembersMemberships", [
+      { name: "members_memberships_member_period", fields: ["gym_member_id", "start_date", "end_date"] },
+      { name: "members_memberships_plan_start", fields: ["membership_plan_id", "start_date"] },
+    ]);
+
+    await queryInterface.createTable("Payments", {
+      id: id(),
+      gym_member_id: reference("Users"),
+      membership_plan_id: reference("MembershipPlans"),
+      start_date: { type: Sequelize.DATE, allowNull: false },
+      end_date: { type: Sequelize.DATE, allowNull: false },
+      payment_date: { type: Sequelize.DATE, allowNull: false },
+      payment_type: { type: Sequelize.ENUM("calculated_fee", "discounted_fee", "topup"), allowNull: false },
+      payment_method: { type: Sequelize.STRING, allowNull: false },
+      calculation_breakup: { type: Sequelize.TEXT },
+      total_amount: { type: Sequelize.DECIMAL(10, 2), allowNull: false },
+      comments: { type: Sequelize.TEXT },
+      ...optionalTimestamps(),
+    });
+    await addMissingIndexes("Payments", [
+      { name: "payments_member_paid", fields: ["gym_member_id", "payment_date"] },
+      { name: "payments_plan_start", fields: ["membership_plan_id", "start_date"] },
+      { name: "payments_start_date", fields: ["start_date"] },
+    ]);
+  },
+
+  async down(queryInterface) {
+    for (const table of [...TABLES].reverse()) {
+      await queryInterface.dropTable(table);
+    }
+  },
+};
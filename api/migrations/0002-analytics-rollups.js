@@ -0,0 +1,31 @@
+// Summary tables of utils/rollups.js (models/revenueRollup.js and
+// models/membershipRollup.js). They start empty; server.js rebuilds them
+// from the payments and memberships on its next start (rollups.ensureBuilt).
+
+const { addMissingIndexes } = require("../utils/indexes");
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    await queryInterface.createTable("RevenueRollups", {
+      membership_plan_id: { type: Sequelize.INTEGER, primaryKey: true },
+      month: { type: Sequelize.STRING(7), primaryKey: true },
+      gym_id: { type: Sequelize.INTEGER, allowNull: false },
+      payments: { type: Sequelize.INTEGER, allowNull: false, defaultValue: 0 },
+      revenue: { type: Sequelize.DECIMAL(14, 2), allowNull: false, defaultValue: 0 },
+    });
+    await addMissingIndexes("RevenueRollups", [{ name: "revenue_rollups_gym_month", fields: ["gym_id", "month"] }]);
+
+    await queryInterface.createTable("MembershipRollups", {
+      membership_plan_id: { type: Sequelize.INTEGER, primaryKey: true },
+      day: { type: Sequelize.DATEONLY, primaryKey: true },
+      gym_id: { type: Sequelize.INTEGER, allowNull: false },
+      delta: { type: Sequelize.INTEGER, allowNull: false, defaultValue: 0 },
+    });
+    await addMissingIndexes("MembershipRollups", [{ name: "membership_rollups_gym_day", fields: ["gym_id", "day"] }]);
+  },
+
+  async down(queryInterface) {
+    await queryInterface.dropTable("MembershipRollups");
+    await queryInterface.dropTable("RevenueRollups");
+  },
+};
@@ -91,6 +91,12 @@ const Gym = sequelize.define("Gym", {
       unique: true,
       fields: ["email"], // Index on email for faster lookups
     },
+    {
+      // Backs the gym search in utils/search.js
+      name: "gyms_search_fulltext",
+      type: "FULLTEXT",
+      fields: ["name", "city", "contact_person"],
+    },
     // Add more indexes as needed
   ],
 });
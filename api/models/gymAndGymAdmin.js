@@ -37,6 +37,13 @@ const GymAndGymAdmin = sequelize.define(
   },
   {
     tableName: "GymAndGymAdmins",
+    indexes: [
+      {
+        // Admin -> gym lookup in authMiddleware
+        name: "gym_and_gym_admins_admin_gym",
+        fields: ["gymAdminId", "gymId"],
+      },
+    ],
   }
 );
 
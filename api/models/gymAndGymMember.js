@@ -31,6 +31,19 @@ const GymAndGymMember = sequelize.define("GymAndGymMember", {
       isInt: true, // Ensure memberId is an integer
     },
   },
+}, {
+  indexes: [
+    {
+      // Members of a gym (gym_admin scoping of the list endpoints)
+      name: "gym_and_gym_members_gym_member",
+      fields: ["gymId", "memberId"],
+    },
+    {
+      // Member -> gym lookup in authMiddleware and the membership checks
+      name: "gym_and_gym_members_member_gym",
+      fields: ["memberId", "gymId"],
+    },
+  ],
 });
 
 // Define associations if not already defined
@@ -47,6 +47,17 @@ const MembersMembership = sequelize.define(
   {
     tableName: "MembersMemberships",
     timestamps: true,
+    indexes: [
+      {
+        // Overlap check on create/update and the per-member listings
+        name: "members_memberships_member_period",
+        fields: ["gym_member_id", "start_date", "end_date"],
+      },
+      {
+        name: "members_memberships_plan_start",
+        fields: ["membership_plan_id", "start_date"],
+      },
+    ],
   }
 );
 
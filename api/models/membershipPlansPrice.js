@@ -46,6 +46,13 @@ const MembershipPlansPrice = sequelize.define(
   {
     tableName: "MembershipPlansPrices",
     timestamps: true,
+    indexes: [
+      {
+        // Price in effect for a plan on a given date
+        name: "membership_plans_prices_plan_validity",
+        fields: ["membership_plan_id", "validity_start_date", "validity_end_date"],
+      },
+    ],
   }
 );
 
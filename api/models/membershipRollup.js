@@ -0,0 +1,42 @@
+const { DataTypes } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+
+// Change in the number of running memberships of a plan on a day: +1 on a
+// membership's start_date, -1 on its end_date (memberships run from start to
+// end, end excluded). The plan's active memberships on day D are the sum of
+// its deltas up to D. Kept up to date by utils/rollups.js, which also folds
+// past days into one row per plan.
+const MembershipRollup = sequelize.define(
+  "MembershipRollup",
+  {
+    membership_plan_id: {
+      type: DataTypes.INTEGER,
+      primaryKey: true,
+    },
+    day: {
+      type: DataTypes.DATEONLY,
+      primaryKey: true,
+    },
+    gym_id: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+    },
+    delta: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    tableName: "MembershipRollups",
+    timestamps: false,
+    indexes: [
+      {
+        name: "membership_rollups_gym_day",
+        fields: ["gym_id", "day"],
+      },
+    ],
+  }
+);
+
+module.exports = MembershipRollup;
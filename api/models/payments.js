@@ -71,6 +71,21 @@ const Payments = sequelize.define(
   {
     tableName: "Payments",
     timestamps: true,
+    indexes: [
+      {
+        name: "payments_member_paid",
+        fields: ["gym_member_id", "payment_date"],
+      },
+      {
+        name: "payments_plan_start",
+        fields: ["membership_plan_id", "start_date"],
+      },
+      {
+        // Default sort of the payments listing
+        name: "payments_start_date",
+        fields: ["start_date"],
+      },
+    ],
   }
 );
 
@@ -0,0 +1,46 @@
+const { DataTypes } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+
+// Payments summed per plan and calendar month (UTC) of payment_date, kept
+// up to date by utils/rollups.js. gym_id is the plan's gym, copied so the
+// dashboards can group by gym without a join.
+const RevenueRollup = sequelize.define(
+  "RevenueRollup",
+  {
+    membership_plan_id: {
+      type: DataTypes.INTEGER,
+      primaryKey: true,
+    },
+    month: {
+      // "YYYY-MM"
+      type: DataTypes.STRING(7),
+      primaryKey: true,
+    },
+    gym_id: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+    },
+    payments: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+    },
+    revenue: {
+      type: DataTypes.DECIMAL(14, 2),
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    tableName: "RevenueRollups",
+    timestamps: false,
+    indexes: [
+      {
+        name: "revenue_rollups_gym_month",
+        fields: ["gym_id", "month"],
+      },
+    ],
+  }
+);
+
+module.exports = RevenueRollup;
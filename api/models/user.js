@@ -120,6 +120,15 @@ const User = sequelize.define("User", {
       notNull: true, // Ensure status is not null
     },
   },
+}, {
+  indexes: [
+    {
+      // Backs the user search in utils/search.js
+      name: "users_search_fulltext",
+      type: "FULLTEXT",
+      fields: ["username", "email"],
+    },
+  ],
 });
 
 module.exports = User;
\ No newline at end of file
@@ -0,0 +1,15 @@
+const express = require("express");
+const router = express.Router();
+const authMiddleware = require("../middleware/authMiddleware");
+const analyticsController = require("../controllers/analyticsController");
+
+// GET /api/analytics/revenue
+router.get("/revenue", authMiddleware, analyticsController.getRevenue);
+
+// GET /api/analytics/activeMembers
+router.get("/activeMembers", authMiddleware, analyticsController.getActiveMembers);
+
+// POST /api/analytics/rebuild
+router.post("/rebuild", authMiddleware, analyticsController.rebuildRollups);
+
+module.exports = router;
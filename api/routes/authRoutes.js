@@ -12,6 +12,9 @@ router.post("/signup/gymadmin", authMiddleware, authController.signupGymAdmin);
 // Sign up a new gym member user
 router.post("/signup/gymmember", authController.signupGymMember);
 
+// Sign up many gym members in one request
+router.post("/signup/gymmember/batch", authMiddleware, authController.signupGymMembersBatch);
+
 // Log in an existing user
 router.post("/login", authController.login);
 
@@ -10,6 +10,13 @@ router.post(
   gymAndGymMemberController.createGymAndGymMember
 );
 
+// Route to stream gym members as NDJSON/CSV
+router.get(
+  "/export",
+  authMiddleware,
+  gymAndGymMemberController.exportGymAndGymMembers
+);
+
 // Route to delete a GymAndGymMember record
 router.delete(
   "/:id",
@@ -9,11 +9,17 @@ const {
   deleteMembershipPlanById,
   getAllMembershipPlans,
 } = require("../controllers/gymMembershipPlanController");
+const responseCache = require("../utils/responseCache");
 
 router.post("/", authMiddleware, createGymMembershipPlan);
 router.get("/", authMiddleware, getAllMembershipPlans);
 router.get("/:planId", authMiddleware, getMembershipPlanById);
-router.get("/allByGym/:gymId", authMiddleware, getMembershipPlansByGymId);
+router.get(
+  "/allByGym/:gymId",
+  authMiddleware,
+  responseCache.cached("MembershipPlans"),
+  getMembershipPlansByGymId
+);
 router.put("/update/:planId", authMiddleware, updateMembershipPlanById);
 router.delete("/delete/:planId", authMiddleware, deleteMembershipPlanById);
 
@@ -2,6 +2,7 @@ const express = require("express");
 const router = express.Router();
 const authMiddleware = require("../middleware/authMiddleware");
 const gymController = require("../controllers/gymController");
+const responseCache = require("../utils/responseCache");
 
 // Route to create a new gym
 router.post("/", authMiddleware, gymController.createGym);
@@ -10,7 +11,7 @@ router.post("/", authMiddleware, gymController.createGym);
 router.get("/", authMiddleware, gymController.getAllGyms);
 
 // Route to get a gym by its ID
-router.get("/:id", authMiddleware, gymController.getGymById);
+router.get("/:id", authMiddleware, responseCache.cached("Gyms"), gymController.getGymById);
 
 // Route to update a gym by its ID
 router.put("/:id", authMiddleware, gymController.updateGymById);
@@ -0,0 +1,8 @@
+const express = require("express");
+const router = express.Router();
+const healthController = require("../controllers/healthController");
+
+// Route to report that this process is alive
+router.get("/", healthController.getHealth);
+
+module.exports = router;
@@ -0,0 +1,16 @@
+const express = require("express");
+const router = express.Router();
+const internalOnly = require("../middleware/internalOnly");
+const metricsController = require("../controllers/metricsController");
+const healthController = require("../controllers/healthController");
+
+// Route to report connection pool metrics of this process
+router.get("/metrics", internalOnly, metricsController.getMetrics);
+
+// Route to expose this process's metrics to Prometheus
+router.get("/prometheus", internalOnly, metricsController.getPrometheus);
+
+// Route to report the health of this process (and of the cluster's workers)
+router.get("/health", internalOnly, healthController.getInternalHealth);
+
+module.exports = router;
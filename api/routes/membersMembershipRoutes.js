@@ -10,6 +10,13 @@ router.post(
   membersMembershipController.createMembersMembership
 );
 
+// POST /api/membersMemberships/batch
+router.post(
+  "/batch",
+  authMiddleware,
+  membersMembershipController.createMembersMembershipsBatch
+);
+
 // GET /api/membersMemberships
 router.get(
   "/",
@@ -17,6 +24,27 @@ router.get(
   membersMembershipController.getAllMembersMemberships
 );
 
+// GET /api/membersMemberships/export (before /:membershipId)
+router.get(
+  "/export",
+  authMiddleware,
+  membersMembershipController.exportMembersMemberships
+);
+
+// GET /api/membersMemberships/expiring (before /:membershipId)
+router.get(
+  "/expiring",
+  authMiddleware,
+  membersMembershipController.getExpiringMemberships
+);
+
+// POST /api/membersMemberships/renewals
+router.post(
+  "/renewals",
+  authMiddleware,
+  membersMembershipController.renewExpiringMemberships
+);
+
 // GET /api/membersMemberships/:membershipId
 router.get(
   "/:membershipId",
@@ -2,6 +2,7 @@ const express = require("express");
 const router = express.Router();
 const authMiddleware = require("../middleware/authMiddleware");
 const membershipPlansPriceController = require("../controllers/membershipPlansPriceController");
+const responseCache = require("../utils/responseCache");
 
 // POST /api/membershipPlansPrices
 router.post(
@@ -10,10 +11,18 @@ router.post(
   membershipPlansPriceController.createMembershipPlanPrice
 );
 
+// POST /api/membershipPlansPrices/quote
+router.post(
+  "/quote",
+  authMiddleware,
+  membershipPlansPriceController.quoteMembershipPlanPrices
+);
+
 // GET /api/membershipPlansPrices
 router.get(
   "/",
   authMiddleware,
+  responseCache.cached("MembershipPlansPrices", "MembershipPlans"),
   membershipPlansPriceController.getAllMembershipPlanPrices
 );
 
@@ -21,6 +30,7 @@ router.get(
 router.get(
   "/:priceId",
   authMiddleware,
+  responseCache.cached("MembershipPlansPrices", "MembershipPlans"),
   membershipPlansPriceController.getMembershipPlanPriceById
 );
 
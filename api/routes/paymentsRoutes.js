@@ -3,6 +3,9 @@ const router = express.Router();
 const authMiddleware = require("../middleware/authMiddleware");
 const paymentsController = require("../controllers/paymentsController");
 
+// Route to stream payments as NDJSON/CSV (before /:paymentId)
+router.get("/export", authMiddleware, paymentsController.exportPayments);
+
 // Route to get a payment by ID
 router.get("/:paymentId", authMiddleware, paymentsController.getPaymentById);
 
@@ -12,6 +15,9 @@ router.get("/", authMiddleware, paymentsController.getAllPayments);
 // Route to create a new payment
 router.post("/", authMiddleware, paymentsController.createPayment);
 
+// Route to create many payments in one request
+router.post("/batch", authMiddleware, paymentsController.createPaymentsBatch);
+
 // Route to update an existing payment
 router.put("/:paymentId", authMiddleware, paymentsController.updatePaymentById);
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env node
+/**
+ * Build the OpenAPI document from the @swagger JSDoc of the controllers and
+ * write it where config/swaggerConfig.js loads it from, so the server never
+ * parses the controllers at startup. Run it as part of every build and after
+ * editing controller docs.
+ *
+ * Options:
+ *   --out <file>  write there instead of OPENAPI_SPEC (default build/openapi.json)
+ *   --check       write nothing; exit 1 if the file is missing or out of date
+ *
+ * Examples:
+ *   npm run build:openapi
+ *   node scripts/buildOpenApi.js --check
+ */
+
+const fs = require("fs");
+const path = require("path");
+
+const main = () => {
+  const { SPEC_PATH, buildSpec } = require("../config/swaggerConfig");
+  const outIndex = process.argv.indexOf("--out");
+  const out = outIndex > 0 ? path.resolve(process.argv[outIndex + 1]) : SPEC_PATH;
+
+  const started = Date.now();
+  const spec = buildSpec();
+  const text = JSON.stringify(spec, null, 2) + "\n";
+
+  if (process.argv.includes("--check")) {
+    const current = fs.existsSync(out) ? fs.readFileSync(out, "utf8") : null;
+    if (current !== text) {
+      console.error(`${out} is ${current === null ? "missing" : "out of date"}; run npm run build:openapi`);
+      process.exit(1);
+    }
+    console.log(`${out} is up to date`);
+    return;
+  }
+
+  fs.mkdirSync(path.dirname(out), { recursive: true });
+  fs.writeFileSync(out, text);
+  const paths = Object.keys(spec.paths || {}).length;
+  console.log(`Wrote ${out}: ${paths} paths in ${Date.now() - started}ms`);
+};
+
+if (require.main === module) {
+  main();
+}
@@ -0,0 +1,46 @@
+#!/usr/bin/env node
+/**
+ * Apply, revert or list the schema migrations in migrations/ (see
+ * utils/migrations.js). Run `up` as a release step before starting the new
+ * servers with DB_SCHEMA=check.
+ *
+ * Commands:
+ *   up            (default) apply every pending migration
+ *   down [steps]  revert the last `steps` (default 1) applied migrations
+ *   status        list applied and pending migrations
+ *
+ * Examples:
+ *   npm run migrate
+ *   node scripts/migrate.js down 2
+ *   DB_DIALECT=sqlite DB_STORAGE=seed.sqlite node scripts/migrate.js
+ */
+
+const main = async () => {
+  const sequelize = require("../config/dbConfig");
+  const migrations = require("../utils/migrations");
+  const [command = "up", steps = "1"] = process.argv.slice(2);
+  try {
+    if (command === "up") {
+      const applied = await migrations.migrate();
+      console.log(applied.length ? `Applied ${applied.join(", ")}` : "No pending migrations");
+    } else if (command === "down") {
+      const reverted = await migrations.undo(parseInt(steps, 10));
+      console.log(reverted.length ? `Reverted ${reverted.join(", ")}` : "No applied migrations");
+    } else if (command === "status") {
+      const { applied, pending } = await migrations.status();
+      for (const name of applied) console.log(`applied  ${name}`);
+      for (const name of pending) console.log(`pending  ${name}`);
+    } else {
+      throw new Error(`Unknown command "${command}" (expected up, down or status)`);
+    }
+  } finally {
+    await sequelize.close();
+  }
+};
+
+if (require.main === module) {
+  main().catch((error) => {
+    console.error(error.message);
+    process.exit(1);
+  });
+}
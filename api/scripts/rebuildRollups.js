@@ -0,0 +1,39 @@
+#!/usr/bin/env node
+/**
+ * Recompute the analytics rollup tables (see utils/rollups.js) from every
+ * payment and membership in the database.
+ *
+ * The API keeps the rollups up to date as it writes; run this after rows were
+ * written some other way (restores, manual SQL, older deployments). Writes
+ * made through the API while it runs may be missed, so stop the API or run it
+ * again afterwards. scripts/seed.js rebuilds the rollups itself.
+ *
+ * Options:
+ *   --migrate  apply pending schema migrations first (utils/migrations.js)
+ *
+ * Examples:
+ *   node scripts/rebuildRollups.js
+ *   DB_DIALECT=sqlite DB_STORAGE=seed.sqlite node scripts/rebuildRollups.js --migrate
+ */
+
+const main = async () => {
+  const sequelize = require("../config/dbConfig");
+  const rollups = require("../utils/rollups");
+  try {
+    if (process.argv.includes("--migrate")) {
+      await require("../utils/migrations").migrate();
+    }
+    const started = Date.now();
+    const rows = await rollups.rebuild();
+    console.log(`Rebuilt analytics rollups: ${rows} rows in ${Date.now() - started}ms`);
+  } finally {
+    await sequelize.close();
+  }
+};
+
+if (require.main === module) {
+  main().catch((error) => {
+    console.error(error.message);
+    process.exit(1);
+  });
+}
@@ -0,0 +1,535 @@
+#!/usr/bin/env node
+/**
+ * Seed the database with a large, deterministic data set for benchmarking.
+ *
+ * Every gym gets one gym admin, `--members-per-gym` members, `--plans-per-gym`
+ * membership plans with `--prices-per-plan` prices each, and every member gets
+ * `--memberships-per-member` consecutive memberships with
+ * `--payments-per-membership` payments each. The same `--seed` always yields
+ * the same rows.
+ *
+ * Two ways of loading the data:
+ *   --mode db   (default) multi-row INSERTs through the Sequelize models, in
+ *               batches of `--batch-size` with up to `--concurrency` batches in
+ *               flight. Use this for the large volumes. Point it at a local
+ *               MySQL, or at SQLite with DB_DIALECT=sqlite DB_STORAGE=<file>
+ *               (after `npm run sqlite:install`) and `--migrate` to create tables.
+ *   --mode api  the public API with up to `--concurrency` requests in flight,
+ *               exercising the same validation and hooks as real clients.
+ *
+ * In db mode the analytics rollups (utils/rollups.js) are rebuilt at the end.
+ *
+ * Examples:
+ *   node scripts/seed.js --gyms 2000 --members-per-gym 150 --seed 7
+ *   DB_DIALECT=sqlite DB_STORAGE=seed.sqlite node scripts/seed.js --migrate --gyms 5000
+ *   node scripts/seed.js --mode api --base-url http://localhost:3000/api --gyms 20
+ */
+
+const http = require("http");
+const https = require("https");
+const axios = require("axios");
+const bcrypt = require("bcryptjs");
+
+const DEFAULTS = {
+  mode: "db",
+  seed: 1,
+  gyms: 10,
+  membersPerGym: 50,
+  plansPerGym: 3,
+  pricesPerPlan: 2,
+  membershipsPerMember: 1,
+  paymentsPerMembership: 1,
+  batchSize: 1000,
+  concurrency: 4,
+  prefix: null,
+  password: "Seed@1234",
+  baseUrl: process.env.GYM_API_BASE_URL || "http://localhost:3000/api",
+  migrate: false,
+};
+
+const CITIES = [
+  ["Mumbai", "Maharashtra", "India", "INR", 19.076, 72.8777],
+  ["Delhi", "Delhi", "India", "INR", 28.7041, 77.1025],
+  ["Bangalore", "Karnataka", "India", "INR", 12.9716, 77.5946],
+  ["New York", "New York", "USA", "USD", 40.7128, -74.006],
+  ["London", "England", "UK", "GBP", 51.5074, -0.1278],
+  ["Berlin", "Berlin", "Germany", "EUR", 52.52, 13.405],
+];
+const FIRST_NAMES = ["Aarav", "Priya", "John", "Jane", "Liam", "Emma", "Noah", "Olivia", "Ravi", "Sara"];
+const LAST_NAMES = ["Sharma", "Smith", "Doe", "Patel", "Brown", "Garcia", "Singh", "Khan", "Miller", "Lee"];
+const PLAN_SHAPES = [
+  ["Monthly", "months", 1],
+  ["Quarterly", "months", 3],
+  ["Half Yearly", "months", 6],
+  ["Annual", "years", 1],
+  ["Day Pass", "days", 1],
+];
+const CATEGORIES = ["Regular", "Premium", "Student", "Corporate"];
+const PAYMENT_TYPES = ["calculated_fee", "discounted_fee", "topup"];
+const PAYMENT_METHODS = ["cash", "card", "upi", "bank_transfer"];
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const EPOCH = Date.UTC(2023, 0, 1);
+
+const parseArgs = (argv) => {
+  const options = { ...DEFAULTS };
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    if (!arg.startsWith("--")) {
+      throw new Error(`Unexpected argument: ${arg}`);
+    }
+    const key = arg.slice(2).replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(key in DEFAULTS)) {
+      throw new Error(`Unknown option: ${arg}`);
+    }
+    if (typeof DEFAULTS[key] === "boolean") {
+      options[key] = true;
+      continue;
+    }
+    const value = argv[++i];
+    if (value === undefined) {
+      throw new Error(`Missing value for ${arg}`);
+    }
+    options[key] = typeof DEFAULTS[key] === "number" ? Number(value) : value;
+    if (Number.isNaN(options[key])) {
+      throw new Error(`${arg} expects a number`);
+    }
+  }
+  if (!["db", "api"].includes(options.mode)) {
+    throw new Error(`--mode must be "db" or "api"`);
+  }
+  options.prefix = options.prefix || `seed${options.seed}`;
+  return options;
+};
+
+// mulberry32: small, fast and good enough for test data
+const createRng = (seed) => {
+  let state = seed >>> 0;
+  const next = () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+  return {
+    next,
+    int: (min, max) => min + Math.floor(next() * (max - min + 1)),
+    pick: (items) => items[Math.floor(next() * items.length)],
+  };
+};
+
+const day = (offset) => new Date(EPOCH + offset * DAY_MS);
+const isoDate = (date) => date.toISOString().slice(0, 10);
+const digits = (rng, length) => Array.from({ length }, () => rng.int(0, 9)).join("");
+
+const durationDays = (type, value) => {
+  if (type === "days") return value;
+  if (type === "months") return value * 30;
+  return value * 365;
+};
+
+/**
+ * Describe everything that belongs to gym number `g`. Each gym has its own
+ * random stream, so the result does not depend on the order in which gyms
+ * are loaded (API mode loads them concurrently).
+ */
+const buildGym = (g, options) => {
+  const rng = createRng(options.seed * 1000003 + g);
+  const [city, state, country, currency, lat, lng] = rng.pick(CITIES);
+  const tag = `${options.prefix}_g${g}`;
+
+  const person = (role, i) => {
+    const firstName = rng.pick(FIRST_NAMES);
+    const lastName = rng.pick(LAST_NAMES);
+    return {
+      username: `${tag}_${role}${i}`,
+      firstName,
+      lastName,
+      email: `${tag}_${role}${i}@example.com`,
+      phone: digits(rng, 10),
+      city,
+      state,
+      country,
+      gender: rng.pick(["male", "female", "other"]),
+      dateOfBirth: isoDate(day(-rng.int(18 * 365, 60 * 365))),
+    };
+  };
+
+  const plans = [];
+  for (let p = 0; p < options.plansPerGym; p++) {
+    const [name, durationType, durationValue] = PLAN_SHAPES[p % PLAN_SHAPES.length];
+    const prices = [];
+    const validity = Math.floor((3 * 365) / Math.max(1, options.pricesPerPlan));
+    for (let i = 0; i < options.pricesPerPlan; i++) {
+      prices.push({
+        price: rng.int(5, 500) * 10,
+        validity_start_date: isoDate(day(i * validity)),
+        validity_end_date: isoDate(day((i + 1) * validity - 1)),
+        comments: `Seeded price ${i + 1}`,
+      });
+    }
+    plans.push({
+      plan: {
+        plan_name: `${name} ${p + 1}`,
+        plan_description: `${name} plan seeded for ${tag}`,
+        duration_type: durationType,
+        duration_value: durationValue,
+        category: rng.pick(CATEGORIES),
+      },
+      prices,
+      days: durationDays(durationType, durationValue),
+    });
+  }
+
+  const members = [];
+  for (let m = 0; m < options.membersPerGym; m++) {
+    const memberships = [];
+    let start = rng.int(0, 365);
+    for (let i = 0; i < options.membershipsPerMember && plans.length; i++) {
+      const planIndex = rng.int(0, plans.length - 1);
+      const end = start + plans[planIndex].days;
+      const payments = [];
+      for (let k = 0; k < options.paymentsPerMembership; k++) {
+        payments.push({
+          payment_date: isoDate(day(start + k)),
+          payment_type: rng.pick(PAYMENT_TYPES),
+          payment_method: rng.pick(PAYMENT_METHODS),
+          total_amount: rng.int(5, 500) * 10,
+          comments: "Seeded payment",
+        });
+      }
+      memberships.push({
+        planIndex,
+        start_date: isoDate(day(start)),
+        end_date: isoDate(day(end)),
+        payments,
+      });
+      start = end + 1;
+    }
+    members.push({ user: person("member", m), memberships });
+  }
+
+  return {
+    gym: {
+      name: `${options.prefix} Gym ${g}`,
+      address: `${rng.int(1, 999)} Seed Street`,
+      city,
+      state,
+      country,
+      pincode: digits(rng, 6),
+      phone_number: digits(rng, 10),
+      email: `${tag}@example.com`,
+      contact_person: `${rng.pick(FIRST_NAMES)} ${rng.pick(LAST_NAMES)}`,
+      currency,
+      latitude: lat + (rng.next() - 0.5) / 10,
+      longitude: lng + (rng.next() - 0.5) / 10,
+    },
+    admin: person("admin", 0),
+    plans,
+    members,
+  };
+};
+
+class Stats {
+  constructor() {
+    this.counts = {};
+    this.startedAt = process.hrtime.bigint();
+  }
+
+  add(table, rows) {
+    this.counts[table] = (this.counts[table] || 0) + rows;
+  }
+
+  report() {
+    const elapsed = Number(process.hrtime.bigint() - this.startedAt) / 1e9;
+    const total = Object.values(this.counts).reduce((sum, n) => sum + n, 0);
+    const lines = Object.entries(this.counts).map(
+      ([table, rows]) => `  ${table.padEnd(22)} ${String(rows).padStart(10)} rows`
+    );
+    lines.push(
+      `  ${"total".padEnd(22)} ${String(total).padStart(10)} rows in ${elapsed.toFixed(1)}s ` +
+        `(${Math.round(total / Math.max(elapsed, 1e-9))} rows/s)`
+    );
+    return lines.join("\n");
+  }
+}
+
+// Tables that must be written before rows of the given table can be
+const PARENTS = {
+  Users: [],
+  Gyms: [],
+  GymAndGymAdmins: ["Users", "Gyms"],
+  GymAndGymMembers: ["Users", "Gyms"],
+  MembershipPlans: ["Gyms"],
+  MembershipPlansPrices: ["MembershipPlans"],
+  MembersMemberships: ["Users", "MembershipPlans"],
+  Payments: ["Users", "MembershipPlans"],
+};
+
+/**
+ * Buffers rows per table and writes them with multi-row INSERTs. A table is
+ * only flushed after every in-flight batch of its parent tables has landed,
+ * so foreign keys always resolve.
+ */
+class BulkWriter {
+  constructor(models, stats, { batchSize, concurrency }) {
+    this.models = models;
+    this.stats = stats;
+    this.batchSize = batchSize;
+    this.concurrency = concurrency;
+    this.buffers = {};
+    this.inflight = {};
+    for (const table of Object.keys(models)) {
+      this.buffers[table] = [];
+      this.inflight[table] = new Set();
+    }
+  }
+
+  async add(table, row) {
+    this.buffers[table].push(row);
+    if (this.buffers[table].length >= this.batchSize) {
+      await this.flush(table);
+    }
+  }
+
+  async flush(table) {
+    for (const parent of PARENTS[table]) {
+      await this.flush(parent);
+      await Promise.all(this.inflight[parent]);
+    }
+    const rows = this.buffers[table].splice(0);
+    if (rows.length) {
+      const insert = this.models[table]
+        .bulkCreate(rows, { validate: false, hooks: false, logging: false })
+        .then(() => this.stats.add(table, rows.length))
+        .finally(() => this.inflight[table].delete(insert));
+      this.inflight[table].add(insert);
+    }
+    while (this.inflight[table].size >= this.concurrency) {
+      await Promise.race(this.inflight[table]);
+    }
+  }
+
+  async close() {
+    for (const table of Object.keys(this.models)) {
+      await this.flush(table);
+    }
+    for (const table of Object.keys(this.models)) {
+      await Promise.all(this.inflight[table]);
+    }
+  }
+}
+
+const seedDatabase = async (options, stats) => {
+  // Loaded lazily so API mode works without database credentials
+  const sequelize = require("../config/dbConfig");
+  const models = {
+    Users: require("../models/user"),
+    Gyms: require("../models/gym"),
+    GymAndGymAdmins: require("../models/gymAndGymAdmin"),
+    GymAndGymMembers: require("../models/gymAndGymMember"),
+    MembershipPlans: require("../models/gymMembershipPlan"),
+    MembershipPlansPrices: require("../models/membershipPlansPrice"),
+    MembersMemberships: require("../models/membersMembership"),
+    Payments: require("../models/payments"),
+  };
+  const rollups = require("../utils/rollups");
+
+  if (options.migrate) {
+    await require("../utils/migrations").migrate();
+  }
+
+  // IDs are assigned here rather than by AUTO_INCREMENT so children can
+  // reference parents that are still buffered. Nothing else may insert into
+  // these tables while the seeder runs.
+  const nextId = {};
+  for (const [table, model] of Object.entries(models)) {
+    nextId[table] = ((await model.max("id")) || 0) + 1;
+  }
+  const id = (table) => nextId[table]++;
+
+  // Hash once: bcrypt per row would dominate the run time
+  const passwordHash = bcrypt.hashSync(options.password, 10);
+  const writer = new BulkWriter(models, stats, options);
+
+  try {
+    for (let g = 0; g < options.gyms; g++) {
+      const blueprint = buildGym(g, options);
+      const gymId = id("Gyms");
+      await writer.add("Gyms", { id: gymId, ...blueprint.gym });
+
+      const adminId = id("Users");
+      await writer.add("Users", { id: adminId, ...blueprint.admin, password: passwordHash, type: "gym_admin" });
+      await writer.add("GymAndGymAdmins", { id: id("GymAndGymAdmins"), gymAdminId: adminId, gymId });
+
+      const planIds = [];
+      for (const { plan, prices } of blueprint.plans) {
+        const planId = id("MembershipPlans");
+        planIds.push(planId);
+        await writer.add("MembershipPlans", { id: planId, gym_id: gymId, ...plan });
+        for (const price of prices) {
+          await writer.add("MembershipPlansPrices", {
+            id: id("MembershipPlansPrices"),
+            membership_plan_id: planId,
+            ...price,
+          });
+        }
+      }
+
+      for (const { user, memberships } of blueprint.members) {
+        const memberId = id("Users");
+        await writer.add("Users", { id: memberId, ...user, password: passwordHash, type: "gym_member" });
+        await writer.add("GymAndGymMembers", { id: id("GymAndGymMembers"), gymId, memberId });
+        for (const { planIndex, start_date, end_date, payments } of memberships) {
+          const planId = planIds[planIndex];
+          await writer.add("MembersMemberships", {
+            id: id("MembersMemberships"),
+            gym_member_id: memberId,
+            membership_plan_id: planId,
+            start_date,
+            end_date,
+          });
+          for (const payment of payments) {
+            await writer.add("Payments", {
+              id: id("Payments"),
+              gym_member_id: memberId,
+              membership_plan_id: planId,
+              start_date,
+              end_date,
+              ...payment,
+            });
+          }
+        }
+      }
+    }
+    await writer.close();
+    // The inserts bypassed the controllers that keep the rollups current
+    await rollups.rebuild();
+  } finally {
+    await sequelize.close();
+  }
+};
+
+// Runs at most `concurrency` of the returned functions' promises at a time
+const createLimiter = (concurrency) => {
+  let active = 0;
+  const queue = [];
+  const next = () => {
+    if (active >= concurrency || !queue.length) return;
+    active++;
+    const { task, resolve, reject } = queue.shift();
+    task()
+      .then(resolve, reject)
+      .finally(() => {
+        active--;
+        next();
+      });
+  };
+  return (task) =>
+    new Promise((resolve, reject) => {
+      queue.push({ task, resolve, reject });
+      next();
+    });
+};
+
+const seedApi = async (options, stats) => {
+  const api = axios.create({
+    baseURL: options.baseUrl,
+    timeout: 30000,
+    httpAgent: new http.Agent({ keepAlive: true, maxSockets: options.concurrency }),
+    httpsAgent: new https.Agent({ keepAlive: true, maxSockets: options.concurrency }),
+  });
+  const limit = createLimiter(options.concurrency);
+
+  const post = (table, path, body) =>
+    limit(() => api.post(path, body)).then(
+      (response) => {
+        stats.add(table, 1);
+        return response.data;
+      },
+      (error) => {
+        const detail = error.response ? JSON.stringify(error.response.data) : error.message;
+        throw new Error(`POST ${path} failed: ${detail}`);
+      }
+    );
+
+  // The seeding admin is reused on later runs with the same prefix
+  const admin = { username: `${options.prefix}_admin`, password: options.password };
+  await api.post("/signup/admin", admin).catch(() => null);
+  const { token } = (await api.post("/login", admin)).data;
+  api.defaults.headers.common.Authorization = `Bearer ${token}`;
+
+  const seedGym = async (g) => {
+    const blueprint = buildGym(g, options);
+    const gymId = (await post("Gyms", "/gym", blueprint.gym)).gym.id;
+
+    const adminId = (
+      await post("Users", "/signup/gymadmin", { ...blueprint.admin, password: options.password })
+    ).user.id;
+    await post("GymAndGymAdmins", "/gymAndGymAdmin", { gymAdminId: adminId, gymId });
+
+    const planIds = await Promise.all(
+      blueprint.plans.map(async ({ plan, prices }) => {
+        const planId = (await post("MembershipPlans", "/gymMembershipPlans", { gym_id: gymId, ...plan })).id;
+        await Promise.all(
+          prices.map((price) =>
+            post("MembershipPlansPrices", "/membershipPlansPrices", { membership_plan_id: planId, ...price })
+          )
+        );
+        return planId;
+      })
+    );
+
+    await Promise.all(
+      blueprint.members.map(async ({ user, memberships }) => {
+        const memberId = (
+          await post("Users", "/signup/gymmember", { ...user, password: options.password, gymId })
+        ).user.id;
+        stats.add("GymAndGymMembers", 1);
+        // Memberships of one member must not overlap, so create them in order
+        for (const { planIndex, start_date, end_date, payments } of memberships) {
+          const ids = { gym_member_id: memberId, membership_plan_id: planIds[planIndex] };
+          await post("MembersMemberships", "/membersMemberships", { ...ids, start_date, end_date });
+          await Promise.all(
+            payments.map((payment) => post("Payments", "/payments", { ...ids, start_date, end_date, ...payment }))
+          );
+        }
+      })
+    );
+  };
+
+  // Gyms are independent; keep a window of them open so the limiter stays busy
+  const window = Math.max(1, options.concurrency);
+  for (let g = 0; g < options.gyms; g += window) {
+    const batch = [];
+    for (let i = g; i < Math.min(g + window, options.gyms); i++) {
+      batch.push(seedGym(i));
+    }
+    await Promise.all(batch);
+  }
+};
+
+const main = async () => {
+  const options = parseArgs(process.argv.slice(2));
+  const stats = new Stats();
+  console.log(
+    `Seeding ${options.gyms} gyms (${options.membersPerGym} members each) ` +
+      `via ${options.mode}, seed ${options.seed}, prefix "${options.prefix}"`
+  );
+  if (options.mode === "api") {
+    await seedApi(options, stats);
+  } else {
+    await seedDatabase(options, stats);
+  }
+  console.log(stats.report());
+};
+
+if (require.main === module) {
+  main().catch((error) => {
+    console.error(error.message);
+    process.exit(1);
+  });
+}
+
+module.exports = { parseArgs, createRng, buildGym, BulkWriter, createLimiter };
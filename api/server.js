@@ -1,3 +1,4 @@
+const cluster = require("cluster");
 const express = require("express");
 const sequelize = require("./config/dbConfig");
 const authRoutes = require("./routes/authRoutes");
@@ -8,8 +9,26 @@ const gymAndGymMemberRoutes = require("./routes/gymAndGymMemberRoutes");
 const gymMembershipPlanRoutes = require("./routes/gymMembershipPlanRoutes");
 const membershipPlansPriceRoutes = require("./routes/membershipPlansPriceRoutes");
 const membersMembershipRoutes = require("./routes/membersMembershipRoutes");
+const analyticsRoutes = require("./routes/analyticsRoutes");
 const paymentsRoutes = require("./routes/paymentsRoutes");
+const healthRoutes = require("./routes/healthRoutes");
+const internalRoutes = require("./routes/internalRoutes");
+const requestMetrics = require("./middleware/requestMetrics");
+const compression = require("./middleware/compression");
 const swaggerConfig = require("./config/swaggerConfig");
+const { workerCount, startPrimary, trackServer, addHealthSource } = require("./utils/cluster");
+const passwordHasher = require("./utils/passwordHasher");
+const userContextCache = require("./utils/userContextCache");
+const countCache = require("./utils/countCache");
+const responseCache = require("./utils/responseCache");
+const priceIndex = require("./utils/priceIndex");
+const expiryBuckets = require("./utils/expiryBuckets");
+const membershipRenewals = require("./utils/membershipRenewals");
+const scheduler = require("./utils/scheduler");
+const rollups = require("./utils/rollups");
+const migrations = require("./utils/migrations");
+const dbPool = require("./utils/dbPool");
+const logger = require("./utils/logger");
 require("dotenv").config();
 
 const app = express();
@@ -22,6 +41,8 @@ app.use((req, res, next) => {
   next();
 });
 
+app.use(requestMetrics);
+app.use(compression);
 app.use(express.json());
 app.use("/api", authRoutes);
 app.use("/api/users", userRoutes);
@@ -32,6 +53,9 @@ app.use("/api/gymMembershipPlans", gymMembershipPlanRoutes);
 app.use("/api/membershipPlansPrices", membershipPlansPriceRoutes);
 app.use("/api/membersMemberships", membersMembershipRoutes);
 app.use("/api/payments", paymentsRoutes);
+app.use("/api/analytics", analyticsRoutes);
+app.use("/api/health", healthRoutes);
+app.use("/api/internal", internalRoutes);
 
 app.get("/", (req, res) => {
   // res.send("Welcome to Gym Management API 1.0");
@@ -44,18 +68,69 @@ swaggerConfig(app);
 
 const PORT = process.env.PORT || 3000;
 
-sequelize
-  .authenticate()
-  .then(() => {
+addHealthSource("passwordHasher", passwordHasher.getStats);
+addHealthSource("userContextCache", userContextCache.getStats);
+addHealthSource("countCache", countCache.getStats);
+addHealthSource("responseCache", responseCache.getStats);
+addHealthSource("compression", compression.getStats);
+addHealthSource("priceIndex", priceIndex.getStats);
+addHealthSource("expiryBuckets", expiryBuckets.getStats);
+addHealthSource("scheduler", scheduler.getStats);
+addHealthSource("rollups", rollups.getStats);
+addHealthSource("migrations", migrations.getStats);
+addHealthSource("logger", logger.getStats);
+addHealthSource("dbPool", () => {
+  const { size, using, waiting, config } = dbPool.getStats();
+  return { size, using, waiting, max: config.max };
+});
+
+// Connect and bring the schema (DB_SCHEMA, see utils/migrations.js) and the
+// analytics rollups up to date; runs once, in the primary when clustered
+const prepareDatabase = () =>
+  sequelize.authenticate().then(() => {
     console.log("Database connection has been established successfully.");
 
-    // Sync database models with Sequelize
-    sequelize.sync().then(() => {
-      app.listen(PORT, () => {
-        console.log(`Server is running on port ${PORT}`);
-      });
-    });
-  })
-  .catch((err) => {
-    console.error("Unable to connect to the database:", err);
+    return migrations.prepareSchema().then(() => rollups.ensureBuilt());
   });
+
+// Background jobs of a serving process (see utils/scheduler.js)
+const startJobs = () => {
+  scheduler.schedule("expiryBuckets.refresh", expiryBuckets.REFRESH_MS, expiryBuckets.rebuild, {
+    everyProcess: true,
+    runAtStart: true,
+  });
+  scheduler.schedule("rollups.compact", rollups.COMPACT_INTERVAL_MS, rollups.compact, { runAtStart: true });
+  if (membershipRenewals.AUTO_RENEW_DAYS > 0) {
+    scheduler.schedule("memberships.autoRenew", membershipRenewals.AUTO_RENEW_INTERVAL_MS, () =>
+      membershipRenewals.renewExpiring({ days: membershipRenewals.AUTO_RENEW_DAYS })
+    );
+  }
+};
+
+const listen = () => {
+  const server = app.listen(PORT, () => {
+    console.log(`Server is running on port ${PORT} (pid ${process.pid})`);
+  });
+  trackServer(server);
+  startJobs();
+  return server;
+};
+
+if (cluster.isWorker) {
+  listen();
+  // The primary disconnects a worker once its server has closed
+  cluster.worker.on("disconnect", () => {
+    sequelize.close().finally(() => process.exit(0));
+  });
+} else if (workerCount() > 0) {
+  startPrimary(workerCount(), prepareDatabase).catch((err) => {
+    console.error("Unable to start the cluster:", err);
+    process.exit(1);
+  });
+} else {
+  prepareDatabase()
+    .then(listen)
+    .catch((err) => {
+      console.error("Unable to connect to the database:", err);
+    });
+}
@@ -0,0 +1,148 @@
+import unittest
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fixtures import admin_client, private_gym, remove_private_gym, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, GymClient
+
+
+def day(offset):
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+class TestAnalyticsEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+
+        # A gym of its own, so the rollups hold only this suite's rows; the
+        # monthly plan comes first, the yearly one second
+        cls.gym = private_gym(cls.client, plans=2, members=6, member_prefix="analyticsmember")
+        cls.gym_id = cls.gym.gym_id
+        cls.plan_ids = cls.gym.plan_ids
+        cls.member_ids = cls.gym.member_ids
+        # payment id -> (month, amount), as the tests expect them
+        cls.payments = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_private_gym(cls.client, cls.gym)
+        cls.client.close()
+
+    def payment(self, member_index, plan_index, paid, amount):
+        return {
+            "gym_member_id": self.member_ids[member_index],
+            "membership_plan_id": self.plan_ids[plan_index],
+            "start_date": paid,
+            "end_date": "2031-12-31",
+            "payment_date": paid,
+            "payment_type": "calculated_fee",
+            "payment_method": "cash",
+            "total_amount": amount,
+        }
+
+    def revenue(self, client=None, **params):
+        response = (client or self.client).revenue_analytics(gymId=self.gym_id, **params)
+        self.assertEqual(response.status_code, 200, response.text)
+        return {row["month"]: (row["payments"], Decimal(row["revenue"])) for row in response.json()["data"]}
+
+    def expected_revenue(self):
+        months = defaultdict(lambda: (0, Decimal("0")))
+        for month, amount in self.payments.values():
+            count, total = months[month]
+            months[month] = (count + 1, total + Decimal(amount))
+        return dict(months)
+
+    def active(self, client=None):
+        response = (client or self.client).active_members_analytics(gymId=self.gym_id)
+        self.assertEqual(response.status_code, 200, response.text)
+        return {row["membership_plan_id"]: row["active"] for row in response.json()["data"]}
+
+    def test_01_payment_writes_update_revenue(self):
+        for member, plan, paid, amount in [
+            (0, 0, "2031-01-05", "100.50"),
+            (1, 0, "2031-01-20", "49.50"),
+            (2, 1, "2031-02-01", "1200.00"),
+        ]:
+            response = self.client.create_payment(self.payment(member, plan, paid, amount))
+            self.assertEqual(response.status_code, 201, response.text)
+            self.payments[response.json()["id"]] = (paid[:7], amount)
+
+        batch = [self.payment(3, 1, "2031-02-10", "300.25"), self.payment(4, 0, "2031-03-01", "75.00")]
+        response = self.client.create_payments_batch(batch)
+        self.assertEqual(response.status_code, 201, response.text)
+        for item, result in zip(batch, response.json()["results"]):
+            self.payments[result["id"]] = (item["payment_date"][:7], item["total_amount"])
+        self.assertEqual(self.revenue(), self.expected_revenue())
+
+        # Amount change, move to another month, delete
+        first, second, third = list(self.payments)[:3]
+        self.assertEqual(self.client.update_payment(first, total_amount="110.50").status_code, 200)
+        self.payments[first] = ("2031-01", "110.50")
+        self.assertEqual(self.client.update_payment(second, payment_date="2031-03-15").status_code, 200)
+        self.payments[second] = ("2031-03", "49.50")
+        self.assertEqual(self.client.delete_payment(third).status_code, 200)
+        del self.payments[third]
+        self.assertEqual(self.revenue(), self.expected_revenue())
+
+        self.assertEqual(set(self.revenue(**{"from": "2031-02", "to": "2031-03"})), {"2031-02", "2031-03"})
+
+    def test_02_membership_writes_update_active_members(self):
+        monthly, yearly = self.plan_ids
+
+        def create(member_index, plan_id, start, end):
+            response = self.client.create_members_membership(
+                gym_member_id=self.member_ids[member_index], membership_plan_id=plan_id, start_date=start, end_date=end
+            )
+            self.assertEqual(response.status_code, 201, response.text)
+            return response.json()["id"]
+
+        running = create(0, monthly, day(-10), day(20))
+        create(1, monthly, day(-40), day(-10))  # over
+        create(2, monthly, day(10), day(40))  # not started
+        yearly_running = create(3, yearly, day(-100), day(265))
+        self.assertEqual(self.active(), {monthly: 1, yearly: 1})
+
+        # Ends today: no longer running
+        self.assertEqual(self.client.update_members_membership(running, end_date=day(0)).status_code, 200)
+        self.assertEqual(self.active(), {yearly: 1})
+        self.assertEqual(self.client.delete_members_membership(yearly_running).status_code, 204)
+        self.assertEqual(self.active(), {})
+
+        create(4, yearly, day(-1), day(30))
+        create(5, yearly, day(0), day(30))
+        self.assertEqual(self.active(), {yearly: 2})
+
+    def test_03_rebuild_matches_incremental(self):
+        revenue, active = self.revenue(), self.active()
+        response = self.client.rebuild_rollups()
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(self.revenue(), revenue)
+        self.assertEqual(self.active(), active)
+
+    def test_04_roles_and_validation(self):
+        gym_admin = GymClient(self.BASE_URL)
+        member = GymClient(self.BASE_URL)
+        try:
+            gym_admin.login(self.fixtures.gym_admin_username, self.fixtures.gym_admin_password)
+            member.login(self.fixtures.member_username, self.fixtures.member_password)
+            # A gym admin always gets their own gym, whatever gymId says
+            rows = gym_admin.revenue_analytics(gymId=self.gym_id).json()["data"]
+            self.assertTrue(all(row["gym_id"] == self.fixtures.gym_id for row in rows))
+            self.assertEqual(gym_admin.rebuild_rollups().status_code, 403)
+            self.assertEqual(member.revenue_analytics().status_code, 401)
+            self.assertEqual(member.active_members_analytics().status_code, 401)
+        finally:
+            gym_admin.close()
+            member.close()
+
+        self.assertEqual(self.client.revenue_analytics(**{"from": "2031-13"}).status_code, 400)
+        self.assertEqual(self.client.active_members_analytics(gymId="x").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
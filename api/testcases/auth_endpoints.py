@@ -1,88 +1,83 @@
 import unittest
-import requests
 import json
 import random
 import string
 
+from fixtures import admin_client, unique_email, unique_name, worker_fixtures
+from gymclient import DEFAULT_BASE_URL
+
 class TestAPIEndpoints(unittest.TestCase):
-    BASE_URL = "http://localhost:3000/api"  # Replace with your actual API base URL
+    BASE_URL = DEFAULT_BASE_URL
     ADMIN_TOKEN = None
     ADMIN_USERNAME = None
     ADMIN_PASSWORD = None
 
     @classmethod
     def setUpClass(cls):
-        # Generate random admin credentials
-        cls.ADMIN_USERNAME = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
-        cls.ADMIN_PASSWORD = ''.join(random.choices(string.ascii_letters + string.digits, k=12))
-
-        # Create a new admin account
-        admin_data = {
-            "username": cls.ADMIN_USERNAME,
-            "password": cls.ADMIN_PASSWORD
-        }
-        response = requests.post(f"{cls.BASE_URL}/signup/admin", json=admin_data)
-        if response.status_code != 200:
-            raise Exception("Failed to create admin account for testing")
+        # Authenticate as this worker's cached fixture admin; `anonymous`
+        # shares the same connection pool
+        fixtures = worker_fixtures(cls.BASE_URL)
+        cls.ADMIN_USERNAME = fixtures.admin_username
+        cls.ADMIN_PASSWORD = fixtures.admin_password
+        cls.ADMIN_TOKEN = fixtures.admin_token
+        cls.client = admin_client(cls.BASE_URL)
+        cls.anonymous = cls.client.clone()
 
-        # Login as the new admin and store the token
-        login_response = requests.post(f"{cls.BASE_URL}/login", json=admin_data)
-        cls.ADMIN_TOKEN = login_response.json().get("token")
-        if not cls.ADMIN_TOKEN:
-            raise Exception("Failed to retrieve admin token")
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
 
     def test_01_signup_admin(self):
         data = {
-            "username": f"testadmin_{random.randint(1000, 9999)}",
+            "username": unique_name("testadmin"),
             "password": "testadmin123"
         }
-        response = requests.post(f"{self.BASE_URL}/signup/admin", json=data)
+        response = self.anonymous.signup_admin(**data)
         self.assertEqual(response.status_code, 200)
         self.assertIn("Admin user created successfully", response.json()["message"])
 
     def test_02_signup_admin_invalid(self):
         data = {
-            "username": f"testadmin_{random.randint(1000, 9999)}",
+            "username": unique_name("testadmin"),
             "password": "short"
         }
-        response = requests.post(f"{self.BASE_URL}/signup/admin", json=data)
+        response = self.anonymous.signup_admin(**data)
         self.assertEqual(response.status_code, 400)
         self.assertIn("Password must be at least 8 characters long", response.json()["error"])
 
     def test_03_signup_gym_admin(self):
         data = {
-            "username": f"testgymadmin_{random.randint(1000, 9999)}",
+            "username": unique_name("testgymadmin"),
             "password": "testgymadmin123",
             "firstName": "Test",
             "lastName": "GymAdmin",
-            "email": f"testgymadmin{random.randint(1000, 9999)}@example.com",
+            "email": unique_email("testgymadmin"),
             "phone": "1234567890"
         }
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        response = requests.post(f"{self.BASE_URL}/signup/gymadmin", json=data, headers=headers)
+        response = self.client.signup_gym_admin(data)
         self.assertEqual(response.status_code, 200)
         self.assertIn("Gym admin user created successfully", response.json()["message"])
 
     def test_04_signup_gym_admin_unauthorized(self):
         data = {
-            "username": f"testgymadmin_{random.randint(1000, 9999)}",
+            "username": unique_name("testgymadmin"),
             "password": "testgymadmin123",
             "firstName": "Test2"
         }
-        response = requests.post(f"{self.BASE_URL}/signup/gymadmin", json=data)
+        response = self.anonymous.signup_gym_admin(data)
         self.assertEqual(response.status_code, 401)
 
     def test_05_signup_gym_member(self):
         data = {
-            "username": f"testgymmember_{random.randint(1000, 9999)}",
+            "username": unique_name("testgymmember"),
             "password": "testgymmember123",
             "firstName": "Test",
             "lastName": "GymMember",
-            "email": f"testgymmember{random.randint(1000, 9999)}@example.com",
+            "email": unique_email("testgymmember"),
             "phone": "9876543210",
-            "gymId": 1  # Ensure that a gym with ID 1 exists
+            "gymId": worker_fixtures().gym_id
         }
-        response = requests.post(f"{self.BASE_URL}/signup/gymmember", json=data)
+        response = self.anonymous.signup_gym_member(data)
         print("Response Status Code:", response.status_code)
         print("Response Content:", response.json())
         self.assertEqual(response.status_code, 200)
@@ -90,11 +85,11 @@ class TestAPIEndpoints(unittest.TestCase):
 
     def test_06_signup_gym_member_invalid(self):
         data = {
-            "username": f"testgymmember_{random.randint(1000, 9999)}",
+            "username": unique_name("testgymmember"),
             "password": "short",
             "firstName": "Test2"
         }
-        response = requests.post(f"{self.BASE_URL}/signup/gymmember", json=data)
+        response = self.anonymous.signup_gym_member(data)
         self.assertEqual(response.status_code, 400)
 
     def test_07_login_valid(self):
@@ -102,7 +97,7 @@ class TestAPIEndpoints(unittest.TestCase):
             "username": self.ADMIN_USERNAME,
             "password": self.ADMIN_PASSWORD
         }
-        response = requests.post(f"{self.BASE_URL}/login", json=data)
+        response = self.client.clone().login(**data)
         self.assertEqual(response.status_code, 200)
         self.assertIn("token", response.json())
 
@@ -111,13 +106,12 @@ class TestAPIEndpoints(unittest.TestCase):
             "username": self.ADMIN_USERNAME,
             "password": "wrongpassword"
         }
-        response = requests.post(f"{self.BASE_URL}/login", json=data)
+        response = self.client.clone().login(**data)
         self.assertEqual(response.status_code, 400)
         self.assertIn("Invalid username or password", response.json()["error"])
 
     def test_09_user_details(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        response = requests.get(f"{self.BASE_URL}/userDetails", headers=headers)
+        response = self.client.user_details()
         self.assertEqual(response.status_code, 200)
         user_data = response.json()
         self.assertEqual(user_data["username"], self.ADMIN_USERNAME)
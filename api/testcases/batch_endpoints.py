@@ -0,0 +1,133 @@
+import unittest
+
+from fixtures import admin_client, user_data, worker_fixtures
+from gymclient import DEFAULT_BASE_URL
+
+
+class TestBatchEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def statuses(self, response):
+        return [result["status"] for result in response.json()["results"]]
+
+    def signup_members(self, count):
+        items = [user_data("batchmember", gymId=self.fixtures.gym_id) for _ in range(count)]
+        response = self.client.signup_gym_members_batch(items)
+        self.assertEqual(response.status_code, 201, response.text)
+        return [result["id"] for result in response.json()["results"]]
+
+    def membership(self, member_id, start, end):
+        return {
+            "gym_member_id": member_id,
+            "membership_plan_id": self.fixtures.plan_id,
+            "start_date": start,
+            "end_date": end,
+        }
+
+    def test_01_signup_partial_failure(self):
+        taken = user_data(
+            "batchmember",
+            gymId=self.fixtures.gym_id,
+            emergencyContactName="Jane Doe",
+            emergencyContactRelationship="Spouse",
+            emergencyContactPhone="9876543211",
+            emergencyContactEmail="jane.doe@example.com",
+        )
+        items = [
+            taken,
+            dict(taken),  # same username again
+            user_data("batchmember", gymId=self.fixtures.gym_id, email="not-an-email"),
+            user_data("batchmember", gymId=self.fixtures.gym_id),
+        ]
+        response = self.client.signup_gym_members_batch(items)
+        self.assertEqual(response.status_code, 207, response.text)
+        self.assertEqual(self.statuses(response), [201, 400, 400, 201])
+        body = response.json()
+        self.assertEqual((body["created"], body["failed"]), (2, 2))
+
+        created = body["results"][0]["id"]
+        user = self.client.get_user(created).json()
+        self.assertEqual(user["username"], taken["username"])
+        for field in ("emergencyContactName", "emergencyContactRelationship",
+                      "emergencyContactPhone", "emergencyContactEmail"):
+            self.assertEqual(user[field], taken[field], field)
+
+    def test_02_memberships_overlap(self):
+        member_id, other_id = self.signup_members(2)
+        response = self.client.create_members_membership(self.membership(member_id, "2032-01-01", "2032-01-31"))
+        self.assertEqual(response.status_code, 201, response.text)
+
+        items = [
+            self.membership(member_id, "2032-01-15", "2032-02-15"),  # overlaps the existing one
+            self.membership(member_id, "2032-03-01", "2032-03-31"),
+            self.membership(member_id, "2032-03-15", "2032-04-15"),  # overlaps the previous item
+            self.membership(other_id, "2032-03-01", "2032-03-31"),
+            self.membership(other_id, "2032-05-01", "2032-04-01"),  # end before start
+        ]
+        response = self.client.create_members_memberships_batch(items)
+        self.assertEqual(response.status_code, 207, response.text)
+        self.assertEqual(self.statuses(response), [400, 201, 400, 201, 400])
+
+        # The created period now blocks the ones the batch rejected
+        response = self.client.create_members_memberships_batch([items[2]])
+        self.assertEqual(self.statuses(response), [400])
+
+    def test_03_atomic_creates_nothing(self):
+        (member_id,) = self.signup_members(1)
+        items = [
+            self.membership(member_id, "2033-01-01", "2033-01-31"),
+            self.membership(member_id, "not-a-date", "2033-02-28"),
+        ]
+        response = self.client.create_members_memberships_batch(items, atomic=True)
+        self.assertEqual(response.status_code, 400, response.text)
+        self.assertEqual(self.statuses(response), [424, 400])
+
+        # The valid item was not inserted, so it can be created on its own
+        response = self.client.create_members_memberships_batch(items[:1], atomic=True)
+        self.assertEqual(response.status_code, 201, response.text)
+
+    def test_04_payments(self):
+        (member_id,) = self.signup_members(1)
+        payment = {
+            "gym_member_id": member_id,
+            "membership_plan_id": self.fixtures.plan_id,
+            "start_date": "2034-01-01",
+            "end_date": "2034-01-31",
+            "payment_date": "2034-01-01",
+            "payment_type": "calculated_fee",
+            "payment_method": "cash",
+            "total_amount": 100,
+        }
+        items = [
+            payment,
+            dict(payment, payment_type="gift"),
+            dict(payment, total_amount="abc"),
+            dict(payment, gym_member_id=0),
+        ]
+        response = self.client.create_payments_batch(items)
+        self.assertEqual(response.status_code, 207, response.text)
+        self.assertEqual(self.statuses(response), [201, 400, 400, 400])
+
+        payment_id = response.json()["results"][0]["id"]
+        self.assertEqual(self.client.get_payment(payment_id).status_code, 200)
+
+    def test_05_malformed_batches(self):
+        for items in ([], ["not an object"]):
+            response = self.client.create_payments_batch(items)
+            self.assertEqual(response.status_code, 400)
+
+        member = self.client.clone()
+        self.assertEqual(member.signup_gym_members_batch([user_data("batchmember")]).status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
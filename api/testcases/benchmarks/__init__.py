@@ -0,0 +1,32 @@
+"""Endpoint latency benchmarks with stored baselines.
+
+Each case is timed with warm-up requests followed by repeated measured runs
+against a dataset of fixed shape (see ``DATASETS``, seeded with
+``api/scripts/seed.js``). Samples are stored as JSON baselines under
+``benchmarks/baselines/`` and later runs are compared against them with a
+one-sided Mann-Whitney U test: a case regresses only when the slowdown is
+both statistically significant and larger than the threshold. Without a
+baseline a run only reports its timings; once one is recorded on the CI
+runner (``--update-baseline``) and committed here, regressions fail CI, and
+``--require-baseline`` also fails a run that has none. Throughput checks that
+are too noisy for a shared runner (``--cluster-scaling``) run with
+``--report-only`` in CI, which prints a missed threshold without failing.
+
+Run from ``api/testcases``:
+    python -m benchmarks --dataset ci --seed-data --update-baseline
+    python -m benchmarks --dataset ci --require-baseline
+    python -m benchmarks --tenant-scope
+    python -m benchmarks --analytics-rollups
+    python -m benchmarks --catalog-cache
+    python -m benchmarks --expiry-buckets
+    python -m benchmarks --login-burst --logins 16
+    python -m benchmarks --cluster-scaling --workers 1,2,4
+    python -m benchmarks --logging-overhead --duration 5
+    python -m benchmarks --list-payload
+    python -m benchmarks --startup --repeats 5
+"""
+
+from .cases import CASES, DATASETS, BenchmarkCase
+from .stats import Comparison, compare, mann_whitney_u
+
+__all__ = ["BenchmarkCase", "CASES", "Comparison", "DATASETS", "compare", "mann_whitney_u"]
@@ -0,0 +1,64 @@
+"""Latency of the dashboard figures as the payment history grows.
+
+The analytics endpoints read ``RevenueRollups`` and ``MembershipRollups``
+(``utils/rollups.js``): a row per plan and month, and a few rows per plan, so
+a dashboard should cost about the same whether a gym has a hundred payments
+or tens of thousands. One gym per history size is seeded with seed.js under
+its own prefix (seed.js rebuilds the rollups) and its admin times the
+dashboard calls.
+"""
+
+import time
+
+from .stats import median
+
+MEMBERS = 100
+# Payments per membership of the seeded gyms
+HISTORY_SIZES = (1, 10, 100)
+PASSWORD = "Seed@1234"
+
+CALLS = {
+    "revenue": lambda c: c.revenue_analytics(),
+    "active_members": lambda c: c.active_members_analytics(),
+}
+
+
+def history_prefix(payments):
+    return f"bench_history_{payments}"
+
+
+def history_admin(client, payments, seed):
+    """A client logged in as the admin of the gym with ``payments`` payments per membership."""
+    admin = client.clone()
+    username = f"{history_prefix(payments)}_g0_admin0"
+    if admin.login(username, PASSWORD).status_code != 200:
+        seed(
+            history_prefix(payments),
+            {"gyms": 1, "members-per-gym": MEMBERS, "payments-per-membership": payments},
+        )
+        admin.login(username, PASSWORD).raise_for_status()
+    return admin
+
+
+def measure_analytics_rollups(client, seed, sizes=HISTORY_SIZES, calls=CALLS, warmup=3, repeats=20):
+    """Median latency (ms) per call and history size, plus largest/smallest ratios.
+
+    Returns ``{"medians": {call: {payments: ms}}, "ratios": {call: ratio}}``.
+    """
+    medians = {name: {} for name in calls}
+    for payments in sizes:
+        admin = history_admin(client, payments, seed)
+        for name, call in calls.items():
+            samples = []
+            for i in range(warmup + repeats):
+                started = time.perf_counter()
+                response = call(admin)
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                if response.status_code != 200:
+                    raise RuntimeError(f"analytics {name}: HTTP {response.status_code} {response.text[:200]}")
+                if i >= warmup:
+                    samples.append(elapsed_ms)
+            medians[name][payments] = median(samples)
+    smallest, largest = min(sizes), max(sizes)
+    ratios = {name: by_size[largest] / by_size[smallest] for name, by_size in medians.items()}
+    return {"medians": medians, "ratios": ratios}
@@ -0,0 +1,39 @@
+"""Per-request cost of resolving ``req.user`` with and without the cache.
+
+The auth middleware caches the user context per user id and token, so the
+first request with a new token pays for the user/gym lookups and later ones
+do not. Tokens only differ once their ``iat`` second changes, so each login
+waits for the next second.
+"""
+
+import time
+
+from .stats import median
+
+
+def _fresh_token(client, username, password, previous):
+    while True:
+        response = client.login(username, password)
+        response.raise_for_status()
+        token = response.json()["token"]
+        if token != previous:
+            return token
+        time.sleep(1.05 - time.time() % 1)
+
+
+def measure_auth_cache(client, username, password, call, tokens=10, warm_calls=5):
+    """Median latency (ms) of the first call per token versus the calls after it."""
+    cold, warm = [], []
+    token = None
+    for _ in range(tokens):
+        token = _fresh_token(client, username, password, token)
+        user = client.clone(token)
+        for i in range(1 + warm_calls):
+            started = time.perf_counter()
+            response = call(user)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            if response.status_code != 200:
+                raise RuntimeError(f"auth cache benchmark: HTTP {response.status_code} {response.text[:200]}")
+            (warm if i else cold).append(elapsed_ms)
+    cold_ms, warm_ms = median(cold), median(warm)
+    return {"cold_median_ms": cold_ms, "warm_median_ms": warm_ms, "savings_ms": cold_ms - warm_ms}
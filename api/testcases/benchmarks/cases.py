@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from gymclient import GymClient, datatables_params
+
+# Dataset shapes passed to ``api/scripts/seed.js``. Baselines are only
+# comparable between runs on the same dataset.
+DATASETS: Dict[str, Dict[str, int]] = {
+    "ci": {"gyms": 20, "members-per-gym": 50, "plans-per-gym": 3, "payments-per-membership": 1},
+    "medium": {"gyms": 500, "members-per-gym": 100, "plans-per-gym": 4, "payments-per-membership": 2},
+    "large": {"gyms": 2000, "members-per-gym": 150, "plans-per-gym": 5, "payments-per-membership": 2},
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    call: Callable[[GymClient], Any]
+
+
+CASES = [
+    # /api/gym: page/limit/sortBy/order/search
+    BenchmarkCase("gym.first_page", lambda c: c.list_gyms()),
+    BenchmarkCase("gym.search", lambda c: c.list_gyms(search="priya")),
+    BenchmarkCase("gym.sort_desc", lambda c: c.list_gyms(sortBy="city", order="desc")),
+    BenchmarkCase("gym.deep_page", lambda c: c.list_gyms(page=50, limit=10)),
+    # /api/users: page/limit/sortBy/order/search
+    BenchmarkCase("users.first_page", lambda c: c.list_users()),
+    BenchmarkCase("users.search", lambda c: c.list_users(search="bench")),
+    BenchmarkCase("users.sort_desc", lambda c: c.list_users(sortBy="username", order="desc")),
+    BenchmarkCase("users.deep_page", lambda c: c.list_users(page=500, limit=10)),
+    # /api/membersMemberships: DataTables draw/start/length/search/order
+    BenchmarkCase("memberships.first_page", lambda c: c.list_members_memberships(**datatables_params())),
+    BenchmarkCase("memberships.search", lambda c: c.list_members_memberships(**datatables_params(search="bench"))),
+    BenchmarkCase(
+        "memberships.sort_desc", lambda c: c.list_members_memberships(**datatables_params(order=[(3, "desc")]))
+    ),
+    BenchmarkCase("memberships.deep_page", lambda c: c.list_members_memberships(**datatables_params(start=10000))),
+    BenchmarkCase("memberships.cursor_page", lambda c: c.list_members_memberships(**datatables_params(), cursor="")),
+    # /api/payments: page/size/sort
+    BenchmarkCase("payments.first_page", lambda c: c.list_payments()),
+    BenchmarkCase("payments.sort_desc", lambda c: c.list_payments(sort="total_amount,desc")),
+    BenchmarkCase("payments.deep_page", lambda c: c.list_payments(page=1000, size=10)),
+]
@@ -0,0 +1,44 @@
+"""Latency of the catalog routes with and without the response cache.
+
+``utils/responseCache.js`` keys entries by URL, so each miss is forced with a
+query parameter the route ignores (``?_=<n>``): the controller and its
+queries run as before the cache existed. A hit repeats the same URL and a
+revalidation sends the ETag back to get a bodyless 304.
+"""
+
+import time
+
+from .stats import median
+
+
+def _timed(call):
+    started = time.perf_counter()
+    response = call()
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return response, elapsed_ms
+
+
+def _check(response, path, expected):
+    if response.status_code != expected:
+        raise RuntimeError(f"catalog cache {path}: HTTP {response.status_code} {response.text[:200]}")
+
+
+def measure_catalog_cache(client, path, warmup=5, repeats=30):
+    """Median latency (ms) of a miss, a hit and a 304 revalidation of ``path``."""
+    samples = {"miss": [], "hit": [], "not_modified": []}
+    for i in range(warmup + repeats):
+        miss, miss_ms = _timed(lambda: client.get(path, params={"_": time.time_ns()}))
+        _check(miss, path, 200)
+        client.get(path)  # stores the entry, unless a write invalidated it meanwhile
+        hit, hit_ms = _timed(lambda: client.get(path))
+        _check(hit, path, 200)
+        etag = hit.headers["ETag"]
+        revalidated, not_modified_ms = _timed(lambda: client.get(path, headers={"If-None-Match": etag}))
+        _check(revalidated, path, 304)
+        if i >= warmup:
+            samples["miss"].append(miss_ms)
+            samples["hit"].append(hit_ms)
+            samples["not_modified"].append(not_modified_ms)
+    result = {f"{name}_median_ms": median(values) for name, values in samples.items()}
+    result["speedup"] = result["miss_median_ms"] / result["hit_median_ms"]
+    return result
@@ -0,0 +1,120 @@
+"""Throughput of the API as cluster workers are added.
+
+``server.js`` forks ``CLUSTER_WORKERS`` workers behind one port
+(``utils/cluster.js``). For each worker count the API is started on a port
+of its own, a fixed number of concurrent clients request the gym list for a
+set time, and throughput is compared to the one-worker run:
+``efficiency = rps(n) / (n * rps(1))``, 1.0 being perfectly linear.
+
+The load comes from a single asyncio process; on a small machine it competes
+with the workers for CPU, so keep the largest worker count below the number
+of cores.
+"""
+
+import asyncio
+import contextlib
+import os
+import signal
+import subprocess
+import time
+
+from gymclient import AsyncGymClient, GymClient
+from gymclient.async_client import new_session
+
+API_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+WORKER_COUNTS = (1, 2, 4)
+
+
+@contextlib.contextmanager
+def start_api(workers, port, startup_timeout=60.0, extra_env=None):
+    """Run ``node server.js`` with ``workers`` cluster workers; yields its base URL.
+
+    ``extra_env`` adds or overrides environment variables of the server.
+    """
+    env = dict(os.environ, CLUSTER_WORKERS=str(workers), PORT=str(port), CLUSTER_HEALTH_INTERVAL_MS="500")
+    env.update(extra_env or {})
+    process = subprocess.Popen(
+        ["node", "server.js"], cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://localhost:{port}/api"
+    try:
+        wait_for_workers(base_url, workers, process, startup_timeout)
+        yield base_url
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def wait_for_workers(base_url, workers, process, timeout):
+    """Block until every worker has reported to the primary's health table."""
+    deadline = time.monotonic() + timeout
+    with GymClient(base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"server.js exited with code {process.returncode}")
+            try:
+                response = client.internal_health(os.environ.get("METRICS_TOKEN"))
+                if response.status_code == 200 and len(response.json()["cluster"] or []) >= workers:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.25)
+    raise RuntimeError(f"{workers} workers did not come up within {timeout:.0f}s")
+
+
+async def _throughput(base_url, token, call, concurrency, duration):
+    """Successful requests per second of ``concurrency`` clients looping for ``duration`` seconds."""
+    ok = errors = 0
+    async with new_session(pool_size=concurrency) as session:
+        client = AsyncGymClient(base_url, token=token, session=session)
+        deadline = time.monotonic() + duration
+
+        async def loop():
+            nonlocal ok, errors
+            while time.monotonic() < deadline:
+                response = await call(client)
+                if response.status_code == 200:
+                    ok += 1
+                else:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+    return ok / elapsed, errors
+
+
+def efficiency(rps):
+    """``rps(n) / (n * rps(smallest n))`` for every worker count, scaled to the smallest."""
+    smallest = min(rps)
+    per_worker = rps[smallest] / smallest
+    return {workers: value / (workers * per_worker) for workers, value in rps.items()}
+
+
+def measure_cluster_scaling(
+    start,
+    login,
+    call,
+    worker_counts=WORKER_COUNTS,
+    concurrency=64,
+    duration=10.0,
+    warmup=2.0,
+    throughput=_throughput,
+):
+    """Throughput per worker count.
+
+    ``start(workers)`` is a context manager yielding the base URL of a running
+    API and ``login(base_url)`` returns a token for it. Returns
+    ``{"rps": {n: rps}, "errors": {n: count}, "efficiency": {n: ratio}}``.
+    """
+    rps, errors = {}, {}
+    for workers in worker_counts:
+        with start(workers) as base_url:
+            token = login(base_url)
+            asyncio.run(throughput(base_url, token, call, concurrency, warmup))
+            rps[workers], errors[workers] = asyncio.run(throughput(base_url, token, call, concurrency, duration))
+    return {"rps": rps, "errors": errors, "efficiency": efficiency(rps)}
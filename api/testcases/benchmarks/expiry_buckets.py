@@ -0,0 +1,74 @@
+"""Latency of "expiring soon" as the gym grows.
+
+``GET /api/membersMemberships/expiring`` walks the per-gym day buckets kept by
+``utils/expiryBuckets.js``, so its cost follows the number of memberships
+expiring in the window, not the size of the gym. The gyms of the tenant-scope
+benchmark are reused (seeded with seed.js when missing) and given
+memberships ending within the window; their admin then times the buckets
+against the database-backed export of the same window.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from gymclient import datatables_params
+
+from .stats import median
+from .tenant_scope import SIZES, gym_admin
+
+WINDOW_DAYS = 30
+BATCH_SIZE = 500
+
+CALLS = {
+    "buckets": lambda c: c.expiring_memberships(WINDOW_DAYS),
+    "export": lambda c: c.get("/membersMemberships/export", params={"from": _day(0), "to": _day(WINDOW_DAYS - 1)}),
+}
+
+
+def _day(offset):
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def seed_expiring(admin, members):
+    """Give every member of the admin's gym a membership ending in the window, once."""
+    if len(admin.expiring_memberships(WINDOW_DAYS).json()["data"]) >= members // 2:
+        return
+    rows = admin.list_members_memberships(**datatables_params(length=members)).json()["data"]
+    plans = {row["gym_member_id"]: row["membership_plan_id"] for row in rows}
+    items = [
+        {
+            "gym_member_id": member_id,
+            "membership_plan_id": plan_id,
+            "start_date": _day(0),
+            "end_date": _day(1 + i % (WINDOW_DAYS - 1)),
+        }
+        for i, (member_id, plan_id) in enumerate(sorted(plans.items()))
+    ]
+    for i in range(0, len(items), BATCH_SIZE):
+        # Members whose seeded membership runs into the window are rejected; fine
+        admin.create_members_memberships_batch(items[i : i + BATCH_SIZE])
+
+
+def measure_expiry_buckets(client, seed, sizes=SIZES, calls=CALLS, warmup=3, repeats=20):
+    """Median latency (ms) per call and gym size, plus largest/smallest ratios.
+
+    Returns ``{"medians": {call: {size: ms}}, "ratios": {call: ratio}}``.
+    """
+    medians = {name: {} for name in calls}
+    for members in sizes:
+        admin = gym_admin(client, members, seed)
+        seed_expiring(admin, members)
+        for name, call in calls.items():
+            samples = []
+            for i in range(warmup + repeats):
+                started = time.perf_counter()
+                response = call(admin)
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                if response.status_code != 200:
+                    raise RuntimeError(f"expiry buckets {name}: HTTP {response.status_code} {response.text[:200]}")
+                if i >= warmup:
+                    samples.append(elapsed_ms)
+            medians[name][members] = median(samples)
+    smallest, largest = min(sizes), max(sizes)
+    ratios = {name: by_size[largest] / by_size[smallest] for name, by_size in medians.items()}
+    return {"medians": medians, "ratios": ratios}
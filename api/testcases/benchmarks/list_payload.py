@@ -0,0 +1,77 @@
+"""Bytes, server CPU and latency of one 100-row list page.
+
+``GET /api/payments`` used to build a Sequelize instance per row and include
+and send every column uncompressed. ``fields=`` now narrows the columns
+(``utils/projection.js``), ``raw=true`` skips the instances and
+``middleware/compression.js`` encodes the body for clients that accept it.
+Each variant of the same page is requested ``repeats`` times; reported are
+its size on the wire, the median latency and the server CPU per request, read
+from ``process_cpu_seconds_total`` of ``/api/internal/prometheus`` (so run it
+against a single-process API nothing else is using).
+"""
+
+import time
+
+from query_budget.budget import Scraper
+
+from .stats import median
+
+PAGE_SIZE = 100
+FIELDS = "payment_date,total_amount,User.username,MembershipPlan.plan_name"
+
+# name -> (extra query parameters, Accept-Encoding)
+VARIANTS = {
+    "before": ({}, "identity"),
+    "fields": ({"fields": FIELDS}, "identity"),
+    "raw": ({"fields": FIELDS, "raw": "true"}, "identity"),
+    "gzip": ({"fields": FIELDS, "raw": "true"}, "gzip"),
+    "br": ({"fields": FIELDS, "raw": "true"}, "br"),
+}
+
+
+def cpu_reader(base_url, token=None):
+    """A callable returning the API's CPU seconds so far, summed over its processes."""
+    scraper = Scraper(base_url, token)
+
+    def read():
+        return sum(value for (name, _), value in scraper.snapshot().items() if name == "process_cpu_seconds_total")
+
+    return read
+
+
+def wire_bytes(response):
+    """Size of the body as sent, before requests decodes it."""
+    return int(response.headers.get("Content-Length", len(response.content)))
+
+
+def measure_list_payload(client, cpu_seconds, variants=VARIANTS, warmup=5, repeats=30):
+    """Size, latency and server CPU per variant of a ``PAGE_SIZE``-row payments page.
+
+    Returns ``{"bytes": {name: n}, "median_ms": {name: ms}, "cpu_ms": {name:
+    ms per request}}``.
+    """
+    sizes, latencies, cpu = {}, {}, {}
+    for name, (params, encoding) in variants.items():
+
+        def call():
+            response = client.get(
+                "/payments",
+                params={"page": 1, "size": PAGE_SIZE, **params},
+                headers={"Accept-Encoding": encoding},
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"list payload {name}: HTTP {response.status_code} {response.text[:200]}")
+            return response
+
+        for _ in range(warmup):
+            call()
+        samples = []
+        cpu_before = cpu_seconds()
+        for _ in range(repeats):
+            started = time.perf_counter()
+            response = call()
+            samples.append((time.perf_counter() - started) * 1000.0)
+        cpu[name] = (cpu_seconds() - cpu_before) * 1000.0 / repeats
+        sizes[name] = wire_bytes(response)
+        latencies[name] = median(samples)
+    return {"bytes": sizes, "median_ms": latencies, "cpu_ms": cpu}
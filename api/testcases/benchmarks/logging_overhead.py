@@ -0,0 +1,44 @@
+"""Throughput cost of request logging.
+
+``utils/logger.js`` batches writes off the request path and samples the log
+lines of hot success paths (``LOG_SAMPLE_PER_SECOND``); ``LOG_PIPELINE=legacy``
+brings back the original winston console and file transports, which format
+and write every line as it is logged. The API is started once per
+configuration on a port of its own and the same concurrent load is run
+against each; the pipeline should serve more requests per second.
+"""
+
+import asyncio
+
+from .cluster_scaling import _throughput
+
+CONFIGS = {
+    "legacy": {"LOG_PIPELINE": "legacy", "LOG_LEVEL": "info"},
+    "pipeline": {"LOG_LEVEL": "info"},
+}
+
+
+def measure_logging_overhead(
+    start,
+    login,
+    call,
+    configs=CONFIGS,
+    concurrency=32,
+    duration=10.0,
+    warmup=2.0,
+    throughput=_throughput,
+):
+    """Throughput per logging configuration.
+
+    ``start(env)`` is a context manager yielding the base URL of an API
+    started with the extra environment ``env`` and ``login(base_url)``
+    returns a token for it. Returns ``{"rps": {name: rps}, "errors": {name:
+    count}, "speedup": rps(pipeline) / rps(legacy)}``.
+    """
+    rps, errors = {}, {}
+    for name, env in configs.items():
+        with start(env) as base_url:
+            token = login(base_url)
+            asyncio.run(throughput(base_url, token, call, concurrency, warmup))
+            rps[name], errors[name] = asyncio.run(throughput(base_url, token, call, concurrency, duration))
+    return {"rps": rps, "errors": errors, "speedup": rps["pipeline"] / rps["legacy"]}
@@ -0,0 +1,80 @@
+"""Read latency during a burst of logins.
+
+bcrypt runs on a pool of worker threads (``utils/passwordHasher.js``), so a
+wave of logins should leave the event loop free for everything else. The gym
+list is timed first on its own and then while ``logins`` threads log in back
+to back; the p95 of the reads should barely move.
+"""
+
+import threading
+import time
+
+from .stats import median
+
+
+def p95(values):
+    ordered = sorted(values)
+    return ordered[max(0, round(0.95 * len(ordered)) - 1)]
+
+
+def _summary(samples):
+    return {"median_ms": median(samples), "p95_ms": p95(samples)}
+
+
+def _time_reads(client, call, warmup, repeats):
+    samples = []
+    for i in range(warmup + repeats):
+        started = time.perf_counter()
+        response = call(client)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if response.status_code != 200:
+            raise RuntimeError(f"login burst read: HTTP {response.status_code} {response.text[:200]}")
+        if i >= warmup:
+            samples.append(elapsed_ms)
+    return samples
+
+
+def measure_login_burst(client, username, password, call, logins=8, warmup=5, repeats=50):
+    """Read latency (ms) alone and under ``logins`` concurrent login loops.
+
+    Returns ``{"idle": {...}, "burst": {...}, "logins": n, "ratio": p95 ratio}``
+    where each phase has ``median_ms`` and ``p95_ms``.
+    """
+    idle = _time_reads(client, call, warmup, repeats)
+
+    stop = threading.Event()
+    completed = []
+    errors = []
+
+    def login_loop():
+        user = client.clone()
+        count = 0
+        # Every loop logs in at least once, however short the read phase
+        while True:
+            response = user.login(username, password)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                break
+            count += 1
+            if stop.is_set():
+                break
+        completed.append(count)
+
+    threads = [threading.Thread(target=login_loop, daemon=True) for _ in range(logins)]
+    for thread in threads:
+        thread.start()
+    try:
+        burst = _time_reads(client, call, warmup, repeats)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise RuntimeError(f"login burst: login failed with HTTP {errors[0]}")
+
+    return {
+        "idle": _summary(idle),
+        "burst": _summary(burst),
+        "logins": sum(completed),
+        "ratio": p95(burst) / p95(idle),
+    }
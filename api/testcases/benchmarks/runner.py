@@ -0,0 +1,440 @@
+import argparse
+import json
+import os
+import subprocess
+import time
+
+from fixtures import admin_client, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, GymClient
+
+from .analytics_rollups import measure_analytics_rollups
+from .auth_cache import measure_auth_cache
+from .catalog_cache import measure_catalog_cache
+from .cases import CASES, DATASETS
+from .cluster_scaling import WORKER_COUNTS, measure_cluster_scaling, start_api
+from .expiry_buckets import measure_expiry_buckets
+from .list_payload import cpu_reader, measure_list_payload
+from .logging_overhead import measure_logging_overhead
+from .login_burst import measure_login_burst
+from .startup import measure_startup
+from .stats import compare, median
+from .tenant_scope import measure_tenant_scope
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+SEED_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "seed.js")
+
+
+def time_case(client, case, warmup=5, repeats=30):
+    """Latency samples in milliseconds for ``repeats`` measured calls."""
+    samples = []
+    for i in range(warmup + repeats):
+        started = time.perf_counter()
+        response = case.call(client)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if response.status_code != 200:
+            raise RuntimeError(f"{case.name}: HTTP {response.status_code} {response.text[:200]}")
+        if i >= warmup:
+            samples.append(elapsed_ms)
+    return samples
+
+
+def run_cases(client, cases, warmup=5, repeats=30):
+    return {case.name: time_case(client, case, warmup, repeats) for case in cases}
+
+
+def baseline_path(dataset, baseline_dir=BASELINE_DIR):
+    return os.path.join(baseline_dir, f"{dataset}.json")
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, dataset, results, warmup, repeats):
+    baseline = {
+        "dataset": dataset,
+        "shape": DATASETS[dataset],
+        "warmup": warmup,
+        "repeats": repeats,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "cases": {
+            name: {"median_ms": round(median(samples), 3), "samples_ms": [round(s, 3) for s in samples]}
+            for name, samples in sorted(results.items())
+        },
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(baseline, results, threshold=0.10, alpha=0.01):
+    """Comparisons for every case present in both, plus the names without a baseline."""
+    comparisons, missing = [], []
+    for name, samples in results.items():
+        recorded = baseline["cases"].get(name)
+        if recorded is None:
+            missing.append(name)
+            continue
+        comparisons.append(compare(name, recorded["samples_ms"], samples, threshold, alpha))
+    return comparisons, missing
+
+
+def run_seed(prefix, options):
+    """Load seed.js data with ``options`` into the database configured for the API."""
+    command = ["node", os.path.normpath(SEED_SCRIPT), "--prefix", prefix]
+    for option, value in options.items():
+        command += [f"--{option}", str(value)]
+    subprocess.run(command, cwd=os.path.dirname(os.path.dirname(os.path.normpath(SEED_SCRIPT))), check=True)
+
+
+def seed_dataset(dataset):
+    run_seed(f"bench_{dataset}", DATASETS[dataset])
+
+
+def check_baseline(path, dataset, results, threshold=0.10, alpha=0.01, require=False):
+    """Exit status of comparing ``results`` to the baseline at ``path``.
+
+    A missing baseline, or a case without one, only fails the run when
+    ``require`` is set; otherwise it is reported and there is nothing to
+    compare against yet.
+    """
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"No baseline at {path}; run with --update-baseline to record one")
+        return 1 if require else 0
+    if baseline.get("shape") != DATASETS[dataset]:
+        print(f"Baseline {path} was recorded on a different dataset shape; re-record it")
+        return 1
+
+    comparisons, missing = compare_to_baseline(baseline, results, threshold, alpha)
+    print(format_comparisons(comparisons))
+    for name in missing:
+        print(f"{name}: no baseline")
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {threshold:.0%} (p < {alpha})")
+        return 1
+    return 1 if require and missing else 0
+
+
+def format_comparisons(comparisons):
+    lines = [f"{'case':<26} {'baseline':>10} {'current':>10} {'ratio':>7} {'p':>8}"]
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(
+            f"{c.name:<26} {c.baseline_median_ms:>8.1f}ms {c.current_median_ms:>8.1f}ms "
+            f"{c.ratio:>6.2f}x {c.p_value:>8.4f}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def format_startup(result):
+    lines = [f"{'startup':<9} {'first 200':>11} {'first docs':>11}"]
+    for name, ready in result["first_200_ms"].items():
+        lines.append(f"{name:<9} {ready:>9.0f}ms {result['first_docs_ms'][name]:>9.0f}ms")
+    if result["speedup"] is not None:
+        lines.append(f"migrations answer {result['speedup']:.2f}x sooner than sync()")
+    return "\n".join(lines)
+
+
+def format_tenant_scope(result):
+    sizes = sorted(next(iter(result["medians"].values())))
+    lines = [f"{'list':<14}" + "".join(f"{f'{size} members':>14}" for size in sizes) + f"{'ratio':>8}"]
+    for name, by_size in result["medians"].items():
+        cells = "".join(f"{by_size[size]:>12.1f}ms" for size in sizes)
+        lines.append(f"{name:<14}{cells}{result['ratios'][name]:>7.2f}x")
+    return "\n".join(lines)
+
+
+def format_analytics_rollups(result):
+    sizes = sorted(next(iter(result["medians"].values())))
+    lines = [f"{'call':<16}" + "".join(f"{f'{size}/membership':>16}" for size in sizes) + f"{'ratio':>8}"]
+    for name, by_size in result["medians"].items():
+        cells = "".join(f"{by_size[size]:>14.1f}ms" for size in sizes)
+        lines.append(f"{name:<16}{cells}{result['ratios'][name]:>7.2f}x")
+    return "\n".join(lines)
+
+
+def format_cluster_scaling(result):
+    lines = [f"{'workers':>7} {'rps':>10} {'errors':>7} {'efficiency':>11}"]
+    for workers, rps in sorted(result["rps"].items()):
+        lines.append(
+            f"{workers:>7} {rps:>10.1f} {result['errors'][workers]:>7} {result['efficiency'][workers]:>10.0%}"
+        )
+    return "\n".join(lines)
+
+
+def format_catalog_cache(results):
+    lines = [f"{'path':<40} {'miss':>9} {'hit':>9} {'304':>9} {'speedup':>8}"]
+    for path, r in results.items():
+        lines.append(
+            f"{path:<40} {r['miss_median_ms']:>7.1f}ms {r['hit_median_ms']:>7.1f}ms "
+            f"{r['not_modified_median_ms']:>7.1f}ms {r['speedup']:>7.2f}x"
+        )
+    return "\n".join(lines)
+
+
+def format_list_payload(result):
+    lines = [f"{'variant':<8} {'bytes':>9} {'median':>9} {'cpu/req':>9}"]
+    for name, size in result["bytes"].items():
+        lines.append(f"{name:<8} {size:>9} {result['median_ms'][name]:>7.1f}ms {result['cpu_ms'][name]:>7.2f}ms")
+    return "\n".join(lines)
+
+
+def format_logging_overhead(result):
+    lines = [f"{'logging':<9} {'rps':>10} {'errors':>7}"]
+    for name, rps in result["rps"].items():
+        lines.append(f"{name:<9} {rps:>10.1f} {result['errors'][name]:>7}")
+    lines.append(f"pipeline serves {result['speedup']:.2f}x the requests of legacy logging")
+    return "\n".join(lines)
+
+
+def format_login_burst(result):
+    idle, burst = result["idle"], result["burst"]
+    return (
+        f"gym list: idle median {idle['median_ms']:.1f}ms p95 {idle['p95_ms']:.1f}ms; "
+        f"with {result['logins']} logins median {burst['median_ms']:.1f}ms p95 {burst['p95_ms']:.1f}ms "
+        f"({result['ratio']:.2f}x)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark list endpoints against stored baselines")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--dataset", choices=sorted(DATASETS), default="ci")
+    parser.add_argument("--case", action="append", default=[], help="only run cases whose name contains this")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--threshold", type=float, default=0.10, help="minimum slowdown of the median (0.10 = 10%%)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="significance level of the Mann-Whitney U test")
+    parser.add_argument("--baseline-dir", default=BASELINE_DIR)
+    parser.add_argument("--seed-data", action="store_true", help="seed the dataset with scripts/seed.js first")
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument(
+        "--require-baseline", action="store_true", help="fail when the dataset or a case has no recorded baseline"
+    )
+    parser.add_argument(
+        "--analytics-rollups",
+        action="store_true",
+        help="only report dashboard analytics latency across payment history sizes",
+    )
+    parser.add_argument(
+        "--analytics-max-ratio", type=float, default=2.0, help="largest/smallest history latency that fails the run"
+    )
+    parser.add_argument("--auth-cache", action="store_true", help="only report cold vs cached auth latency")
+    parser.add_argument(
+        "--catalog-cache", action="store_true", help="only report catalog latency on cache misses, hits and 304s"
+    )
+    parser.add_argument(
+        "--catalog-min-speedup", type=float, default=1.0, help="miss/hit latency ratio below which the run fails"
+    )
+    parser.add_argument(
+        "--cluster-scaling", action="store_true", help="only report throughput as cluster workers are added"
+    )
+    parser.add_argument(
+        "--workers",
+        default=",".join(map(str, WORKER_COUNTS)),
+        help="comma-separated worker counts of --cluster-scaling",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="concurrent clients of --cluster-scaling and --logging-overhead"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per server started")
+    parser.add_argument("--cluster-port", type=int, default=3100, help="port the benchmarked servers listen on")
+    parser.add_argument(
+        "--min-efficiency", type=float, default=0.75, help="rps(n) / (n * rps(1)) below which the run fails"
+    )
+    parser.add_argument(
+        "--expiry-buckets",
+        action="store_true",
+        help="only report expiring-memberships latency across gym sizes, buckets vs export",
+    )
+    parser.add_argument(
+        "--expiry-max-ratio", type=float, default=2.0, help="largest/smallest gym bucket latency that fails the run"
+    )
+    parser.add_argument(
+        "--list-payload",
+        action="store_true",
+        help="only report size, latency and server CPU of a 100-row page with and without fields/raw/compression",
+    )
+    parser.add_argument(
+        "--payload-max-ratio", type=float, default=0.5, help="br/before page size ratio above which the run fails"
+    )
+    parser.add_argument("--metrics-token", help="METRICS_TOKEN of the API, when it is not on this machine")
+    parser.add_argument(
+        "--logging-overhead",
+        action="store_true",
+        help="only report throughput with legacy logging vs the buffered, sampled pipeline",
+    )
+    parser.add_argument(
+        "--min-speedup", type=float, default=1.0, help="pipeline/legacy throughput ratio below which the run fails"
+    )
+    parser.add_argument(
+        "--login-burst", action="store_true", help="only report gym list latency with and without concurrent logins"
+    )
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login loops of --login-burst")
+    parser.add_argument(
+        "--login-max-ratio", type=float, default=2.0, help="p95 read latency ratio under logins that fails the run"
+    )
+    parser.add_argument(
+        "--startup", action="store_true", help="only report time to the first 200 of a freshly started server"
+    )
+    parser.add_argument(
+        "--startup-min-speedup", type=float, default=1.0, help="legacy/migrate time to first 200 that fails the run"
+    )
+    parser.add_argument(
+        "--tenant-scope", action="store_true", help="only report gym-admin list latency across gym sizes"
+    )
+    parser.add_argument(
+        "--tenant-max-ratio", type=float, default=2.0, help="largest/smallest gym latency ratio that fails the run"
+    )
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="print results and failed thresholds but exit 0 (for noisy shared runners)",
+    )
+    args = parser.parse_args(argv)
+    status = run(args)
+    if status and args.report_only:
+        print("Threshold not met; not failing the run (--report-only)")
+        return 0
+    return status
+
+
+def run(args):
+    """Run the benchmark ``args`` select; returns the exit status."""
+
+    if args.analytics_rollups:
+        with admin_client(args.base_url) as client:
+            result = measure_analytics_rollups(client, run_seed, warmup=args.warmup, repeats=args.repeats)
+        print(format_analytics_rollups(result))
+        return 0 if all(ratio <= args.analytics_max_ratio for ratio in result["ratios"].values()) else 1
+
+    if args.auth_cache:
+        fixtures = worker_fixtures(args.base_url)
+        with admin_client(args.base_url) as client:
+            result = measure_auth_cache(
+                client,
+                fixtures.admin_username,
+                fixtures.admin_password,
+                lambda user: user.get_gym(fixtures.gym_id),
+            )
+        print(
+            f"auth context: cold {result['cold_median_ms']:.1f}ms, cached {result['warm_median_ms']:.1f}ms, "
+            f"saves {result['savings_ms']:.1f}ms per request"
+        )
+        return 0
+
+    if args.catalog_cache:
+        fixtures = worker_fixtures(args.base_url)
+        paths = [
+            f"/gym/{fixtures.gym_id}",
+            f"/gymMembershipPlans/allByGym/{fixtures.gym_id}",
+            f"/membershipPlansPrices/{fixtures.price_id}",
+        ]
+        with admin_client(args.base_url) as client:
+            results = {
+                path: measure_catalog_cache(client, path, warmup=args.warmup, repeats=args.repeats) for path in paths
+            }
+        print(format_catalog_cache(results))
+        return 0 if all(r["speedup"] >= args.catalog_min_speedup for r in results.values()) else 1
+
+    if args.cluster_scaling:
+        fixtures = worker_fixtures(args.base_url)
+
+        def login(base_url):
+            with GymClient(base_url) as client:
+                response = client.login(fixtures.admin_username, fixtures.admin_password)
+                response.raise_for_status()
+                return response.json()["token"]
+
+        result = measure_cluster_scaling(
+            lambda workers: start_api(workers, args.cluster_port),
+            login,
+            lambda client: client.list_gyms(),
+            worker_counts=[int(n) for n in args.workers.split(",")],
+            concurrency=args.concurrency,
+            duration=args.duration,
+        )
+        print(format_cluster_scaling(result))
+        return 0 if min(result["efficiency"].values()) >= args.min_efficiency else 1
+
+    if args.logging_overhead:
+        fixtures = worker_fixtures(args.base_url)
+
+        def login(base_url):
+            with GymClient(base_url) as client:
+                response = client.login(fixtures.admin_username, fixtures.admin_password)
+                response.raise_for_status()
+                return response.json()["token"]
+
+        result = measure_logging_overhead(
+            lambda env: start_api(0, args.cluster_port, extra_env=env),
+            login,
+            lambda client: client.list_gyms(),
+            concurrency=args.concurrency,
+            duration=args.duration,
+        )
+        print(format_logging_overhead(result))
+        return 0 if result["speedup"] >= args.min_speedup else 1
+
+    if args.startup:
+        result = measure_startup(args.cluster_port, repeats=args.repeats)
+        print(format_startup(result))
+        return 0 if result["speedup"] >= args.startup_min_speedup else 1
+
+    if args.list_payload:
+        with admin_client(args.base_url) as client:
+            result = measure_list_payload(
+                client, cpu_reader(args.base_url, args.metrics_token), warmup=args.warmup, repeats=args.repeats
+            )
+        print(format_list_payload(result))
+        return 0 if result["bytes"]["br"] <= args.payload_max_ratio * result["bytes"]["before"] else 1
+
+    if args.expiry_buckets:
+        with admin_client(args.base_url) as client:
+            result = measure_expiry_buckets(client, run_seed, warmup=args.warmup, repeats=args.repeats)
+        print(format_tenant_scope(result))
+        return 0 if result["ratios"]["buckets"] <= args.expiry_max_ratio else 1
+
+    if args.login_burst:
+        fixtures = worker_fixtures(args.base_url)
+        with admin_client(args.base_url) as client:
+            result = measure_login_burst(
+                client,
+                fixtures.admin_username,
+                fixtures.admin_password,
+                lambda c: c.list_gyms(),
+                logins=args.logins,
+                warmup=args.warmup,
+                repeats=args.repeats,
+            )
+        print(format_login_burst(result))
+        return 0 if result["ratio"] <= args.login_max_ratio else 1
+
+    if args.tenant_scope:
+        with admin_client(args.base_url) as client:
+            result = measure_tenant_scope(client, run_seed, warmup=args.warmup, repeats=args.repeats)
+        print(format_tenant_scope(result))
+        flat = all(ratio <= args.tenant_max_ratio for ratio in result["ratios"].values())
+        return 0 if flat else 1
+
+    if args.seed_data:
+        seed_dataset(args.dataset)
+
+    cases = [c for c in CASES if not args.case or any(part in c.name for part in args.case)]
+    with admin_client(args.base_url) as client:
+        results = run_cases(client, cases, args.warmup, args.repeats)
+
+    path = baseline_path(args.dataset, args.baseline_dir)
+    if args.update_baseline:
+        save_baseline(path, args.dataset, results, args.warmup, args.repeats)
+        print(f"Recorded {len(results)} cases to {path}")
+        return 0
+
+    return check_baseline(path, args.dataset, results, args.threshold, args.alpha, args.require_baseline)
@@ -0,0 +1,101 @@
+"""Time from ``node server.js`` to its first successful response.
+
+The API used to run swagger-jsdoc over every controller and
+``sequelize.sync()`` over every model before listening. Now the OpenAPI
+document is prebuilt (``npm run build:openapi``) and read on the first
+``/api-docs`` request, and the schema is brought up to date from versioned
+migrations (``utils/migrations.js``, ``DB_SCHEMA``), a single query when
+nothing is pending. For each configuration the API is started on a port of
+its own ``repeats`` times and timed until ``GET /api/health`` answers 200,
+then the first ``GET /api-docs/openapi.json`` is timed.
+"""
+
+import os
+import subprocess
+import time
+
+import requests
+
+from .cluster_scaling import API_DIR
+from .stats import median
+
+CONFIGS = {
+    # The old startup: sync() and no prebuilt document
+    "legacy": {"DB_SCHEMA": "sync", "OPENAPI_SPEC": os.path.join(API_DIR, "build", "missing-openapi.json")},
+    "migrate": {"DB_SCHEMA": "migrate"},
+    "check": {"DB_SCHEMA": "check"},
+}
+
+
+def launch_api(port, env):
+    """Start a single-process ``node server.js`` on ``port`` with the extra environment ``env``."""
+    env = dict(os.environ, CLUSTER_WORKERS="0", PORT=str(port), **env)
+    return subprocess.Popen(
+        ["node", "server.js"], cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def probe_api(port, path):
+    """Status code of ``GET path``; raises OSError while nothing listens."""
+    return requests.get(f"http://localhost:{port}{path}", timeout=5).status_code
+
+
+def _stop(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _start_once(port, env, timeout, launch, probe, clock, sleep):
+    """(ms until the first 200 of /api/health, ms of the first /api-docs/openapi.json)."""
+    started = clock()
+    process = launch(port, env)
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server.js exited with code {process.returncode}")
+            if clock() - started > timeout:
+                raise RuntimeError(f"server.js did not answer within {timeout:.0f}s")
+            try:
+                if probe(port, "/api/health") == 200:
+                    break
+            except OSError:
+                pass
+            sleep(0.01)
+        first_200 = clock()
+        status = probe(port, "/api-docs/openapi.json")
+        if status != 200:
+            raise RuntimeError(f"/api-docs/openapi.json: HTTP {status}")
+        return (first_200 - started) * 1000.0, (clock() - first_200) * 1000.0
+    finally:
+        _stop(process)
+
+
+def measure_startup(
+    port,
+    configs=CONFIGS,
+    repeats=5,
+    timeout=60.0,
+    launch=launch_api,
+    probe=probe_api,
+    clock=time.perf_counter,
+    sleep=time.sleep,
+):
+    """Median startup times (ms) per configuration.
+
+    Returns ``{"first_200_ms": {name: ms}, "first_docs_ms": {name: ms},
+    "speedup": first_200(legacy) / first_200(migrate)}``, the speedup being
+    None unless both configurations were run.
+    """
+    first_200, first_docs = {}, {}
+    for name, env in configs.items():
+        samples = [_start_once(port, env, timeout, launch, probe, clock, sleep) for _ in range(repeats)]
+        first_200[name] = median([ready for ready, _ in samples])
+        first_docs[name] = median([docs for _, docs in samples])
+    speedup = None
+    if "legacy" in first_200 and "migrate" in first_200:
+        speedup = first_200["legacy"] / first_200["migrate"]
+    return {"first_200_ms": first_200, "first_docs_ms": first_docs, "speedup": speedup}
@@ -0,0 +1,73 @@
+import math
+from dataclasses import dataclass
+
+
+def median(values):
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("median of empty sample")
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _ranks(values):
+    """1-based ranks of ``values``, averaging ties. Also returns the tie sizes."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def mann_whitney_u(baseline, current):
+    """One-sided Mann-Whitney U test that ``current`` tends to be larger.
+
+    Returns ``(u, p_value)`` using the normal approximation with tie and
+    continuity corrections, which is accurate for the 20+ samples per side
+    the runner collects.
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        raise ValueError("both samples must be non-empty")
+    ranks, ties = _ranks(list(baseline) + list(current))
+    u = sum(ranks[n1:]) - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    tie_term = sum(t**3 - t for t in ties) / (n * (n - 1)) if n > 1 else 0.0
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_median_ms: float
+    current_median_ms: float
+    p_value: float
+    regressed: bool
+
+    @property
+    def ratio(self):
+        return self.current_median_ms / self.baseline_median_ms if self.baseline_median_ms else float("inf")
+
+
+def compare(name, baseline, current, threshold=0.10, alpha=0.01):
+    """Flag a regression when ``current`` is significantly slower than ``baseline``
+    (p < ``alpha``) *and* its median is more than ``threshold`` slower."""
+    base_median, current_median = median(baseline), median(current)
+    _, p_value = mann_whitney_u(baseline, current)
+    regressed = p_value < alpha and current_median > base_median * (1 + threshold)
+    return Comparison(name, base_median, current_median, p_value, regressed)
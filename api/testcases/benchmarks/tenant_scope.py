@@ -0,0 +1,65 @@
+"""Latency of gym-admin list views as the gym grows.
+
+A gym admin's listings are scoped to their gym's members with a subquery
+(``utils/tenantScope.js``), so a page should cost about the same whether the
+gym has ten members or thousands. One gym per size is seeded with seed.js
+under its own prefix and its admin times the first page of each scoped list.
+"""
+
+import time
+
+from gymclient import datatables_params
+
+from .stats import median
+
+SIZES = (10, 100, 1000)
+PASSWORD = "Seed@1234"
+
+# Scoped list calls, timed as the gym admin
+CALLS = {
+    "memberships": lambda c: c.list_members_memberships(**datatables_params()),
+    "payments": lambda c: c.list_payments(),
+    "users": lambda c: c.list_users(),
+}
+
+
+def tenant_prefix(members):
+    return f"bench_tenant_{members}"
+
+
+def admin_username(members):
+    # seed.js names the admin of gym 0 "<prefix>_g0_admin0"
+    return f"{tenant_prefix(members)}_g0_admin0"
+
+
+def gym_admin(client, members, seed):
+    """A client logged in as the admin of the ``members``-sized gym, seeding it if needed."""
+    admin = client.clone()
+    if admin.login(admin_username(members), PASSWORD).status_code != 200:
+        seed(tenant_prefix(members), {"gyms": 1, "members-per-gym": members, "payments-per-membership": 1})
+        admin.login(admin_username(members), PASSWORD).raise_for_status()
+    return admin
+
+
+def measure_tenant_scope(client, seed, sizes=SIZES, calls=CALLS, warmup=3, repeats=20):
+    """Median latency (ms) per call and gym size, plus largest/smallest ratios.
+
+    Returns ``{"medians": {call: {size: ms}}, "ratios": {call: ratio}}``.
+    """
+    medians = {name: {} for name in calls}
+    for members in sizes:
+        admin = gym_admin(client, members, seed)
+        for name, call in calls.items():
+            samples = []
+            for i in range(warmup + repeats):
+                started = time.perf_counter()
+                response = call(admin)
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                if response.status_code != 200:
+                    raise RuntimeError(f"tenant scope {name}: HTTP {response.status_code} {response.text[:200]}")
+                if i >= warmup:
+                    samples.append(elapsed_ms)
+            medians[name][members] = median(samples)
+    smallest, largest = min(sizes), max(sizes)
+    ratios = {name: by_size[largest] / by_size[smallest] for name, by_size in medians.items()}
+    return {"medians": medians, "ratios": ratios}
@@ -0,0 +1,129 @@
+import unittest
+
+from fixtures import admin_client, plan_data, private_gym, remove_private_gym, unique_name, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, GymClient
+
+
+class TestCatalogCacheEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+        cls.gym_admin = cls.login(cls.fixtures.gym_admin_username, cls.fixtures.gym_admin_password)
+        cls.member = cls.login(cls.fixtures.member_username, cls.fixtures.member_password)
+
+        # A second tenant whose catalog the fixture gym's users must not see
+        cls.other_gym = private_gym(cls.client, price=500)
+        cls.other_gym_id = cls.other_gym.gym_id
+        cls.other_price_id = cls.other_gym.price_ids[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_private_gym(cls.client, cls.other_gym)
+        for client in (cls.client, cls.gym_admin, cls.member):
+            client.close()
+
+    @classmethod
+    def login(cls, username, password):
+        client = GymClient(cls.BASE_URL)
+        response = client.login(username, password)
+        assert response.status_code == 200, response.text
+        return client
+
+    def test_01_etag_and_not_modified(self):
+        first = self.client.get_gym(self.fixtures.gym_id)
+        self.assertEqual(first.status_code, 200, first.text)
+        etag = first.headers["ETag"]
+
+        again = self.client.get_gym(self.fixtures.gym_id)
+        self.assertEqual(again.headers["X-Cache"], "HIT")
+        self.assertEqual(again.headers["ETag"], etag)
+        self.assertEqual(again.json(), first.json())
+
+        response = self.client.get_gym(self.fixtures.gym_id, etag=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get_gym(self.fixtures.gym_id, etag='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_02_roles_and_tenants_do_not_share_entries(self):
+        # Cached for the admin first; the other gym's users must still be refused
+        self.assertEqual(self.client.get_gym(self.other_gym_id).status_code, 200)
+        self.assertEqual(self.client.get_gym(self.other_gym_id).headers["X-Cache"], "HIT")
+        self.assertEqual(self.gym_admin.get_gym(self.other_gym_id).status_code, 401)
+        self.assertEqual(self.member.get_gym(self.other_gym_id).status_code, 401)
+
+        self.assertEqual(self.client.get_plan_price(self.other_price_id).status_code, 200)
+        self.assertEqual(self.gym_admin.get_plan_price(self.other_price_id).status_code, 401)
+
+        self.assertEqual(self.client.list_membership_plans_by_gym(self.other_gym_id).status_code, 200)
+        self.assertEqual(self.member.list_membership_plans_by_gym(self.other_gym_id).status_code, 401)
+
+        # Users of the fixture gym see the same gym the admin does
+        as_admin = self.client.get_gym(self.fixtures.gym_id).json()
+        self.assertEqual(self.gym_admin.get_gym(self.fixtures.gym_id).json(), as_admin)
+        self.assertEqual(self.member.get_gym(self.fixtures.gym_id).json(), as_admin)
+
+    def test_03_gym_update_invalidates(self):
+        before = self.gym_admin.get_gym(self.fixtures.gym_id)
+        self.assertEqual(before.status_code, 200, before.text)
+        contact = unique_name("Contact")
+        response = self.client.update_gym(self.fixtures.gym_id, contact_person=contact)
+        self.assertEqual(response.status_code, 200, response.text)
+
+        after = self.gym_admin.get_gym(self.fixtures.gym_id, etag=before.headers["ETag"])
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.json()["contact_person"], contact)
+        self.assertNotEqual(after.headers["ETag"], before.headers["ETag"])
+
+    def test_04_plan_and_price_writes_invalidate(self):
+        plans = self.member.list_membership_plans_by_gym(self.fixtures.gym_id)
+        self.assertEqual(plans.status_code, 200, plans.text)
+        plan = plan_data(self.fixtures.gym_id, "Cache Plan", duration_type="days", duration_value=10)
+        response = self.client.create_membership_plan(plan)
+        self.assertEqual(response.status_code, 201, response.text)
+        plan_id = response.json()["id"]
+        try:
+            fresh = self.member.list_membership_plans_by_gym(self.fixtures.gym_id, etag=plans.headers["ETag"])
+            self.assertEqual(fresh.status_code, 200)
+            self.assertIn(plan_id, [p["id"] for p in fresh.json()])
+        finally:
+            self.client.delete_membership_plan(plan_id)
+
+        price = self.gym_admin.get_plan_price(self.fixtures.price_id)
+        self.assertEqual(price.status_code, 200, price.text)
+        comments = unique_name("Comment")
+        response = self.client.update_plan_price(self.fixtures.price_id, comments=comments)
+        self.assertEqual(response.status_code, 200, response.text)
+        fresh = self.gym_admin.get_plan_price(self.fixtures.price_id, etag=price.headers["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()["comments"], comments)
+
+    def test_05_compressed_etag_not_modified(self):
+        # A plan list past COMPRESSION_MIN_BYTES, so it is sent gzipped
+        plan = plan_data(self.other_gym_id, "Long Plan", plan_description="x" * 4096)
+        response = self.client.create_membership_plan(plan)
+        self.assertEqual(response.status_code, 201, response.text)
+        plan_id = response.json()["id"]
+        try:
+            path = f"/gymMembershipPlans/allByGym/{self.other_gym_id}"
+            first = self.client.get(path, headers={"Accept-Encoding": "gzip"})
+            self.assertEqual(first.status_code, 200, first.text)
+            self.assertEqual(first.headers["Content-Encoding"], "gzip")
+            etag = first.headers["ETag"]
+            self.assertTrue(etag.endswith('-gzip"'), etag)
+
+            # Answered from the cache now, by its uncompressed ETag
+            again = self.client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+            self.assertEqual(again.headers["X-Cache"], "HIT")
+            self.assertEqual(again.status_code, 304)
+            self.assertEqual(again.content, b"")
+        finally:
+            self.client.delete_membership_plan(plan_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
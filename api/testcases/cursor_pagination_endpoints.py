@@ -0,0 +1,110 @@
+import datetime
+import statistics
+import unittest
+
+from fixtures import PASSWORD, admin_client, user_data, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, datatables_params
+
+
+class TestCursorPagination(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+    MEMBERSHIPS = 23
+    PAGE = 5
+
+    @classmethod
+    def setUpClass(cls):
+        fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+
+        # A fresh member per run: a member only sees their own memberships,
+        # which gives a listing of known size regardless of other workers
+        member = user_data("cursormember", gymId=fixtures.gym_id)
+        response = cls.client.signup_gym_member(member)
+        if response.status_code != 200:
+            raise Exception("Failed to create gym member for cursor tests")
+        member_id = response.json()["user"]["id"]
+
+        start = datetime.date(2030, 1, 1)
+        for i in range(cls.MEMBERSHIPS):
+            response = cls.client.create_members_membership(
+                gym_member_id=member_id,
+                membership_plan_id=fixtures.plan_id,
+                start_date=str(start + datetime.timedelta(days=10 * i)),
+                end_date=str(start + datetime.timedelta(days=10 * i + 9)),
+            )
+            if response.status_code != 201:
+                raise Exception(f"Failed to create membership: {response.text}")
+
+        cls.member_client = cls.client.clone()
+        cls.member_client.login(member["username"], PASSWORD).raise_for_status()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
+    def walk(self, client, order, length, max_pages=None):
+        """Follow nextCursor from the first page; returns the responses' JSON bodies."""
+        pages, cursor = [], ""
+        while cursor is not None and (max_pages is None or len(pages) < max_pages):
+            response = client.list_members_memberships(
+                **datatables_params(draw=len(pages) + 1, length=length, order=order), cursor=cursor
+            )
+            self.assertEqual(response.status_code, 200, response.text)
+            pages.append(response.json())
+            cursor = pages[-1]["nextCursor"]
+        return pages
+
+    def test_01_cursor_pages_match_offset_pages(self):
+        for order in ([(0, "asc")], [(3, "desc")]):
+            offset = self.member_client.list_members_memberships(
+                **datatables_params(length=100, order=order)
+            ).json()["data"]
+            pages = self.walk(self.member_client, order, self.PAGE)
+            self.assertEqual([row["id"] for page in pages for row in page["data"]], [row["id"] for row in offset])
+            self.assertEqual(len(pages), -(-self.MEMBERSHIPS // self.PAGE))
+            for draw, page in enumerate(pages, start=1):
+                self.assertEqual(page["draw"], draw)
+                self.assertEqual(page["recordsTotal"], self.MEMBERSHIPS)
+                self.assertEqual(page["recordsFiltered"], self.MEMBERSHIPS)
+            self.assertIsNone(pages[0]["prevCursor"])
+            self.assertIsNone(pages[-1]["nextCursor"])
+
+    def test_02_prev_cursor_returns_previous_page(self):
+        order = [(3, "asc")]
+        pages = self.walk(self.member_client, order, self.PAGE, max_pages=3)
+        response = self.member_client.list_members_memberships(
+            **datatables_params(length=self.PAGE, order=order), cursor=pages[2]["prevCursor"]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["id"] for r in response.json()["data"]], [r["id"] for r in pages[1]["data"]])
+
+    def test_03_invalid_cursor(self):
+        response = self.member_client.list_members_memberships(**datatables_params(), cursor="not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+
+        # A cursor is only valid for the sort order it was issued for
+        first = self.walk(self.member_client, [(0, "asc")], self.PAGE, max_pages=1)[0]
+        response = self.member_client.list_members_memberships(
+            **datatables_params(order=[(3, "asc")]), cursor=first["nextCursor"]
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_04_deep_pages_stay_flat(self):
+        # Walk the whole (shared, growing) memberships table as admin and
+        # compare the latency of late pages with the first ones. With OFFSET
+        # paging the late pages get slower the more rows precede them.
+        latencies = []
+        self.client.hooks.append(lambda method, template, status, elapsed_ms: latencies.append(elapsed_ms))
+        try:
+            pages = self.walk(self.client, [(3, "asc")], 50, max_pages=40)
+        finally:
+            self.client.hooks.pop()
+        if len(pages) < 10:
+            self.skipTest("not enough memberships to compare deep pages; seed with scripts/seed.js")
+        early = statistics.median(latencies[1:6])
+        late = statistics.median(latencies[-5:])
+        self.assertLess(late, max(3 * early, early + 50), f"early {early:.1f}ms, late {late:.1f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
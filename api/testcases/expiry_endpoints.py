@@ -0,0 +1,164 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from fixtures import admin_client, private_gym, remove_private_gym, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, GymClient
+
+WINDOW_DAYS = 30
+MEMBERS = 24
+
+
+def day(offset):
+    """UTC date ``offset`` days from today, as the API buckets end dates."""
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+class TestExpiryEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+
+        # A gym of its own, so the expiring list holds only this suite's rows
+        cls.gym = private_gym(
+            cls.client, members=MEMBERS, member_prefix="expirymember", duration_type="days", duration_value=30
+        )
+        cls.gym_id = cls.gym.gym_id
+        cls.plan_id = cls.gym.plan_ids[0]
+        cls.member_ids = cls.gym.member_ids
+        # membership id -> end date (None once deleted), as the tests expect it
+        cls.expected = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_private_gym(cls.client, cls.gym)
+        cls.client.close()
+
+    def membership(self, member_id, end_offset):
+        return {
+            "gym_member_id": member_id,
+            "membership_plan_id": self.plan_id,
+            "start_date": day(end_offset - 30),
+            "end_date": day(end_offset),
+        }
+
+    def writer(self):
+        """An admin client of its own for one thread, sharing the connection pool."""
+        return self.client.clone(self.client.token)
+
+    def expiring(self, client=None, **params):
+        response = (client or self.client).expiring_memberships(WINDOW_DAYS, gymId=self.gym_id, **params)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()
+
+    def expected_window(self):
+        last = day(WINDOW_DAYS - 1)
+        return {mid: end for mid, end in self.expected.items() if end is not None and end <= last}
+
+    def assert_matches_expected(self):
+        body = self.expiring()
+        listed = {row["id"]: row["end_date"][:10] for row in body["data"]}
+        self.assertEqual(listed, self.expected_window())
+        self.assertEqual(sum(bucket["count"] for bucket in body["days"]), len(body["data"]))
+        self.assertEqual([row["end_date"] for row in body["data"]], sorted(row["end_date"] for row in body["data"]))
+
+    def test_01_concurrent_writes_keep_buckets_exact(self):
+        rng = random.Random(22)
+        offsets = {member_id: rng.randrange(1, WINDOW_DAYS - 5) for member_id in self.member_ids}
+
+        def create(member_id):
+            response = self.writer().create_members_membership(self.membership(member_id, offsets[member_id]))
+            self.assertEqual(response.status_code, 201, response.text)
+            return response.json()["id"], offsets[member_id]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            created = list(pool.map(create, self.member_ids))
+        self.expected.update((mid, day(offset)) for mid, offset in created)
+        self.assert_matches_expected()
+
+        # Moves inside the window, out past it, and deletes, all at once; ids
+        # line up with cls.member_ids
+        ids = [mid for mid, _ in created]
+        moved, pushed_out, deleted = ids[:8], ids[8:12], ids[12:16]
+
+        def change(mid):
+            client = self.writer()
+            if mid in deleted:
+                self.assertEqual(client.delete_members_membership(mid).status_code, 204)
+                return mid, None
+            end = day(2) if mid in moved else day(WINDOW_DAYS + 40)
+            response = client.update_members_membership(mid, end_date=end)
+            self.assertEqual(response.status_code, 200, response.text)
+            return mid, end
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.expected.update(pool.map(change, moved + pushed_out + deleted))
+        self.assert_matches_expected()
+
+        # Ground truth from the database for a sample of the listed rows
+        for row in self.expiring()["data"][:5]:
+            stored = self.client.get_members_membership(row["id"]).json()
+            self.assertEqual(stored["end_date"][:10], row["end_date"][:10])
+
+    def test_02_batch_created_rows_are_listed(self):
+        # Members whose membership test_01 deleted, so nothing overlaps
+        members = self.member_ids[12:16]
+        items = [self.membership(member_id, WINDOW_DAYS + 10 + i) for i, member_id in enumerate(members)]
+        items[0] = self.membership(members[0], -40)  # already over, never listed
+        response = self.client.create_members_memberships_batch(items)
+        self.assertEqual(response.status_code, 201, response.text)
+        for item, result in zip(items, response.json()["results"]):
+            self.expected[result["id"]] = item["end_date"]
+        self.assert_matches_expected()
+
+    def test_03_renewal_job(self):
+        due = self.expected_window()
+        self.assertTrue(due)
+
+        dry = self.client.renew_expiring_memberships(WINDOW_DAYS, gym_id=self.gym_id, dry_run=True)
+        self.assertEqual(dry.status_code, 200, dry.text)
+        self.assertEqual(dry.json()["renewed"], len(due))
+        self.assert_matches_expected()  # nothing was created
+
+        response = self.client.renew_expiring_memberships(WINDOW_DAYS, gym_id=self.gym_id)
+        self.assertEqual(response.status_code, 200, response.text)
+        body = response.json()
+        self.assertEqual((body["candidates"], body["renewed"], body["skipped"]), (len(due), len(due), 0))
+        for result in body["results"]:
+            renewal = self.client.get_members_membership(result["renewal_id"]).json()
+            self.assertEqual(renewal["start_date"][:10], due[result["membership_id"]])
+            self.expected[result["renewal_id"]] = renewal["end_date"][:10]
+        self.assert_matches_expected()
+
+        again = self.client.renew_expiring_memberships(WINDOW_DAYS, gym_id=self.gym_id).json()
+        self.assertEqual(again["renewed"], 0)
+        self.assertEqual({result["status"] for result in again["results"]}, {409})
+
+    def test_04_roles_and_validation(self):
+        gym_admin = GymClient(self.BASE_URL)
+        member = GymClient(self.BASE_URL)
+        try:
+            gym_admin.login(self.fixtures.gym_admin_username, self.fixtures.gym_admin_password)
+            member.login(self.fixtures.member_username, self.fixtures.member_password)
+            # A gym admin always gets their own gym, whatever gymId says
+            listed = {row["id"] for row in self.expiring(gym_admin)["data"]}
+            self.assertFalse(listed & set(self.expected))
+            self.assertEqual(member.expiring_memberships(7).status_code, 401)
+            self.assertEqual(member.renew_expiring_memberships(7, dry_run=True).status_code, 401)
+        finally:
+            gym_admin.close()
+            member.close()
+
+        self.assertEqual(self.client.expiring_memberships(0).status_code, 400)
+        self.assertEqual(self.client.expiring_memberships(1000).status_code, 400)
+        self.assertEqual(self.client.expiring_memberships(7, gymId="x").status_code, 400)
+        # Members are only deleted once their memberships are
+        self.assertEqual(self.client.delete_user(self.member_ids[0]).status_code, 409)
+
+
+if __name__ == "__main__":
+    unittest.main()
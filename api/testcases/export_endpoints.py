@@ -0,0 +1,120 @@
+import csv
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from fixtures import PASSWORD, admin_client, private_gym, remove_private_gym, user_data, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, ApiError, datatables_params
+
+
+class TestExportEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+    MEMBERSHIPS = 12
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+
+        # A fresh member per run gives an export of known size
+        member = user_data("exportmember", gymId=cls.fixtures.gym_id)
+        response = cls.client.signup_gym_member(member)
+        if response.status_code != 200:
+            raise Exception("Failed to create gym member for export tests")
+        cls.member_id = response.json()["user"]["id"]
+
+        start = datetime.date(2031, 1, 1)
+        for i in range(cls.MEMBERSHIPS):
+            response = cls.client.create_members_membership(
+                gym_member_id=cls.member_id,
+                membership_plan_id=cls.fixtures.plan_id,
+                start_date=str(start + datetime.timedelta(days=30 * i)),
+                end_date=str(start + datetime.timedelta(days=30 * i + 29)),
+            )
+            if response.status_code != 201:
+                raise Exception(f"Failed to create membership: {response.text}")
+
+        cls.member_client = cls.client.clone()
+        cls.member_client.login(member["username"], PASSWORD).raise_for_status()
+        cls.directory = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in os.listdir(cls.directory):
+            os.remove(os.path.join(cls.directory, name))
+        os.rmdir(cls.directory)
+        cls.client.close()
+
+    def test_01_ndjson_matches_listing(self):
+        dest = os.path.join(self.directory, "memberships.ndjson")
+        self.member_client.export("members_memberships", dest)
+        with open(dest) as f:
+            rows = [json.loads(line) for line in f]
+        listed = self.member_client.list_members_memberships(**datatables_params(length=100)).json()["data"]
+        self.assertEqual([row["id"] for row in rows], sorted(row["id"] for row in listed))
+        self.assertEqual({row["gym_member_id"] for row in rows}, {self.member_id})
+
+    def test_02_csv_with_date_range(self):
+        dest = os.path.join(self.directory, "memberships.csv")
+        self.member_client.export("members_memberships", dest, format="csv", **{"from": "2031-02-15", "to": "2031-04-15"})
+        with open(dest, newline="") as f:
+            rows = list(csv.DictReader(f))
+        # February, March and April overlap the range
+        self.assertEqual(len(rows), 3)
+        self.assertIn("plan_name", rows[0])
+
+    def test_03_gym_members_export_is_scoped(self):
+        dest = os.path.join(self.directory, "members.ndjson")
+        self.client.export("gym_members", dest, gymId=self.fixtures.gym_id)
+        with open(dest) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertIn(self.member_id, [row["memberId"] for row in rows])
+        self.assertEqual({row["gymId"] for row in rows}, {self.fixtures.gym_id})
+        with self.assertRaises(ApiError):
+            self.member_client.export("gym_members", dest)
+
+    def test_04_invalid_parameters(self):
+        dest = os.path.join(self.directory, "invalid")
+        for params in ({"format": "xml"}, {"from": "not-a-date"}, {"gymId": "abc"}):
+            with self.assertRaises(ApiError) as raised:
+                self.client.export("payments", dest, **params)
+            self.assertEqual(raised.exception.status_code, 400)
+
+    def test_05_gym_admin_writes_stay_in_their_gym(self):
+        gym_admin = self.client.clone()
+        gym_admin.login(self.fixtures.gym_admin_username, self.fixtures.gym_admin_password).raise_for_status()
+        other_gym = private_gym(self.client, members=1)
+        try:
+            other = self.client.create_members_membership(
+                gym_member_id=other_gym.member_ids[0],
+                membership_plan_id=other_gym.plan_ids[0],
+                start_date="2031-01-01",
+                end_date="2031-01-31",
+            )
+            self.assertEqual(other.status_code, 201, other.text)
+            other_id = other.json()["id"]
+            self.assertEqual(gym_admin.update_members_membership(other_id, end_date="2031-01-30").status_code, 401)
+            self.assertEqual(gym_admin.delete_members_membership(other_id).status_code, 401)
+            self.assertEqual(self.client.get_members_membership(other_id).status_code, 200)
+
+            # The same writes in the gym admin's own gym go through
+            own = self.client.create_members_membership(
+                gym_member_id=self.member_id,
+                membership_plan_id=self.fixtures.plan_id,
+                start_date="2035-01-01",
+                end_date="2035-01-31",
+            )
+            self.assertEqual(own.status_code, 201, own.text)
+            own_id = own.json()["id"]
+            response = gym_admin.update_members_membership(own_id, end_date="2035-01-30")
+            self.assertEqual(response.status_code, 200, response.text)
+            self.assertEqual(gym_admin.delete_members_membership(own_id).status_code, 204)
+        finally:
+            remove_private_gym(self.client, other_gym)
+            gym_admin.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
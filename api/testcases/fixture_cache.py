@@ -0,0 +1,72 @@
+"""On-disk cache for the fixture graph built by fixtures.py.
+
+Each entry lives in its own JSON file keyed by base URL and worker name, so
+parallel workers never write the same file. Entries written with a
+different ``SCHEMA_VERSION``, base URL or worker are ignored; callers are
+expected to validate the rest (token expiry, IDs still present) before
+reusing an entry.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Bump when the shape of the cached fixture graph changes
+SCHEMA_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "GYM_FIXTURE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fixture_cache"),
+)
+
+
+class FixtureCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, schema_version=SCHEMA_VERSION):
+        self.cache_dir = cache_dir
+        self.schema_version = schema_version
+
+    def path(self, base_url, worker):
+        digest = hashlib.sha1(base_url.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{digest}-{worker}.json")
+
+    def load(self, base_url, worker, cls):
+        """Return the cached ``cls`` instance, or None if missing or stale."""
+        try:
+            with open(self.path(base_url, worker)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            entry.get("schema_version") != self.schema_version
+            or entry.get("base_url") != base_url
+            or entry.get("worker") != worker
+        ):
+            return None
+        try:
+            return cls(**entry["fixtures"])
+        except (KeyError, TypeError):
+            return None
+
+    def store(self, base_url, worker, fixtures):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            "schema_version": self.schema_version,
+            "base_url": base_url,
+            "worker": worker,
+            "stored_at": time.time(),
+            "fixtures": dataclasses.asdict(fixtures),
+        }
+        # Write then rename so a concurrent reader never sees a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, self.path(base_url, worker))
+
+    def invalidate(self, base_url, worker):
+        try:
+            os.remove(self.path(base_url, worker))
+        except FileNotFoundError:
+            pass
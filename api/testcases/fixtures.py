@@ -0,0 +1,296 @@
+"""Per-worker test fixtures.
+
+Every test process gets its own namespace (``GYM_TEST_NAMESPACE``, set by
+parallel_runner.py for each worker) and builds its own admin, gym, gym admin,
+gym member, membership plan and plan price under that namespace, so suites
+never rely on ``gymId: 1`` or on wiping the database and can run side by side.
+
+The graph is persisted with fixture_cache.py and reused by later runs against
+the same server as long as its IDs still exist; only the admin token is
+renewed when it expires.
+"""
+
+import json
+import os
+import random
+import string
+import time
+from dataclasses import dataclass, replace
+
+from fixture_cache import FixtureCache
+from gymclient import DEFAULT_BASE_URL, GymClient
+from gymclient.auth import token_expiry
+from gymclient.config import TOKEN_REFRESH_MARGIN
+
+PASSWORD = "Fixture@123"
+
+_RUN_ID = "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
+_counter = 0
+_fixtures = None
+
+
+def worker_name():
+    return os.environ.get("GYM_TEST_NAMESPACE", "main")
+
+
+def namespace():
+    """Namespace for this process: the worker name plus a per-run suffix."""
+    return f"{worker_name()}{_RUN_ID}"
+
+
+def unique_name(prefix):
+    """A username/email-safe identifier that is unique across workers and runs."""
+    global _counter
+    _counter += 1
+    return f"{prefix}_{namespace()}_{_counter}"
+
+
+def unique_email(prefix):
+    return f"{unique_name(prefix)}@example.com"
+
+
+def gym_data(**overrides):
+    data = {
+        "name": unique_name("Fixture Gym"),
+        "address": "123 Test St",
+        "city": "Test City",
+        "state": "Test State",
+        "country": "Test Country",
+        "pincode": "123456",
+        "phone_number": "1234567890",
+        "email": unique_email("gym"),
+        "contact_person": "Test Person",
+        "currency": "USD",
+        "latitude": 40.7128,
+        "longitude": -74.0060,
+    }
+    data.update(overrides)
+    return data
+
+
+def user_data(prefix, **overrides):
+    username = unique_name(prefix)
+    data = {
+        "username": username,
+        "password": PASSWORD,
+        "firstName": "Test",
+        "lastName": prefix.title(),
+        "email": f"{username}@example.com",
+        "phone": "1234567890",
+    }
+    data.update(overrides)
+    return data
+
+
+def plan_data(gym_id, prefix="Fixture Plan", **overrides):
+    data = {
+        "gym_id": gym_id,
+        "plan_name": unique_name(prefix),
+        "plan_description": "Fixture monthly plan",
+        "duration_type": "months",
+        "duration_value": 1,
+        "category": "Regular",
+    }
+    data.update(overrides)
+    return data
+
+
+def price_data(plan_id, price=1000, start="2024-01-01", end="2099-12-31", **overrides):
+    data = {
+        "membership_plan_id": plan_id,
+        "price": price,
+        "validity_start_date": start,
+        "validity_end_date": end,
+        "comments": "Fixture price",
+    }
+    data.update(overrides)
+    return data
+
+
+@dataclass
+class WorkerFixtures:
+    namespace: str
+    admin_username: str
+    admin_password: str
+    admin_token: str
+    gym_id: int
+    gym_admin_id: int
+    gym_admin_username: str
+    gym_admin_password: str
+    member_id: int
+    member_username: str
+    member_password: str
+    plan_id: int
+    price_id: int
+
+
+def _checked(response, what):
+    if response.status_code not in (200, 201):
+        raise Exception(f"Failed to create {what} fixture: {response.status_code} {response.text}")
+    return response.json()
+
+
+def build_fixtures(client):
+    """Create the admin -> gym -> gym admin/member graph for this namespace.
+
+    ``client`` is left logged in as the fixture admin.
+    """
+    admin = {"username": unique_name("admin"), "password": PASSWORD}
+    _checked(client.signup_admin(**admin), "admin")
+    token = _checked(client.login(**admin), "admin login")["token"]
+
+    gym_id = _checked(client.create_gym(gym_data()), "gym")["gym"]["id"]
+
+    gym_admin = user_data("gymadmin")
+    gym_admin_id = _checked(client.signup_gym_admin(gym_admin), "gym admin")["user"]["id"]
+    _checked(client.link_gym_admin(gym_admin_id, gym_id), "gym admin link")
+
+    member = user_data("gymmember", gymId=gym_id)
+    member_id = _checked(client.signup_gym_member(member), "gym member")["user"]["id"]
+
+    plan_id = _checked(client.create_membership_plan(plan_data(gym_id)), "membership plan")["id"]
+    price_id = _checked(client.create_plan_price(price_data(plan_id)), "plan price")["id"]
+
+    return WorkerFixtures(
+        namespace=namespace(),
+        admin_username=admin["username"],
+        admin_password=admin["password"],
+        admin_token=token,
+        gym_id=gym_id,
+        gym_admin_id=gym_admin_id,
+        gym_admin_username=gym_admin["username"],
+        gym_admin_password=gym_admin["password"],
+        member_id=member_id,
+        member_username=member["username"],
+        member_password=member["password"],
+        plan_id=plan_id,
+        price_id=price_id,
+    )
+
+
+def revalidate_fixtures(client, fixtures, now=None):
+    """Return ``fixtures`` with a usable admin token, or None if they are gone.
+
+    The admin token is renewed by logging in again when it has expired (or is
+    about to); the graph is dropped if the login fails or any of its IDs no
+    longer resolve.
+    """
+    now = time.time() if now is None else now
+    expires_at = token_expiry(fixtures.admin_token)
+    if expires_at is None or expires_at - TOKEN_REFRESH_MARGIN <= now:
+        response = client.login(fixtures.admin_username, fixtures.admin_password)
+        if response.status_code != 200:
+            return None
+        fixtures = replace(fixtures, admin_token=response.json()["token"])
+    else:
+        client.tokens.set_token(fixtures.admin_token)
+
+    lookups = (
+        (client.get_gym, fixtures.gym_id),
+        (client.get_user, fixtures.gym_admin_id),
+        (client.get_user, fixtures.member_id),
+        (client.get_membership_plan, fixtures.plan_id),
+        (client.get_plan_price, fixtures.price_id),
+    )
+    for lookup, record_id in lookups:
+        if lookup(record_id).status_code != 200:
+            return None
+    return fixtures
+
+
+def load_or_build_fixtures(client, base_url, cache=None):
+    """Reuse the cached graph for this worker if it is still valid, else rebuild it."""
+    cache = cache or FixtureCache()
+    worker = worker_name()
+    fixtures = cache.load(base_url, worker, WorkerFixtures)
+    if fixtures is not None:
+        fixtures = revalidate_fixtures(client, fixtures)
+    if fixtures is None:
+        fixtures = build_fixtures(client)
+    cache.store(base_url, worker, fixtures)
+    return fixtures
+
+
+def worker_fixtures(base_url=DEFAULT_BASE_URL):
+    """Fixtures shared by every test class running in this process."""
+    global _fixtures
+    if _fixtures is None:
+        with GymClient(base_url) as client:
+            _fixtures = load_or_build_fixtures(client, base_url)
+    return _fixtures
+
+
+@dataclass
+class PrivateGym:
+    gym_id: int
+    plan_ids: list
+    price_ids: list
+    member_ids: list
+
+
+def private_gym(client, plans=1, members=0, price=None, member_prefix="member", **plan_overrides):
+    """A gym of a suite's own, for assertions over everything a gym holds.
+
+    It gets ``plans`` membership plans (``plan_overrides`` applied to each), a
+    price of ``price`` on each of them unless ``price`` is None, and
+    ``members`` gym members signed up in one batch. Remove it with
+    ``remove_private_gym``.
+    """
+    gym_id = _checked(client.create_gym(gym_data()), "private gym")["gym"]["id"]
+    gym = PrivateGym(gym_id=gym_id, plan_ids=[], price_ids=[], member_ids=[])
+    for _ in range(plans):
+        plan = _checked(client.create_membership_plan(plan_data(gym_id, **plan_overrides)), "membership plan")
+        gym.plan_ids.append(plan["id"])
+        if price is not None:
+            gym.price_ids.append(_checked(client.create_plan_price(price_data(plan["id"], price)), "plan price")["id"])
+    if members:
+        items = [user_data(member_prefix, gymId=gym_id) for _ in range(members)]
+        results = _checked(client.signup_gym_members_batch(items), "gym members")["results"]
+        gym.member_ids = [result["id"] for result in results]
+    return gym
+
+
+def _deleted(response, what):
+    if response.status_code not in (200, 204):
+        raise Exception(f"Failed to delete {what}: {response.status_code} {response.text}")
+
+
+def _exported(client, path, gym_id):
+    response = client.get(path, params={"format": "ndjson", "gymId": gym_id})
+    if response.status_code != 200:
+        raise Exception(f"Failed to export {path}: {response.status_code} {response.text}")
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def remove_private_gym(client, gym):
+    """Delete ``gym`` and everything that references it.
+
+    The foreign keys have no ON DELETE rule, so dependents go first: payments
+    and memberships of its members, their gym links and accounts, the prices,
+    the plans and last the gym. Payments, memberships, links and plans are
+    looked up through the API, so whatever a suite created in the gym is
+    removed with it; prices a suite adds have to be appended to
+    ``gym.price_ids``.
+    """
+    for row in _exported(client, "/payments/export", gym.gym_id):
+        _deleted(client.delete_payment(row["id"]), f"payment {row['id']}")
+    for row in _exported(client, "/membersMemberships/export", gym.gym_id):
+        _deleted(client.delete_members_membership(row["id"]), f"membership {row['id']}")
+    for row in _exported(client, "/gymAndGymMember/export", gym.gym_id):
+        _deleted(client.unlink_gym_member(row["id"]), f"gym member link {row['id']}")
+    for member_id in gym.member_ids:
+        _deleted(client.delete_user(member_id), f"gym member {member_id}")
+    for price_id in gym.price_ids:
+        _deleted(client.delete_plan_price(price_id), f"plan price {price_id}")
+    plans = client.list_membership_plans_by_gym(gym.gym_id)
+    for plan in plans.json() if plans.status_code == 200 else []:
+        _deleted(client.delete_membership_plan(plan["id"]), f"membership plan {plan['id']}")
+    _deleted(client.delete_gym(gym.gym_id), f"gym {gym.gym_id}")
+
+
+def admin_client(base_url=DEFAULT_BASE_URL):
+    """A client authenticated as the fixture admin, without a fresh login."""
+    fixtures = worker_fixtures(base_url)
+    client = GymClient(base_url, token=fixtures.admin_token)
+    client.tokens.set_credentials(fixtures.admin_username, fixtures.admin_password)
+    return client
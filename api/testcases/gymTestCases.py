@@ -1,11 +1,13 @@
 import unittest
-import requests
 import json
 import random
 import string
 
+from fixtures import admin_client, unique_email, unique_name, worker_fixtures
+from gymclient import DEFAULT_BASE_URL
+
 class TestGymEndpoints(unittest.TestCase):
-    BASE_URL = "http://localhost:3000/api"
+    BASE_URL = DEFAULT_BASE_URL
     ADMIN_TOKEN = None
     GYM_ADMIN_TOKEN = None
     GYM_MEMBER_TOKEN = None
@@ -13,110 +15,86 @@ class TestGymEndpoints(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        # Create admin account and get token
-        admin_username = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
-        admin_password = ''.join(random.choices(string.ascii_letters + string.digits, k=12))
-        admin_data = {"username": admin_username, "password": admin_password}
-        response = requests.post(f"{cls.BASE_URL}/signup/admin", json=admin_data)
-        if response.status_code != 200:
-            raise Exception("Failed to create admin account for testing")
-        
-        login_response = requests.post(f"{cls.BASE_URL}/login", json=admin_data)
-        cls.ADMIN_TOKEN = login_response.json().get("token")
-        if not cls.ADMIN_TOKEN:
-            raise Exception("Failed to retrieve admin token")
-
-        # Create gym admin account and get token
-        gym_admin_data = {
-            "username": f"gymadmin_{random.randint(1000, 9999)}",
-            "password": "gymadmin123",
-            "firstName": "Test",
-            "lastName": "GymAdmin",
-            "email": f"gymadmin{random.randint(1000, 9999)}@example.com",
-            "phone": "1234567890"
-        }
-        headers = {"Authorization": f"Bearer {cls.ADMIN_TOKEN}"}
-        response = requests.post(f"{cls.BASE_URL}/signup/gymadmin", json=gym_admin_data, headers=headers)
-        if response.status_code != 200:
-            raise Exception("Failed to create gym admin account for testing")
+        # Reuse this worker's cached fixture graph instead of signing up new
+        # accounts; the gym admin and member clones share the admin's pool
+        fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+        cls.ADMIN_TOKEN = fixtures.admin_token
+        cls.gym_admin_client = cls.client.clone()
+        cls.gym_member_client = cls.client.clone()
 
-        login_response = requests.post(f"{cls.BASE_URL}/login", json={"username": gym_admin_data["username"], "password": gym_admin_data["password"]})
+        login_response = cls.gym_admin_client.login(fixtures.gym_admin_username, fixtures.gym_admin_password)
         cls.GYM_ADMIN_TOKEN = login_response.json().get("token")
         if not cls.GYM_ADMIN_TOKEN:
             raise Exception("Failed to retrieve gym admin token")
 
-        # Create gym member account and get token
-        gym_member_data = {
-            "username": f"gymmember_{random.randint(1000, 9999)}",
-            "password": "gymmember123",
-            "firstName": "Test",
-            "lastName": "GymMember",
-            "email": f"gymmember{random.randint(1000, 9999)}@example.com",
-            "phone": "9876543210",
-            "gymId": 1  # Assuming a gym with ID 1 exists
-        }
-        response = requests.post(f"{cls.BASE_URL}/signup/gymmember", json=gym_member_data)
-        if response.status_code != 200:
-            raise Exception("Failed to create gym member account for testing")
-
-        login_response = requests.post(f"{cls.BASE_URL}/login", json={"username": gym_member_data["username"], "password": gym_member_data["password"]})
+        login_response = cls.gym_member_client.login(fixtures.member_username, fixtures.member_password)
         cls.GYM_MEMBER_TOKEN = login_response.json().get("token")
         if not cls.GYM_MEMBER_TOKEN:
             raise Exception("Failed to retrieve gym member token")
 
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+
     def test_01_create_gym(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         gym_data = {
-            "name": f"Test Gym {random.randint(1000, 9999)}",
+            "name": unique_name("Test Gym"),
             "address": "123 Test St",
             "city": "Test City",
             "state": "Test State",
             "country": "Test Country",
             "pincode": "123456",
             "phone_number": "1234567890",
-            "email": f"testgym{random.randint(1000, 9999)}@example.com",
+            "email": unique_email("testgym"),
             "contact_person": "Test Person",
             "currency": "USD",
             "latitude": 40.7128,
             "longitude": -74.0060
         }
-        response = requests.post(f"{self.BASE_URL}/gym", headers=headers, json=gym_data)
+        response = self.client.create_gym(gym_data)
         self.assertEqual(response.status_code, 200)
         self.assertIn("gym", response.json())
         self.__class__.TEST_GYM_ID = response.json()["gym"]["id"]
 
     def test_02_get_all_gyms(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        response = requests.get(f"{self.BASE_URL}/gym", headers=headers)
+        response = self.client.list_gyms()
         self.assertEqual(response.status_code, 200)
         self.assertIn("data", response.json())
         self.assertIn("meta", response.json())
 
+    def test_02_search_gyms_by_name_prefix(self):
+        # Words match as prefixes of the indexed name/city/contact words
+        name_token = self.client.get_gym(self.TEST_GYM_ID).json()["name"].split()[-1]
+        for term in (name_token, name_token[:-1], f"test {name_token}"):
+            response = self.client.list_gyms(search=term, limit=100)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(self.TEST_GYM_ID, [gym["id"] for gym in response.json()["data"]], term)
+
+        response = self.client.list_gyms(search=f"{name_token} nosuchword")
+        self.assertEqual(response.json()["data"], [])
+
     def test_03_get_gym_by_id(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        response = requests.get(f"{self.BASE_URL}/gym/{self.TEST_GYM_ID}", headers=headers)
+        response = self.client.get_gym(self.TEST_GYM_ID)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["id"], self.TEST_GYM_ID)
 
     def test_04_update_gym(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         update_data = {
-            "name": f"Updated Test Gym {random.randint(1000, 9999)}",
-            "email": f"updatedtestgym{random.randint(1000, 9999)}@example.com"
+            "name": unique_name("Updated Test Gym"),
+            "email": unique_email("updatedtestgym")
         }
-        response = requests.put(f"{self.BASE_URL}/gym/{self.TEST_GYM_ID}", headers=headers, json=update_data)
+        response = self.client.update_gym(self.TEST_GYM_ID, update_data)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["name"], update_data["name"])
         self.assertEqual(response.json()["email"], update_data["email"])
 
     def test_05_delete_gym(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        response = requests.delete(f"{self.BASE_URL}/gym/{self.TEST_GYM_ID}", headers=headers)
+        response = self.client.delete_gym(self.TEST_GYM_ID)
         self.assertEqual(response.status_code, 200)
 
     def test_06_gym_access_admin(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        response = requests.get(f"{self.BASE_URL}/gym", headers=headers)
+        response = self.client.list_gyms()
         self.assertEqual(response.status_code, 200)
         self.assertIn("data", response.json())
 
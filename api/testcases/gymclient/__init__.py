@@ -0,0 +1,45 @@
+"""Python client for the gym API.
+
+Sync usage::
+
+    from gymclient import GymClient
+
+    with GymClient() as client:
+        client.login("admin", "secret123")
+        gyms = client.list_gyms(page=1, limit=10).json()
+
+Async usage::
+
+    from gymclient import AsyncGymClient
+
+    async with AsyncGymClient() as client:
+        await client.login("admin", "secret123")
+        response = await client.list_gyms()
+
+Exports stream straight to disk::
+
+    client.export("payments", "payments.csv", format="csv", gymId=3, **{"from": "2024-01-01"})
+
+Both clients keep a pooled keep-alive session, attach the Bearer token
+automatically and log in again when the token is about to expire or the API
+rejects it. ``client.clone()`` returns a client that shares the same
+connection pool but keeps its own credentials.
+"""
+
+from .async_client import ApiResponse, AsyncGymClient
+from .auth import TokenManager
+from .client import GymClient
+from .config import DEFAULT_BASE_URL
+from .errors import ApiError
+from .query import datatables_params, flatten_query
+
+__all__ = [
+    "ApiError",
+    "ApiResponse",
+    "AsyncGymClient",
+    "DEFAULT_BASE_URL",
+    "GymClient",
+    "TokenManager",
+    "datatables_params",
+    "flatten_query",
+]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import json as jsonlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Mapping, Optional
+
+import aiohttp
+
+from .auth import TokenManager, is_auth_failure
+from .config import DEFAULT_BASE_URL, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from .errors import ApiError, error_message
+from .query import flatten_query
+from .routes import Routes
+
+# Called after every request with (method, route template, status, elapsed ms).
+# Transport failures (refused connections, timeouts) report status 0.
+RequestHook = Callable[[str, str, int, float], None]
+
+
+@dataclass
+class ApiResponse:
+    """Fully read response, mirroring the parts of ``requests.Response`` we use."""
+
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+    elapsed_ms: float
+    _json: Any = field(default=None, repr=False)
+    _parsed: bool = field(default=False, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        if not self._parsed:
+            self._json = jsonlib.loads(self.content) if self.content else None
+            self._parsed = True
+        return self._json
+
+    def json_or_none(self) -> Any:
+        try:
+            return self.json()
+        except ValueError:
+            return None
+
+    def raise_for_status(self) -> "ApiResponse":
+        if self.status_code >= 400:
+            raise ApiError(self.status_code, error_message(self.json_or_none(), self.text), self)
+        return self
+
+
+def new_session(pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT) -> aiohttp.ClientSession:
+    """An ``aiohttp.ClientSession`` keeping up to ``pool_size`` keep-alive connections."""
+    connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+
+class AsyncGymClient(Routes[Awaitable[ApiResponse]]):
+    """asyncio client backed by a pooled ``aiohttp.ClientSession``.
+
+    The session is created lazily inside the running event loop. Pass
+    ``session`` to share one pool between many clients (e.g. one per virtual
+    user in a load test).
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        token: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.tokens = TokenManager(token)
+        self.hooks: List[RequestHook] = []
+        self._owns_session = session is None
+        self._session = session
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncGymClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = new_session(self.pool_size, self.timeout)
+        return self._session
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.tokens.token
+
+    def clone(self, token: Optional[str] = None) -> "AsyncGymClient":
+        """A client for another identity that reuses this client's connection pool."""
+        client = AsyncGymClient(self.base_url, token=token, session=self.session, timeout=self.timeout)
+        client.hooks = list(self.hooks)
+        return client
+
+    async def authenticate(self, username: str, password: str) -> "AsyncGymClient":
+        """Log in, raising ``ApiError`` on failure, and return ``self``."""
+        (await self.login(username, password)).raise_for_status()
+        return self
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        template: str,
+        params: Any,
+        json: Any,
+        auth: bool,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> ApiResponse:
+        headers = {**(self.tokens.headers() if auth else {}), **(headers or {})}
+        start = time.perf_counter()
+        status = 0
+        try:
+            async with self.session.request(
+                method, f"{self.base_url}{path}", params=flatten_query(params), json=json, headers=headers
+            ) as response:
+                status = response.status
+                content = await response.read()
+                response_headers = dict(response.headers)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            for hook in self.hooks:
+                hook(method, template, status, elapsed_ms)
+        return ApiResponse(status, response_headers, content, elapsed_ms)
+
+    async def _refresh_token(self, stale_token: Optional[str]) -> bool:
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            # Another coroutine may already have renewed the token while we waited
+            if self.tokens.token != stale_token and not self.tokens.needs_refresh():
+                return True
+            response = await self._send(
+                "POST",
+                "/login",
+                "/login",
+                None,
+                {"username": self.tokens.username, "password": self.tokens.password},
+                False,
+            )
+            body = response.json_or_none()
+            if response.status_code == 200 and isinstance(body, dict) and body.get("token"):
+                self.tokens.set_token(body["token"])
+                return True
+            return False
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        template: Optional[str] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        auth: bool = True,
+        on_success: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> ApiResponse:
+        template = template or path
+        if auth and self.tokens.needs_refresh():
+            await self._refresh_token(self.tokens.token)
+        sent_token = self.tokens.token
+        response = await self._send(method, path, template, params, json, auth, headers=headers)
+        if (
+            auth
+            and self.tokens.can_refresh
+            and response.status_code in (400, 401)
+            and is_auth_failure(response.status_code, response.json_or_none())
+            and await self._refresh_token(sent_token)
+        ):
+            response = await self._send(method, path, template, params, json, auth, headers=headers)
+        if on_success is not None and response.ok:
+            on_success(response.json_or_none())
+        return response
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import base64
+import json
+import time
+from typing import Optional
+
+from .config import TOKEN_REFRESH_MARGIN
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Return the ``exp`` claim of a JWT without verifying its signature."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """Holds the Bearer token and the credentials needed to renew it."""
+
+    def __init__(self, token: Optional[str] = None):
+        self.username: Optional[str] = None
+        self.password: Optional[str] = None
+        self.token: Optional[str] = None
+        self.expires_at: Optional[float] = None
+        if token:
+            self.set_token(token)
+
+    def set_credentials(self, username: str, password: str) -> None:
+        self.username = username
+        self.password = password
+
+    def set_token(self, token: Optional[str]) -> None:
+        self.token = token
+        self.expires_at = token_expiry(token) if token else None
+
+    @property
+    def can_refresh(self) -> bool:
+        return self.username is not None and self.password is not None
+
+    def needs_refresh(self, now: Optional[float] = None) -> bool:
+        if not self.can_refresh:
+            return False
+        if not self.token:
+            return True
+        if self.expires_at is None:
+            return False
+        return (now if now is not None else time.time()) >= self.expires_at - TOKEN_REFRESH_MARGIN
+
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def copy(self) -> "TokenManager":
+        clone = TokenManager(self.token)
+        clone.username, clone.password = self.username, self.password
+        return clone
+
+
+# Errors authMiddleware answers with when the token is missing or no longer valid.
+# Controllers also use 401 for role checks, so the status alone is not enough.
+AUTH_FAILURE_ERRORS = {
+    (400, "Invalid token."),
+    (401, "Access denied. No token provided."),
+    (401, "Access denied. Invalid token format."),
+}
+
+
+def is_auth_failure(status_code: int, body: object) -> bool:
+    """True when authMiddleware rejected the request's token."""
+    return isinstance(body, dict) and (status_code, body.get("error")) in AUTH_FAILURE_ERRORS
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Callable, List, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .auth import TokenManager, is_auth_failure
+from .config import DEFAULT_BASE_URL, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from .errors import ApiError, error_message
+from .query import flatten_query
+from .routes import Routes
+
+# Called after every request with (method, route template, status, elapsed ms)
+RequestHook = Callable[[str, str, int, float], None]
+
+# Streaming export routes, by the name GymClient.export() takes
+EXPORTS = {
+    "payments": "/payments/export",
+    "members_memberships": "/membersMemberships/export",
+    "gym_members": "/gymAndGymMember/export",
+}
+
+
+def new_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """A ``requests.Session`` whose keep-alive pool fits ``pool_size`` threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _json_or_none(response: requests.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def raise_for_status(response: requests.Response) -> requests.Response:
+    if response.status_code >= 400:
+        raise ApiError(response.status_code, error_message(_json_or_none(response), response.text), response)
+    return response
+
+
+class GymClient(Routes[requests.Response]):
+    """Blocking client backed by a pooled ``requests.Session``."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.tokens = TokenManager(token)
+        self.hooks: List[RequestHook] = []
+        self._owns_session = session is None
+        self.session = session if session is not None else new_session(pool_size)
+
+    def __enter__(self) -> "GymClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.session.close()
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.tokens.token
+
+    def clone(self, token: Optional[str] = None) -> "GymClient":
+        """A client for another identity that reuses this client's connection pool."""
+        client = GymClient(self.base_url, token=token, session=self.session, timeout=self.timeout)
+        client.hooks = list(self.hooks)
+        return client
+
+    def authenticate(self, username: str, password: str) -> "GymClient":
+        """Log in, raising ``ApiError`` on failure, and return ``self``."""
+        raise_for_status(self.login(username, password))
+        return self
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        template: str,
+        params: Any,
+        json: Any,
+        auth: bool,
+        stream: bool = False,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        headers = {**(self.tokens.headers() if auth else {}), **(headers or {})}
+        start = time.perf_counter()
+        kwargs = {"stream": True} if stream else {}
+        response = self.session.request(
+            method,
+            f"{self.base_url}{path}",
+            params=flatten_query(params),
+            json=json,
+            headers=headers,
+            timeout=self.timeout,
+            **kwargs,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        for hook in self.hooks:
+            hook(method, template, response.status_code, elapsed_ms)
+        return response
+
+    def _refresh_token(self) -> bool:
+        response = self._send(
+            "POST",
+            "/login",
+            "/login",
+            None,
+            {"username": self.tokens.username, "password": self.tokens.password},
+            False,
+        )
+        body = _json_or_none(response)
+        if response.status_code == 200 and isinstance(body, dict) and body.get("token"):
+            self.tokens.set_token(body["token"])
+            return True
+        return False
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        template: Optional[str] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        auth: bool = True,
+        on_success: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        template = template or path
+        if auth and self.tokens.needs_refresh():
+            self._refresh_token()
+        response = self._send(method, path, template, params, json, auth, headers=headers)
+        if (
+            auth
+            and self.tokens.can_refresh
+            and response.status_code in (400, 401)
+            and is_auth_failure(response.status_code, _json_or_none(response))
+            and self._refresh_token()
+        ):
+            response = self._send(method, path, template, params, json, auth, headers=headers)
+        if on_success is not None and response.ok:
+            on_success(_json_or_none(response))
+        return response
+
+    def export(
+        self, resource: str, dest: str, format: str = "ndjson", chunk_size: int = 64 * 1024, **params: Any
+    ) -> int:
+        """Stream the ``resource`` export (a key of ``EXPORTS``) to the file ``dest``.
+
+        ``params`` are the export filters (``from``, ``to``, ``gymId``; use
+        ``**{"from": ...}`` for the reserved word). The body goes to disk as it
+        arrives, so memory use does not grow with the export, through
+        ``dest + ".part"`` which is only renamed once the download completed.
+        Returns the number of bytes written and raises ``ApiError`` if the API
+        refuses the export.
+        """
+        path = EXPORTS[resource]
+        if self.tokens.needs_refresh():
+            self._refresh_token()
+        response = self._send("GET", path, path, {"format": format, **params}, None, True, stream=True)
+        try:
+            raise_for_status(response)
+            written = 0
+            partial = f"{dest}.part"
+            try:
+                with open(partial, "wb") as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                        written += len(chunk)
+            except BaseException:
+                if os.path.exists(partial):
+                    os.remove(partial)
+                raise
+            os.replace(partial, dest)
+            return written
+        finally:
+            response.close()
@@ -0,0 +1,10 @@
+import os
+
+DEFAULT_BASE_URL = os.environ.get("GYM_API_BASE_URL", "http://localhost:3000/api").rstrip("/")
+
+# Keep-alive pool sizing shared by the sync and async clients
+DEFAULT_POOL_SIZE = int(os.environ.get("GYM_API_POOL_SIZE", "20"))
+DEFAULT_TIMEOUT = float(os.environ.get("GYM_API_TIMEOUT", "30"))
+
+# Log in again when the token expires within this many seconds
+TOKEN_REFRESH_MARGIN = 60
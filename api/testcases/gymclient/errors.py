@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class ApiError(Exception):
+    """Raised by ``raise_for_status`` helpers when the API answers with an error."""
+
+    def __init__(self, status_code: int, message: str, response: Any = None):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+        self.response = response
+
+
+def error_message(body: Any, text: str) -> str:
+    """Pick the human readable part out of the API's error payloads."""
+    if isinstance(body, dict):
+        for key in ("error", "message"):
+            if body.get(key):
+                details = body.get("details")
+                return f"{body[key]} {details}" if details else str(body[key])
+    return text
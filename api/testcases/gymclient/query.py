@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional, Sequence
+
+
+def flatten_query(params: Optional[Mapping[str, Any]]) -> dict:
+    """Flatten nested dicts/lists into the bracket notation Express parses.
+
+    ``{"order": [{"column": 0, "dir": "asc"}]}`` becomes
+    ``{"order[0][column]": 0, "order[0][dir]": "asc"}``. ``None`` values are
+    dropped so optional keyword arguments can be passed straight through.
+    """
+    flat: dict = {}
+
+    def walk(prefix: str, value: Any) -> None:
+        if value is None:
+            return
+        if isinstance(value, Mapping):
+            for key, item in value.items():
+                walk(f"{prefix}[{key}]", item)
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                walk(f"{prefix}[{index}]", item)
+        elif isinstance(value, bool):
+            flat[prefix] = "true" if value else "false"
+        else:
+            flat[prefix] = value
+
+    for key, value in (params or {}).items():
+        walk(key, value)
+    return flat
+
+
+def datatables_params(
+    draw: int = 1,
+    start: int = 0,
+    length: int = 10,
+    search: str = "",
+    order: Sequence[tuple] = ((0, "asc"),),
+    **extra: Any,
+) -> dict:
+    """Build the query a DataTables client sends to the list endpoints."""
+    params = {
+        "draw": draw,
+        "start": start,
+        "length": length,
+        "search": {"value": search},
+        "order": [{"column": column, "dir": direction} for column, direction in order],
+    }
+    params.update(extra)
+    return params
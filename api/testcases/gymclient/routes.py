@@ -0,0 +1,332 @@
+"""Route table shared by the sync and async clients.
+
+Every method maps one route from ``api/routes/*.js`` onto ``self._request``.
+The sync client's ``_request`` returns a ``requests.Response`` and the async
+client's returns an awaitable ``ApiResponse``, so each method simply returns
+whatever its client produces.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Generic, Mapping, Optional, TypeVar
+
+R = TypeVar("R")
+
+
+def _batch(items: Any, atomic: bool) -> dict:
+    return {"json": {"items": list(items)}, "params": {"atomic": "true"} if atomic else None}
+
+
+def _conditional(etag: Optional[str]) -> Optional[dict]:
+    """Headers of a conditional GET: a 304 with no body if ``etag`` still matches."""
+    return {"If-None-Match": etag} if etag else None
+
+
+def _payload(data: Optional[Mapping[str, Any]], fields: Mapping[str, Any]) -> dict:
+    payload = dict(data or {})
+    payload.update(fields)
+    return payload
+
+
+class Routes(Generic[R]):
+    def _request(
+        self,
+        method: str,
+        path: str,
+        template: Optional[str] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        auth: bool = True,
+        on_success: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> R:
+        raise NotImplementedError
+
+    # -- raw access ---------------------------------------------------------
+
+    def get(self, path: str, params: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> R:
+        return self._request("GET", path, params=params, **kwargs)
+
+    def post(self, path: str, json: Any = None, **kwargs: Any) -> R:
+        return self._request("POST", path, json=json, **kwargs)
+
+    def put(self, path: str, json: Any = None, **kwargs: Any) -> R:
+        return self._request("PUT", path, json=json, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> R:
+        return self._request("DELETE", path, **kwargs)
+
+    # -- health -------------------------------------------------------------
+
+    def health(self) -> R:
+        return self._request("GET", "/health", auth=False)
+
+    def internal_health(self, metrics_token: Optional[str] = None) -> R:
+        """Process and cluster report; needs ``metrics_token`` unless the API is on this machine."""
+        headers = {"X-Metrics-Token": metrics_token} if metrics_token else None
+        return self._request("GET", "/internal/health", auth=False, headers=headers)
+
+    # -- auth (routes/authRoutes.js) ----------------------------------------
+
+    def signup_admin(self, username: str, password: str) -> R:
+        return self._request(
+            "POST", "/signup/admin", json={"username": username, "password": password}, auth=False
+        )
+
+    def signup_gym_admin(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/signup/gymadmin", json=_payload(data, fields))
+
+    def signup_gym_member(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/signup/gymmember", json=_payload(data, fields))
+
+    def signup_gym_members_batch(self, items: Any, atomic: bool = False) -> R:
+        return self._request("POST", "/signup/gymmember/batch", **_batch(items, atomic))
+
+    def login(self, username: str, password: str, remember: bool = True) -> R:
+        """Log in and, on success, use the returned token for later calls.
+
+        With ``remember`` the credentials are kept so the client can log in
+        again by itself once the token expires.
+        """
+
+        def store_token(body: Any) -> None:
+            if remember:
+                self.tokens.set_credentials(username, password)
+            self.tokens.set_token(body.get("token") if isinstance(body, dict) else None)
+
+        return self._request(
+            "POST",
+            "/login",
+            json={"username": username, "password": password},
+            auth=False,
+            on_success=store_token,
+        )
+
+    def user_details(self) -> R:
+        return self._request("POST", "/userDetails")
+
+    def delete_all(self) -> R:
+        return self._request("DELETE", "/deleteAll")
+
+    # -- users (routes/userRoutes.js) ---------------------------------------
+
+    def list_users(self, **params: Any) -> R:
+        return self._request("GET", "/users", params=params)
+
+    def get_user(self, user_id: int) -> R:
+        return self._request("GET", f"/users/{user_id}", template="/users/:id")
+
+    def update_user(self, user_id: int, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("PUT", f"/users/{user_id}", template="/users/:id", json=_payload(data, fields))
+
+    def delete_user(self, user_id: int) -> R:
+        return self._request("DELETE", f"/users/{user_id}", template="/users/:id")
+
+    # -- gyms (routes/gymRoutes.js) -----------------------------------------
+
+    def create_gym(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/gym", json=_payload(data, fields))
+
+    def list_gyms(self, **params: Any) -> R:
+        return self._request("GET", "/gym", params=params)
+
+    def get_gym(self, gym_id: int, etag: Optional[str] = None) -> R:
+        return self._request("GET", f"/gym/{gym_id}", template="/gym/:id", headers=_conditional(etag))
+
+    def update_gym(self, gym_id: int, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("PUT", f"/gym/{gym_id}", template="/gym/:id", json=_payload(data, fields))
+
+    def delete_gym(self, gym_id: int) -> R:
+        return self._request("DELETE", f"/gym/{gym_id}", template="/gym/:id")
+
+    # -- gym <-> gym admin links (routes/gymAndGymAdminRoutes.js) -----------
+
+    def link_gym_admin(self, gym_admin_id: int, gym_id: int) -> R:
+        return self._request("POST", "/gymAndGymAdmin", json={"gymAdminId": gym_admin_id, "gymId": gym_id})
+
+    def unlink_gym_admin(self, link_id: int) -> R:
+        return self._request("DELETE", f"/gymAndGymAdmin/{link_id}", template="/gymAndGymAdmin/:id")
+
+    def list_gym_admin_links(self, **params: Any) -> R:
+        return self._request("GET", "/gymAndGymAdmin", params=params)
+
+    def get_gym_admins_of_gym(self, gym_id: int) -> R:
+        return self._request(
+            "GET", f"/gymAndGymAdmin/gymAdmins/{gym_id}", template="/gymAndGymAdmin/gymAdmins/:gymId"
+        )
+
+    def get_gyms_of_gym_admin(self, gym_admin_id: int) -> R:
+        return self._request(
+            "GET", f"/gymAndGymAdmin/gyms/{gym_admin_id}", template="/gymAndGymAdmin/gyms/:gymAdminId"
+        )
+
+    # -- gym <-> member links (routes/gymAndGymMemberRoutes.js) -------------
+
+    def link_gym_member(self, member_id: int, gym_id: int) -> R:
+        return self._request("POST", "/gymAndGymMember", json={"memberId": member_id, "gymId": gym_id})
+
+    def unlink_gym_member(self, link_id: int) -> R:
+        return self._request("DELETE", f"/gymAndGymMember/{link_id}", template="/gymAndGymMember/:id")
+
+    def list_gym_member_links(self, **params: Any) -> R:
+        return self._request("GET", "/gymAndGymMember", params=params)
+
+    def get_members_of_gym(self, gym_id: int) -> R:
+        return self._request(
+            "GET", f"/gymAndGymMember/members/{gym_id}", template="/gymAndGymMember/members/:gymId"
+        )
+
+    def get_gyms_of_member(self, member_id: int) -> R:
+        return self._request(
+            "GET", f"/gymAndGymMember/gyms/{member_id}", template="/gymAndGymMember/gyms/:memberId"
+        )
+
+    # -- membership plans (routes/gymMembershipPlanRoutes.js) ---------------
+
+    def create_membership_plan(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/gymMembershipPlans", json=_payload(data, fields))
+
+    def list_membership_plans(self, **params: Any) -> R:
+        return self._request("GET", "/gymMembershipPlans", params=params)
+
+    def get_membership_plan(self, plan_id: int) -> R:
+        return self._request("GET", f"/gymMembershipPlans/{plan_id}", template="/gymMembershipPlans/:planId")
+
+    def list_membership_plans_by_gym(self, gym_id: int, etag: Optional[str] = None) -> R:
+        return self._request(
+            "GET",
+            f"/gymMembershipPlans/allByGym/{gym_id}",
+            template="/gymMembershipPlans/allByGym/:gymId",
+            headers=_conditional(etag),
+        )
+
+    def update_membership_plan(self, plan_id: int, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request(
+            "PUT",
+            f"/gymMembershipPlans/update/{plan_id}",
+            template="/gymMembershipPlans/update/:planId",
+            json=_payload(data, fields),
+        )
+
+    def delete_membership_plan(self, plan_id: int) -> R:
+        return self._request(
+            "DELETE", f"/gymMembershipPlans/delete/{plan_id}", template="/gymMembershipPlans/delete/:planId"
+        )
+
+    # -- membership plan prices (routes/membershipPlansPriceRoutes.js) ------
+
+    def create_plan_price(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/membershipPlansPrices", json=_payload(data, fields))
+
+    def list_plan_prices(self, **params: Any) -> R:
+        return self._request("GET", "/membershipPlansPrices", params=params)
+
+    def quote_plan_prices(self, items: Any) -> R:
+        """Prices in force for ``items`` of ``{"membership_plan_id": ..., "date": "YYYY-MM-DD"}``."""
+        return self._request("POST", "/membershipPlansPrices/quote", json={"items": list(items)})
+
+    def get_plan_price(self, price_id: int, etag: Optional[str] = None) -> R:
+        return self._request(
+            "GET",
+            f"/membershipPlansPrices/{price_id}",
+            template="/membershipPlansPrices/:priceId",
+            headers=_conditional(etag),
+        )
+
+    def update_plan_price(self, price_id: int, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request(
+            "PUT",
+            f"/membershipPlansPrices/update/{price_id}",
+            template="/membershipPlansPrices/update/:priceId",
+            json=_payload(data, fields),
+        )
+
+    def delete_plan_price(self, price_id: int) -> R:
+        return self._request(
+            "DELETE",
+            f"/membershipPlansPrices/delete/{price_id}",
+            template="/membershipPlansPrices/delete/:priceId",
+        )
+
+    # -- members memberships (routes/membersMembershipRoutes.js) ------------
+
+    def create_members_membership(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/membersMemberships", json=_payload(data, fields))
+
+    def create_members_memberships_batch(self, items: Any, atomic: bool = False) -> R:
+        return self._request("POST", "/membersMemberships/batch", **_batch(items, atomic))
+
+    def list_members_memberships(self, **params: Any) -> R:
+        return self._request("GET", "/membersMemberships", params=params)
+
+    def expiring_memberships(self, days: Optional[int] = None, **params: Any) -> R:
+        """Memberships ending within ``days`` days (server default 7); admins may pass ``gymId``."""
+        if days is not None:
+            params["days"] = days
+        return self._request("GET", "/membersMemberships/expiring", params=params)
+
+    def renew_expiring_memberships(
+        self, days: Optional[int] = None, gym_id: Optional[int] = None, dry_run: bool = False
+    ) -> R:
+        body: Dict[str, Any] = {"dryRun": dry_run}
+        if days is not None:
+            body["days"] = days
+        if gym_id is not None:
+            body["gymId"] = gym_id
+        return self._request("POST", "/membersMemberships/renewals", json=body)
+
+    def get_members_membership(self, membership_id: int) -> R:
+        return self._request(
+            "GET", f"/membersMemberships/{membership_id}", template="/membersMemberships/:membershipId"
+        )
+
+    def update_members_membership(
+        self, membership_id: int, data: Optional[Mapping[str, Any]] = None, **fields: Any
+    ) -> R:
+        return self._request(
+            "PUT",
+            f"/membersMemberships/update/{membership_id}",
+            template="/membersMemberships/update/:membershipId",
+            json=_payload(data, fields),
+        )
+
+    def delete_members_membership(self, membership_id: int) -> R:
+        return self._request(
+            "DELETE",
+            f"/membersMemberships/delete/{membership_id}",
+            template="/membersMemberships/delete/:membershipId",
+        )
+
+    # -- payments (routes/paymentsRoutes.js) --------------------------------
+
+    def create_payment(self, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request("POST", "/payments", json=_payload(data, fields))
+
+    def create_payments_batch(self, items: Any, atomic: bool = False) -> R:
+        return self._request("POST", "/payments/batch", **_batch(items, atomic))
+
+    def list_payments(self, **params: Any) -> R:
+        return self._request("GET", "/payments", params=params)
+
+    def get_payment(self, payment_id: int) -> R:
+        return self._request("GET", f"/payments/{payment_id}", template="/payments/:paymentId")
+
+    def update_payment(self, payment_id: int, data: Optional[Mapping[str, Any]] = None, **fields: Any) -> R:
+        return self._request(
+            "PUT", f"/payments/{payment_id}", template="/payments/:paymentId", json=_payload(data, fields)
+        )
+
+    def delete_payment(self, payment_id: int) -> R:
+        return self._request("DELETE", f"/payments/{payment_id}", template="/payments/:paymentId")
+
+    # -- analytics (routes/analyticsRoutes.js) ------------------------------
+
+    def revenue_analytics(self, **params: Any) -> R:
+        """Payments and revenue per gym and month; ``gymId``, ``from`` and ``to`` (YYYY-MM) filter."""
+        return self._request("GET", "/analytics/revenue", params=params)
+
+    def active_members_analytics(self, **params: Any) -> R:
+        return self._request("GET", "/analytics/activeMembers", params=params)
+
+    def rebuild_rollups(self) -> R:
+        return self._request("POST", "/analytics/rebuild")
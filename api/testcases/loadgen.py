@@ -0,0 +1,589 @@
+"""Asyncio load generator for the gym API.
+
+Replays the setup_data.py flows (signup/admin -> login -> create gym ->
+signup/gymmember -> membersMemberships) as weighted scenarios across a pool
+of concurrent virtual users and reports per-endpoint latency percentiles,
+throughput and error rate.
+
+With --pool-metrics N the connection pool of the API is sampled every N
+seconds from /api/internal/metrics, and each sample is reported next to the
+p95 latency of the requests that finished in the same interval, so latency
+spikes can be matched with pool exhaustion.
+
+Examples:
+    python loadgen.py --users 50 --ramp-up 30 --duration 120
+    python loadgen.py --stages 30:10,60:50,30:0 --scenario login=5 --scenario browse_gyms=3
+    python loadgen.py --users 100 --duration 60 --pool-metrics 1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import string
+import sys
+import time
+from dataclasses import dataclass, field
+
+import aiohttp
+
+from gymclient import DEFAULT_BASE_URL, AsyncGymClient
+from gymclient.async_client import new_session
+
+PASSWORD = "LoadTest@123"
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list = field(default_factory=list)
+    errors: int = 0
+    status_counts: dict = field(default_factory=dict)
+
+    @property
+    def requests(self):
+        return len(self.latencies_ms)
+
+    def record(self, latency_ms, status, ok):
+        self.latencies_ms.append(latency_ms)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed_s):
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": (self.errors / count) if count else 0.0,
+            "throughput_rps": (count / elapsed_s) if elapsed_s > 0 else 0.0,
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "max_ms": values[-1] if values else 0.0,
+            "status_counts": {str(k): v for k, v in sorted(self.status_counts.items(), key=str)},
+        }
+
+
+class StatsCollector:
+    def __init__(self):
+        self.endpoints = {}
+        self.started_at = None
+        self.finished_at = None
+        # (monotonic completion time, latency ms) of every request
+        self.completions = []
+
+    def record(self, endpoint, latency_ms, status, ok):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        stats.record(latency_ms, status, ok)
+        self.completions.append((time.monotonic(), latency_ms))
+
+    def latencies_between(self, start, end):
+        return sorted(latency for at, latency in self.completions if start <= at < end)
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def report(self):
+        elapsed = self.elapsed()
+        endpoints = {name: stats.summary(elapsed) for name, stats in sorted(self.endpoints.items())}
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.latencies_ms.extend(stats.latencies_ms)
+            total.errors += stats.errors
+            for status, n in stats.status_counts.items():
+                total.status_counts[status] = total.status_counts.get(status, 0) + n
+        return {"elapsed_s": elapsed, "endpoints": endpoints, "total": total.summary(elapsed)}
+
+
+def format_report(report):
+    header = f"{'endpoint':<42} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+    lines = [f"Elapsed: {report['elapsed_s']:.1f}s", header, "-" * len(header)]
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, s in rows:
+        lines.append(
+            f"{name:<42} {s['requests']:>7} {s['throughput_rps']:>8.1f} {s['error_rate'] * 100:>6.2f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Connection pool metrics
+# ---------------------------------------------------------------------------
+
+
+class PoolSampler:
+    """Samples the API's connection pool from /api/internal/metrics.
+
+    The endpoint only answers local requests unless the API has METRICS_TOKEN
+    set, in which case pass the same token. In cluster mode each sample comes
+    from whichever worker served it (its pid is kept).
+    """
+
+    def __init__(self, base_url, interval=1.0, token=None):
+        self.url = f"{base_url}/internal/metrics"
+        self.interval = interval
+        self.headers = {"X-Metrics-Token": token} if token else {}
+        self.samples = []
+
+    async def sample(self, session):
+        try:
+            async with session.get(self.url, headers=self.headers) as response:
+                if response.status != 200:
+                    return None
+                body = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+        pool = body["dbPool"]
+        sample = {
+            "at": time.monotonic(),
+            "pid": body.get("pid"),
+            "size": pool["size"],
+            "using": pool["using"],
+            "waiting": pool["waiting"],
+            "max": pool["config"]["max"],
+            "acquire_count": pool["acquire"]["count"],
+            "acquire_sum_ms": pool["acquire"]["sumMs"],
+        }
+        self.samples.append(sample)
+        return sample
+
+    async def run(self, session, stop):
+        while not stop.is_set():
+            await self.sample(session)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def report(self, stats):
+        """One row per sample with the request p95 of the interval before it, plus peaks."""
+        timeline = []
+        previous = None
+        for sample in self.samples:
+            start = previous["at"] if previous else stats.started_at or sample["at"]
+            latencies = stats.latencies_between(start, sample["at"])
+            acquire_avg_ms = None
+            if previous and previous["pid"] == sample["pid"]:
+                acquires = sample["acquire_count"] - previous["acquire_count"]
+                if acquires > 0:
+                    acquire_avg_ms = (sample["acquire_sum_ms"] - previous["acquire_sum_ms"]) / acquires
+            timeline.append(
+                {
+                    "t_s": round(sample["at"] - (stats.started_at or sample["at"]), 3),
+                    "pid": sample["pid"],
+                    "using": sample["using"],
+                    "waiting": sample["waiting"],
+                    "max": sample["max"],
+                    "acquire_avg_ms": acquire_avg_ms,
+                    "requests": len(latencies),
+                    "p95_ms": percentile(latencies, 95),
+                }
+            )
+            previous = sample
+        return {
+            "samples": len(timeline),
+            "peak_using": max((row["using"] for row in timeline), default=0),
+            "peak_waiting": max((row["waiting"] for row in timeline), default=0),
+            "saturated_samples": sum(1 for row in timeline if row["waiting"] > 0),
+            "timeline": timeline,
+        }
+
+
+def format_pool_report(pool):
+    lines = [
+        f"Pool: {pool['samples']} samples, peak {pool['peak_using']} in use, peak {pool['peak_waiting']} waiting, "
+        f"{pool['saturated_samples']} with requests queued for a connection",
+        f"{'t(s)':>7} {'using':>6} {'waiting':>8} {'acquire':>9} {'reqs':>6} {'p95':>8}",
+    ]
+    for row in pool["timeline"]:
+        acquire = f"{row['acquire_avg_ms']:.1f}ms" if row["acquire_avg_ms"] is not None else "-"
+        lines.append(
+            f"{row['t_s']:>7.1f} {row['using']:>3}/{row['max']:<2} {row['waiting']:>8} {acquire:>9} "
+            f"{row['requests']:>6} {row['p95_ms']:>6.1f}ms"
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Ramp-up schedule
+# ---------------------------------------------------------------------------
+
+
+def parse_stages(spec):
+    """Parse "duration:target,..." (seconds:virtual users) into a list of tuples."""
+    stages = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        duration, target = part.split(":")
+        duration, target = float(duration), int(target)
+        if duration < 0 or target < 0:
+            raise ValueError(f"Invalid stage: {part}")
+        stages.append((duration, target))
+    if not stages:
+        raise ValueError("At least one stage is required")
+    return stages
+
+
+def target_users(stages, elapsed):
+    """Number of virtual users that should be running `elapsed` seconds in.
+
+    Each stage ramps linearly from the previous stage's target to its own.
+    Returns None once the schedule is over.
+    """
+    previous = 0
+    offset = 0.0
+    for duration, target in stages:
+        if elapsed < offset + duration:
+            fraction = (elapsed - offset) / duration if duration else 1.0
+            return int(round(previous + (target - previous) * fraction))
+        previous = target
+        offset += duration
+    return None
+
+
+def total_duration(stages):
+    return sum(duration for duration, _ in stages)
+
+
+# ---------------------------------------------------------------------------
+# Virtual users and scenarios
+# ---------------------------------------------------------------------------
+
+
+def unique_suffix(k=8):
+    return "".join(random.choices(string.ascii_lowercase + string.digits, k=k))
+
+
+class VirtualUser:
+    """One simulated client with its own admin account and gym graph."""
+
+    def __init__(self, vu_id, session, stats, base_url):
+        self.vu_id = vu_id
+        self.stats = stats
+        self.client = AsyncGymClient(base_url, session=session)
+        self.client.hooks.append(self.record)
+        self.prefix = f"lg{vu_id}{unique_suffix(5)}"
+        self.seq = 0
+        self.admin = None
+        self.gym_id = None
+        self.plan_id = None
+        self.member_ids = []
+        self.membership_windows = {}
+
+    def next_name(self, kind):
+        self.seq += 1
+        return f"{self.prefix}_{kind}{self.seq}"
+
+    def record(self, method, template, status, elapsed_ms):
+        self.stats.record(f"{method} /api{template}", elapsed_ms, status, 200 <= status < 300)
+
+    async def call(self, request):
+        """Await one client call; returns (ok, body). Latency is recorded by the client hook."""
+        try:
+            response = await request
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False, None
+        return response.ok, response.json_or_none()
+
+    # -- building blocks ----------------------------------------------------
+
+    async def ensure_admin(self):
+        if self.client.token:
+            return True
+        admin = {"username": self.next_name("admin"), "password": PASSWORD}
+        ok, _ = await self.call(self.client.signup_admin(**admin))
+        if not ok:
+            return False
+        self.admin = admin
+        return await self.login()
+
+    async def login(self):
+        ok, body = await self.call(self.client.login(**self.admin))
+        return ok and bool(body and body.get("token"))
+
+    async def ensure_gym(self):
+        if self.gym_id:
+            return True
+        if not await self.ensure_admin():
+            return False
+        ok, body = await self.call(
+            self.client.create_gym(
+                name=f"Load Gym {self.prefix}",
+                address="123, ABC Street",
+                city="Mumbai",
+                state="Maharashtra",
+                country="India",
+                pincode="400001",
+                phone_number="9876543210",
+                email=f"{self.prefix}@loadtest.example.com",
+                contact_person="Load Tester",
+                currency="INR",
+                latitude=19.0760,
+                longitude=72.8777,
+            )
+        )
+        if not ok or not body:
+            return False
+        self.gym_id = body["gym"]["id"]
+        return True
+
+    async def ensure_plan(self):
+        if self.plan_id:
+            return True
+        if not await self.ensure_gym():
+            return False
+        ok, body = await self.call(
+            self.client.create_membership_plan(
+                gym_id=self.gym_id,
+                plan_name="Monthly Plan",
+                plan_description="Load test plan",
+                duration_type="months",
+                duration_value=1,
+                category="Regular",
+            )
+        )
+        if not ok or not body:
+            return False
+        self.plan_id = body["id"]
+        return True
+
+    async def create_member(self):
+        if not await self.ensure_gym():
+            return None
+        username = self.next_name("member")
+        ok, body = await self.call(
+            self.client.signup_gym_member(
+                username=username,
+                password=PASSWORD,
+                firstName="Load",
+                lastName="Member",
+                email=f"{username}@loadtest.example.com",
+                phone="9876543210",
+                gymId=self.gym_id,
+            )
+        )
+        if not ok or not body:
+            return None
+        member_id = body["user"]["id"]
+        self.member_ids.append(member_id)
+        return member_id
+
+    async def create_membership(self, member_id):
+        # Each member gets consecutive, non-overlapping 30 day windows
+        window = self.membership_windows.get(member_id, 0)
+        self.membership_windows[member_id] = window + 1
+        start = 1_719_619_200 + window * 30 * 86_400  # 2024-06-29 UTC
+        ok, _ = await self.call(
+            self.client.create_members_membership(
+                gym_member_id=member_id,
+                membership_plan_id=self.plan_id,
+                start_date=time.strftime("%Y-%m-%d", time.gmtime(start)),
+                end_date=time.strftime("%Y-%m-%d", time.gmtime(start + 29 * 86_400)),
+            )
+        )
+        return ok
+
+
+async def scenario_onboarding(vu):
+    """Full setup_data.py flow: admin, gym, plan, member and membership."""
+    if not await vu.ensure_plan():
+        return
+    member_id = await vu.create_member()
+    if member_id:
+        await vu.create_membership(member_id)
+
+
+async def scenario_login(vu):
+    if not await vu.ensure_admin():
+        return
+    await vu.login()
+
+
+async def scenario_browse_gyms(vu):
+    if not await vu.ensure_gym():
+        return
+    await vu.call(vu.client.list_gyms())
+    await vu.call(vu.client.get_gym(vu.gym_id))
+
+
+async def scenario_membership(vu):
+    """Create a membership for an already onboarded member."""
+    if not await vu.ensure_plan():
+        return
+    if not vu.member_ids and not await vu.create_member():
+        return
+    await vu.create_membership(random.choice(vu.member_ids))
+
+
+SCENARIOS = {
+    "onboarding": scenario_onboarding,
+    "login": scenario_login,
+    "browse_gyms": scenario_browse_gyms,
+    "membership": scenario_membership,
+}
+
+DEFAULT_WEIGHTS = {"onboarding": 1, "login": 4, "browse_gyms": 4, "membership": 2}
+
+
+def parse_weights(values):
+    if not values:
+        return dict(DEFAULT_WEIGHTS)
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+def pick_scenario(weights, rng=random):
+    names = [name for name, weight in weights.items() if weight > 0]
+    return rng.choices(names, weights=[weights[name] for name in names])[0]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+class LoadRunner:
+    def __init__(
+        self,
+        stages,
+        weights,
+        base_url=DEFAULT_BASE_URL,
+        think_time=0.0,
+        timeout=30.0,
+        scenarios=None,
+        pool_sampler=None,
+    ):
+        self.stages = stages
+        self.weights = weights
+        self.base_url = base_url
+        self.think_time = think_time
+        self.timeout = timeout
+        self.scenarios = scenarios or SCENARIOS
+        self.stats = StatsCollector()
+        self.peak_users = 0
+        self.pool_sampler = pool_sampler
+
+    async def _user_loop(self, vu, stop):
+        while not stop.is_set():
+            await self.scenarios[pick_scenario(self.weights)](vu)
+            if self.think_time:
+                await asyncio.sleep(random.uniform(0.5, 1.5) * self.think_time)
+            else:
+                await asyncio.sleep(0)
+
+    async def run(self):
+        # One keep-alive pool (unbounded, limit=0) shared by every virtual user
+        async with new_session(pool_size=0, timeout=self.timeout) as session:
+            running = []  # list of (task, stop_event)
+            next_vu_id = 0
+            self.stats.started_at = time.monotonic()
+            sampling = asyncio.Event()
+            sampler = None
+            if self.pool_sampler:
+                sampler = asyncio.create_task(self.pool_sampler.run(session, sampling))
+            while True:
+                target = target_users(self.stages, time.monotonic() - self.stats.started_at)
+                if target is None:
+                    break
+                while len(running) < target:
+                    stop = asyncio.Event()
+                    vu = VirtualUser(next_vu_id, session, self.stats, self.base_url)
+                    next_vu_id += 1
+                    running.append((asyncio.create_task(self._user_loop(vu, stop)), stop))
+                while len(running) > target:
+                    _, stop = running.pop()
+                    stop.set()
+                self.peak_users = max(self.peak_users, len(running))
+                await asyncio.sleep(0.1)
+            for _, stop in running:
+                stop.set()
+            if running:
+                await asyncio.gather(*(task for task, _ in running), return_exceptions=True)
+            self.stats.finished_at = time.monotonic()
+            if sampler:
+                sampling.set()
+                await sampler
+        report = self.stats.report()
+        report["peak_users"] = self.peak_users
+        if self.pool_sampler:
+            report["pool"] = self.pool_sampler.report(self.stats)
+        return report
+
+
+def build_stages(args):
+    if args.stages:
+        return parse_stages(args.stages)
+    stages = []
+    if args.ramp_up > 0:
+        stages.append((args.ramp_up, args.users))
+    stages.append((args.duration, args.users))
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asyncio load generator for the gym API")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users at steady state")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds to ramp from 0 to --users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to hold --users after ramp-up")
+    parser.add_argument("--stages", help="Custom schedule as duration:users,... (overrides --users/--ramp-up/--duration)")
+    parser.add_argument("--scenario", action="append", metavar="NAME=WEIGHT", help="Weighted scenario, repeatable")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between iterations in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", dest="json_path", help="Write the full report to this file")
+    parser.add_argument(
+        "--pool-metrics", type=float, default=0.0, metavar="SECONDS", help="Sample the DB pool at this interval"
+    )
+    parser.add_argument("--metrics-token", help="METRICS_TOKEN of the API, when it is not on this machine")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url.rstrip("/")
+    runner = LoadRunner(
+        build_stages(args),
+        parse_weights(args.scenario),
+        base_url=base_url,
+        think_time=args.think_time,
+        timeout=args.timeout,
+        pool_sampler=PoolSampler(base_url, args.pool_metrics, args.metrics_token) if args.pool_metrics > 0 else None,
+    )
+    print(f"Running {total_duration(runner.stages):.0f}s load against {runner.base_url} ({runner.weights})")
+    report = asyncio.run(runner.run())
+    print(format_report(report))
+    if "pool" in report:
+        print(format_pool_report(report["pool"]))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["total"]["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Run the unittest suites in parallel worker processes.
+
+Test classes are discovered the same way ``python -m unittest discover``
+does, then sharded across workers (largest classes first onto the least
+loaded worker). Each worker is a separate ``python -m unittest`` process
+with its own ``GYM_TEST_NAMESPACE`` so fixtures.py builds an isolated
+admin/gym/member graph per worker.
+
+Example:
+    python parallel_runner.py --workers 4
+    python parallel_runner.py -s api/testcases -p "*.py" --workers 8
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+def iter_tests(suite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+
+def discover_classes(start_dir, pattern):
+    """Map "module.Class" -> number of tests, in discovery order."""
+    suite = unittest.TestLoader().discover(start_dir, pattern=pattern)
+    classes = {}
+    for test in iter_tests(suite):
+        if type(test).__name__ == "_FailedTest":
+            # Import error: rerun the module itself so the worker reports it
+            class_id = test._testMethodName
+        else:
+            class_id = test.id().rsplit(".", 1)[0]
+        classes[class_id] = classes.get(class_id, 0) + 1
+    return classes
+
+
+def shard(classes, workers):
+    """Greedy longest-processing-time sharding of classes onto workers."""
+    shards = [[] for _ in range(max(1, workers))]
+    loads = [0] * len(shards)
+    for class_id, weight in sorted(classes.items(), key=lambda item: (-item[1], item[0])):
+        index = loads.index(min(loads))
+        shards[index].append(class_id)
+        loads[index] += weight
+    return [s for s in shards if s]
+
+
+@dataclass
+class WorkerResult:
+    worker: int
+    classes: list
+    returncode: int
+    output: str
+    elapsed_s: float
+
+    @property
+    def tests_run(self):
+        match = re.search(r"^Ran (\d+) tests?", self.output, re.MULTILINE)
+        return int(match.group(1)) if match else 0
+
+
+def run_worker(worker, classes, start_dir, extra_env=None):
+    env = dict(os.environ)
+    env.update(extra_env or {})
+    env["GYM_TEST_NAMESPACE"] = f"w{worker}"
+    started = time.monotonic()
+    completed = subprocess.run(
+        [sys.executable, "-m", "unittest", *classes],
+        cwd=start_dir,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    return WorkerResult(worker, classes, completed.returncode, completed.stdout, time.monotonic() - started)
+
+
+def run_parallel(start_dir, pattern="*.py", workers=None, extra_env=None):
+    start_dir = os.path.abspath(start_dir)
+    workers = workers or os.cpu_count() or 1
+    shards = shard(discover_classes(start_dir, pattern), workers)
+    with ThreadPoolExecutor(max_workers=len(shards) or 1) as pool:
+        futures = [
+            pool.submit(run_worker, index, classes, start_dir, extra_env) for index, classes in enumerate(shards)
+        ]
+        return [future.result() for future in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the API test suites in parallel worker processes")
+    parser.add_argument("-s", "--start-directory", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("-p", "--pattern", default="*.py")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    results = run_parallel(args.start_directory, args.pattern, args.workers)
+    for result in results:
+        status = "ok" if result.returncode == 0 else "FAILED"
+        print(f"===== worker {result.worker}: {status} ({result.tests_run} tests, {result.elapsed_s:.1f}s)")
+        print(f"      {', '.join(result.classes)}")
+        print(result.output)
+    failed = [r for r in results if r.returncode != 0]
+    total = sum(r.tests_run for r in results)
+    print(
+        f"Ran {total} tests in {len(results)} workers in {time.monotonic() - started:.1f}s: "
+        f"{'FAILED' if failed else 'OK'}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import unittest
+
+from fixtures import admin_client, plan_data, price_data, private_gym, remove_private_gym, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, GymClient
+
+
+class TestPriceQuoteEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+
+        plan = plan_data(cls.fixtures.gym_id, "Quote Plan")
+        cls.plan_id = cls.created(cls.client.create_membership_plan(plan))
+        first_half = cls.price(cls.plan_id, 100, "2030-01-01", "2030-06-30")
+        second_half = cls.price(cls.plan_id, 150, "2030-07-01", "2030-12-31")
+        cls.first_half = cls.created(cls.client.create_plan_price(first_half))
+        cls.second_half = cls.created(cls.client.create_plan_price(second_half))
+
+        cls.other_gym = private_gym(cls.client, price=80)
+        cls.other_plan_id = cls.other_gym.plan_ids[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        # The plan lives in the shared fixture gym: its prices go first
+        for price_id in (cls.first_half, cls.second_half):
+            assert cls.client.delete_plan_price(price_id).status_code == 204
+        assert cls.client.delete_membership_plan(cls.plan_id).status_code == 204
+        remove_private_gym(cls.client, cls.other_gym)
+        cls.client.close()
+
+    @classmethod
+    def created(cls, response):
+        assert response.status_code in (200, 201), response.text
+        return response.json()["id"]
+
+    @staticmethod
+    def price(plan_id, amount, start, end):
+        return price_data(plan_id, amount, start, end, comments="Quote test price")
+
+    def quote(self, client, *pairs):
+        response = client.quote_plan_prices({"membership_plan_id": plan, "date": date} for plan, date in pairs)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()
+
+    def test_01_resolves_each_pair(self):
+        body = self.quote(
+            self.client,
+            (self.plan_id, "2030-03-15"),
+            (self.plan_id, "2030-07-01"),
+            (self.plan_id, "2031-01-15"),
+            (self.fixtures.plan_id, "2050-01-01"),
+        )
+        results = body["results"]
+        self.assertEqual([r["status"] for r in results], [200, 200, 404, 200])
+        self.assertEqual(results[0]["price_id"], self.first_half)
+        self.assertEqual(results[1]["price_id"], self.second_half)
+        self.assertEqual(results[3]["price_id"], self.fixtures.price_id)
+        self.assertEqual((body["resolved"], body["unresolved"]), (3, 1))
+
+    def test_02_price_writes_are_seen(self):
+        self.quote(self.client, (self.plan_id, "2030-03-15"))
+        response = self.client.update_plan_price(self.first_half, price=110)
+        self.assertEqual(response.status_code, 200, response.text)
+        result = self.quote(self.client, (self.plan_id, "2030-03-15"))["results"][0]
+        self.assertEqual(float(result["price"]), 110.0)
+
+        extra = self.created(self.client.create_plan_price(self.price(self.plan_id, 200, "2031-01-01", "2031-12-31")))
+        result = self.quote(self.client, (self.plan_id, "2031-01-15"))["results"][0]
+        self.assertEqual(result["price_id"], extra)
+
+        self.assertEqual(self.client.delete_plan_price(extra).status_code, 204)
+        result = self.quote(self.client, (self.plan_id, "2031-01-15"))["results"][0]
+        self.assertEqual(result["status"], 404)
+
+    def test_03_other_gyms_plans_are_hidden(self):
+        member = GymClient(self.BASE_URL)
+        self.assertEqual(member.login(self.fixtures.member_username, self.fixtures.member_password).status_code, 200)
+        try:
+            results = self.quote(member, (self.plan_id, "2030-03-15"), (self.other_plan_id, "2030-03-15"))["results"]
+            self.assertEqual([r["status"] for r in results], [200, 404])
+            self.assertEqual(results[1]["error"], "Membership plan not found")
+        finally:
+            member.close()
+
+    def test_04_malformed_items(self):
+        body = self.quote(self.client, (self.plan_id, "not-a-date"), (None, "2030-03-15"))
+        self.assertEqual([r["status"] for r in body["results"]], [400, 400])
+        self.assertEqual(self.client.quote_plan_prices([]).status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import gzip
+import unittest
+
+from fixtures import admin_client, worker_fixtures
+from gymclient import DEFAULT_BASE_URL, datatables_params
+
+PAYMENTS = 3
+
+
+class TestProjectionEndpoints(unittest.TestCase):
+    BASE_URL = DEFAULT_BASE_URL
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = worker_fixtures(cls.BASE_URL)
+        cls.client = admin_client(cls.BASE_URL)
+        cls.payment_ids = []
+        for i in range(PAYMENTS):
+            response = cls.client.create_payment(
+                gym_member_id=cls.fixtures.member_id,
+                membership_plan_id=cls.fixtures.plan_id,
+                start_date="2032-01-01",
+                end_date="2032-01-31",
+                payment_date=f"2032-01-0{i + 1}",
+                payment_type="calculated_fee",
+                payment_method="cash",
+                total_amount="25.00",
+                comments="projection test " * 20,
+            )
+            assert response.status_code == 201, response.text
+            cls.payment_ids.append(response.json()["id"])
+
+    @classmethod
+    def tearDownClass(cls):
+        for payment_id in cls.payment_ids:
+            cls.client.delete_payment(payment_id)
+        cls.client.close()
+
+    def payments(self, **params):
+        filter_ = '{"gym_member_id": %d}' % self.fixtures.member_id
+        response = self.client.list_payments(size=PAYMENTS, sort="id,asc", filter=filter_, **params)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()["payments"]
+
+    def test_fields_select_columns_of_the_model_and_its_includes(self):
+        rows = self.payments(fields="total_amount,User.username")
+        self.assertEqual(len(rows), PAYMENTS)
+        for row in rows:
+            self.assertEqual(set(row) - {"MembershipPlan"}, {"id", "total_amount", "User"})
+            self.assertEqual(row["User"], {"username": self.fixtures.member_username})
+            self.assertFalse(row.get("MembershipPlan"))
+
+    def test_raw_rows_match_instances(self):
+        self.assertEqual(self.payments(raw="true"), self.payments())
+        fields = "payment_date,MembershipPlan.plan_name"
+        self.assertEqual(self.payments(fields=fields, raw=1), self.payments(fields=fields))
+
+    def test_unknown_or_hidden_fields_are_rejected(self):
+        self.assertEqual(self.client.list_payments(fields="no_such_column").status_code, 400)
+        self.assertEqual(self.client.list_payments(fields="User.password").status_code, 400)
+        self.assertEqual(self.client.list_users(fields="password").status_code, 400)
+        self.assertEqual(self.client.list_gym_member_links(fields="member.password").status_code, 400)
+
+    def test_other_list_endpoints(self):
+        users = self.client.list_users(limit=5, fields="username", raw="true").json()["data"]
+        self.assertTrue(users)
+        self.assertTrue(all(set(user) == {"id", "username"} for user in users))
+
+        params = datatables_params(length=5, fields="end_date,User.username")
+        memberships = self.client.list_members_memberships(**params).json()["data"]
+        for row in memberships:
+            self.assertEqual(set(row) - {"MembershipPlan"}, {"id", "end_date", "User"})
+
+        # Cursor pages keep the sort column, which the cursor is built from
+        params = datatables_params(length=2, fields="gym.name", raw="true", cursor="")
+        page = self.client.list_gym_member_links(**params).json()
+        for row in page["data"]:
+            self.assertEqual(set(row["gym"]), {"name"})
+        if page["nextCursor"]:
+            params["cursor"] = page["nextCursor"]
+            self.assertEqual(self.client.list_gym_member_links(**params).status_code, 200)
+
+    def test_compression(self):
+        path = f"/payments?size={PAYMENTS}"
+        plain = self.client.get(path, headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertIn("Accept-Encoding", plain.headers.get("Vary", ""))
+
+        response = self.client.session.get(
+            f"{self.client.base_url}{path}",
+            headers={"Authorization": f"Bearer {self.client.token}", "Accept-Encoding": "gzip"},
+            stream=True,
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        body = response.raw.read()
+        self.assertLess(len(body), len(plain.content))
+        self.assertEqual(gzip.decompress(body), plain.content)
+
+
+if __name__ == "__main__":
+    unittest.main()
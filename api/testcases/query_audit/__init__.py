@@ -0,0 +1,32 @@
+"""Query-plan audit of the controllers' queries.
+
+Every shape in ``SHAPES`` mirrors a query the API issues on a hot path (the
+membership overlap check, gym scoping, list filters, searches) and names the
+index declared for it in the models. On top of these, ``--captured`` audits
+the SELECTs the controllers really sent: an API started with
+``QUERY_LOG=<file>`` writes one per distinct statement shape
+(``utils/queryMetrics.js``), e.g. while the parallel suite runs, so a
+dropped ``where`` or an include that no longer uses an index shows up as a
+full scan. The audit runs EXPLAIN for each against a seeded MySQL database
+(the one configured in ``api/.env``) and flags full table scans and plans
+that do not use the expected index.
+
+Run from ``api/testcases``:
+    python -m query_audit --dataset ci --seed-data
+    python -m query_audit --shape memberships -v
+    python -m query_audit --captured ../query-log.ndjson
+"""
+
+from .captured import load_captured, unfiltered_page
+from .plan import Finding, analyze
+from .shapes import SHAPES, QueryShape, declared_indexes
+
+__all__ = [
+    "Finding",
+    "QueryShape",
+    "SHAPES",
+    "analyze",
+    "declared_indexes",
+    "load_captured",
+    "unfiltered_page",
+]
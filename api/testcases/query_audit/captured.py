@@ -0,0 +1,47 @@
+import json
+import re
+
+from .plan import ANY_TABLE
+from .shapes import QueryShape
+
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+def unfiltered_page(sql):
+    """Whether ``sql`` is a page of a whole table (a LIMIT and no WHERE at all).
+
+    Such a statement reads only a page's worth of rows, however large the
+    table, so the full scan EXPLAIN reports for it is not a finding.
+    """
+    return bool(_LIMIT.search(sql)) and not _WHERE.search(sql)
+
+
+def load_captured(path):
+    """Query shapes of the statements in a ``QUERY_LOG`` file, one per distinct shape.
+
+    The API writes the file (``utils/queryMetrics.js``) with the route that
+    sent each statement; shapes are named after it, e.g. ``GET /api/payments
+    #2``. Statements sent outside a request (the scheduler, startup) are
+    named ``background``.
+    """
+    shapes, seen, per_route = [], set(), {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["shape"] in seen:
+                continue
+            seen.add(entry["shape"])
+            route = entry.get("route") or "background"
+            per_route[route] = per_route.get(route, 0) + 1
+            sql = entry["sql"].rstrip().rstrip(";")
+            shapes.append(
+                QueryShape(
+                    f"{route} #{per_route[route]}",
+                    sql,
+                    allow_scan=(ANY_TABLE,) if unfiltered_page(sql) else (),
+                )
+            )
+    return shapes
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+# In ``QueryShape.allow_scan``: a full scan of any table is acceptable
+ANY_TABLE = "*"
+
+
+@dataclass(frozen=True)
+class Finding:
+    shape: str
+    table: str
+    problem: str
+
+
+def analyze(shape, plan, min_rows=100):
+    """Findings for one EXPLAIN result (a list of row dicts) of ``shape``.
+
+    A full table scan (``type`` ALL) is flagged once the optimizer expects to
+    read at least ``min_rows`` rows; below that MySQL legitimately prefers
+    scanning a tiny table over using an index.
+    """
+    findings = []
+    for row in plan:
+        table = row.get("table")
+        rows = row.get("rows") or 0
+        allowed = table in shape.allow_scan or ANY_TABLE in shape.allow_scan
+        if row.get("type") == "ALL" and not allowed and rows >= min_rows:
+            findings.append(Finding(shape.name, table, f"full table scan over ~{rows} rows"))
+
+    if shape.expect_key and not any(row.get("key") == shape.expect_key for row in plan):
+        used = ", ".join(sorted({str(row.get("key")) for row in plan})) or "nothing"
+        findings.append(
+            Finding(shape.name, plan[0].get("table") if plan else "", f"expected {shape.expect_key}, uses {used}")
+        )
+    return findings
+
+
+def format_plan(plan):
+    lines = [f"  {'table':<24} {'type':<10} {'key':<40} {'rows':>8}  extra"]
+    for row in plan:
+        lines.append(
+            f"  {str(row.get('table')):<24} {str(row.get('type')):<10} {str(row.get('key')):<40} "
+            f"{row.get('rows') or 0:>8}  {row.get('Extra') or ''}"
+        )
+    return "\n".join(lines)
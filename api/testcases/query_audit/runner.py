@@ -0,0 +1,131 @@
+import argparse
+import os
+
+from benchmarks.cases import DATASETS
+from benchmarks.runner import seed_dataset
+
+from .captured import load_captured
+from .plan import analyze, format_plan
+from .shapes import SHAPES
+
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".env")
+TABLES = [
+    "Users",
+    "Gyms",
+    "GymAndGymAdmins",
+    "GymAndGymMembers",
+    "MembershipPlans",
+    "MembershipPlansPrices",
+    "MembersMemberships",
+    "Payments",
+]
+
+
+def read_env_file(path):
+    values = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip().strip("'\"")
+    except FileNotFoundError:
+        pass
+    return values
+
+
+def db_config(environ=os.environ, env_file=ENV_FILE):
+    """Connection settings of the API's database: DB_* variables over api/.env."""
+    values = read_env_file(env_file)
+    values.update({key: value for key, value in environ.items() if key.startswith("DB_")})
+    return {
+        "host": values.get("DB_HOST", "localhost"),
+        "port": int(values.get("DB_PORT", "3306")),
+        "user": values.get("DB_USERNAME"),
+        "password": values.get("DB_PASSWORD") or "",
+        "database": values.get("DB_NAME"),
+    }
+
+
+def connect(config):
+    try:
+        import pymysql
+        import pymysql.cursors
+    except ImportError:
+        raise SystemExit("The query audit needs PyMySQL: pip install -r requirements.txt")
+    return pymysql.connect(**config, cursorclass=pymysql.cursors.DictCursor, autocommit=True)
+
+
+def explain(cursor, shape):
+    """EXPLAIN rows for ``shape``, or None if the data has no sample for it."""
+    params = {}
+    if shape.sample:
+        cursor.execute(shape.sample)
+        params = cursor.fetchone()
+        if params is None:
+            return None
+    cursor.execute("EXPLAIN " + shape.sql, params or None)
+    return list(cursor.fetchall())
+
+
+def audit(connection, shapes, min_rows=100):
+    """Returns ``(results, skipped)``; results are ``(shape, plan, findings)``."""
+    results, skipped = [], []
+    with connection.cursor() as cursor:
+        for shape in shapes:
+            plan = explain(cursor, shape)
+            if plan is None:
+                skipped.append(shape)
+            else:
+                results.append((shape, plan, analyze(shape, plan, min_rows)))
+    return results, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the controllers' query shapes and flag full scans")
+    parser.add_argument("--dataset", choices=sorted(DATASETS), default="ci")
+    parser.add_argument("--seed-data", action="store_true", help="seed the dataset with scripts/seed.js first")
+    parser.add_argument("--shape", action="append", default=[], help="only audit shapes whose name contains this")
+    parser.add_argument("--min-rows", type=int, default=100, help="ignore full scans of smaller tables")
+    parser.add_argument(
+        "--captured",
+        action="append",
+        default=[],
+        help="also audit the statements in this QUERY_LOG file of the API",
+    )
+    parser.add_argument("--env-file", default=ENV_FILE)
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    if args.seed_data:
+        seed_dataset(args.dataset)
+
+    shapes = SHAPES + [shape for path in args.captured for shape in load_captured(path)]
+    shapes = [s for s in shapes if not args.shape or any(part in s.name for part in args.shape)]
+    connection = connect(db_config(env_file=args.env_file))
+    try:
+        # Fresh statistics, so the plans reflect the seeded data
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE TABLE " + ", ".join(TABLES))
+            cursor.fetchall()
+        results, skipped = audit(connection, shapes, args.min_rows)
+    finally:
+        connection.close()
+
+    findings = [finding for _, _, shape_findings in results for finding in shape_findings]
+    for shape, plan, shape_findings in results:
+        print(f"{shape.name:<28} {'FLAGGED' if shape_findings else 'ok'}")
+        for finding in shape_findings:
+            print(f"  {finding.table}: {finding.problem}")
+        if shape_findings:
+            print(f"  {shape.sql}")
+        if args.verbose or shape_findings:
+            print(format_plan(plan))
+    for shape in skipped:
+        print(f"{shape.name:<28} skipped (no sample data)")
+
+    if findings:
+        print(f"{len(findings)} finding(s) in {len({f.shape for f in findings})} query shape(s)")
+        return 1
+    return 0
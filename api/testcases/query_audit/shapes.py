@@ -0,0 +1,152 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "models")
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """One query the controllers issue, as the SQL Sequelize generates for it.
+
+    ``sql`` uses PyMySQL ``%(name)s`` placeholders, filled from the row
+    returned by ``sample`` (a query picking real values from the seeded data).
+    ``expect_key`` is the index the plan should use; ``allow_scan`` lists
+    tables a full scan is acceptable on.
+    """
+
+    name: str
+    sql: str
+    sample: Optional[str] = None
+    expect_key: Optional[str] = None
+    allow_scan: Tuple[str, ...] = ()
+
+
+MEMBERSHIP = (
+    "SELECT gym_member_id AS member, membership_plan_id AS plan, start_date AS start, end_date AS end "
+    "FROM MembersMemberships ORDER BY id DESC LIMIT 1"
+)
+GYM_MEMBER = "SELECT gymId AS gym, memberId AS member FROM GymAndGymMembers ORDER BY id DESC LIMIT 1"
+GYM_ADMIN = "SELECT gymId AS gym, gymAdminId AS admin FROM GymAndGymAdmins ORDER BY id DESC LIMIT 1"
+PLAN = "SELECT id AS plan, gym_id AS gym FROM MembershipPlans ORDER BY id DESC LIMIT 1"
+PRICE = "SELECT membership_plan_id AS plan FROM MembershipPlansPrices ORDER BY id DESC LIMIT 1"
+PAYMENT = "SELECT gym_member_id AS member, membership_plan_id AS plan FROM Payments ORDER BY id DESC LIMIT 1"
+USER = "SELECT username FROM Users ORDER BY id DESC LIMIT 1"
+
+SHAPES = [
+    # membersMembershipController: overlap check on create/update
+    QueryShape(
+        "memberships.overlap_check",
+        "SELECT id FROM MembersMemberships WHERE gym_member_id = %(member)s "
+        "AND start_date < %(end)s AND end_date > %(start)s LIMIT 1",
+        MEMBERSHIP,
+        "members_memberships_member_period",
+    ),
+    # membersMembershipController: gym_member listing
+    QueryShape(
+        "memberships.member_list",
+        "SELECT * FROM MembersMemberships WHERE gym_member_id = %(member)s ORDER BY start_date LIMIT 10",
+        MEMBERSHIP,
+        "members_memberships_member_period",
+    ),
+    # gym_admin listings, scoped by utils/tenantScope.js
+    QueryShape(
+        "memberships.gym_list",
+        "SELECT * FROM MembersMemberships WHERE gym_member_id IN "
+        "(SELECT memberId FROM GymAndGymMembers WHERE gymId = %(gym)s) ORDER BY id LIMIT 10",
+        GYM_MEMBER,
+    ),
+    QueryShape(
+        "payments.gym_list",
+        "SELECT * FROM Payments WHERE gym_member_id IN "
+        "(SELECT memberId FROM GymAndGymMembers WHERE gymId = %(gym)s) ORDER BY start_date LIMIT 10",
+        GYM_MEMBER,
+    ),
+    # membersMembershipController: numeric search on membership_plan_id
+    QueryShape(
+        "memberships.by_plan",
+        "SELECT * FROM MembersMemberships WHERE membership_plan_id = %(plan)s ORDER BY start_date LIMIT 10",
+        MEMBERSHIP,
+        "members_memberships_plan_start",
+    ),
+    # membersMembershipController: member search through the User include
+    QueryShape(
+        "memberships.member_search",
+        "SELECT MembersMemberships.id FROM MembersMemberships "
+        "INNER JOIN Users ON Users.id = MembersMemberships.gym_member_id "
+        "WHERE MATCH (Users.username, Users.email) AGAINST ('+bench*' IN BOOLEAN MODE) LIMIT 10",
+        expect_key="users_search_fulltext",
+    ),
+    # authMiddleware, gym_admin scoping and the membership checks
+    QueryShape(
+        "gym_members.by_gym",
+        "SELECT memberId FROM GymAndGymMembers WHERE gymId = %(gym)s",
+        GYM_MEMBER,
+        "gym_and_gym_members_gym_member",
+    ),
+    QueryShape(
+        "gym_members.by_member",
+        "SELECT * FROM GymAndGymMembers WHERE memberId = %(member)s LIMIT 1",
+        GYM_MEMBER,
+        "gym_and_gym_members_member_gym",
+    ),
+    QueryShape(
+        "gym_admins.by_admin",
+        "SELECT * FROM GymAndGymAdmins WHERE gymAdminId = %(admin)s LIMIT 1",
+        GYM_ADMIN,
+        "gym_and_gym_admins_admin_gym",
+    ),
+    QueryShape("gym_admins.by_gym", "SELECT * FROM GymAndGymAdmins WHERE gymId = %(gym)s", GYM_ADMIN),
+    # gymMembershipPlanController: plans of a gym
+    QueryShape("plans.by_gym", "SELECT * FROM MembershipPlans WHERE gym_id = %(gym)s", PLAN),
+    # membershipPlansPriceController: price in effect for a plan
+    QueryShape(
+        "prices.in_effect",
+        "SELECT * FROM MembershipPlansPrices WHERE membership_plan_id = %(plan)s "
+        "AND validity_start_date <= NOW() AND validity_end_date >= NOW()",
+        PRICE,
+        "membership_plans_prices_plan_validity",
+    ),
+    # paymentsController: default listing and the usual filters
+    QueryShape(
+        "payments.first_page",
+        "SELECT * FROM Payments ORDER BY start_date ASC LIMIT 10",
+        expect_key="payments_start_date",
+    ),
+    QueryShape(
+        "payments.by_member",
+        "SELECT * FROM Payments WHERE gym_member_id = %(member)s ORDER BY payment_date",
+        PAYMENT,
+        "payments_member_paid",
+    ),
+    QueryShape(
+        "payments.by_plan",
+        "SELECT * FROM Payments WHERE membership_plan_id = %(plan)s ORDER BY start_date LIMIT 10",
+        PAYMENT,
+        "payments_plan_start",
+    ),
+    # authController.login
+    QueryShape("users.login", "SELECT * FROM Users WHERE username = %(username)s LIMIT 1", USER),
+    # utils/search.js
+    QueryShape(
+        "users.search",
+        "SELECT id FROM Users WHERE MATCH (username, email) AGAINST ('+bench*' IN BOOLEAN MODE) LIMIT 10",
+        expect_key="users_search_fulltext",
+    ),
+    QueryShape(
+        "gyms.search",
+        "SELECT id FROM Gyms WHERE MATCH (name, city, contact_person) AGAINST ('+bench*' IN BOOLEAN MODE) LIMIT 10",
+        expect_key="gyms_search_fulltext",
+    ),
+]
+
+
+def declared_indexes(models_dir=MODELS_DIR):
+    """Index names declared in the Sequelize models' ``indexes`` options."""
+    names = set()
+    for filename in sorted(os.listdir(models_dir)):
+        if filename.endswith(".js"):
+            with open(os.path.join(models_dir, filename)) as f:
+                names.update(re.findall(r'name:\s*"([^"]+)"', f.read()))
+    return names
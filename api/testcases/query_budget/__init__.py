@@ -0,0 +1,20 @@
+"""Per-request SQL query budgets checked while the live suites run.
+
+The API counts the SQL statements of every request per route template
+(``http_request_db_queries`` on ``/api/internal/prometheus``). The runner
+scrapes it before and after each test and fails the test when a request to
+some route ran more statements than that route's budget in
+``budgets.json``, which is how N+1 regressions (a query per row or per item
+of a batch) get caught. Run the suites serially against a single-process API
+so the scrapes only see this run's requests.
+
+Run from ``api/testcases``:
+    python -m query_budget
+    python -m query_budget -p "export_endpoints.py" -v
+    python -m query_budget --record
+"""
+
+from .budget import BudgetTestResult, Scraper, load_budgets, over_budget, queries_by_route
+from .prometheus import parse
+
+__all__ = ["BudgetTestResult", "Scraper", "load_budgets", "over_budget", "parse", "queries_by_route"]
@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+import unittest
+
+import requests
+
+from .prometheus import parse
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "budgets.json")
+METRIC = "http_request_db_queries"
+# Routes whose requests are the harness's own, not the suite's
+IGNORED_PREFIXES = ("/api/internal/",)
+
+
+class Scraper:
+    """Fetches the API's Prometheus metrics."""
+
+    def __init__(self, base_url, token=None, session=None):
+        self.url = f"{base_url.rstrip('/')}/internal/prometheus"
+        self.headers = {"X-Metrics-Token": token} if token else {}
+        self.session = session or requests.Session()
+
+    def snapshot(self):
+        response = self.session.get(self.url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        return parse(response.text)
+
+
+def _route_buckets(samples):
+    """``{route: {le: cumulative count}}`` of the queries-per-request histogram, summed over workers."""
+    routes = {}
+    for (name, labels), value in samples.items():
+        if name != f"{METRIC}_bucket":
+            continue
+        labels = dict(labels)
+        route = f"{labels['method']} {labels['route']}"
+        buckets = routes.setdefault(route, {})
+        buckets[labels["le"]] = buckets.get(labels["le"], 0) + value
+    return routes
+
+
+def _bound(le):
+    return float("inf") if le == "+Inf" else float(le)
+
+
+def queries_by_route(before, after):
+    """Requests and queries per route between two snapshots.
+
+    Returns ``{route: {"requests": n, "max_queries": bound}}`` where
+    ``max_queries`` is the upper bound of the histogram bucket holding the
+    request with the most statements (exact up to 6, coarser above).
+    """
+    previous = _route_buckets(before)
+    usage = {}
+    for route, buckets in _route_buckets(after).items():
+        if any(route.split(" ", 1)[1].startswith(prefix) for prefix in IGNORED_PREFIXES):
+            continue
+        old = previous.get(route, {})
+        delta = {le: count - old.get(le, 0) for le, count in buckets.items()}
+        requests_seen = delta.get("+Inf", 0)
+        if requests_seen <= 0:
+            continue
+        max_queries = min(_bound(le) for le, count in delta.items() if count >= requests_seen)
+        usage[route] = {"requests": int(requests_seen), "max_queries": max_queries}
+    return usage
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+
+def over_budget(usage, budgets):
+    """``[(route, max_queries, budget)]`` for every route above its budget."""
+    violations = []
+    for route, seen in sorted(usage.items()):
+        budget = budgets["routes"].get(route, budgets["default"])
+        if seen["max_queries"] > budget:
+            violations.append((route, seen["max_queries"], budget))
+    return violations
+
+
+class BudgetTestResult(unittest.TextTestResult):
+    """Test result that fails tests whose requests exceeded a query budget.
+
+    Set ``scraper`` and ``budgets`` on the class before running. Every
+    route's worst request of the run is kept in ``observed``.
+    """
+
+    scraper = None
+    budgets = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.observed = {}
+        self._before = None
+
+    def startTest(self, test):
+        self._before = self.scraper.snapshot()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        usage = queries_by_route(self._before, self.scraper.snapshot())
+        for route, seen in usage.items():
+            self.observed[route] = max(self.observed.get(route, 0), seen["max_queries"])
+        violations = over_budget(usage, self.budgets)
+        if violations:
+            message = "; ".join(f"{route}: up to {seen:g} queries (budget {budget})" for route, seen, budget in violations)
+            try:
+                raise AssertionError(f"Query budget exceeded: {message}")
+            except AssertionError:
+                self.addFailure(test, sys.exc_info())
+        super().stopTest(test)
@@ -0,0 +1,27 @@
+import re
+
+SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)")
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def _unescape(value):
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def parse(text):
+    """Samples of a Prometheus text exposition as ``{(name, ((label, value), ...)): float}``.
+
+    Labels are sorted by name, so a key can be built without knowing the
+    order the server wrote them in.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        pairs = tuple(sorted((key, _unescape(val)) for key, val in LABEL.findall(labels or "")))
+        samples[(name, pairs)] = float(value)
+    return samples
@@ -0,0 +1,58 @@
+import argparse
+import json
+import math
+import os
+import unittest
+
+from gymclient import DEFAULT_BASE_URL
+
+from .budget import BUDGETS_FILE, BudgetTestResult, Scraper, load_budgets
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def record_budgets(path, budgets, observed):
+    """Store the worst request seen per route as that route's budget."""
+    routes = dict(budgets["routes"])
+    for route, seen in observed.items():
+        if not math.isinf(seen):
+            routes[route] = int(seen)
+    with open(path, "w") as f:
+        json.dump({"default": budgets["default"], "routes": dict(sorted(routes.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the live suites and enforce per-route SQL query budgets")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("-s", "--start-dir", default=TESTS_DIR)
+    parser.add_argument("-p", "--pattern", default="*_endpoints.py")
+    parser.add_argument("--budgets", default=BUDGETS_FILE)
+    parser.add_argument("--metrics-token", help="METRICS_TOKEN of the API, when it is not on this machine")
+    parser.add_argument("--record", action="store_true", help="write the worst request per route as its budget")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    budgets = load_budgets(args.budgets)
+    if args.record:
+        # Record what the suites do today instead of failing on it
+        budgets = {"default": math.inf, "routes": {}}
+
+    result_class = type(
+        "ConfiguredBudgetTestResult",
+        (BudgetTestResult,),
+        {"scraper": Scraper(args.base_url, args.metrics_token), "budgets": budgets},
+    )
+    suite = unittest.defaultTestLoader.discover(args.start_dir, pattern=args.pattern, top_level_dir=TESTS_DIR)
+    runner = unittest.TextTestRunner(verbosity=2 if args.verbose else 1, resultclass=result_class)
+    result = runner.run(suite)
+
+    width = max((len(route) for route in result.observed), default=5)
+    for route, seen in sorted(result.observed.items()):
+        print(f"{route:<{width}}  up to {seen:g} queries")
+
+    if args.record:
+        record_budgets(args.budgets, load_budgets(args.budgets), result.observed)
+        print(f"Recorded {len(result.observed)} route budgets to {args.budgets}")
+        return 0
+    return 0 if result.wasSuccessful() else 1
@@ -1,66 +1,61 @@
 import unittest
-import requests
-import random
+
+from fixture_cache import FixtureCache
+from fixtures import WorkerFixtures, namespace, unique_email, unique_name, worker_name
+from gymclient import DEFAULT_BASE_URL, GymClient
 
 class TestAdminSignupAndActions(unittest.TestCase):     
-    BASE_URL = "http://localhost:3000/api"  # Replace with your actual API base URL
+    BASE_URL = DEFAULT_BASE_URL
     ADMIN_TOKEN = None
-    ADMIN_USERNAME = "testadmin" + str(random.randint(1, 1000))
+    ADMIN_USERNAME = unique_name("testadmin")
     ADMIN_PASSWORD = "TestAdmin@123"
     GYM_ID = None
     GYM_MEMBER_ID = None
+    GYM_MEMBER_USERNAME = unique_name("jane_smith")
+    GYM_ADMIN_ID = None
+    GYM_ADMIN_USERNAME = unique_name("john_doe")
     MEMBERSHIP_PLAN_ID = None
 
     @classmethod
     def setUpClass(cls):
+        cls.client = GymClient(cls.BASE_URL)
+
         # Create a new admin account
         admin_data = {
             "username": cls.ADMIN_USERNAME,
             "password": cls.ADMIN_PASSWORD
         }
-        response = requests.post(f"{cls.BASE_URL}/signup/admin", json=admin_data)
+        response = cls.client.signup_admin(**admin_data)
         if response.status_code != 200:
             raise Exception("Failed to create admin account for testing")
 
         # Login as the new admin and store the token
-        login_response = requests.post(f"{cls.BASE_URL}/login", json=admin_data)
+        login_response = cls.client.login(**admin_data)
         if login_response.status_code != 200:
             raise Exception("Failed to login as admin for testing")
         cls.ADMIN_TOKEN = login_response.json()["token"]
 
-        # Use the token to delete all data
-        headers = {"Authorization": f"Bearer {cls.ADMIN_TOKEN}"}
-        response = requests.delete(f"{cls.BASE_URL}/deleteAll", headers=headers)
-        if response.status_code != 200:
-            raise Exception("Failed to delete all data")
-        print("Deleted all data:", response.json())
+        # No /deleteAll here: every record below is namespaced to this worker,
+        # so the suite can run next to others without wiping their data.
 
-        # Signup again to prepare for other test cases
-        signup_response = requests.post(f"{cls.BASE_URL}/signup/admin", json=admin_data)
-        if signup_response.status_code != 200:
-            raise Exception("Failed to signup admin again")
-
-        # Login again to get a new token for further actions
-        login_response = requests.post(f"{cls.BASE_URL}/login", json=admin_data)
-        if login_response.status_code != 200:
-            raise Exception("Failed to login again as admin")
-        cls.ADMIN_TOKEN = login_response.json()["token"]
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
 
     def test_admin_token(self):
         self.assertIsNotNone(self.ADMIN_TOKEN)
         print("Admin Token:", self.ADMIN_TOKEN)
 
     def test_create_gym(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         gym_data = {
-            "name": "Fitness Hub",
+            "name": unique_name("Fitness Hub"),
             "address": "123, ABC Street",
             "city": "Mumbai",
             "state": "Maharashtra",
             "country": "India",
             "pincode": "400001",
             "phone_number": "9876543210",
-            "email": "info@fitnesshub.com",
+            "email": unique_email("info"),
             "website": "www.fitnesshub.com",
             "contact_person": "Mr. John Doe",
             "currency": "INR",
@@ -69,7 +64,7 @@ class TestAdminSignupAndActions(unittest.TestCase):
         }
 
         # Send POST request to create a gym
-        response = requests.post(f"{self.BASE_URL}/gym", json=gym_data, headers=headers)
+        response = self.client.create_gym(gym_data)
         
         # Assert the response
         print("Create Gym Response:", response.json())
@@ -77,13 +72,12 @@ class TestAdminSignupAndActions(unittest.TestCase):
         self.__class__.GYM_ID = response.json()["gym"]["id"]
         
     def test_create_gym_member(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         gym_member = {
-            "username": "jane_smith",
+            "username": self.GYM_MEMBER_USERNAME,
             "password": "Password456",
             "firstName": "Jane",
             "lastName": "Smith",
-            "email": "jane.smith@example.com",
+            "email": unique_email("jane.smith"),
             "phone": "9876543210",
             "address": "789, PQR Street",
             "city": "Delhi",
@@ -100,19 +94,18 @@ class TestAdminSignupAndActions(unittest.TestCase):
             "gymId": self.GYM_ID
         }
         
-        response = requests.post(f"{self.BASE_URL}/signup/gymmember", json=gym_member, headers=headers)
+        response = self.client.signup_gym_member(gym_member)
         print("Create Gym Member Response:", response.json())
         self.assertEqual(response.status_code, 201)  # Typically, creation endpoints return 201
         self.__class__.GYM_MEMBER_ID = response.json()["user"]["id"]  
         
     def test_create_gym_admin(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         gym_admin = {
-            "username": "john_doe",
+            "username": self.GYM_ADMIN_USERNAME,
             "password": "Password123",
             "firstName": "John",
             "lastName": "Doe",
-            "email": "john.doe@example.com",
+            "email": unique_email("john.doe"),
             "phone": "9876543210",
             "address": "456, XYZ Street",
             "city": "Bangalore",
@@ -128,23 +121,17 @@ class TestAdminSignupAndActions(unittest.TestCase):
             "emergencyContactEmail": "jane.doe@example.com"
         }
         
-        response = requests.post(f"{self.BASE_URL}/signup/gymadmin", json=gym_admin, headers=headers)
+        response = self.client.signup_gym_admin(gym_admin)
         print("Create Gym Admin Response:", response.json())
         self.assertEqual(response.status_code, 201)  # Typically, creation endpoints return 201
         self.__class__.GYM_ADMIN_ID = response.json()["user"]["id"]
         
     def test_link_gym_admin_to_gym(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
-        link_data = {
-            "gymAdminId": self.GYM_ADMIN_ID,
-            "gymId": self.GYM_ID
-        }
-        response = requests.post(f"{self.BASE_URL}/gymAndGymAdmin", json=link_data, headers=headers)
+        response = self.client.link_gym_admin(self.GYM_ADMIN_ID, self.GYM_ID)
         print("Link Gym Admin to Gym Response:", response.json())
         self.assertEqual(response.status_code, 200)
             
     def test_create_membership_plan(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         membership_plan = {
             "gym_id": self.GYM_ID,
             "plan_name": "Monthly Plan",
@@ -153,13 +140,12 @@ class TestAdminSignupAndActions(unittest.TestCase):
             "duration_value": 1,
             "category": "Regular"
         }
-        response = requests.post(f"{self.BASE_URL}/gymMembershipPlans", json=membership_plan, headers=headers)
+        response = self.client.create_membership_plan(membership_plan)
         print("Create Membership Plan Response:", response.json())
         self.assertEqual(response.status_code, 201)
         self.__class__.MEMBERSHIP_PLAN_ID = response.json()["id"]
         
     def test_create_membership_plan_price(self):
-        headers = {"Authorization": f"Bearer {self.ADMIN_TOKEN}"}
         membership_plan_price = {
             "membership_plan_id": self.MEMBERSHIP_PLAN_ID,
             "price": 1000,
@@ -167,25 +153,42 @@ class TestAdminSignupAndActions(unittest.TestCase):
             "validity_end_date": "2025-06-29",
             "comments": "This is a test price"
         }
-        response = requests.post(f"{self.BASE_URL}/membershipPlansPrices", json=membership_plan_price, headers=headers)
+        response = self.client.create_plan_price(membership_plan_price)
         print("Create Membership Plan Price Response:", response.json())
         self.assertEqual(response.status_code, 201)
+        price_id = response.json()["id"]
         members_membership = {
             "gym_member_id": self.GYM_MEMBER_ID,
             "membership_plan_id": self.MEMBERSHIP_PLAN_ID,
             "start_date": "2024-06-29",
             "end_date": "2024-08-29"
         }
-        response = requests.post(f"{self.BASE_URL}/membersMemberships", json=members_membership, headers=headers)
+        response = self.client.create_members_membership(members_membership)
         print("Create Members Membership Response:", response.json())
         self.assertEqual(response.status_code, 201)
         
-        with open("setup_data.out", "w") as f:
-            f.write(f"ADMIN_TOKEN={TestAdminSignupAndActions.ADMIN_TOKEN}\n")
-            f.write(f"GYM_ID={TestAdminSignupAndActions.GYM_ID}\n")
-            f.write(f"GYM_MEMBER_ID={TestAdminSignupAndActions.GYM_MEMBER_ID}\n")
-            f.write(f"GYM_ADMIN_ID={TestAdminSignupAndActions.GYM_ADMIN_ID}\n")
-            f.write(f"MEMBERSHIP_PLAN_ID={TestAdminSignupAndActions.MEMBERSHIP_PLAN_ID}\n")
+        # Publish the graph to the fixture cache (replaces setup_data.out) so
+        # later suites and runs on this worker reuse it instead of rebuilding
+        cls = TestAdminSignupAndActions
+        FixtureCache().store(
+            cls.BASE_URL,
+            worker_name(),
+            WorkerFixtures(
+                namespace=namespace(),
+                admin_username=cls.ADMIN_USERNAME,
+                admin_password=cls.ADMIN_PASSWORD,
+                admin_token=cls.ADMIN_TOKEN,
+                gym_id=cls.GYM_ID,
+                gym_admin_id=cls.GYM_ADMIN_ID,
+                gym_admin_username=cls.GYM_ADMIN_USERNAME,
+                gym_admin_password="Password123",
+                member_id=cls.GYM_MEMBER_ID,
+                member_username=cls.GYM_MEMBER_USERNAME,
+                member_password="Password456",
+                plan_id=cls.MEMBERSHIP_PLAN_ID,
+                price_id=price_id,
+            ),
+        )
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,23 +1,12 @@
-import configparser
+"""Print the fixture graph cached for this worker (see fixture_cache.py).
 
-# Read the configuration file
-filename = "../setup_data.out"
+Reuses the cached entry when it is still valid and builds it otherwise.
+"""
 
-config = configparser.ConfigParser()
-config.read(filename)
+from dataclasses import asdict
 
-# Check if the section exists
-if "SetupData" in config:
-    # Accessing values from the section
-    ADMIN_TOKEN = config.get("SetupData", "ADMIN_TOKEN", fallback=None)
-    GYM_ID = config.get("SetupData", "GYM_ID", fallback=None)
-    GYM_MEMBER_ID = config.get("SetupData", "GYM_MEMBER_ID", fallback=None)
-    GYM_ADMIN_ID = config.get("SetupData", "GYM_ADMIN_ID", fallback=None)
+from fixtures import worker_fixtures
 
-    # Example usage
-    print(f"ADMIN_TOKEN: {ADMIN_TOKEN}")
-    print(f"GYM_ID: {GYM_ID}")
-    print(f"GYM_MEMBER_ID: {GYM_MEMBER_ID}")
-    print(f"GYM_ADMIN_ID: {GYM_ADMIN_ID}")
-else:
-    print("SetupData section not found in the configuration file.")
+if __name__ == "__main__":
+    for key, value in asdict(worker_fixtures()).items():
+        print(f"{key.upper()}: {value}")
@@ -0,0 +1,386 @@
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from benchmarks import BenchmarkCase, compare, mann_whitney_u
+from benchmarks.analytics_rollups import history_prefix, measure_analytics_rollups
+from benchmarks.auth_cache import measure_auth_cache
+from benchmarks.catalog_cache import measure_catalog_cache
+from benchmarks.cluster_scaling import efficiency, measure_cluster_scaling
+from benchmarks.expiry_buckets import seed_expiring
+from benchmarks.list_payload import PAGE_SIZE, measure_list_payload
+from benchmarks.logging_overhead import measure_logging_overhead
+from benchmarks.login_burst import measure_login_burst, p95
+from benchmarks.runner import (
+    baseline_path,
+    check_baseline,
+    compare_to_baseline,
+    load_baseline,
+    main,
+    save_baseline,
+    time_case,
+)
+from benchmarks.startup import measure_startup
+from benchmarks.tenant_scope import admin_username, measure_tenant_scope, tenant_prefix
+
+
+class TestMannWhitneyU(unittest.TestCase):
+
+    def test_clear_slowdown_is_significant(self):
+        rng = random.Random(1)
+        baseline = [rng.gauss(20, 1) for _ in range(30)]
+        current = [rng.gauss(26, 1) for _ in range(30)]
+        _, p_value = mann_whitney_u(baseline, current)
+        self.assertLess(p_value, 0.001)
+
+    def test_speedup_is_not_a_regression(self):
+        rng = random.Random(2)
+        baseline = [rng.gauss(26, 1) for _ in range(30)]
+        current = [rng.gauss(20, 1) for _ in range(30)]
+        _, p_value = mann_whitney_u(baseline, current)
+        self.assertGreater(p_value, 0.99)
+
+    def test_all_ties(self):
+        self.assertEqual(mann_whitney_u([5.0] * 10, [5.0] * 10)[1], 1.0)
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_needs_significance_and_threshold(self):
+        rng = random.Random(3)
+        baseline = [rng.gauss(100, 1) for _ in range(40)]
+        # Significant but only ~3% slower: below the 10% threshold
+        small = [rng.gauss(103, 1) for _ in range(40)]
+        self.assertFalse(compare("case", baseline, small).regressed)
+        large = [rng.gauss(130, 1) for _ in range(40)]
+        result = compare("case", baseline, large)
+        self.assertTrue(result.regressed)
+        self.assertAlmostEqual(result.ratio, 1.3, delta=0.05)
+
+    def test_noise_is_not_flagged(self):
+        rng = random.Random(4)
+        baseline = [rng.gauss(100, 30) for _ in range(30)]
+        current = [rng.gauss(100, 30) for _ in range(30)]
+        self.assertFalse(compare("case", baseline, current).regressed)
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.baseline_dir)
+
+    def test_warmup_calls_are_not_recorded(self):
+        call = MagicMock(return_value=MagicMock(status_code=200))
+        samples = time_case(MagicMock(), BenchmarkCase("case", call), warmup=3, repeats=5)
+        self.assertEqual(call.call_count, 8)
+        self.assertEqual(len(samples), 5)
+
+    def test_error_responses_abort(self):
+        call = MagicMock(return_value=MagicMock(status_code=500, text="boom"))
+        with self.assertRaises(RuntimeError):
+            time_case(MagicMock(), BenchmarkCase("case", call), warmup=0, repeats=1)
+
+    def test_baseline_round_trip(self):
+        path = baseline_path("ci", self.baseline_dir)
+        save_baseline(path, "ci", {"gym.first_page": [10.0, 11.0, 12.0]}, warmup=1, repeats=3)
+        baseline = load_baseline(path)
+        self.assertEqual(baseline["cases"]["gym.first_page"]["median_ms"], 11.0)
+        comparisons, missing = compare_to_baseline(
+            baseline, {"gym.first_page": [10.5, 11.0, 11.5], "users.first_page": [5.0]}
+        )
+        self.assertEqual([c.name for c in comparisons], ["gym.first_page"])
+        self.assertEqual(missing, ["users.first_page"])
+        self.assertIsNone(load_baseline(os.path.join(self.baseline_dir, "missing.json")))
+
+    def test_missing_baselines_fail_only_when_required(self):
+        path = baseline_path("ci", self.baseline_dir)
+        results = {"gym.first_page": [10.0, 11.0, 12.0]}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(check_baseline(path, "ci", results), 0)
+            self.assertEqual(check_baseline(path, "ci", results, require=True), 1)
+            save_baseline(path, "ci", results, warmup=1, repeats=3)
+            self.assertEqual(check_baseline(path, "ci", results, require=True), 0)
+            results["users.first_page"] = [5.0]
+            self.assertEqual(check_baseline(path, "ci", results), 0)
+            self.assertEqual(check_baseline(path, "ci", results, require=True), 1)
+
+    def test_report_only_passes_missed_thresholds(self):
+        with patch("benchmarks.runner.run", return_value=1), contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main([]), 1)
+            self.assertEqual(main(["--report-only"]), 0)
+
+
+class TestAuthCacheBenchmark(unittest.TestCase):
+
+    def test_first_call_per_token_counts_as_cold(self):
+        client = MagicMock()
+        client.login.side_effect = [MagicMock(json=MagicMock(return_value={"token": f"t{i}"})) for i in range(3)]
+        call = MagicMock(return_value=MagicMock(status_code=200))
+        result = measure_auth_cache(client, "admin", "secret", call, tokens=3, warm_calls=4)
+        self.assertEqual(call.call_count, 15)
+        self.assertEqual([c.args[0] for c in client.clone.call_args_list], ["t0", "t1", "t2"])
+        self.assertEqual(set(result), {"cold_median_ms", "warm_median_ms", "savings_ms"})
+
+
+class TestCatalogCacheBenchmark(unittest.TestCase):
+
+    def test_forces_misses_and_revalidates(self):
+        calls = []
+
+        def get(path, params=None, headers=None):
+            calls.append((params, headers))
+            if headers:
+                return MagicMock(status_code=304)
+            return MagicMock(status_code=200, headers={"ETag": '"v1"'})
+
+        client = MagicMock()
+        client.get.side_effect = get
+        result = measure_catalog_cache(client, "/gym/1", warmup=0, repeats=2)
+        self.assertEqual(len(calls), 8)
+        self.assertIn("_", calls[0][0])
+        self.assertNotEqual(calls[0][0], calls[4][0])
+        self.assertEqual(calls[3][1], {"If-None-Match": '"v1"'})
+        self.assertEqual(set(result), {"miss_median_ms", "hit_median_ms", "not_modified_median_ms", "speedup"})
+
+    def test_unexpected_status_raises(self):
+        client = MagicMock()
+        client.get.return_value = MagicMock(status_code=401, headers={})
+        with self.assertRaises(RuntimeError):
+            measure_catalog_cache(client, "/gym/1", warmup=0, repeats=1)
+
+
+class TestTenantScopeBenchmark(unittest.TestCase):
+
+    def test_seeds_missing_gyms_and_reports_ratios(self):
+        admin = MagicMock()
+        # The 10-member gym exists, the 100-member one has to be seeded first
+        admin.login.side_effect = [MagicMock(status_code=200), MagicMock(status_code=401), MagicMock(status_code=200)]
+        client = MagicMock()
+        client.clone.return_value = admin
+        seed = MagicMock()
+        call = MagicMock(return_value=MagicMock(status_code=200))
+        result = measure_tenant_scope(client, seed, sizes=(10, 100), calls={"list": call}, warmup=1, repeats=2)
+        seed.assert_called_once_with(tenant_prefix(100), {"gyms": 1, "members-per-gym": 100, "payments-per-membership": 1})
+        self.assertEqual([c.args[0] for c in admin.login.call_args_list], [admin_username(10)] + [admin_username(100)] * 2)
+        self.assertEqual(call.call_count, 6)
+        self.assertEqual(set(result["medians"]["list"]), {10, 100})
+        self.assertIn("list", result["ratios"])
+
+
+class TestAnalyticsRollupsBenchmark(unittest.TestCase):
+
+    def test_seeds_one_gym_per_history_size(self):
+        admin = MagicMock()
+        # The 1-payment gym exists, the 10-payment one has to be seeded first
+        admin.login.side_effect = [MagicMock(status_code=200), MagicMock(status_code=401), MagicMock(status_code=200)]
+        client = MagicMock()
+        client.clone.return_value = admin
+        seed = MagicMock()
+        call = MagicMock(return_value=MagicMock(status_code=200))
+        result = measure_analytics_rollups(client, seed, sizes=(1, 10), calls={"revenue": call}, warmup=1, repeats=2)
+        seed.assert_called_once_with(
+            history_prefix(10), {"gyms": 1, "members-per-gym": 100, "payments-per-membership": 10}
+        )
+        self.assertEqual(call.call_count, 6)
+        self.assertEqual(set(result["medians"]["revenue"]), {1, 10})
+        self.assertIn("revenue", result["ratios"])
+
+    def test_error_response_aborts(self):
+        client = MagicMock()
+        client.clone.return_value.login.return_value = MagicMock(status_code=200)
+        call = MagicMock(return_value=MagicMock(status_code=500, text="boom"))
+        with self.assertRaises(RuntimeError):
+            measure_analytics_rollups(client, MagicMock(), sizes=(1,), calls={"revenue": call}, warmup=0, repeats=1)
+
+
+class TestExpiryBucketsBenchmark(unittest.TestCase):
+
+    def test_seeds_one_expiring_membership_per_member(self):
+        admin = MagicMock()
+        admin.expiring_memberships.return_value = MagicMock(status_code=200, **{"json.return_value": {"data": []}})
+        rows = [{"gym_member_id": i, "membership_plan_id": 7} for i in range(1200)]
+        admin.list_members_memberships.return_value = MagicMock(**{"json.return_value": {"data": rows}})
+        seed_expiring(admin, 1200)
+        batches = [c.args[0] for c in admin.create_members_memberships_batch.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [500, 500, 200])
+        items = [item for batch in batches for item in batch]
+        self.assertEqual(len({item["gym_member_id"] for item in items}), 1200)
+        self.assertTrue(all(item["start_date"] < item["end_date"] for item in items))
+
+    def test_already_seeded_gym_is_left_alone(self):
+        admin = MagicMock()
+        admin.expiring_memberships.return_value = MagicMock(**{"json.return_value": {"data": [{}] * 60}})
+        seed_expiring(admin, 100)
+        admin.create_members_memberships_batch.assert_not_called()
+
+
+class TestLoginBurstBenchmark(unittest.TestCase):
+
+    def test_p95_nearest_rank(self):
+        self.assertEqual(p95(list(range(1, 101))), 95)
+        self.assertEqual(p95([3.0]), 3.0)
+
+    def test_reads_timed_with_and_without_logins(self):
+        user = MagicMock()
+        user.login.return_value = MagicMock(status_code=200)
+        client = MagicMock()
+        client.clone.return_value = user
+        call = MagicMock(return_value=MagicMock(status_code=200))
+        result = measure_login_burst(client, "admin", "secret", call, logins=2, warmup=1, repeats=3)
+        self.assertEqual(call.call_count, 8)
+        self.assertEqual(client.clone.call_count, 2)
+        self.assertGreater(result["logins"], 0)
+        self.assertEqual(set(result), {"idle", "burst", "logins", "ratio"})
+
+    def test_failed_login_aborts(self):
+        user = MagicMock()
+        user.login.return_value = MagicMock(status_code=503)
+        client = MagicMock()
+        client.clone.return_value = user
+        call = MagicMock(return_value=MagicMock(status_code=200))
+        with self.assertRaises(RuntimeError):
+            measure_login_burst(client, "admin", "secret", call, logins=1, warmup=0, repeats=1)
+
+
+class TestClusterScalingBenchmark(unittest.TestCase):
+
+    def test_efficiency_relative_to_smallest_count(self):
+        self.assertEqual(efficiency({1: 100.0, 2: 200.0, 4: 300.0}), {1: 1.0, 2: 1.0, 4: 0.75})
+        self.assertEqual(efficiency({2: 200.0, 4: 200.0}), {2: 1.0, 4: 0.5})
+
+    def test_starts_one_server_per_worker_count(self):
+        started = []
+
+        @contextlib.contextmanager
+        def start(workers):
+            started.append(workers)
+            yield f"http://api.test/{workers}"
+
+        async def throughput(base_url, token, call, concurrency, duration):
+            workers = int(base_url.rsplit("/", 1)[1])
+            return 90.0 * workers, 0
+
+        login = MagicMock(return_value="token")
+        result = measure_cluster_scaling(start, login, None, worker_counts=(1, 2), throughput=throughput)
+        self.assertEqual(started, [1, 2])
+        self.assertEqual(login.call_count, 2)
+        self.assertEqual(result["rps"], {1: 90.0, 2: 180.0})
+        self.assertEqual(result["efficiency"], {1: 1.0, 2: 1.0})
+
+
+class TestLoggingOverheadBenchmark(unittest.TestCase):
+
+    def test_starts_one_server_per_config(self):
+        started = []
+
+        @contextlib.contextmanager
+        def start(env):
+            started.append(env)
+            yield "http://api.test/" + env.get("LOG_PIPELINE", "pipeline")
+
+        async def throughput(base_url, token, call, concurrency, duration):
+            return (150.0 if base_url.endswith("pipeline") else 100.0), 0
+
+        login = MagicMock(return_value="token")
+        result = measure_logging_overhead(start, login, None, throughput=throughput)
+        self.assertEqual([env.get("LOG_PIPELINE") for env in started], ["legacy", None])
+        self.assertEqual(result["rps"], {"legacy": 100.0, "pipeline": 150.0})
+        self.assertEqual(result["speedup"], 1.5)
+
+
+class TestListPayloadBenchmark(unittest.TestCase):
+
+    def test_reports_wire_size_and_cpu_per_variant(self):
+        sizes = {"identity": "9000", "gzip": "900"}
+        client = MagicMock()
+        client.get.side_effect = lambda path, params, headers: MagicMock(
+            status_code=200, headers={"Content-Length": sizes[headers["Accept-Encoding"]]}
+        )
+        cpu = iter([1.0, 1.5, 2.0, 2.1])
+        variants = {"before": ({}, "identity"), "gzip": ({"raw": "true"}, "gzip")}
+        result = measure_list_payload(client, lambda: next(cpu), variants, warmup=1, repeats=5)
+        self.assertEqual(result["bytes"], {"before": 9000, "gzip": 900})
+        self.assertAlmostEqual(result["cpu_ms"]["before"], 100.0)
+        self.assertAlmostEqual(result["cpu_ms"]["gzip"], 20.0)
+        self.assertEqual(client.get.call_count, 12)
+        params = client.get.call_args.kwargs["params"]
+        self.assertEqual(params, {"page": 1, "size": PAGE_SIZE, "raw": "true"})
+
+    def test_error_response_aborts(self):
+        client = MagicMock()
+        client.get.return_value = MagicMock(status_code=400, text="Unknown column in fields.")
+        with self.assertRaises(RuntimeError):
+            measure_list_payload(client, lambda: 0.0, warmup=0, repeats=1)
+
+
+class TestStartupBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.processes = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def launch(self, port, env):
+        process = MagicMock()
+        process.poll.return_value = None
+        process.env = env
+        # Health probes refused before the server answers: 4 for sync(), 1 with migrations
+        process.refusals = 4 if env.get("DB_SCHEMA") == "sync" else 1
+        self.processes.append(process)
+        return process
+
+    def probe(self, port, path):
+        process = self.processes[-1]
+        if path == "/api/health":
+            if process.refusals:
+                process.refusals -= 1
+                raise ConnectionRefusedError()
+            return 200
+        self.now += 0.5 if "OPENAPI_SPEC" in process.env else 0.002
+        return 200
+
+    def test_times_first_200_and_first_docs(self):
+        configs = {"legacy": {"DB_SCHEMA": "sync", "OPENAPI_SPEC": "missing.json"}, "migrate": {"DB_SCHEMA": "migrate"}}
+        result = measure_startup(
+            3100, configs, repeats=3, launch=self.launch, probe=self.probe, clock=self.clock, sleep=self.sleep
+        )
+        self.assertAlmostEqual(result["first_200_ms"]["legacy"], 40.0)
+        self.assertAlmostEqual(result["first_200_ms"]["migrate"], 10.0)
+        self.assertAlmostEqual(result["first_docs_ms"]["legacy"], 500.0)
+        self.assertAlmostEqual(result["speedup"], 4.0)
+        self.assertEqual(len(self.processes), 6)
+        self.assertTrue(all(process.terminate.called for process in self.processes))
+
+    def test_server_exit_aborts(self):
+        def launch(port, env):
+            process = MagicMock()
+            process.poll.return_value = 1
+            process.returncode = 1
+            self.processes.append(process)
+            return process
+
+        with self.assertRaises(RuntimeError):
+            measure_startup(3100, {"check": {"DB_SCHEMA": "check"}}, repeats=1, launch=launch, probe=self.probe)
+        self.assertTrue(self.processes[0].terminate.called)
+        self.assertIsNone(
+            measure_startup(
+                3100, {"check": {}}, repeats=1, launch=self.launch, probe=self.probe, clock=self.clock, sleep=self.sleep
+            )["speedup"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
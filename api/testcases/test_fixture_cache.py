@@ -0,0 +1,138 @@
+import base64
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import fixtures
+from fixture_cache import FixtureCache
+from fixtures import WorkerFixtures, load_or_build_fixtures, revalidate_fixtures
+
+BASE_URL = "http://api.test/api"
+
+
+def make_token(exp):
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'HS256'})}.{encode({'id': 1, 'exp': exp})}.signature"
+
+
+def fake_response(status_code, body=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = body or {}
+    return response
+
+
+def sample_fixtures(**overrides):
+    data = dict(
+        namespace="w0abc123",
+        admin_username="admin_w0abc123_1",
+        admin_password="Fixture@123",
+        admin_token=make_token(time.time() + 3600),
+        gym_id=1,
+        gym_admin_id=2,
+        gym_admin_username="gymadmin_w0abc123_2",
+        gym_admin_password="Fixture@123",
+        member_id=3,
+        member_username="gymmember_w0abc123_3",
+        member_password="Fixture@123",
+        plan_id=4,
+        price_id=5,
+    )
+    data.update(overrides)
+    return WorkerFixtures(**data)
+
+
+class TestFixtureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = FixtureCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_round_trip(self):
+        stored = sample_fixtures()
+        self.cache.store(BASE_URL, "w0", stored)
+        self.assertEqual(self.cache.load(BASE_URL, "w0", WorkerFixtures), stored)
+
+    def test_entries_are_keyed_by_base_url_and_worker(self):
+        self.cache.store(BASE_URL, "w0", sample_fixtures())
+        self.assertIsNone(self.cache.load("http://other.test/api", "w0", WorkerFixtures))
+        self.assertIsNone(self.cache.load(BASE_URL, "w1", WorkerFixtures))
+
+    def test_schema_version_mismatch_is_a_miss(self):
+        self.cache.store(BASE_URL, "w0", sample_fixtures())
+        newer = FixtureCache(self.cache_dir, schema_version=self.cache.schema_version + 1)
+        self.assertIsNone(newer.load(BASE_URL, "w0", WorkerFixtures))
+
+    def test_invalidate(self):
+        self.cache.store(BASE_URL, "w0", sample_fixtures())
+        self.cache.invalidate(BASE_URL, "w0")
+        self.cache.invalidate(BASE_URL, "w0")
+        self.assertIsNone(self.cache.load(BASE_URL, "w0", WorkerFixtures))
+
+
+class TestRevalidateFixtures(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        for lookup in ("get_gym", "get_user", "get_membership_plan", "get_plan_price"):
+            getattr(self.client, lookup).return_value = fake_response(200)
+
+    def test_valid_token_is_reused_without_login(self):
+        cached = sample_fixtures()
+        self.assertEqual(revalidate_fixtures(self.client, cached), cached)
+        self.client.login.assert_not_called()
+        self.client.tokens.set_token.assert_called_once_with(cached.admin_token)
+
+    def test_expired_token_is_renewed(self):
+        fresh = make_token(time.time() + 7200)
+        self.client.login.return_value = fake_response(200, {"token": fresh})
+        cached = sample_fixtures(admin_token=make_token(time.time() - 10))
+        self.assertEqual(revalidate_fixtures(self.client, cached).admin_token, fresh)
+        self.client.login.assert_called_once_with(cached.admin_username, cached.admin_password)
+
+    def test_failed_login_drops_the_graph(self):
+        self.client.login.return_value = fake_response(400, {"error": "Invalid username or password"})
+        self.assertIsNone(revalidate_fixtures(self.client, sample_fixtures(admin_token=make_token(0))))
+
+    def test_missing_id_drops_the_graph(self):
+        self.client.get_plan_price.return_value = fake_response(404)
+        self.assertIsNone(revalidate_fixtures(self.client, sample_fixtures()))
+
+
+class TestLoadOrBuildFixtures(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = FixtureCache(self.cache_dir)
+        self.client = MagicMock()
+        self.client.get_gym.return_value = fake_response(404)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_builds_and_stores_on_miss(self):
+        built = sample_fixtures()
+        with patch.object(fixtures, "build_fixtures", return_value=built) as build:
+            self.assertEqual(load_or_build_fixtures(self.client, BASE_URL, self.cache), built)
+        build.assert_called_once_with(self.client)
+        self.assertEqual(self.cache.load(BASE_URL, fixtures.worker_name(), WorkerFixtures), built)
+
+    def test_rebuilds_when_cached_ids_are_gone(self):
+        self.cache.store(BASE_URL, fixtures.worker_name(), sample_fixtures())
+        rebuilt = replace(sample_fixtures(), gym_id=10)
+        with patch.object(fixtures, "build_fixtures", return_value=rebuilt) as build:
+            self.assertEqual(load_or_build_fixtures(self.client, BASE_URL, self.cache).gym_id, 10)
+        build.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from aiohttp import web
+
+from gymclient import ApiError, AsyncGymClient, GymClient, TokenManager, datatables_params, flatten_query
+
+
+def make_token(exp):
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'HS256'})}.{encode({'id': 1, 'exp': exp})}.signature"
+
+
+def fake_response(status_code, body):
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.json.return_value = body
+    response.text = json.dumps(body)
+    return response
+
+
+class TestQueryHelpers(unittest.TestCase):
+
+    def test_flatten_datatables_params(self):
+        params = flatten_query(datatables_params(draw=2, start=20, length=10, search="fit", order=[(1, "desc")]))
+        self.assertEqual(
+            params,
+            {
+                "draw": 2,
+                "start": 20,
+                "length": 10,
+                "search[value]": "fit",
+                "order[0][column]": 1,
+                "order[0][dir]": "desc",
+            },
+        )
+
+    def test_flatten_drops_none(self):
+        self.assertEqual(flatten_query({"page": 1, "search": None, "raw": True}), {"page": 1, "raw": "true"})
+
+
+class TestTokenManager(unittest.TestCase):
+
+    def test_reads_expiry_from_jwt(self):
+        tokens = TokenManager(make_token(1_000_000))
+        self.assertEqual(tokens.expires_at, 1_000_000)
+
+    def test_refresh_only_with_credentials(self):
+        tokens = TokenManager(make_token(time.time() - 10))
+        self.assertFalse(tokens.needs_refresh())
+        tokens.set_credentials("admin", "secret123")
+        self.assertTrue(tokens.needs_refresh())
+        tokens.set_token(make_token(time.time() + 3600))
+        self.assertFalse(tokens.needs_refresh())
+
+
+class TestGymClient(unittest.TestCase):
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.client = GymClient("http://api.test/api", session=self.session)
+
+    def test_login_stores_token_and_sends_it(self):
+        token = make_token(time.time() + 3600)
+        self.session.request.side_effect = [fake_response(200, {"token": token}), fake_response(200, {"data": []})]
+        self.client.login("admin", "secret123")
+        self.client.list_gyms(page=2)
+        method, url = self.session.request.call_args.args
+        self.assertEqual((method, url), ("GET", "http://api.test/api/gym"))
+        self.assertEqual(self.session.request.call_args.kwargs["headers"], {"Authorization": f"Bearer {token}"})
+        self.assertEqual(self.session.request.call_args.kwargs["params"], {"page": 2})
+
+    def test_relogin_after_invalid_token(self):
+        self.client.tokens.set_credentials("admin", "secret123")
+        self.client.tokens.set_token(make_token(time.time() + 3600))
+        fresh = make_token(time.time() + 7200)
+        self.session.request.side_effect = [
+            fake_response(400, {"error": "Invalid token."}),
+            fake_response(200, {"token": fresh}),
+            fake_response(200, {"id": 7}),
+        ]
+        response = self.client.get_gym(7)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.token, fresh)
+        self.assertEqual(self.session.request.call_count, 3)
+
+    def test_role_check_401_is_not_retried(self):
+        self.client.tokens.set_credentials("admin", "secret123")
+        self.client.tokens.set_token(make_token(time.time() + 3600))
+        self.session.request.return_value = fake_response(401, {"error": "Unauthorized"})
+        self.assertEqual(self.client.create_gym(name="x").status_code, 401)
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_hooks_receive_route_template(self):
+        calls = []
+        self.client.hooks.append(lambda *args: calls.append(args[:3]))
+        self.session.request.return_value = fake_response(200, {})
+        self.client.get_user(42)
+        self.assertEqual(calls, [("GET", "/users/:id", 200)])
+
+    def test_clone_shares_pool_not_token(self):
+        self.client.tokens.set_token("a.b.c")
+        clone = self.client.clone()
+        self.assertIs(clone.session, self.session)
+        self.assertIsNone(clone.token)
+
+    def test_batch_sends_items_and_atomic_flag(self):
+        self.session.request.return_value = fake_response(201, {"created": 1, "failed": 0, "results": []})
+        self.client.create_payments_batch([{"gym_member_id": 1}], atomic=True)
+        kwargs = self.session.request.call_args.kwargs
+        self.assertEqual(self.session.request.call_args.args[1], "http://api.test/api/payments/batch")
+        self.assertEqual(kwargs["json"], {"items": [{"gym_member_id": 1}]})
+        self.assertEqual(kwargs["params"], {"atomic": "true"})
+
+    def test_quote_sends_items(self):
+        self.session.request.return_value = fake_response(200, {"resolved": 0, "unresolved": 0, "results": []})
+        self.client.quote_plan_prices(iter([{"membership_plan_id": 1, "date": "2024-05-01"}]))
+        method, url = self.session.request.call_args.args
+        self.assertEqual((method, url), ("POST", "http://api.test/api/membershipPlansPrices/quote"))
+        self.assertEqual(
+            self.session.request.call_args.kwargs["json"], {"items": [{"membership_plan_id": 1, "date": "2024-05-01"}]}
+        )
+
+    def test_renewals_send_camel_case_body(self):
+        self.session.request.return_value = fake_response(200, {"candidates": 0, "renewed": 0, "results": []})
+        self.client.renew_expiring_memberships(14, gym_id=3, dry_run=True)
+        method, url = self.session.request.call_args.args
+        self.assertEqual((method, url), ("POST", "http://api.test/api/membersMemberships/renewals"))
+        self.assertEqual(self.session.request.call_args.kwargs["json"], {"dryRun": True, "days": 14, "gymId": 3})
+
+    def test_revenue_analytics_passes_month_range(self):
+        self.session.request.return_value = fake_response(200, {"data": []})
+        self.client.revenue_analytics(gymId=4, **{"from": "2024-01", "to": "2024-06"})
+        method, url = self.session.request.call_args.args
+        self.assertEqual((method, url), ("GET", "http://api.test/api/analytics/revenue"))
+        self.assertEqual(self.session.request.call_args.kwargs["params"], {"gymId": 4, "from": "2024-01", "to": "2024-06"})
+
+    def test_etag_sends_if_none_match(self):
+        self.session.request.return_value = fake_response(304, None)
+        token = make_token(time.time() + 3600)
+        self.client.tokens.set_token(token)
+        response = self.client.get_gym(7, etag='"v1"')
+        self.assertEqual(response.status_code, 304)
+        headers = self.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["Authorization"], f"Bearer {token}")
+
+        self.client.get_gym(7)
+        self.assertNotIn("If-None-Match", self.session.request.call_args.kwargs["headers"])
+
+    def test_export_streams_to_file(self):
+        response = fake_response(200, None)
+        response.iter_content.return_value = [b'{"id":1}\n', b'{"id":2}\n']
+        self.session.request.return_value = response
+        with tempfile.TemporaryDirectory() as directory:
+            dest = os.path.join(directory, "payments.ndjson")
+            written = self.client.export("payments", dest, gymId=3, **{"from": "2024-01-01"})
+            with open(dest, "rb") as f:
+                self.assertEqual(f.read(), b'{"id":1}\n{"id":2}\n')
+            self.assertEqual(os.listdir(directory), ["payments.ndjson"])
+        self.assertEqual(written, 18)
+        kwargs = self.session.request.call_args.kwargs
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["params"], {"format": "ndjson", "gymId": 3, "from": "2024-01-01"})
+        self.assertEqual(self.session.request.call_args.args[1], "http://api.test/api/payments/export")
+        response.close.assert_called_once()
+
+    def test_export_error_leaves_no_file(self):
+        self.session.request.return_value = fake_response(400, {"error": "Invalid date range."})
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ApiError):
+                self.client.export("members_memberships", os.path.join(directory, "m.csv"), format="csv")
+            self.assertEqual(os.listdir(directory), [])
+
+
+class TestAsyncGymClient(unittest.TestCase):
+
+    def test_login_then_authenticated_call(self):
+        token = make_token(time.time() + 3600)
+        seen = []
+
+        async def login(request):
+            return web.json_response({"token": token})
+
+        async def gym(request):
+            seen.append(request.headers.get("Authorization"))
+            return web.json_response({"id": int(request.match_info["id"])})
+
+        async def missing(request):
+            return web.json_response({"error": "Gym with ID 9 not found"}, status=404)
+
+        app = web.Application()
+        app.router.add_post("/api/login", login)
+        app.router.add_get("/api/gym/9", missing)
+        app.router.add_get("/api/gym/{id}", gym)
+
+        async def scenario():
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                async with AsyncGymClient(f"http://127.0.0.1:{port}/api") as client:
+                    await client.authenticate("admin", "secret123")
+                    found = await client.get_gym(3)
+                    missing_response = await client.get_gym(9)
+                    return found, missing_response
+            finally:
+                await runner.cleanup()
+
+        found, missing_response = asyncio.run(scenario())
+        self.assertEqual(found.json(), {"id": 3})
+        self.assertEqual(seen, [f"Bearer {token}"])
+        with self.assertRaises(ApiError) as ctx:
+            missing_response.raise_for_status()
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
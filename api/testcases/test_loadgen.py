@@ -0,0 +1,150 @@
+import asyncio
+import random
+import unittest
+
+from aiohttp import web
+
+import loadgen
+
+
+class TestLoadgenSchedule(unittest.TestCase):
+
+    def test_parse_stages(self):
+        self.assertEqual(loadgen.parse_stages("30:10, 60:50,30:0"), [(30.0, 10), (60.0, 50), (30.0, 0)])
+        with self.assertRaises(ValueError):
+            loadgen.parse_stages("")
+        with self.assertRaises(ValueError):
+            loadgen.parse_stages("10:-1")
+
+    def test_target_users_ramps_linearly(self):
+        stages = [(10, 10), (10, 10), (10, 0)]
+        self.assertEqual(loadgen.target_users(stages, 0), 0)
+        self.assertEqual(loadgen.target_users(stages, 5), 5)
+        self.assertEqual(loadgen.target_users(stages, 15), 10)
+        self.assertEqual(loadgen.target_users(stages, 25), 5)
+        self.assertIsNone(loadgen.target_users(stages, 30))
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadgen.percentile(values, 50), 50)
+        self.assertEqual(loadgen.percentile(values, 95), 95)
+        self.assertEqual(loadgen.percentile(values, 99), 99)
+        self.assertEqual(loadgen.percentile([7], 99), 7)
+        self.assertEqual(loadgen.percentile([], 50), 0.0)
+
+    def test_parse_weights(self):
+        self.assertEqual(loadgen.parse_weights(None), loadgen.DEFAULT_WEIGHTS)
+        self.assertEqual(loadgen.parse_weights(["login=3", "browse_gyms"]), {"login": 3.0, "browse_gyms": 1.0})
+        with self.assertRaises(ValueError):
+            loadgen.parse_weights(["nope=1"])
+
+    def test_pick_scenario_skips_zero_weights(self):
+        rng = random.Random(1)
+        picks = {loadgen.pick_scenario({"login": 1, "onboarding": 0}, rng) for _ in range(50)}
+        self.assertEqual(picks, {"login"})
+
+    def test_stats_report(self):
+        stats = loadgen.StatsCollector()
+        stats.started_at, stats.finished_at = 0.0, 2.0
+        for latency in range(1, 11):
+            stats.record("GET /api/gym", float(latency), 200, True)
+        stats.record("POST /api/login", 5.0, 400, False)
+        report = stats.report()
+        self.assertEqual(report["endpoints"]["GET /api/gym"]["requests"], 10)
+        self.assertEqual(report["endpoints"]["GET /api/gym"]["throughput_rps"], 5.0)
+        self.assertEqual(report["endpoints"]["POST /api/login"]["error_rate"], 1.0)
+        self.assertEqual(report["total"]["requests"], 11)
+        self.assertEqual(report["total"]["errors"], 1)
+
+
+class FakeGymAPI:
+    """Minimal in-process stand-in for the endpoints the scenarios call."""
+
+    def __init__(self):
+        self.next_id = 0
+        self.app = web.Application()
+        self.app.router.add_post("/api/signup/admin", self.ok)
+        self.app.router.add_post("/api/login", self.login)
+        self.app.router.add_post("/api/gym", self.create_gym)
+        self.app.router.add_get("/api/gym", self.ok)
+        self.app.router.add_get("/api/gym/{id}", self.ok)
+        self.app.router.add_post("/api/gymMembershipPlans", self.create_plan)
+        self.app.router.add_post("/api/signup/gymmember", self.create_user)
+        self.app.router.add_post("/api/membersMemberships", self.created)
+        self.app.router.add_get("/api/internal/metrics", self.metrics)
+
+    def new_id(self):
+        self.next_id += 1
+        return self.next_id
+
+    async def ok(self, request):
+        return web.json_response({"message": "ok"})
+
+    async def metrics(self, request):
+        self.metric_calls = getattr(self, "metric_calls", 0) + 1
+        return web.json_response(
+            {
+                "pid": 1,
+                "dbPool": {
+                    "size": 3,
+                    "using": 2,
+                    "waiting": self.metric_calls % 2,
+                    "config": {"max": 10},
+                    "acquire": {"count": 10 * self.metric_calls, "sumMs": 20.0 * self.metric_calls},
+                },
+            }
+        )
+
+    async def created(self, request):
+        return web.json_response({"id": self.new_id()}, status=201)
+
+    async def login(self, request):
+        return web.json_response({"token": "token"})
+
+    async def create_gym(self, request):
+        return web.json_response({"gym": {"id": self.new_id()}})
+
+    async def create_plan(self, request):
+        return web.json_response({"id": self.new_id()}, status=201)
+
+    async def create_user(self, request):
+        return web.json_response({"user": {"id": self.new_id()}})
+
+
+class TestLoadRunner(unittest.TestCase):
+
+    def test_run_against_fake_api(self):
+        async def scenario():
+            runner_app = web.AppRunner(FakeGymAPI().app)
+            await runner_app.setup()
+            site = web.TCPSite(runner_app, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                base_url = f"http://127.0.0.1:{port}/api"
+                runner = loadgen.LoadRunner(
+                    [(0.3, 4), (0.3, 4)],
+                    dict(loadgen.DEFAULT_WEIGHTS),
+                    base_url=base_url,
+                    pool_sampler=loadgen.PoolSampler(base_url, interval=0.1),
+                )
+                return await runner.run()
+            finally:
+                await runner_app.cleanup()
+
+        report = asyncio.run(scenario())
+        self.assertGreater(report["total"]["requests"], 0)
+        self.assertEqual(report["total"]["errors"], 0)
+        self.assertEqual(report["peak_users"], 4)
+        self.assertIn("POST /api/login", report["endpoints"])
+
+        pool = report["pool"]
+        self.assertGreaterEqual(pool["samples"], 3)
+        self.assertEqual(pool["peak_using"], 2)
+        self.assertEqual(pool["peak_waiting"], 1)
+        self.assertEqual(pool["timeline"][1]["acquire_avg_ms"], 2.0)
+        self.assertIn("Pool:", loadgen.format_pool_report(pool))
+
+
+if __name__ == "__main__":
+    unittest.main()
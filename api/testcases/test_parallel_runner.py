@@ -0,0 +1,49 @@
+import os
+import tempfile
+import textwrap
+import unittest
+
+import parallel_runner
+
+
+class TestSharding(unittest.TestCase):
+
+    def test_balances_by_test_count(self):
+        classes = {"a.A": 6, "b.B": 3, "c.C": 3, "d.D": 2, "e.E": 1}
+        shards = parallel_runner.shard(classes, 2)
+        loads = sorted(sum(classes[c] for c in s) for s in shards)
+        self.assertEqual(loads, [7, 8])
+        self.assertEqual(sorted(c for s in shards for c in s), sorted(classes))
+
+    def test_never_returns_empty_shards(self):
+        self.assertEqual(parallel_runner.shard({"a.A": 1}, 4), [["a.A"]])
+        self.assertEqual(parallel_runner.shard({}, 4), [])
+
+
+class TestRunParallel(unittest.TestCase):
+
+    def test_workers_get_distinct_namespaces(self):
+        module = textwrap.dedent(
+            """
+            import os
+            import unittest
+
+            class Test{name}(unittest.TestCase):
+                def test_namespace(self):
+                    print("NAMESPACE=" + os.environ["GYM_TEST_NAMESPACE"])
+            """
+        )
+        with tempfile.TemporaryDirectory() as start_dir:
+            for name in ("One", "Two"):
+                with open(os.path.join(start_dir, f"test_{name.lower()}.py"), "w") as f:
+                    f.write(module.format(name=name))
+            results = parallel_runner.run_parallel(start_dir, "test_*.py", workers=2)
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r.returncode == 0 for r in results))
+        self.assertEqual(sum(r.tests_run for r in results), 2)
+        self.assertEqual({r.output.split("NAMESPACE=")[1].split()[0] for r in results}, {"w0", "w1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from query_audit import SHAPES, QueryShape, analyze, declared_indexes, load_captured, unfiltered_page
+from query_audit.runner import audit, db_config
+
+
+def plan_row(table, type_, key=None, rows=1):
+    return {"table": table, "type": type_, "key": key, "rows": rows, "Extra": None}
+
+
+class TestAnalyze(unittest.TestCase):
+    SHAPE = QueryShape("memberships.overlap_check", "SELECT 1", expect_key="members_memberships_member_period")
+
+    def test_indexed_plan_passes(self):
+        plan = [plan_row("MembersMemberships", "range", "members_memberships_member_period", 3)]
+        self.assertEqual(analyze(self.SHAPE, plan), [])
+
+    def test_full_scan_is_flagged(self):
+        findings = analyze(self.SHAPE, [plan_row("MembersMemberships", "ALL", rows=50000)])
+        self.assertEqual(len(findings), 2)
+        self.assertIn("full table scan", findings[0].problem)
+        self.assertIn("members_memberships_member_period", findings[1].problem)
+
+    def test_small_and_allowed_scans_are_ignored(self):
+        shape = QueryShape("gyms.all", "SELECT 1", allow_scan=("Gyms",))
+        self.assertEqual(analyze(shape, [plan_row("Users", "ALL", rows=20)]), [])
+        self.assertEqual(analyze(shape, [plan_row("Gyms", "ALL", rows=50000)]), [])
+
+
+class TestShapes(unittest.TestCase):
+
+    def test_names_are_unique(self):
+        names = [shape.name for shape in SHAPES]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_expected_indexes_are_declared_in_the_models(self):
+        declared = declared_indexes()
+        for shape in SHAPES:
+            if shape.expect_key:
+                self.assertIn(shape.expect_key, declared, shape.name)
+
+    def test_audit_skips_shapes_without_sample_data(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        cursor.fetchall.return_value = [plan_row("Payments", "index", "payments_start_date", 10)]
+        connection = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+        sampled = QueryShape("a", "SELECT * FROM Payments WHERE id = %(id)s", sample="SELECT 1")
+        unsampled = QueryShape("b", "SELECT * FROM Payments", expect_key="payments_start_date")
+        results, skipped = audit(connection, [sampled, unsampled])
+        self.assertEqual(skipped, [sampled])
+        self.assertEqual([(shape, findings) for shape, _, findings in results], [(unsampled, [])])
+
+
+class TestCaptured(unittest.TestCase):
+
+    def write_log(self, lines):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as f:
+            f.write("".join(json.dumps(line) + "\n" for line in lines))
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def test_one_shape_per_distinct_statement(self):
+        page = "SELECT * FROM `Gyms` AS `Gym` ORDER BY `Gym`.`id` LIMIT 10"
+        by_member = "SELECT * FROM `Payments` WHERE `gym_member_id` = 7"
+        path = self.write_log(
+            [
+                {"route": "GET /api/gym", "shape": "a", "sql": page},
+                {"route": "GET /api/payments", "shape": "b", "sql": by_member + ";"},
+                # Another worker logged the same shape
+                {"route": "GET /api/payments", "shape": "b", "sql": by_member.replace("7", "8")},
+                {"route": None, "shape": "c", "sql": "SELECT 1"},
+            ]
+        )
+        shapes = load_captured(path)
+        self.assertEqual([s.name for s in shapes], ["GET /api/gym #1", "GET /api/payments #1", "background #1"])
+        self.assertEqual(shapes[1].sql, by_member)
+
+        scan = [plan_row("Gym", "ALL", rows=50000)]
+        self.assertEqual(analyze(shapes[0], scan), [])
+        self.assertEqual(len(analyze(shapes[1], [plan_row("Payments", "ALL", rows=50000)])), 1)
+
+    def test_only_unfiltered_pages_may_scan(self):
+        self.assertTrue(unfiltered_page("SELECT * FROM Gyms ORDER BY id LIMIT 10"))
+        self.assertFalse(unfiltered_page("SELECT * FROM Gyms WHERE city = 'x' LIMIT 10"))
+        self.assertFalse(unfiltered_page("SELECT * FROM Payments"))
+
+
+class TestDbConfig(unittest.TestCase):
+
+    def test_environment_overrides_env_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".env", delete=False) as f:
+            f.write('# api settings\nDB_HOST=db.internal\nDB_NAME="gym"\nDB_USERNAME=app\n')
+        try:
+            config = db_config({"DB_NAME": "gym_test", "PATH": "/bin"}, f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(config["host"], "db.internal")
+        self.assertEqual(config["database"], "gym_test")
+        self.assertEqual(config["user"], "app")
+        self.assertEqual(config["port"], 3306)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from query_budget import BudgetTestResult, over_budget, parse, queries_by_route
+
+
+def exposition(route_counts):
+    """Queries-per-request histogram text for ``{(method, route): [queries of each request]}``."""
+    lines = ["# HELP http_request_db_queries SQL statements run per HTTP request.", "# TYPE http_request_db_queries histogram"]
+    for (method, route), queries in route_counts.items():
+        for le in ("0", "1", "2", "3", "5", "10", "+Inf"):
+            bound = float("inf") if le == "+Inf" else float(le)
+            count = sum(1 for q in queries if q <= bound)
+            lines.append(f'http_request_db_queries_bucket{{worker="0",method="{method}",route="{route}",le="{le}"}} {count}')
+        lines.append(f'http_request_db_queries_count{{worker="0",method="{method}",route="{route}"}} {len(queries)}')
+    return "\n".join(lines) + "\n"
+
+
+class TestParse(unittest.TestCase):
+
+    def test_labels_are_sorted_and_unescaped(self):
+        samples = parse('# TYPE x gauge\nx{route="/a\\"b",method="GET"} 2.5\nup 1\n')
+        self.assertEqual(samples[("x", (("method", "GET"), ("route", '/a"b')))], 2.5)
+        self.assertEqual(samples[("up", ())], 1.0)
+
+
+class TestQueriesByRoute(unittest.TestCase):
+
+    def test_delta_between_snapshots(self):
+        before = parse(exposition({("GET", "/api/gym"): [2, 2]}))
+        after = parse(exposition({("GET", "/api/gym"): [2, 2, 2, 4], ("GET", "/api/internal/prometheus"): [0]}))
+        usage = queries_by_route(before, after)
+        self.assertEqual(usage, {"GET /api/gym": {"requests": 2, "max_queries": 5.0}})
+
+    def test_routes_without_new_requests_are_skipped(self):
+        snapshot = parse(exposition({("GET", "/api/gym"): [1]}))
+        self.assertEqual(queries_by_route(snapshot, snapshot), {})
+
+    def test_over_budget_uses_route_then_default(self):
+        usage = {"GET /api/gym": {"requests": 1, "max_queries": 5.0}, "GET /api/users": {"requests": 1, "max_queries": 3.0}}
+        budgets = {"default": 4, "routes": {"GET /api/gym": 5}}
+        self.assertEqual(over_budget(usage, budgets), [])
+        budgets["routes"]["GET /api/gym"] = 3
+        self.assertEqual(over_budget(usage, budgets), [("GET /api/gym", 5.0, 3)])
+
+
+class TestBudgetTestResult(unittest.TestCase):
+
+    def run_with(self, snapshots, budgets):
+        scraper = MagicMock()
+        scraper.snapshot.side_effect = [parse(exposition(s)) for s in snapshots]
+        result_class = type("Result", (BudgetTestResult,), {"scraper": scraper, "budgets": budgets})
+        result = result_class(io.StringIO(), descriptions=False, verbosity=0)
+        test = unittest.FunctionTestCase(lambda: None)
+        test.run(result)
+        return result
+
+    def test_test_over_budget_fails(self):
+        result = self.run_with([{}, {("GET", "/api/gym"): [1, 8]}], {"default": 5, "routes": {}})
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn("GET /api/gym: up to 10 queries (budget 5)", result.failures[0][1])
+        self.assertEqual(result.observed, {"GET /api/gym": 10.0})
+
+    def test_test_within_budget_passes(self):
+        result = self.run_with([{}, {("GET", "/api/gym"): [1, 2]}], {"default": 5, "routes": {}})
+        self.assertTrue(result.wasSuccessful())
+
+
+if __name__ == "__main__":
+    unittest.main()
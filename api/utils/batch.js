@@ -0,0 +1,87 @@
+// utils/batch.js
+//
+// Shared plumbing of the batch create endpoints. A batch request carries
+// { items: [...] } (or a bare array). Every item is validated up front, with
+// set-based queries rather than one query per item. The items that pass are
+// inserted with bulkCreate in a single transaction, and the response reports
+// one result per item:
+//
+//   201 { created, failed: 0, results }   every item was created
+//   207 { created, failed, results }      some items were rejected
+//   400 { created: 0, failed, results }   nothing was created
+//
+// With ?atomic=true any rejected item keeps the whole batch from being
+// inserted; the valid items then report status 424.
+
+const sequelize = require("../config/dbConfig");
+
+const MAX_ITEMS = parseInt(process.env.BATCH_MAX_ITEMS || "1000", 10);
+
+/**
+ * The items and options of a batch request, or { error } if the body is not
+ * a usable batch.
+ */
+const readBatch = (req) => {
+  const items = Array.isArray(req.body) ? req.body : req.body && req.body.items;
+  if (!Array.isArray(items) || items.length === 0) {
+    return { error: "Expected a non-empty items array." };
+  }
+  if (items.length > MAX_ITEMS) {
+    return { error: `A batch takes at most ${MAX_ITEMS} items.` };
+  }
+  if (items.some((item) => !item || typeof item !== "object" || Array.isArray(item))) {
+    return { error: "Every item must be an object." };
+  }
+  return { items, atomic: String(req.query.atomic) === "true" };
+};
+
+// Per-item validation state; the first error recorded for an item wins
+const createBatch = (items) => {
+  const errors = new Array(items.length).fill(null);
+  return {
+    items,
+    errors,
+    fail: (index, error) => {
+      if (errors[index] === null) errors[index] = error;
+    },
+    valid: () => items.map((item, index) => ({ item, index })).filter(({ index }) => errors[index] === null),
+  };
+};
+
+/**
+ * Insert the items that passed validation in one transaction.
+ * `insert(items, transaction)` must resolve to the created ids, in order.
+ * Returns a Map of item index -> created id.
+ */
+const commitValid = async (batch, atomic, insert) => {
+  const created = new Map();
+  const valid = batch.valid();
+  if (valid.length === 0 || (atomic && valid.length < batch.items.length)) {
+    return created;
+  }
+  const ids = await sequelize.transaction((transaction) =>
+    insert(
+      valid.map(({ item }) => item),
+      transaction
+    )
+  );
+  ids.forEach((id, i) => created.set(valid[i].index, id));
+  return created;
+};
+
+const sendBatchResults = (res, batch, created) => {
+  const results = batch.items.map((item, index) => {
+    if (batch.errors[index] !== null) {
+      return { index, status: 400, error: batch.errors[index] };
+    }
+    if (created.has(index)) {
+      return { index, status: 201, id: created.get(index) };
+    }
+    return { index, status: 424, error: "Not created: another item of the atomic batch was rejected." };
+  });
+  const failed = results.length - created.size;
+  const status = failed === 0 ? 201 : created.size === 0 ? 400 : 207;
+  res.status(status).json({ created: created.size, failed, results });
+};
+
+module.exports = { MAX_ITEMS, readBatch, createBatch, commitValid, sendBatchResults };
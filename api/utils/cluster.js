@@ -0,0 +1,194 @@
+// utils/cluster.js
+//
+// Cluster mode for server.js. With CLUSTER_WORKERS=N (or "auto" for one per
+// CPU) the primary process prepares the database once (authenticate,
+// migrations), then forks N workers that only serve HTTP on the shared port,
+// so workers never race each other through the schema on startup.
+//
+// The primary restarts workers that die, relays utils/clusterBus.js messages
+// between them and collects a health report from each one every
+// CLUSTER_HEALTH_INTERVAL_MS (default 5000). SIGHUP restarts the workers one
+// at a time: a replacement is forked and listening before the old worker is
+// told to finish its in-flight requests and exit. SIGTERM/SIGINT stop every
+// worker the same way. A worker still busy after CLUSTER_SHUTDOWN_TIMEOUT_MS
+// (default 10000) is killed.
+//
+// One worker at a time runs the once-per-deployment jobs of
+// utils/scheduler.js; it is forked with CLUSTER_SCHEDULER=1. A worker forked
+// after it died inherits the role; in a rolling restart the replacement is
+// forked without it and only given the role (a "scheduler" message) once the
+// old worker has exited, so the jobs never run twice at the same time.
+
+const cluster = require("cluster");
+const os = require("os");
+const { once } = require("events");
+const { monitorEventLoopDelay } = require("perf_hooks");
+const clusterBus = require("./clusterBus");
+const logger = require("./logger");
+const scheduler = require("./scheduler");
+
+const HEALTH_INTERVAL_MS = parseInt(process.env.CLUSTER_HEALTH_INTERVAL_MS || "5000", 10);
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.CLUSTER_SHUTDOWN_TIMEOUT_MS || "10000", 10);
+const RESTART_DELAY_MS = 1000;
+
+// Number of workers to fork; 0 runs the API in this process
+const workerCount = () => {
+  const value = process.env.CLUSTER_WORKERS || "0";
+  if (value === "auto") return os.cpus().length;
+  return Math.max(0, parseInt(value, 10) || 0);
+};
+
+// -- health -------------------------------------------------------------------
+
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+eventLoopDelay.enable();
+
+const requests = { served: 0, active: 0 };
+// Sources of extra health fields, e.g. cache and pool statistics
+const healthSources = {};
+// The primary's latest table of worker reports, as seen by this worker
+let clusterReports = null;
+
+const addHealthSource = (name, getStats) => {
+  healthSources[name] = getStats;
+};
+
+const localHealth = () => {
+  const memory = process.memoryUsage();
+  const report = {
+    pid: process.pid,
+    worker: cluster.isWorker ? cluster.worker.id : null,
+    uptimeS: Math.round(process.uptime()),
+    rssMb: Math.round(memory.rss / 1048576),
+    heapUsedMb: Math.round(memory.heapUsed / 1048576),
+    eventLoopDelayP99Ms: Math.round(eventLoopDelay.percentile(99) / 1e4) / 100,
+    requestsServed: requests.served,
+    requestsActive: requests.active,
+  };
+  for (const [name, getStats] of Object.entries(healthSources)) report[name] = getStats();
+  return report;
+};
+
+// Every worker's latest report (with its age) in cluster mode, else null
+const clusterHealth = () => clusterReports;
+
+// -- primary --------------------------------------------------------------------
+
+const startPrimary = async (count, prepare) => {
+  await prepare();
+
+  const reports = new Map();
+  let stopping = false;
+  let restarting = false;
+
+  const fork = (scheduler = false) => {
+    const worker = cluster.fork(scheduler ? { CLUSTER_SCHEDULER: "1" } : {});
+    worker.scheduler = scheduler;
+    worker.on("message", (message) => {
+      if (!message) return;
+      if (message.type === "bus") {
+        clusterBus.relay(worker, message);
+      } else if (message.type === "health") {
+        reports.set(worker.id, { ...message.report, reportedAt: Date.now() });
+      }
+    });
+    return worker;
+  };
+
+  // Ask a worker to finish its requests and exit; kill it if it takes too long
+  const stop = (worker) => {
+    if (worker.isDead()) return Promise.resolve();
+    const exited = once(worker, "exit");
+    const timer = setTimeout(() => worker.kill(), SHUTDOWN_TIMEOUT_MS);
+    clusterBus.send(worker, { type: "shutdown" });
+    worker.disconnect();
+    return exited.then(() => clearTimeout(timer));
+  };
+
+  const rollingRestart = async () => {
+    if (restarting || stopping) return;
+    restarting = true;
+    logger.info("Rolling restart of %d workers", Object.keys(cluster.workers).length);
+    for (const worker of Object.values(cluster.workers)) {
+      const replacement = fork();
+      await once(replacement, "listening");
+      await stop(worker);
+      if (worker.scheduler) {
+        replacement.scheduler = true;
+        clusterBus.send(replacement, { type: "scheduler" });
+      }
+    }
+    restarting = false;
+    logger.info("Rolling restart finished");
+  };
+
+  const shutdown = async () => {
+    if (stopping) return;
+    stopping = true;
+    await Promise.all(Object.values(cluster.workers).map(stop));
+    process.exit(0);
+  };
+
+  cluster.on("exit", (worker, code, signal) => {
+    reports.delete(worker.id);
+    if (stopping || worker.exitedAfterDisconnect) return;
+    logger.error("Worker %d (pid %d) died (%s); restarting", worker.id, worker.process.pid, signal || code);
+    setTimeout(() => fork(worker.scheduler), RESTART_DELAY_MS);
+  });
+
+  // Share the table of reports with the workers for their /api/internal/health
+  setInterval(() => {
+    const now = Date.now();
+    const table = [...reports.values()].map((report) => ({ ...report, ageMs: now - report.reportedAt }));
+    for (const worker of Object.values(cluster.workers)) clusterBus.send(worker, { type: "health", workers: table });
+  }, HEALTH_INTERVAL_MS);
+
+  process.on("SIGHUP", rollingRestart);
+  process.on("SIGTERM", shutdown);
+  process.on("SIGINT", shutdown);
+
+  for (let i = 0; i < count; i++) fork(i === 0);
+  console.log(`Primary ${process.pid} started ${count} workers`);
+};
+
+// -- worker / single process ----------------------------------------------------
+
+/**
+ * Count the requests of `server` for the health report and, in a worker,
+ * report to the primary and wind down gracefully when it asks.
+ */
+const trackServer = (server) => {
+  let shuttingDown = false;
+
+  server.on("request", (req, res) => {
+    requests.active++;
+    // Keep-alive connections would hold a stopping worker open
+    if (shuttingDown) res.setHeader("Connection", "close");
+    res.on("close", () => {
+      requests.active--;
+      requests.served++;
+    });
+  });
+
+  if (!cluster.isWorker) return;
+
+  const sendReport = () => {
+    clusterBus.send(process, { type: "health", report: localHealth() });
+  };
+  setInterval(sendReport, HEALTH_INTERVAL_MS).unref();
+  server.once("listening", sendReport);
+
+  process.on("message", (message) => {
+    if (!message) return;
+    if (message.type === "health") {
+      clusterReports = message.workers;
+    } else if (message.type === "scheduler") {
+      scheduler.grantRole();
+    } else if (message.type === "shutdown") {
+      shuttingDown = true;
+      if (server.closeIdleConnections) server.closeIdleConnections();
+    }
+  });
+};
+
+module.exports = { workerCount, startPrimary, trackServer, addHealthSource, localHealth, clusterHealth };
@@ -0,0 +1,49 @@
+// utils/clusterBus.js
+//
+// Messages between the workers of a cluster (see utils/cluster.js). A worker
+// publishes on a channel, the primary relays the message to every other
+// worker, and their subscribers run. Outside a cluster publish() is a no-op.
+//
+// The per-process caches use it for invalidations: the worker that handled a
+// write drops its own entries directly and publishes the same invalidation,
+// so no worker keeps serving what another one has changed.
+
+const cluster = require("cluster");
+
+const handlers = new Map();
+
+// Sending to a process that is exiting fails with EPIPE; with a callback the
+// error is handed to it instead of being thrown as an 'error' event.
+const ignoreSendError = () => {};
+
+// Send `message` over an IPC channel (a cluster worker, or `process` in one)
+const send = (target, message) => {
+  if (target && target.connected !== false && (!target.isConnected || target.isConnected())) {
+    target.send(message, ignoreSendError);
+  }
+};
+
+const publish = (channel, payload) => {
+  if (cluster.isWorker) send(process, { type: "bus", channel, payload });
+};
+
+const subscribe = (channel, handler) => {
+  if (!handlers.has(channel)) handlers.set(channel, []);
+  handlers.get(channel).push(handler);
+};
+
+// Primary side: forward a worker's message to all the others
+const relay = (from, message) => {
+  for (const worker of Object.values(cluster.workers)) {
+    if (worker !== from) send(worker, message);
+  }
+};
+
+if (cluster.isWorker) {
+  process.on("message", (message) => {
+    if (!message || message.type !== "bus") return;
+    for (const handler of handlers.get(message.channel) || []) handler(message.payload);
+  });
+}
+
+module.exports = { publish, subscribe, relay, send };
@@ -0,0 +1,92 @@
+// utils/countCache.js
+//
+// Cached row counts for the list endpoints' recordsTotal/recordsFiltered
+// (or meta.totalItems). Counts are cached per table, tenant scope (e.g.
+// "all", "gym:5", "member:12") and filter, so turning pages of the same
+// search reuses one COUNT instead of running it on every draw.
+//
+// Writes call invalidate(table) for every table whose counts they change.
+// Filtered counts also expire quickly, since edits (not just creates and
+// deletes) can move rows in or out of a search.
+//
+// In cluster mode invalidations reach every worker through utils/clusterBus.js.
+//
+// COUNT_CACHE_TTL_MS (default 300000) and COUNT_CACHE_FILTERED_TTL_MS
+// (default 30000) tune the lifetimes; 0 disables caching.
+
+const clusterBus = require("./clusterBus");
+
+const TOTAL_TTL_MS = parseInt(process.env.COUNT_CACHE_TTL_MS || "300000", 10);
+const FILTERED_TTL_MS = parseInt(process.env.COUNT_CACHE_FILTERED_TTL_MS || "30000", 10);
+const MAX_ENTRIES_PER_TABLE = 1000;
+
+// table -> Map(key -> { promise, expiresAt })
+const tables = new Map();
+
+const stats = { hits: 0, misses: 0 };
+
+const cached = (table, key, ttlMs, compute) => {
+  if (ttlMs <= 0) return compute();
+  if (!tables.has(table)) tables.set(table, new Map());
+  const entries = tables.get(table);
+
+  const entry = entries.get(key);
+  if (entry && entry.expiresAt > Date.now()) {
+    stats.hits++;
+    return entry.promise;
+  }
+  stats.misses++;
+
+  // Cache the promise so concurrent requests share a single COUNT
+  const promise = compute();
+  entries.set(key, { promise, expiresAt: Date.now() + ttlMs });
+  promise.catch(() => {
+    if (entries.get(key) && entries.get(key).promise === promise) entries.delete(key);
+  });
+  if (entries.size > MAX_ENTRIES_PER_TABLE) {
+    entries.delete(entries.keys().next().value);
+  }
+  return promise;
+};
+
+/**
+ * Resolve { recordsTotal, recordsFiltered } for `table`.
+ *
+ * `total` counts the rows visible to `scope`; `filtered` additionally applies
+ * `filter` (any JSON-serializable description of the search/filters). With
+ * no filter, recordsFiltered is recordsTotal and `filtered` is never called.
+ */
+const counts = async (table, { scope = "all", filter = null, total, filtered }) => {
+  const recordsTotal = await cached(table, `${scope}|`, TOTAL_TTL_MS, total);
+  if (filter === null) {
+    return { recordsTotal, recordsFiltered: recordsTotal };
+  }
+  const recordsFiltered = await cached(
+    table,
+    `${scope}|${JSON.stringify(filter)}`,
+    FILTERED_TTL_MS,
+    filtered
+  );
+  return { recordsTotal, recordsFiltered };
+};
+
+const dropTables = (tableNames) => {
+  for (const table of tableNames) tables.delete(table);
+};
+
+const invalidate = (...tableNames) => {
+  dropTables(tableNames);
+  clusterBus.publish("countCache:invalidate", tableNames);
+};
+
+const clear = () => {
+  tables.clear();
+  clusterBus.publish("countCache:clear");
+};
+
+clusterBus.subscribe("countCache:invalidate", dropTables);
+clusterBus.subscribe("countCache:clear", () => tables.clear());
+
+const getStats = () => ({ ...stats, tables: tables.size });
+
+module.exports = { counts, invalidate, clear, getStats };
@@ -0,0 +1,121 @@
+// utils/cursorPagination.js
+//
+// Opt-in keyset ("cursor") paging for the DataTables list endpoints. Instead
+// of OFFSET, each page continues after the (sort column, id) pair of the last
+// row it returned, so deep pages cost the same as the first one. Requests
+// opt in with `cursor` (empty for the first page); responses keep
+// draw/recordsTotal/recordsFiltered and add opaque nextCursor/prevCursor.
+//
+// The counts are taken once on the first page and carried inside the cursor,
+// so following pages skip the COUNT query entirely.
+
+const { Op } = require("sequelize");
+
+const isCursorRequest = (query) => query.cursor !== undefined;
+
+const normalizeDir = (dir) => (String(dir).toUpperCase() === "DESC" ? "DESC" : "ASC");
+const flip = (dir) => (dir === "DESC" ? "ASC" : "DESC");
+
+const encodeValue = (value) => (value instanceof Date ? { d: value.toISOString() } : value);
+const decodeValue = (value) => (value && typeof value === "object" && value.d ? new Date(value.d) : value);
+
+const encodeCursor = (payload) => Buffer.from(JSON.stringify(payload)).toString("base64url");
+
+/**
+ * Decode a cursor for a listing sorted by `field` `dir`.
+ * Returns {} for the first page and null if the cursor is malformed or was
+ * issued for a different sort order.
+ */
+const parseCursor = (value, field, dir) => {
+  if (value === undefined || value === "") return {};
+  try {
+    const cursor = JSON.parse(Buffer.from(String(value), "base64url").toString("utf8"));
+    if (cursor.f !== field || cursor.o !== normalizeDir(dir) || cursor.id === undefined) {
+      return null;
+    }
+    return cursor;
+  } catch (error) {
+    return null;
+  }
+};
+
+// Rows strictly after (value, id) when ordered by `field dir, id dir`. MySQL
+// sorts NULLs first ascending and last descending.
+const afterCondition = (field, value, id, dir) => {
+  const cmp = dir === "DESC" ? Op.lt : Op.gt;
+  if (field === "id") {
+    return { id: { [cmp]: id } };
+  }
+  const tie = { [Op.and]: [{ [field]: value }, { id: { [cmp]: id } }] };
+  if (value === null) {
+    return dir === "DESC" ? tie : { [Op.or]: [tie, { [field]: { [Op.ne]: null } }] };
+  }
+  const beyond = { [field]: { [cmp]: value } };
+  return dir === "DESC"
+    ? { [Op.or]: [beyond, tie, { [field]: null }] }
+    : { [Op.or]: [beyond, tie] };
+};
+
+// A column of a model instance, or of a plain row of a raw query
+const valueOf = (row, key) => (typeof row.get === "function" ? row.get(key) : row[key]);
+
+/**
+ * Fetch one keyset page of `Model`.
+ *
+ * `count` is called on the first page only and must resolve to
+ * { recordsTotal, recordsFiltered }. Any other findAll options (include,
+ * attributes, raw, ...) are passed through; `attributes` must keep the id
+ * and the sort column.
+ */
+const findPage = async (Model, { where = {}, field, dir, limit, cursor, count, ...options }) => {
+  const order = normalizeDir(dir);
+  const backward = cursor.p === 1;
+  const scanDir = backward ? flip(order) : order;
+  const hasCursor = cursor.id !== undefined;
+
+  const rows = await Model.findAll({
+    ...options,
+    where: hasCursor
+      ? { [Op.and]: [where, afterCondition(field, decodeValue(cursor.v), cursor.id, scanDir)] }
+      : where,
+    order: field === "id" ? [["id", scanDir]] : [[field, scanDir], ["id", scanDir]],
+    limit: limit + 1,
+  });
+
+  const hasMore = rows.length > limit;
+  const page = rows.slice(0, limit);
+  if (backward) page.reverse();
+
+  const counts = hasCursor ? { recordsTotal: cursor.t, recordsFiltered: cursor.c } : await count();
+  const cursorFor = (row, p) =>
+    encodeCursor({
+      f: field,
+      o: order,
+      v: encodeValue(valueOf(row, field)),
+      id: valueOf(row, "id"),
+      p,
+      t: counts.recordsTotal,
+      c: counts.recordsFiltered,
+    });
+
+  const first = page[0];
+  const last = page[page.length - 1];
+  return {
+    rows: page,
+    ...counts,
+    nextCursor: last && (backward || hasMore) ? cursorFor(last, 0) : null,
+    prevCursor: first && hasCursor && (!backward || hasMore) ? cursorFor(first, 1) : null,
+  };
+};
+
+// DataTables-compatible body for a page returned by findPage
+const cursorResponse = (draw, page) => ({
+  draw: parseInt(draw, 10) || 1,
+  recordsTotal: page.recordsTotal,
+  recordsFiltered: page.recordsFiltered,
+  data: page.rows,
+  nextCursor: page.nextCursor,
+  prevCursor: page.prevCursor,
+});
+
+module.exports = { isCursorRequest, parseCursor, findPage, cursorResponse };
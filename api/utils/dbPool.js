@@ -0,0 +1,70 @@
+// utils/dbPool.js
+//
+// Saturation of the Sequelize connection pool (see config/dbConfig.js). The
+// pool's own counters give connections in use, idle and queued requests; the
+// beforePoolAcquire/afterPoolAcquire hooks time every acquire into a
+// histogram, so latency spikes can be told apart from pool exhaustion (long
+// acquires while `waiting` > 0) and slow queries (short acquires).
+
+const sequelize = require("../config/dbConfig");
+
+// Upper bounds (ms) of the acquire latency histogram buckets
+const BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+const acquire = { count: 0, sumMs: 0, maxMs: 0, buckets: new Array(BUCKETS_MS.length + 1).fill(0) };
+const startedAt = new WeakMap();
+
+sequelize.addHook("beforePoolAcquire", (options) => {
+  if (options) startedAt.set(options, process.hrtime.bigint());
+});
+
+sequelize.addHook("afterPoolAcquire", (connection, options) => {
+  const started = options && startedAt.get(options);
+  if (started === undefined) return;
+  startedAt.delete(options);
+  const ms = Number(process.hrtime.bigint() - started) / 1e6;
+  acquire.count++;
+  acquire.sumMs += ms;
+  acquire.maxMs = Math.max(acquire.maxMs, ms);
+  const bucket = BUCKETS_MS.findIndex((bound) => ms <= bound);
+  acquire.buckets[bucket === -1 ? BUCKETS_MS.length : bucket]++;
+});
+
+// sequelize-pool instances (read and write pools with replication; none on SQLite)
+const pools = () => {
+  const pool = sequelize.connectionManager.pool;
+  if (!pool) return [];
+  return pool.read ? [pool.read, pool.write] : [pool];
+};
+
+const sum = (key) => pools().reduce((total, pool) => total + (pool[key] || 0), 0);
+
+/**
+ * Pool gauges and the acquire latency histogram. `histogram` is cumulative,
+ * Prometheus style: { "<le ms>": acquires that took at most that long }.
+ */
+const getStats = () => {
+  const { max, min, idle, acquire: acquireTimeoutMs, evict } = sequelize.config.pool || {};
+  let cumulative = 0;
+  const histogram = {};
+  BUCKETS_MS.forEach((bound, i) => {
+    cumulative += acquire.buckets[i];
+    histogram[bound] = cumulative;
+  });
+  histogram["+Inf"] = acquire.count;
+  return {
+    config: { max, min, idleMs: idle, acquireTimeoutMs, evictMs: evict },
+    size: sum("size"),
+    available: sum("available"),
+    using: sum("using"),
+    waiting: sum("waiting"),
+    acquire: {
+      count: acquire.count,
+      sumMs: Math.round(acquire.sumMs * 1000) / 1000,
+      maxMs: Math.round(acquire.maxMs * 1000) / 1000,
+      histogram,
+    },
+  };
+};
+
+module.exports = { BUCKETS_MS, getStats };
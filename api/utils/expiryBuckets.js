@@ -0,0 +1,268 @@
+// utils/expiryBuckets.js
+//
+// Memberships ending in the next EXPIRY_HORIZON_DAYS (default 60) days,
+// bucketed per gym and per end day, so "who expires this week" is a walk
+// over a few buckets instead of LIKE searches through every membership.
+// A membership belongs to the gym of its member (GymAndGymMembers), the same
+// tenant the listings are scoped by (see utils/tenantScope.js).
+//
+// The buckets are built from the database on first use and rebuilt by
+// utils/scheduler.js every EXPIRY_REFRESH_MS (default 3600000), which also
+// moves the horizon forward as days pass. In between, the membership
+// controllers keep them current: track(rows) after a create or update,
+// untrack(ids) after a delete. Changes are applied in updatedAt order, so a
+// slow write cannot overwrite a newer one, and a delete is not undone by an
+// update that was already in flight. Changes made while a rebuild loads are
+// replayed on top of it. In cluster mode every worker keeps its own buckets
+// and receives the others' changes through utils/clusterBus.js.
+//
+// Moving members between gyms calls invalidate(), which rebuilds the
+// buckets on their next use.
+
+const { Op } = require("sequelize");
+const MembersMembership = require("../models/membersMembership");
+const GymAndGymMember = require("../models/gymAndGymMember");
+const clusterBus = require("./clusterBus");
+const logger = require("./logger");
+
+const HORIZON_DAYS = parseInt(process.env.EXPIRY_HORIZON_DAYS || "60", 10);
+const REFRESH_MS = parseInt(process.env.EXPIRY_REFRESH_MS || "3600000", 10);
+const DAY_MS = 86400000;
+// Members per GymAndGymMembers lookup
+const LOOKUP_CHUNK = 5000;
+
+// gym id (null without a gym) -> Map(day "YYYY-MM-DD" -> Map(membership id -> entry))
+let buckets = new Map();
+// membership id -> entry ({ id, gymId, day, gym_member_id, membership_plan_id, start_date, end_date, updatedAt })
+let entries = new Map();
+// membership id -> time of its delete, so late updates do not bring it back
+const deleted = new Map();
+let horizon = null; // { from, to } days, inclusive
+let stale = true;
+let building = null;
+// Changes applied while a rebuild is loading, replayed onto its result
+let pending = null;
+
+const stats = { rebuilds: 0, lastRebuildMs: null, tracked: 0, untracked: 0, queries: 0 };
+
+const dayOf = (date) => new Date(date).toISOString().slice(0, 10);
+const addDays = (day, days) => dayOf(new Date(`${day}T00:00:00Z`).getTime() + days * DAY_MS);
+const today = () => dayOf(Date.now());
+
+const toEntry = (row, gymId) => ({
+  id: row.id,
+  gymId: gymId === undefined ? null : gymId,
+  day: dayOf(row.end_date),
+  gym_member_id: row.gym_member_id,
+  membership_plan_id: row.membership_plan_id,
+  start_date: new Date(row.start_date).toISOString(),
+  end_date: new Date(row.end_date).toISOString(),
+  updatedAt: row.updatedAt ? new Date(row.updatedAt).getTime() : Date.now(),
+});
+
+// -- the two structures, kept in step --------------------------------------
+
+const removeFrom = (state, id) => {
+  const entry = state.entries.get(id);
+  if (!entry) return;
+  state.entries.delete(id);
+  const days = state.buckets.get(entry.gymId);
+  const bucket = days && days.get(entry.day);
+  if (!bucket) return;
+  bucket.delete(id);
+  if (bucket.size === 0) days.delete(entry.day);
+  if (days.size === 0) state.buckets.delete(entry.gymId);
+};
+
+const inHorizon = (state, day) => state.horizon && day >= state.horizon.from && day <= state.horizon.to;
+
+const upsertInto = (state, entry) => {
+  const current = state.entries.get(entry.id);
+  if (current && current.updatedAt > entry.updatedAt) return;
+  removeFrom(state, entry.id);
+  if (!inHorizon(state, entry.day)) return;
+  if (!state.buckets.has(entry.gymId)) state.buckets.set(entry.gymId, new Map());
+  const days = state.buckets.get(entry.gymId);
+  if (!days.has(entry.day)) days.set(entry.day, new Map());
+  days.get(entry.day).set(entry.id, entry);
+  state.entries.set(entry.id, entry);
+};
+
+const live = () => ({ buckets, entries, horizon });
+
+// A change is { upsert: entry } or { remove: id, at: ms }
+const apply = (change) => {
+  if (change.remove !== undefined) {
+    deleted.set(change.remove, change.at);
+    removeFrom(live(), change.remove);
+  } else {
+    const deletedAt = deleted.get(change.upsert.id);
+    if (deletedAt !== undefined && deletedAt >= change.upsert.updatedAt) return;
+    upsertInto(live(), change.upsert);
+  }
+  if (pending) pending.push(change);
+};
+
+const applyAll = (changes) => changes.forEach(apply);
+
+// -- loading ---------------------------------------------------------------
+
+// Member id -> gym id for `memberIds`
+const gymsOf = async (memberIds) => {
+  const gyms = new Map();
+  const ids = [...new Set(memberIds)];
+  for (let i = 0; i < ids.length; i += LOOKUP_CHUNK) {
+    const links = await GymAndGymMember.findAll({
+      where: { memberId: { [Op.in]: ids.slice(i, i + LOOKUP_CHUNK) } },
+      attributes: ["memberId", "gymId"],
+    });
+    links.forEach((link) => gyms.set(link.memberId, link.gymId));
+  }
+  return gyms;
+};
+
+const load = async () => {
+  const started = Date.now();
+  const from = today();
+  const to = addDays(from, HORIZON_DAYS);
+  const rows = await MembersMembership.findAll({
+    where: {
+      end_date: { [Op.gte]: new Date(`${from}T00:00:00Z`), [Op.lt]: new Date(`${addDays(to, 1)}T00:00:00Z`) },
+    },
+    attributes: ["id", "gym_member_id", "membership_plan_id", "start_date", "end_date", "updatedAt"],
+  });
+  const gyms = await gymsOf(rows.map((row) => row.gym_member_id));
+
+  const state = { buckets: new Map(), entries: new Map(), horizon: { from, to } };
+  rows.forEach((row) => upsertInto(state, toEntry(row, gyms.get(row.gym_member_id))));
+  return { state, started };
+};
+
+/**
+ * Reload the buckets from the database. Concurrent calls share one load;
+ * reads keep using the previous buckets until it is done.
+ */
+const rebuild = () => {
+  if (building) return building;
+  pending = [];
+  building = load()
+    .then(({ state, started }) => {
+      // Replay what changed while loading; updatedAt keeps the newest version
+      for (const change of pending) {
+        if (change.remove !== undefined) removeFrom(state, change.remove);
+        else if (!(deleted.get(change.upsert.id) >= change.upsert.updatedAt)) upsertInto(state, change.upsert);
+      }
+      ({ buckets, entries, horizon } = state);
+      stale = false;
+      for (const [id, at] of deleted) {
+        if (at < started - REFRESH_MS) deleted.delete(id);
+      }
+      stats.rebuilds++;
+      stats.lastRebuildMs = Date.now() - started;
+    })
+    .finally(() => {
+      pending = null;
+      building = null;
+    });
+  return building;
+};
+
+const ready = async () => {
+  if (stale || !horizon || horizon.from !== today()) await rebuild();
+};
+
+// -- changes from the controllers --------------------------------------------
+
+const markStale = () => {
+  stale = true;
+};
+
+const invalidate = () => {
+  markStale();
+  clusterBus.publish("expiryBuckets:invalidate");
+};
+
+/**
+ * Record created or updated membership rows. Resolves the members' gyms
+ * with one query, then applies the rows here and on the other workers. The
+ * write is already committed, so a failed lookup only marks the buckets
+ * stale instead of failing the caller.
+ */
+const track = async (rows) => {
+  if (rows.length === 0) return;
+  let gyms;
+  try {
+    gyms = await gymsOf(rows.map((row) => row.gym_member_id));
+  } catch (error) {
+    logger.error(`Error tracking membership expiries: ${error.message}`);
+    invalidate();
+    return;
+  }
+  const changes = rows.map((row) => ({ upsert: toEntry(row, gyms.get(row.gym_member_id)) }));
+  applyAll(changes);
+  stats.tracked += rows.length;
+  clusterBus.publish("expiryBuckets:apply", changes);
+};
+
+const untrack = (ids) => {
+  const at = Date.now();
+  const changes = ids.map((id) => ({ remove: Number(id), at }));
+  applyAll(changes);
+  stats.untracked += ids.length;
+  clusterBus.publish("expiryBuckets:apply", changes);
+};
+
+clusterBus.subscribe("expiryBuckets:apply", applyAll);
+clusterBus.subscribe("expiryBuckets:invalidate", markStale);
+
+// -- reads -----------------------------------------------------------------
+
+/**
+ * Memberships ending within the next `days` days (today included), sorted
+ * by end date. `gymId` null means every gym. Returns { from, to, days:
+ * [{ date, count }], data: [entry] }; `days` may not exceed HORIZON_DAYS.
+ */
+const expiring = async (gymId, days) => {
+  await ready();
+  stats.queries++;
+  const from = today();
+  const to = addDays(from, days - 1);
+  const perDay = new Map();
+  const gyms = gymId === null ? [...buckets.values()] : [buckets.get(Number(gymId))].filter(Boolean);
+  for (const gymDays of gyms) {
+    for (const [day, bucket] of gymDays) {
+      if (day < from || day > to) continue;
+      if (!perDay.has(day)) perDay.set(day, []);
+      perDay.get(day).push(...bucket.values());
+    }
+  }
+  const sortedDays = [...perDay.keys()].sort();
+  const data = sortedDays.flatMap((day) =>
+    perDay.get(day).sort((a, b) => (a.end_date < b.end_date ? -1 : a.end_date > b.end_date ? 1 : a.id - b.id))
+  );
+  return {
+    from,
+    to,
+    days: sortedDays.map((day) => ({ date: day, count: perDay.get(day).length })),
+    data,
+  };
+};
+
+const getStats = () => ({
+  ...stats,
+  horizon,
+  memberships: entries.size,
+  gyms: buckets.size,
+  stale,
+});
+
+module.exports = {
+  HORIZON_DAYS,
+  REFRESH_MS,
+  rebuild,
+  track,
+  untrack,
+  invalidate,
+  expiring,
+  getStats,
+};
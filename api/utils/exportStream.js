@@ -0,0 +1,110 @@
+// utils/exportStream.js
+//
+// Bulk exports streamed as NDJSON or CSV. Rows are read in id-ordered keyset
+// batches of EXPORT_BATCH_SIZE (default 1000) and written to the response as
+// they arrive (chunked transfer encoding), waiting for the socket to drain
+// between batches. Memory stays flat however many rows match, nothing is
+// counted up front, and the export stops as soon as the client goes away.
+
+const { once } = require("events");
+const { Op } = require("sequelize");
+
+const BATCH_SIZE = parseInt(process.env.EXPORT_BATCH_SIZE || "1000", 10);
+
+const CONTENT_TYPES = {
+  ndjson: "application/x-ndjson",
+  csv: "text/csv",
+};
+
+// The requested export format, or null if it is not supported
+const exportFormat = (query) => {
+  const format = String(query.format || "ndjson").toLowerCase();
+  return CONTENT_TYPES[format] ? format : null;
+};
+
+/**
+ * The `from`/`to` query parameters as Dates ({} when absent), or null if
+ * either is not a valid date. `to` is inclusive: a bare date covers that day.
+ */
+const parseDateRange = (query) => {
+  const range = {};
+  if (query.from) {
+    range.from = new Date(query.from);
+    if (isNaN(range.from)) return null;
+  }
+  if (query.to) {
+    range.to = new Date(query.to);
+    if (isNaN(range.to)) return null;
+    if (/^\d{4}-\d{2}-\d{2}$/.test(query.to)) {
+      range.to = new Date(range.to.getTime() + 24 * 60 * 60 * 1000 - 1);
+    }
+  }
+  return range;
+};
+
+const csvCell = (value) => {
+  if (value === null || value === undefined) return "";
+  const text = value instanceof Date ? value.toISOString() : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+const csvLine = (values) => `${values.map(csvCell).join(",")}\r\n`;
+
+/**
+ * Stream every row of `Model` matching `where` to `res`.
+ *
+ * `columns` lists [name, key] pairs: `name` is the CSV header / NDJSON field
+ * and `key` the attribute of the raw row, e.g. ["plan_name",
+ * "MembershipPlan.plan_name"] for an included model. Errors after the first
+ * byte was sent can only abort the response, so callers should check
+ * res.headersSent in their error handling.
+ */
+const streamExport = async (res, { Model, where = {}, include, columns, format, filename }) => {
+  let closed = false;
+  res.on("close", () => {
+    closed = true;
+  });
+
+  const write = async (chunk) => {
+    if (!res.write(chunk) && !closed) {
+      await Promise.race([once(res, "drain"), once(res, "close")]);
+    }
+  };
+
+  res.status(200);
+  res.setHeader("Content-Type", `${CONTENT_TYPES[format]}; charset=utf-8`);
+  res.setHeader("Content-Disposition", `attachment; filename="${filename}.${format}"`);
+  res.setHeader("Cache-Control", "no-store");
+
+  const formatRow =
+    format === "csv"
+      ? (row) => csvLine(columns.map(([, key]) => row[key]))
+      : (row) => `${JSON.stringify(Object.fromEntries(columns.map(([name, key]) => [name, row[key]])))}\n`;
+
+  if (format === "csv") {
+    await write(csvLine(columns.map(([name]) => name)));
+  }
+
+  let lastId = 0;
+  let exported = 0;
+  while (!closed) {
+    const rows = await Model.findAll({
+      where: { [Op.and]: [where, { id: { [Op.gt]: lastId } }] },
+      include,
+      order: [["id", "ASC"]],
+      limit: BATCH_SIZE,
+      raw: true,
+    });
+    if (rows.length === 0) break;
+
+    await write(rows.map(formatRow).join(""));
+    exported += rows.length;
+    lastId = rows[rows.length - 1].id;
+    if (rows.length < BATCH_SIZE) break;
+  }
+
+  res.end();
+  return exported;
+};
+
+module.exports = { exportFormat, parseDateRange, streamExport, csvLine };
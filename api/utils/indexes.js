@@ -0,0 +1,64 @@
+// utils/indexes.js
+//
+// sequelize.sync() only creates indexes together with a new table, so indexes
+// declared on a model after its table exists never reach the database. After
+// sync (DB_SCHEMA=sync, see utils/migrations.js), ensureIndexes() adds every
+// named index declared in a model's `indexes` option that the table is
+// missing. FULLTEXT indexes are skipped on dialects that do not support them
+// (e.g. the SQLite stand-in used for seeding).
+
+const sequelize = require("../config/dbConfig");
+const logger = require("./logger");
+
+const supportsFullText = () => ["mysql", "mariadb"].includes(sequelize.getDialect());
+
+/**
+ * Named indexes declared on the loaded models, as
+ * [{ table, name, fields, type, unique }].
+ */
+const declaredIndexes = () =>
+  Object.values(sequelize.models).flatMap((Model) =>
+    (Model.options.indexes || [])
+      .filter((index) => index.name)
+      .map((index) => ({
+        table: Model.getTableName(),
+        name: index.name,
+        fields: index.fields,
+        type: index.type,
+        unique: Boolean(index.unique),
+      }))
+  );
+
+/**
+ * Add those of `indexes` ([{ name, fields, type, unique }]) that `table` does
+ * not have yet. Also used by the migrations in migrations/.
+ */
+const addMissingIndexes = async (table, indexes) => {
+  const queryInterface = sequelize.getQueryInterface();
+  const existing = new Set((await queryInterface.showIndex(table)).map((candidate) => candidate.name));
+
+  for (const index of indexes) {
+    if (index.type === "FULLTEXT" && !supportsFullText()) continue;
+    if (existing.has(index.name)) continue;
+
+    logger.info(`Creating index ${index.name} on ${table}`);
+    await queryInterface.addIndex(table, index.fields, {
+      name: index.name,
+      type: index.type,
+      unique: Boolean(index.unique),
+    });
+  }
+};
+
+const ensureIndexes = async () => {
+  const byTable = new Map();
+  for (const index of declaredIndexes()) {
+    if (!byTable.has(index.table)) byTable.set(index.table, []);
+    byTable.get(index.table).push(index);
+  }
+  for (const [table, indexes] of byTable) {
+    await addMissingIndexes(table, indexes);
+  }
+};
+
+module.exports = { declaredIndexes, addMissingIndexes, ensureIndexes };
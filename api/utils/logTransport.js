@@ -0,0 +1,146 @@
+// utils/logTransport.js
+//
+// Winston transport that buffers formatted lines in memory and writes them
+// in batches every LOG_FLUSH_MS (default 250) or once LOG_BUFFER_BYTES
+// (default 64 KiB) are pending, so logging never waits on the disk and costs
+// one write per batch instead of one per line. File targets rotate by size:
+// past LOG_MAX_BYTES (default 10 MiB) `combined.log` becomes
+// `combined.log.1`, older files shift up and LOG_MAX_FILES (default 5) are
+// kept. Each process rotates on its own, so cluster workers write files of
+// their own (`processFile`: `combined.<pid>.log`) and never rename each
+// other's. If the disk falls behind, at most LOG_BUFFER_MAX_LINES (default
+// 10000) lines wait; later ones are dropped and counted. Whatever is still
+// buffered when the process exits is written synchronously.
+
+const cluster = require("cluster");
+const fs = require("fs");
+const path = require("path");
+const { Transport } = require("winston");
+
+const MESSAGE = Symbol.for("message");
+
+const envInt = (name, fallback) => parseInt(process.env[name] || String(fallback), 10);
+
+const FLUSH_MS = envInt("LOG_FLUSH_MS", 250);
+const BUFFER_BYTES = envInt("LOG_BUFFER_BYTES", 65536);
+const BUFFER_MAX_LINES = envInt("LOG_BUFFER_MAX_LINES", 10000);
+const MAX_BYTES = envInt("LOG_MAX_BYTES", 10 * 1024 * 1024);
+const MAX_FILES = envInt("LOG_MAX_FILES", 5);
+
+// `filename` of this process: the primary (or a single process) keeps it,
+// a cluster worker gets `<name>.<pid><ext>`
+const processFile = (filename) => {
+  if (!cluster.isWorker) return filename;
+  const ext = path.extname(filename);
+  return `${filename.slice(0, filename.length - ext.length)}.${process.pid}${ext}`;
+};
+
+class BufferedTransport extends Transport {
+  /**
+   * Exactly one of `filename` (appended to, with rotation) or `stream`
+   * (e.g. process.stdout) is the target.
+   */
+  constructor({ filename, stream, ...options }) {
+    super(options);
+    this.filename = filename;
+    this.stream = stream;
+    this.lines = [];
+    this.bytes = 0;
+    this.dropped = 0;
+    this.droppedTotal = 0;
+    this.writing = Promise.resolve();
+    this.handle = null;
+    this.size = 0;
+    if (filename) {
+      try {
+        this.size = fs.statSync(filename).size;
+      } catch (error) {
+        this.size = 0;
+      }
+    }
+
+    this.timer = setInterval(() => this.flush(), FLUSH_MS);
+    this.timer.unref();
+    process.once("exit", () => this.flushSync());
+  }
+
+  log(info, callback) {
+    if (this.lines.length >= BUFFER_MAX_LINES) {
+      this.dropped++;
+      this.droppedTotal++;
+    } else {
+      const line = `${info[MESSAGE]}\n`;
+      this.lines.push(line);
+      this.bytes += Buffer.byteLength(line);
+      if (this.bytes >= BUFFER_BYTES) this.flush();
+    }
+    callback();
+  }
+
+  // Take the buffered lines (plus a note of any dropped ones) as one chunk
+  drain() {
+    if (this.dropped > 0) {
+      this.lines.push(`${JSON.stringify({ level: "warn", message: `Dropped ${this.dropped} log lines` })}\n`);
+      this.dropped = 0;
+    }
+    const chunk = this.lines.join("");
+    this.lines = [];
+    this.bytes = 0;
+    return chunk;
+  }
+
+  flush() {
+    if (this.lines.length === 0 && this.dropped === 0) return this.writing;
+    const chunk = this.drain();
+    this.writing = this.writing
+      .then(() => this.write(chunk))
+      .catch((error) => {
+        process.stderr.write(`Log write failed: ${error.message}\n`);
+      });
+    return this.writing;
+  }
+
+  async write(chunk) {
+    if (this.stream) {
+      await new Promise((resolve) => this.stream.write(chunk, resolve));
+      return;
+    }
+    const bytes = Buffer.byteLength(chunk);
+    if (this.size > 0 && this.size + bytes > MAX_BYTES) await this.rotate();
+    if (!this.handle) this.handle = await fs.promises.open(this.filename, "a");
+    await this.handle.write(chunk);
+    this.size += bytes;
+  }
+
+  async rotate() {
+    if (this.handle) {
+      await this.handle.close();
+      this.handle = null;
+    }
+    // The oldest file makes room, then .1..MAX_FILES-1 shift up by one
+    await fs.promises.unlink(`${this.filename}.${MAX_FILES}`).catch(() => {});
+    for (let i = MAX_FILES - 1; i >= 1; i--) {
+      await fs.promises.rename(`${this.filename}.${i}`, `${this.filename}.${i + 1}`).catch(() => {});
+    }
+    await fs.promises.rename(this.filename, `${this.filename}.1`).catch(() => {});
+    this.size = 0;
+  }
+
+  // Last resort on exit: pending async writes are lost with the process
+  flushSync() {
+    if (this.lines.length === 0 && this.dropped === 0) return;
+    const chunk = this.drain();
+    try {
+      if (this.stream) fs.writeSync(this.stream.fd, chunk);
+      else fs.appendFileSync(this.filename, chunk);
+    } catch (error) {
+      // Nothing left to report it to
+    }
+  }
+
+  getStats() {
+    return { buffered: this.lines.length, dropped: this.droppedTotal };
+  }
+}
+
+module.exports = { BufferedTransport, processFile };
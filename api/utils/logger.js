@@ -1,20 +1,92 @@
 // utils/logger.js
+//
+// Application logger. Lines go to the console, error.log (errors only) and
+// combined.log through utils/logTransport.js, which batches writes off the
+// request path and rotates the files by size; cluster workers write
+// error.<pid>.log and combined.<pid>.log instead, since each process rotates
+// its own files. LOG_LEVEL (default "info") sets the threshold.
+//
+// Hot success paths pass a `sample` key in their metadata, e.g.
+// logger.info("User authenticated: %s", name, { sample: "auth.success" }).
+// At most LOG_SAMPLE_PER_SECOND (default 5) lines per key are kept each
+// second; the next kept line carries `suppressed` with the number skipped.
+// Warnings and errors are never sampled. LOG_SAMPLING=off keeps every line.
+//
+// LOG_PIPELINE=legacy restores the original unbuffered winston transports
+// with no sampling, for comparison (benchmarks/logging_overhead.py) or as a
+// fallback.
 
 const { createLogger, transports, format } = require("winston");
+const { BufferedTransport, processFile } = require("./logTransport");
+
+const LEGACY = process.env.LOG_PIPELINE === "legacy";
+const SAMPLING = !LEGACY && process.env.LOG_SAMPLING !== "off";
+const SAMPLE_PER_SECOND = parseInt(process.env.LOG_SAMPLE_PER_SECOND || "5", 10);
+const UNSAMPLED_LEVELS = new Set(["error", "warn"]);
+
+// sample key -> { second, kept, suppressed }
+const windows = new Map();
+let suppressedTotal = 0;
+
+const sample = format((info) => {
+  const key = info.sample;
+  if (key === undefined) return info;
+  delete info.sample;
+  if (!SAMPLING || UNSAMPLED_LEVELS.has(info.level)) return info;
+
+  const second = Math.floor(Date.now() / 1000);
+  let window = windows.get(key);
+  if (!window) {
+    window = { second, kept: 0, suppressed: 0 };
+    windows.set(key, window);
+  }
+  if (window.second !== second) {
+    window.second = second;
+    window.kept = 0;
+  }
+  if (window.kept >= SAMPLE_PER_SECOND) {
+    window.suppressed++;
+    suppressedTotal++;
+    return false;
+  }
+  window.kept++;
+  if (window.suppressed > 0) {
+    info.suppressed = window.suppressed;
+    window.suppressed = 0;
+  }
+  return info;
+});
+
+const outputs = LEGACY
+  ? [
+      new transports.Console(),
+      new transports.File({ filename: "error.log", level: "error" }),
+      new transports.File({ filename: "combined.log" }),
+    ]
+  : [
+      new BufferedTransport({ stream: process.stdout }),
+      new BufferedTransport({ filename: processFile("error.log"), level: "error" }),
+      new BufferedTransport({ filename: processFile("combined.log") }),
+    ];
 
 const logger = createLogger({
-  level: "info",
+  level: process.env.LOG_LEVEL || "info",
   format: format.combine(
     format.timestamp({ format: "YYYY-MM-DD HH:mm:ss" }),
     format.errors({ stack: true }),
     format.splat(),
+    // After splat, which merges the trailing metadata object into the line
+    sample(),
     format.json()
   ),
-  transports: [
-    new transports.Console(),
-    new transports.File({ filename: "error.log", level: "error" }),
-    new transports.File({ filename: "combined.log" }),
-  ],
+  transports: outputs,
+});
+
+// Lines skipped by sampling and lines dropped by a full write buffer
+logger.getStats = () => ({
+  pipeline: LEGACY ? "legacy" : "buffered",
+  suppressed: suppressedTotal,
+  dropped: outputs.reduce((sum, output) => sum + (output.getStats ? output.getStats().dropped : 0), 0),
 });
 
 module.exports = logger;
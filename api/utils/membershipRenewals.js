@@ -0,0 +1,118 @@
+// utils/membershipRenewals.js
+//
+// Batch renewal of memberships about to expire. The candidates come from
+// utils/expiryBuckets.js; a member who already has a membership starting at
+// or after the candidate's end is skipped as already renewed. Everything
+// else is renewed on the same plan, starting when the old period ends, with
+// one query for the plans, one for the later memberships and one insert for
+// the whole run (plus its utils/rollups.js update).
+//
+// Runs from POST /api/membersMemberships/renewals and, when
+// EXPIRY_AUTO_RENEW_DAYS is above 0, every EXPIRY_AUTO_RENEW_INTERVAL_MS
+// (default 86400000) as a utils/scheduler.js job for the memberships ending
+// within that many days. Runs in one process never overlap.
+
+const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+const MembersMembership = require("../models/membersMembership");
+const MembershipPlan = require("../models/gymMembershipPlan");
+const expiryBuckets = require("./expiryBuckets");
+const countCache = require("./countCache");
+const rollups = require("./rollups");
+
+const AUTO_RENEW_DAYS = parseInt(process.env.EXPIRY_AUTO_RENEW_DAYS || "0", 10);
+const AUTO_RENEW_INTERVAL_MS = parseInt(process.env.EXPIRY_AUTO_RENEW_INTERVAL_MS || "86400000", 10);
+
+let running = Promise.resolve();
+
+// `date` moved forward by the plan's duration, in UTC calendar units
+const addDuration = (date, plan) => {
+  const end = new Date(date);
+  const value = plan.duration_value;
+  if (plan.duration_type === "days") end.setUTCDate(end.getUTCDate() + value);
+  else if (plan.duration_type === "months") end.setUTCMonth(end.getUTCMonth() + value);
+  else end.setUTCFullYear(end.getUTCFullYear() + value);
+  return end;
+};
+
+const renew = async ({ gymId = null, days, dryRun = false }) => {
+  const { data: candidates } = await expiryBuckets.expiring(gymId, days);
+  if (candidates.length === 0) return { candidates: 0, renewed: 0, skipped: 0, results: [] };
+
+  const memberIds = [...new Set(candidates.map((c) => c.gym_member_id))];
+  const planIds = [...new Set(candidates.map((c) => c.membership_plan_id))];
+  const earliestEnd = new Date(candidates[0].end_date);
+  const [plans, later] = await Promise.all([
+    MembershipPlan.findAll({
+      where: { id: { [Op.in]: planIds } },
+      attributes: ["id", "duration_type", "duration_value"],
+    }),
+    MembersMembership.findAll({
+      where: { gym_member_id: { [Op.in]: memberIds }, start_date: { [Op.gte]: earliestEnd } },
+      attributes: ["gym_member_id", "start_date"],
+    }),
+  ]);
+  const planById = new Map(plans.map((plan) => [plan.id, plan]));
+  // Member id -> latest start of the memberships after the earliest candidate
+  const latestStart = new Map();
+  later.forEach((row) => {
+    const start = new Date(row.start_date).getTime();
+    latestStart.set(row.gym_member_id, Math.max(latestStart.get(row.gym_member_id) || 0, start));
+  });
+
+  const results = [];
+  const renewals = [];
+  for (const candidate of candidates) {
+    const end = new Date(candidate.end_date);
+    const plan = planById.get(candidate.membership_plan_id);
+    if ((latestStart.get(candidate.gym_member_id) || 0) >= end.getTime()) {
+      results.push({ membership_id: candidate.id, status: 409, error: "Already renewed." });
+    } else if (!plan) {
+      results.push({ membership_id: candidate.id, status: 404, error: "Membership plan not found." });
+    } else {
+      const renewal = {
+        gym_member_id: candidate.gym_member_id,
+        membership_plan_id: plan.id,
+        start_date: end,
+        end_date: addDuration(end, plan),
+      };
+      results.push({ membership_id: candidate.id, status: 201 });
+      renewals.push({ result: results[results.length - 1], renewal });
+    }
+  }
+
+  if (!dryRun && renewals.length > 0) {
+    const rows = await sequelize.transaction(async (transaction) => {
+      const created = await MembersMembership.bulkCreate(
+        renewals.map(({ renewal }) => renewal),
+        { transaction }
+      );
+      await rollups.recordMemberships([], created, transaction);
+      return created;
+    });
+    rows.forEach((row, i) => {
+      renewals[i].result.renewal_id = row.id;
+    });
+    countCache.invalidate("MembersMemberships");
+    await expiryBuckets.track(rows);
+  }
+
+  return {
+    candidates: candidates.length,
+    renewed: renewals.length,
+    skipped: candidates.length - renewals.length,
+    results,
+  };
+};
+
+/**
+ * Renew what expires within `days` days, for one gym or (gymId null) all of
+ * them. With `dryRun` nothing is created and the results say what would be.
+ */
+const renewExpiring = (options) => {
+  const run = running.then(() => renew(options));
+  running = run.catch(() => {});
+  return run;
+};
+
+module.exports = { AUTO_RENEW_DAYS, AUTO_RENEW_INTERVAL_MS, addDuration, renewExpiring };
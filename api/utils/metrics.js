@@ -0,0 +1,111 @@
+// utils/metrics.js
+//
+// In-process metrics rendered in the Prometheus text exposition format
+// (version 0.0.4) by GET /api/internal/prometheus. Counters and histograms
+// are created once at module load with their label names; collectors add
+// gauges read from other modules (pool, caches, hasher) at scrape time.
+//
+// Every process keeps its own series. In cluster mode a scrape through the
+// shared port is answered by one worker, whose id is on the `worker` label
+// of every sample; scrape the workers one by one or run one process when the
+// totals matter.
+
+const cluster = require("cluster");
+
+const metrics = [];
+const collectors = [];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, "\\\\").replace(/"/g, '\\"').replace(/\n/g, "\\n");
+
+const formatLabels = (labels) => {
+  const entries = Object.entries(labels);
+  if (entries.length === 0) return "";
+  return `{${entries.map(([name, value]) => `${name}="${escapeLabel(value)}"`).join(",")}}`;
+};
+
+const seriesKey = (labelNames, labels) => JSON.stringify(labelNames.map((name) => String(labels[name] ?? "")));
+
+const labelsOf = (labelNames, key) => Object.fromEntries(JSON.parse(key).map((value, i) => [labelNames[i], value]));
+
+const counter = (name, help, labelNames = []) => {
+  const series = new Map();
+  const metric = {
+    inc: (labels = {}, value = 1) => {
+      const key = seriesKey(labelNames, labels);
+      series.set(key, (series.get(key) || 0) + value);
+    },
+    render: (common) => [
+      `# HELP ${name} ${help}`,
+      `# TYPE ${name} counter`,
+      ...[...series].map(([key, value]) => `${name}${formatLabels({ ...common, ...labelsOf(labelNames, key) })} ${value}`),
+    ],
+  };
+  metrics.push(metric);
+  return metric;
+};
+
+const histogram = (name, help, buckets, labelNames = []) => {
+  // key -> { counts per bucket (non-cumulative, last one +Inf), sum, count }
+  const series = new Map();
+  const metric = {
+    observe: (labels, value) => {
+      const key = seriesKey(labelNames, labels);
+      if (!series.has(key)) series.set(key, { counts: new Array(buckets.length + 1).fill(0), sum: 0, count: 0 });
+      const entry = series.get(key);
+      const bucket = buckets.findIndex((bound) => value <= bound);
+      entry.counts[bucket === -1 ? buckets.length : bucket]++;
+      entry.sum += value;
+      entry.count++;
+    },
+    render: (common) => {
+      const lines = [`# HELP ${name} ${help}`, `# TYPE ${name} histogram`];
+      for (const [key, entry] of series) {
+        const labels = { ...common, ...labelsOf(labelNames, key) };
+        let cumulative = 0;
+        buckets.forEach((bound, i) => {
+          cumulative += entry.counts[i];
+          lines.push(`${name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+        });
+        lines.push(`${name}_bucket${formatLabels({ ...labels, le: "+Inf" })} ${entry.count}`);
+        lines.push(`${name}_sum${formatLabels(labels)} ${entry.sum}`);
+        lines.push(`${name}_count${formatLabels(labels)} ${entry.count}`);
+      }
+      return lines;
+    },
+  };
+  metrics.push(metric);
+  return metric;
+};
+
+/**
+ * Register a scrape-time source of samples. `collect()` returns
+ * [{ name, help, type: "gauge" | "counter", value }], or with `histogram`
+ * ({ "<le>": cumulative count, "+Inf": count }) and `sum` instead of
+ * `value` for type "histogram".
+ */
+const addCollector = (collect) => collectors.push(collect);
+
+const renderSample = (sample, common) => {
+  const lines = [`# HELP ${sample.name} ${sample.help}`, `# TYPE ${sample.name} ${sample.type}`];
+  if (sample.type !== "histogram") {
+    lines.push(`${sample.name}${formatLabels(common)} ${sample.value}`);
+    return lines;
+  }
+  for (const [le, count] of Object.entries(sample.histogram)) {
+    lines.push(`${sample.name}_bucket${formatLabels({ ...common, le })} ${count}`);
+  }
+  lines.push(`${sample.name}_sum${formatLabels(common)} ${sample.sum}`);
+  lines.push(`${sample.name}_count${formatLabels(common)} ${sample.histogram["+Inf"]}`);
+  return lines;
+};
+
+const render = () => {
+  const common = { worker: cluster.isWorker ? cluster.worker.id : 0 };
+  const lines = metrics.flatMap((metric) => metric.render(common));
+  for (const collect of collectors) {
+    for (const sample of collect()) lines.push(...renderSample(sample, common));
+  }
+  return `${lines.join("\n")}\n`;
+};
+
+module.exports = { counter, histogram, addCollector, render };
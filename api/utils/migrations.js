@@ -0,0 +1,140 @@
+// utils/migrations.js
+//
+// Versioned schema changes. Every file in migrations/ exports
+// up(queryInterface, Sequelize) and down(queryInterface, Sequelize); pending
+// ones are applied once each, in file-name order, and the names of the
+// applied ones are kept in the SequelizeMeta table (the layout sequelize-cli
+// uses, so either tool can take over).
+//
+// server.js brings the schema up to date according to DB_SCHEMA:
+//   migrate (default)  apply pending migrations; a single SELECT when there
+//                      are none, so restarts stay fast
+//   check              only verify that nothing is pending and refuse to
+//                      start otherwise, for deployments that run
+//                      `npm run migrate` as a release step
+//   sync               sequelize.sync() plus utils/indexes.js, the old
+//                      startup path, for throwaway development databases
+// There is no lock between hosts: run migrations from one process at a time.
+
+const fs = require("fs");
+const path = require("path");
+const { DataTypes, Sequelize } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+const { ensureIndexes } = require("./indexes");
+const logger = require("./logger");
+
+const MIGRATIONS_DIR = path.join(__dirname, "..", "migrations");
+const SCHEMA_MODE = process.env.DB_SCHEMA || "migrate";
+
+const SequelizeMeta = sequelize.define(
+  "SequelizeMeta",
+  {
+    name: {
+      type: DataTypes.STRING,
+      allowNull: false,
+      primaryKey: true,
+    },
+  },
+  {
+    tableName: "SequelizeMeta",
+    timestamps: false,
+  }
+);
+
+const stats = { applied: 0, pending: 0, lastRunMs: 0 };
+
+// Migration files on disk, in the order they apply
+const available = () =>
+  fs
+    .readdirSync(MIGRATIONS_DIR)
+    .filter((name) => name.endsWith(".js"))
+    .sort();
+
+const appliedNames = async () => {
+  await SequelizeMeta.sync();
+  const rows = await SequelizeMeta.findAll({ attributes: ["name"], raw: true });
+  return rows.map((row) => row.name).sort();
+};
+
+/**
+ * { applied, pending } migration names. Applied names without a file (a
+ * newer release's migrations, during a rollback) are listed as applied.
+ */
+const status = async () => {
+  const applied = await appliedNames();
+  const done = new Set(applied);
+  const pending = available().filter((name) => !done.has(name));
+  stats.applied = applied.length;
+  stats.pending = pending.length;
+  return { applied, pending };
+};
+
+const load = (name) => require(path.join(MIGRATIONS_DIR, name));
+
+/** Apply every pending migration; returns their names. */
+const migrate = async () => {
+  const started = Date.now();
+  const { pending } = await status();
+  const queryInterface = sequelize.getQueryInterface();
+  for (const name of pending) {
+    logger.info(`Applying migration ${name}`);
+    await load(name).up(queryInterface, Sequelize);
+    await SequelizeMeta.create({ name });
+    stats.applied += 1;
+    stats.pending -= 1;
+  }
+  stats.lastRunMs = Date.now() - started;
+  return pending;
+};
+
+/** Revert the last `steps` applied migrations; returns their names. */
+const undo = async (steps = 1) => {
+  const reverted = (await appliedNames()).slice(-steps).reverse();
+  const queryInterface = sequelize.getQueryInterface();
+  for (const name of reverted) {
+    logger.info(`Reverting migration ${name}`);
+    await load(name).down(queryInterface, Sequelize);
+    await SequelizeMeta.destroy({ where: { name } });
+  }
+  await status();
+  return reverted;
+};
+
+/** Throw if any migration is pending. */
+const check = async () => {
+  const { pending } = await status();
+  if (pending.length > 0) {
+    throw new Error(`Pending migrations: ${pending.join(", ")}; run \`npm run migrate\` first`);
+  }
+};
+
+/** Bring the schema up to date the way DB_SCHEMA asks for (see above). */
+const prepareSchema = async () => {
+  switch (SCHEMA_MODE) {
+    case "migrate":
+      await migrate();
+      return;
+    case "check":
+      await check();
+      return;
+    case "sync":
+      await sequelize.sync();
+      await ensureIndexes();
+      return;
+    default:
+      throw new Error(`Unknown DB_SCHEMA "${SCHEMA_MODE}" (expected migrate, check or sync)`);
+  }
+};
+
+const getStats = () => ({ mode: SCHEMA_MODE, ...stats });
+
+module.exports = {
+  SCHEMA_MODE,
+  available,
+  status,
+  migrate,
+  undo,
+  check,
+  prepareSchema,
+  getStats,
+};
@@ -0,0 +1,111 @@
+// utils/passwordHasher.js
+//
+// bcrypt hashing and verification on a bounded pool of worker threads, so a
+// burst of logins or signups no longer stalls every other request on the
+// event loop. Jobs wait in a FIFO queue while all workers are busy; once the
+// queue is full new jobs are rejected (isBusy(error)) and the controllers
+// answer 503 instead of letting the backlog grow without limit.
+//
+// PASSWORD_HASH_CONCURRENCY (default: CPUs - 1, at most 4; 0 hashes on the
+// main thread), PASSWORD_HASH_MAX_QUEUE (default 1000) and BCRYPT_ROUNDS
+// (default 10) tune it. Workers are started on first use.
+
+const os = require("os");
+const path = require("path");
+const { Worker } = require("worker_threads");
+const bcrypt = require("bcryptjs");
+
+const concurrency = parseInt(
+  process.env.PASSWORD_HASH_CONCURRENCY || String(Math.max(1, Math.min(4, os.cpus().length - 1))),
+  10
+);
+const maxQueue = parseInt(process.env.PASSWORD_HASH_MAX_QUEUE || "1000", 10);
+const rounds = parseInt(process.env.BCRYPT_ROUNDS || "10", 10);
+
+const BUSY = "PASSWORD_HASHER_BUSY";
+
+const workers = new Set();
+const idle = [];
+const queue = [];
+
+const stats = { completed: 0, failed: 0, rejected: 0, peakQueued: 0, waitMs: 0, runMs: 0 };
+
+const finish = (job, error, result) => {
+  stats.runMs += Date.now() - job.startedAt;
+  if (error) {
+    stats.failed += 1;
+    job.reject(error);
+  } else {
+    stats.completed += 1;
+    job.resolve(result);
+  }
+};
+
+const spawn = () => {
+  const worker = new Worker(path.join(__dirname, "passwordWorker.js"));
+  worker.on("message", ({ error, result }) => {
+    const job = worker.job;
+    worker.job = null;
+    // Idle workers must not keep the process alive
+    worker.unref();
+    idle.push(worker);
+    finish(job, error && new Error(error), result);
+    dispatch();
+  });
+  worker.on("error", (error) => {
+    workers.delete(worker);
+    const index = idle.indexOf(worker);
+    if (index !== -1) idle.splice(index, 1);
+    if (worker.job) finish(worker.job, error);
+    dispatch();
+  });
+  workers.add(worker);
+  return worker;
+};
+
+const dispatch = () => {
+  while (queue.length > 0) {
+    const worker = idle.pop() || (workers.size < concurrency ? spawn() : null);
+    if (!worker) return;
+    const job = queue.shift();
+    job.startedAt = Date.now();
+    stats.waitMs += job.startedAt - job.queuedAt;
+    worker.job = job;
+    worker.ref();
+    worker.postMessage(job.task);
+  }
+};
+
+const run = (task) => {
+  if (concurrency <= 0) {
+    return task.op === "hash" ? bcrypt.hash(task.password, task.rounds) : bcrypt.compare(task.password, task.hash);
+  }
+  if (queue.length >= maxQueue) {
+    stats.rejected += 1;
+    const error = new Error("Password hashing queue is full.");
+    error.code = BUSY;
+    return Promise.reject(error);
+  }
+  return new Promise((resolve, reject) => {
+    queue.push({ task, resolve, reject, queuedAt: Date.now() });
+    stats.peakQueued = Math.max(stats.peakQueued, queue.length);
+    dispatch();
+  });
+};
+
+const hash = (password) => run({ op: "hash", password: String(password), rounds });
+
+const compare = (password, hash) => run({ op: "compare", password: String(password), hash });
+
+const isBusy = (error) => Boolean(error) && error.code === BUSY;
+
+const getStats = () => ({
+  ...stats,
+  concurrency,
+  maxQueue,
+  workers: workers.size,
+  busy: workers.size - idle.length,
+  queued: queue.length,
+});
+
+module.exports = { hash, compare, isBusy, getStats };
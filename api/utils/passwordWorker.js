@@ -0,0 +1,17 @@
+// utils/passwordWorker.js
+//
+// Worker thread of utils/passwordHasher.js. Runs one bcrypt hash or compare
+// per message; the pool never hands a worker a second job before the first
+// one is answered, so the synchronous calls are fine here.
+
+const { parentPort } = require("worker_threads");
+const bcrypt = require("bcryptjs");
+
+parentPort.on("message", ({ op, password, hash, rounds }) => {
+  try {
+    const result = op === "hash" ? bcrypt.hashSync(password, rounds) : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ result });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
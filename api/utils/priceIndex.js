@@ -0,0 +1,176 @@
+// utils/priceIndex.js
+//
+// In-memory index of the validity windows of every plan's prices, answering
+// "which price is in force for plan P on date D" without a query per lookup.
+// A plan's windows are loaded on first use (one query for all the plans a
+// request is missing) and kept sorted by validity_start_date, so a lookup is
+// a binary search.
+//
+// Price writes are meant to keep a plan's windows disjoint, but rows that
+// predate that check may overlap; a lookup then returns the window that
+// started last among those covering the date.
+//
+// Price and plan writes call invalidate(planId) for every plan they touch, in
+// cluster mode on every worker through utils/clusterBus.js, and a load that
+// raced such a write is not kept. PRICE_INDEX_TTL_MS (default 300000) bounds
+// how long a plan is trusted (rows changed outside the API);
+// PRICE_INDEX_MAX_PLANS (default 10000) caps how many are kept.
+
+const { Op } = require("sequelize");
+const MembershipPlan = require("../models/gymMembershipPlan");
+const MembershipPlansPrice = require("../models/membershipPlansPrice");
+const clusterBus = require("./clusterBus");
+
+const TTL_MS = parseInt(process.env.PRICE_INDEX_TTL_MS || "300000", 10);
+const MAX_PLANS = parseInt(process.env.PRICE_INDEX_MAX_PLANS || "10000", 10);
+
+// plan id -> { promise (of the plan's index, or null if there is no such plan), expiresAt }
+const plans = new Map();
+// plan id -> number of invalidations so far; `cleared` counts clear() calls
+const generations = new Map();
+let cleared = 0;
+
+const stats = { hits: 0, misses: 0, loads: 0 };
+
+const generation = (planId) => generations.get(planId) || 0;
+
+/**
+ * Index of one plan: windows sorted by start, and for every position the
+ * latest end among the windows up to it, which bounds the backward scan.
+ */
+const buildIndex = (gymId, rows) => {
+  const windows = rows
+    .map((row) => ({
+      id: row.id,
+      price: row.price,
+      validity_start_date: row.validity_start_date,
+      validity_end_date: row.validity_end_date,
+      start: new Date(row.validity_start_date).getTime(),
+      end: new Date(row.validity_end_date).getTime(),
+    }))
+    .sort((a, b) => a.start - b.start);
+  const maxEnd = [];
+  windows.forEach((window, i) => {
+    maxEnd.push(i === 0 ? window.end : Math.max(maxEnd[i - 1], window.end));
+  });
+  return { gymId, windows, maxEnd };
+};
+
+// Load the plans in `planIds` with one query per table
+const loadPlans = async (planIds) => {
+  stats.loads++;
+  const [planRows, priceRows] = await Promise.all([
+    MembershipPlan.findAll({ where: { id: { [Op.in]: planIds } }, attributes: ["id", "gym_id"] }),
+    MembershipPlansPrice.findAll({
+      where: { membership_plan_id: { [Op.in]: planIds } },
+      attributes: ["id", "membership_plan_id", "price", "validity_start_date", "validity_end_date"],
+    }),
+  ]);
+  const rowsByPlan = new Map(planRows.map((plan) => [plan.id, []]));
+  for (const row of priceRows) {
+    if (rowsByPlan.has(row.membership_plan_id)) rowsByPlan.get(row.membership_plan_id).push(row);
+  }
+  const gymByPlan = new Map(planRows.map((plan) => [plan.id, plan.gym_id]));
+  return new Map(
+    planIds.map((id) => [id, rowsByPlan.has(id) ? buildIndex(gymByPlan.get(id), rowsByPlan.get(id)) : null])
+  );
+};
+
+/**
+ * The indexes of `planIds` (numbers) as a Map of plan id -> index, or null
+ * for plans that do not exist.
+ */
+const getPlans = async (planIds) => {
+  const now = Date.now();
+  const promises = new Map();
+  const missing = [];
+  for (const id of new Set(planIds)) {
+    const entry = plans.get(id);
+    if (entry && entry.expiresAt > now) {
+      stats.hits++;
+      promises.set(id, entry.promise);
+    } else {
+      stats.misses++;
+      missing.push(id);
+    }
+  }
+
+  if (missing.length > 0) {
+    const started = missing.map(generation);
+    const startedCleared = cleared;
+    // Cache the promise so concurrent requests share one load
+    const loading = loadPlans(missing);
+    missing.forEach((id, i) => {
+      const promise = loading.then((loaded) => loaded.get(id));
+      plans.set(id, { promise, expiresAt: now + TTL_MS });
+      promises.set(id, promise);
+      loading
+        .then(() => {
+          // A write since the load started may not be reflected in it
+          if (cleared !== startedCleared || generation(id) !== started[i]) {
+            if (plans.get(id) && plans.get(id).promise === promise) plans.delete(id);
+          }
+        })
+        .catch(() => {
+          if (plans.get(id) && plans.get(id).promise === promise) plans.delete(id);
+        });
+    });
+    while (plans.size > MAX_PLANS) plans.delete(plans.keys().next().value);
+  }
+
+  const ids = [...promises.keys()];
+  const indexes = await Promise.all(promises.values());
+  return new Map(ids.map((id, i) => [id, indexes[i]]));
+};
+
+// The window of `index` in force at `time` (ms), or null
+const activeWindow = (index, time) => {
+  const { windows, maxEnd } = index;
+  // Last window starting at or before `time`
+  let low = 0;
+  let high = windows.length - 1;
+  let found = -1;
+  while (low <= high) {
+    const mid = (low + high) >> 1;
+    if (windows[mid].start <= time) {
+      found = mid;
+      low = mid + 1;
+    } else {
+      high = mid - 1;
+    }
+  }
+  for (let i = found; i >= 0 && maxEnd[i] >= time; i--) {
+    if (windows[i].end >= time) return windows[i];
+  }
+  return null;
+};
+
+const dropPlans = (planIds) => {
+  for (const id of planIds) {
+    generations.set(id, generation(id) + 1);
+    plans.delete(id);
+  }
+};
+
+const dropAll = () => {
+  cleared++;
+  plans.clear();
+};
+
+const invalidate = (...planIds) => {
+  const ids = planIds.filter((id) => id !== undefined && id !== null).map(Number);
+  dropPlans(ids);
+  clusterBus.publish("priceIndex:invalidate", ids);
+};
+
+const clear = () => {
+  dropAll();
+  clusterBus.publish("priceIndex:clear");
+};
+
+clusterBus.subscribe("priceIndex:invalidate", dropPlans);
+clusterBus.subscribe("priceIndex:clear", dropAll);
+
+const getStats = () => ({ ...stats, plans: plans.size });
+
+module.exports = { getPlans, activeWindow, invalidate, clear, getStats };
@@ -0,0 +1,72 @@
+// utils/projection.js
+//
+// Sparse fieldsets and raw rows for the list endpoints.
+//
+// `fields` names the columns a caller needs, comma-separated: `start_date`
+// for a column of the listed model, `User.username` for one of an include
+// (by its `as`, else its model name). Only those columns are selected, plus
+// the id and the sort column; includes none of whose columns are named are
+// still joined, since they may filter the rows, but return nothing. Only
+// columns the listing returns anyway can be named, so a projection never
+// reaches e.g. a password.
+//
+// `raw=true` skips building model instances: rows come from the driver as
+// plain objects with the includes nested. The JSON is the same except that an
+// include without a matching row is an object of nulls rather than null.
+
+const parseFields = (value) =>
+  String(value)
+    .split(",")
+    .map((field) => field.trim())
+    .filter(Boolean);
+
+const isRaw = (query) => ["1", "true"].includes(String(query.raw));
+
+const includeName = (include) => include.as || include.model.name;
+
+// Columns returned for `attributes` (an array, { exclude } or undefined)
+const columnsOf = (Model, attributes) => {
+  if (Array.isArray(attributes)) return attributes.filter((attribute) => typeof attribute === "string");
+  const exclude = (attributes && attributes.exclude) || [];
+  return Object.keys(Model.getAttributes()).filter((name) => !exclude.includes(name));
+};
+
+/**
+ * findAll `options` of a listing of `Model` narrowed to the `fields` and
+ * `raw` query parameters. `always` lists further columns of `Model` the
+ * endpoint needs (e.g. the sort column of a cursor page). Returns null if
+ * `fields` names a column the listing does not return.
+ */
+const project = (Model, query, options, always = []) => {
+  let projected = options;
+  const includes = options.include || [];
+
+  if (query.fields !== undefined && String(query.fields) !== "") {
+    const base = new Set(["id", ...always]);
+    const byInclude = new Map(includes.map((include) => [includeName(include), new Set()]));
+    for (const field of parseFields(query.fields)) {
+      const dot = field.indexOf(".");
+      if (dot === -1) {
+        if (!columnsOf(Model, options.attributes).includes(field)) return null;
+        base.add(field);
+        continue;
+      }
+      const name = field.slice(0, dot);
+      const column = field.slice(dot + 1);
+      const include = includes.find((candidate) => includeName(candidate) === name);
+      if (!include || !columnsOf(include.model, include.attributes).includes(column)) return null;
+      byInclude.get(name).add(column);
+    }
+    projected = {
+      ...options,
+      attributes: [...base],
+      ...(options.include && {
+        include: includes.map((include) => ({ ...include, attributes: [...byInclude.get(includeName(include))] })),
+      }),
+    };
+  }
+
+  return isRaw(query) ? { ...projected, raw: true, nest: true } : projected;
+};
+
+module.exports = { parseFields, isRaw, project };
@@ -0,0 +1,92 @@
+// utils/queryMetrics.js
+//
+// Times every SQL statement through the Sequelize beforeQuery/afterQuery
+// hooks. Each statement is observed in db_query_duration_seconds and added to
+// the current request's query count and time (see middleware/requestMetrics.js),
+// so N+1 patterns show up as a growing queries-per-request histogram.
+// Statements slower than SLOW_QUERY_MS (default 200, 0 disables) are logged
+// with their SQL and bind parameters.
+//
+// QUERY_LOG=<file> appends the first SELECT of every distinct shape (its SQL
+// with literals replaced by ?) to <file> as a JSON line { route, shape, sql },
+// so testcases/query_audit can EXPLAIN the statements the controllers really
+// send while the test suite runs.
+
+const fs = require("fs");
+const sequelize = require("../config/dbConfig");
+const logger = require("./logger");
+const metrics = require("./metrics");
+const requestContext = require("./requestContext");
+
+const SLOW_QUERY_MS = parseInt(process.env.SLOW_QUERY_MS || "200", 10);
+
+const queryDuration = metrics.histogram(
+  "db_query_duration_seconds",
+  "Duration of SQL statements by query type.",
+  [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+  ["type"]
+);
+const slowQueries = metrics.counter(
+  "db_slow_queries_total",
+  "SQL statements slower than SLOW_QUERY_MS.",
+  ["type"]
+);
+
+const startedAt = new WeakMap();
+
+const QUERY_LOG = process.env.QUERY_LOG;
+const loggedShapes = new Set();
+
+// The SQL with string and number literals, and lists of them, replaced by ?
+const statementShape = (sql) =>
+  sql
+    .replace(/'(?:[^'\\]|\\.)*'/g, "?")
+    .replace(/\b\d+(?:\.\d+)?\b/g, "?")
+    .replace(/\?(?:\s*,\s*\?)+/g, "?");
+
+const logStatement = (options, query, context) => {
+  // Bound statements cannot be EXPLAINed as they are
+  if (typeof query.sql !== "string" || !/^\s*SELECT\b/i.test(query.sql) || (options && options.bind)) return;
+  const shape = statementShape(query.sql);
+  if (loggedShapes.has(shape)) return;
+  loggedShapes.add(shape);
+  const route = context ? context.route() : null;
+  try {
+    fs.appendFileSync(QUERY_LOG, `${JSON.stringify({ route, shape, sql: query.sql })}\n`);
+  } catch (error) {
+    logger.warn(`Could not write QUERY_LOG: ${error.message}`);
+  }
+};
+
+sequelize.addHook("beforeQuery", (options, query) => {
+  startedAt.set(query, process.hrtime.bigint());
+});
+
+sequelize.addHook("afterQuery", (options, query) => {
+  const started = startedAt.get(query);
+  if (started === undefined) return;
+  startedAt.delete(query);
+  const ms = Number(process.hrtime.bigint() - started) / 1e6;
+  const type = (options && options.type) || "RAW";
+
+  queryDuration.observe({ type }, ms / 1000);
+  const context = requestContext.current();
+  if (context) {
+    context.queries++;
+    context.queryMs += ms;
+  }
+
+  if (QUERY_LOG) logStatement(options, query, context);
+
+  if (SLOW_QUERY_MS > 0 && ms >= SLOW_QUERY_MS) {
+    slowQueries.inc({ type });
+    logger.warn("Slow query", {
+      durationMs: Math.round(ms),
+      route: context ? context.route() : null,
+      sql: query.sql,
+      bind: options && options.bind,
+    });
+  }
+});
+
+module.exports = { SLOW_QUERY_MS };
@@ -0,0 +1,14 @@
+// utils/requestContext.js
+//
+// Per-request state that code deep in a call chain (e.g. Sequelize hooks)
+// can reach without it being passed along: middleware/requestMetrics.js runs
+// each request inside storage.run(), and current() returns its store, or
+// undefined outside a request.
+
+const { AsyncLocalStorage } = require("async_hooks");
+
+const storage = new AsyncLocalStorage();
+
+const current = () => storage.getStore();
+
+module.exports = { storage, current };
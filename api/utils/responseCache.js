@@ -0,0 +1,143 @@
+// utils/responseCache.js
+//
+// Read-through cache of whole JSON responses for the slow-changing catalog
+// routes (a gym, the plans of a gym, plan prices), with ETags. Responses are
+// keyed by URL (query string included), role and tenant (the caller's
+// gym_id), so users who may see different data never share an entry, and a
+// hit skips the controller and the database altogether.
+//
+// Every 200 response of a cached route carries a strong ETag and
+// `Cache-Control: private, no-cache`; a request whose If-None-Match matches
+// (with or without the encoding suffix the compression adds) is answered
+// with 304 and no body. Entries are grouped by the tables their
+// data comes from and writes call invalidate(table), in cluster mode on
+// every worker through utils/clusterBus.js. A read that started before such
+// a write is not stored.
+//
+// RESPONSE_CACHE_TTL_MS (default 60000) bounds how long an entry is served
+// (rows changed outside the API, e.g. by scripts/seed.js); 0 disables the
+// cache but keeps the ETags. RESPONSE_CACHE_MAX_ENTRIES (default 5000) caps
+// its size.
+
+const crypto = require("crypto");
+const clusterBus = require("./clusterBus");
+
+const TTL_MS = parseInt(process.env.RESPONSE_CACHE_TTL_MS || "60000", 10);
+const MAX_ENTRIES = parseInt(process.env.RESPONSE_CACHE_MAX_ENTRIES || "5000", 10);
+
+// key -> { body, etag, tables, expiresAt }
+const entries = new Map();
+// table -> Set(key)
+const keysByTable = new Map();
+// table -> number of invalidations so far; `cleared` counts clear() calls
+const generations = new Map();
+let cleared = 0;
+
+const stats = { hits: 0, misses: 0, notModified: 0 };
+
+const etagOf = (body) => `"${crypto.createHash("sha1").update(body).digest("hex")}"`;
+
+const generation = (table) => generations.get(table) || 0;
+
+const remove = (key) => {
+  const entry = entries.get(key);
+  if (!entry) return;
+  entries.delete(key);
+  for (const table of entry.tables) {
+    const keys = keysByTable.get(table);
+    if (keys) keys.delete(key);
+  }
+};
+
+const store = (key, tables, body, etag) => {
+  remove(key);
+  entries.set(key, { body, etag, tables, expiresAt: Date.now() + TTL_MS });
+  for (const table of tables) {
+    if (!keysByTable.has(table)) keysByTable.set(table, new Set());
+    keysByTable.get(table).add(key);
+  }
+  if (entries.size > MAX_ENTRIES) remove(entries.keys().next().value);
+};
+
+const dropTables = (tableNames) => {
+  for (const table of tableNames) {
+    generations.set(table, generation(table) + 1);
+    for (const key of keysByTable.get(table) || []) remove(key);
+    keysByTable.delete(table);
+  }
+};
+
+const dropAll = () => {
+  cleared++;
+  entries.clear();
+  keysByTable.clear();
+};
+
+// middleware/compression.js hands out "<hash>-br" / "<hash>-gzip" for the
+// compressed bytes; a client revalidates with that form
+const matches = (ifNoneMatch, etag) =>
+  Boolean(ifNoneMatch) &&
+  ifNoneMatch.split(",").some((tag) => tag.trim().replace(/-(?:br|gzip)"$/, '"') === etag);
+
+const keyOf = (req) => `${req.originalUrl}|${req.user.type}|${req.user.gym_id ?? ""}`;
+
+const setValidators = (res, etag) => {
+  res.set("ETag", etag);
+  res.set("Cache-Control", "private, no-cache");
+  res.vary("Authorization");
+};
+
+/**
+ * Middleware caching the 200 responses of a GET route whose data comes from
+ * `tables`; goes after authMiddleware, which sets the role and tenant.
+ */
+const cached = (...tables) => (req, res, next) => {
+  const key = keyOf(req);
+  const entry = entries.get(key);
+
+  if (entry && entry.expiresAt > Date.now()) {
+    stats.hits++;
+    setValidators(res, entry.etag);
+    res.set("X-Cache", "HIT");
+    if (matches(req.get("If-None-Match"), entry.etag)) {
+      stats.notModified++;
+      return res.status(304).end();
+    }
+    return res.type("json").send(entry.body);
+  }
+  stats.misses++;
+
+  const started = tables.map(generation);
+  const startedCleared = cleared;
+  const send = res.send;
+  res.send = function (body) {
+    if (res.statusCode === 200 && typeof body === "string") {
+      const etag = etagOf(body);
+      setValidators(res, etag);
+      res.set("X-Cache", "MISS");
+      const unchanged =
+        cleared === startedCleared && tables.every((table, i) => generation(table) === started[i]);
+      if (TTL_MS > 0 && unchanged) store(key, tables, body, etag);
+      // Express answers 304 itself when If-None-Match matches the ETag
+    }
+    return send.call(this, body);
+  };
+  next();
+};
+
+const invalidate = (...tableNames) => {
+  dropTables(tableNames);
+  clusterBus.publish("responseCache:invalidate", tableNames);
+};
+
+const clear = () => {
+  dropAll();
+  clusterBus.publish("responseCache:clear");
+};
+
+clusterBus.subscribe("responseCache:invalidate", dropTables);
+clusterBus.subscribe("responseCache:clear", dropAll);
+
+const getStats = () => ({ ...stats, entries: entries.size });
+
+module.exports = { cached, invalidate, clear, getStats };
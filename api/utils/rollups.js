@@ -0,0 +1,367 @@
+// utils/rollups.js
+//
+// Summary tables behind the analytics endpoints, so a dashboard reads a few
+// rows per gym instead of scanning the payments and memberships tables:
+//
+//   RevenueRollups     payments and revenue per plan and month
+//   MembershipRollups  +1/-1 per plan on the days memberships start and end
+//
+// The payment and membership controllers call recordPayments() and
+// recordMemberships() with the rows a write removed and added, inside the
+// transaction of the write, so a rollup never disagrees with a committed
+// row. Each call is one lookup of the plans' gyms and one multi-row
+// "insert or add" statement per table.
+//
+// rebuild() recomputes both tables from scratch, a page of rows at a time
+// (scripts/rebuildRollups.js, after loading data behind the API's back, e.g.
+// with scripts/seed.js); server start runs it when the tables are still
+// empty. compact() folds the membership deltas of past days
+// into one row per plan, so reading today's active members stays a few rows
+// per plan however long the history; utils/scheduler.js runs it every
+// ROLLUP_COMPACT_INTERVAL_MS (default 86400000).
+
+const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+const Payments = require("../models/payments");
+const MembersMembership = require("../models/membersMembership");
+const MembershipPlan = require("../models/gymMembershipPlan");
+const RevenueRollup = require("../models/revenueRollup");
+const MembershipRollup = require("../models/membershipRollup");
+
+const COMPACT_INTERVAL_MS = parseInt(process.env.ROLLUP_COMPACT_INTERVAL_MS || "86400000", 10);
+// Rows read per query by rebuild()
+const PAGE_SIZE = 5000;
+// Rows written per statement
+const WRITE_CHUNK = 1000;
+
+const stats = { recorded: 0, rebuilds: 0, lastRebuildMs: null, compactions: 0 };
+
+const monthOf = (date) => new Date(date).toISOString().slice(0, 7);
+const dayOf = (date) => new Date(date).toISOString().slice(0, 10);
+const today = () => dayOf(Date.now());
+const toCents = (amount) => Math.round(parseFloat(amount) * 100) || 0;
+
+// -- aggregation, shared by the incremental path and rebuild() --------------
+
+// Add `sign` times `rows` (payments) to `into`: "plan|month" -> rollup row
+const addPayments = (into, rows, sign, gyms) => {
+  for (const row of rows) {
+    const planId = Number(row.membership_plan_id);
+    const gymId = gyms.get(planId);
+    if (gymId === undefined) continue;
+    const month = monthOf(row.payment_date);
+    const key = `${planId}|${month}`;
+    if (!into.has(key)) into.set(key, { membership_plan_id: planId, month, gym_id: gymId, payments: 0, cents: 0 });
+    const entry = into.get(key);
+    entry.payments += sign;
+    entry.cents += sign * toCents(row.total_amount);
+  }
+  return into;
+};
+
+// Add `sign` times `rows` (memberships) to `into`: "plan|day" -> rollup row.
+// Days before `foldBefore` are counted on `foldBefore` (see compact()).
+const addMemberships = (into, rows, sign, gyms, foldBefore = null) => {
+  const add = (planId, gymId, date, delta) => {
+    let day = dayOf(date);
+    if (foldBefore && day < foldBefore) day = foldBefore;
+    const key = `${planId}|${day}`;
+    if (!into.has(key)) into.set(key, { membership_plan_id: planId, day, gym_id: gymId, delta: 0 });
+    into.get(key).delta += delta;
+  };
+  for (const row of rows) {
+    const planId = Number(row.membership_plan_id);
+    const gymId = gyms.get(planId);
+    if (gymId === undefined) continue;
+    add(planId, gymId, row.start_date, sign);
+    add(planId, gymId, row.end_date, -sign);
+  }
+  return into;
+};
+
+const revenueRows = (entries) =>
+  [...entries.values()]
+    .filter((entry) => entry.payments !== 0 || entry.cents !== 0)
+    .map(({ cents, ...entry }) => ({ ...entry, revenue: (cents / 100).toFixed(2) }));
+
+const membershipRows = (entries) => [...entries.values()].filter((entry) => entry.delta !== 0);
+
+// Plan id -> gym id for `planIds`
+const gymsOfPlans = async (planIds, transaction) => {
+  const ids = [...new Set(planIds.filter((id) => id !== undefined && id !== null).map(Number))];
+  if (ids.length === 0) return new Map();
+  const plans = await MembershipPlan.findAll({
+    where: { id: { [Op.in]: ids } },
+    attributes: ["id", "gym_id"],
+    transaction,
+  });
+  return new Map(plans.map((plan) => [plan.id, plan.gym_id]));
+};
+
+// -- writes ------------------------------------------------------------------
+
+/**
+ * Insert `rows` into `Model`, or add their `added` columns to the rows
+ * already there with the same primary key, in one statement per chunk. Rows
+ * go in primary key order, so concurrent writers lock them in the same order.
+ */
+const addRows = async (Model, rows, added, transaction) => {
+  if (rows.length === 0) return;
+  const queryInterface = sequelize.getQueryInterface();
+  const quote = (name) => queryInterface.quoteIdentifier(name);
+  const table = queryInterface.quoteTable(Model.getTableName());
+  const keys = Model.primaryKeyAttributes;
+  const columns = Object.keys(rows[0]);
+  let onConflict;
+  if (["mysql", "mariadb"].includes(sequelize.getDialect())) {
+    const updates = added.map((column) => `${quote(column)} = ${quote(column)} + VALUES(${quote(column)})`);
+    onConflict = `ON DUPLICATE KEY UPDATE ${updates.join(", ")}`;
+  } else {
+    const updates = added.map((column) => `${quote(column)} = ${table}.${quote(column)} + excluded.${quote(column)}`);
+    onConflict = `ON CONFLICT (${keys.map(quote).join(", ")}) DO UPDATE SET ${updates.join(", ")}`;
+  }
+  const byKey = (a, b) => {
+    for (const key of keys) {
+      if (a[key] < b[key]) return -1;
+      if (a[key] > b[key]) return 1;
+    }
+    return 0;
+  };
+  const sorted = [...rows].sort(byKey);
+
+  for (let i = 0; i < sorted.length; i += WRITE_CHUNK) {
+    const chunk = sorted.slice(i, i + WRITE_CHUNK);
+    const values = chunk.map(() => `(${columns.map(() => "?").join(", ")})`).join(", ");
+    await sequelize.query(
+      `INSERT INTO ${table} (${columns.map(quote).join(", ")}) VALUES ${values} ${onConflict}`,
+      { replacements: chunk.flatMap((row) => columns.map((column) => row[column])), transaction }
+    );
+  }
+};
+
+/**
+ * Account for payments a write removed (their values before it) and added
+ * (their values after it). For an update pass the old and the new version.
+ */
+const recordPayments = async (removed, added, transaction) => {
+  if (removed.length === 0 && added.length === 0) return;
+  const gyms = await gymsOfPlans([...removed, ...added].map((row) => row.membership_plan_id), transaction);
+  const entries = addPayments(addPayments(new Map(), removed, -1, gyms), added, 1, gyms);
+  await addRows(RevenueRollup, revenueRows(entries), ["payments", "revenue"], transaction);
+  stats.recorded += removed.length + added.length;
+};
+
+/** Same as recordPayments(), for memberships. */
+const recordMemberships = async (removed, added, transaction) => {
+  if (removed.length === 0 && added.length === 0) return;
+  const gyms = await gymsOfPlans([...removed, ...added].map((row) => row.membership_plan_id), transaction);
+  const entries = addMemberships(addMemberships(new Map(), removed, -1, gyms), added, 1, gyms);
+  await addRows(MembershipRollup, membershipRows(entries), ["delta"], transaction);
+  stats.recorded += removed.length + added.length;
+};
+
+/** A plan moved to another gym: its rollups move with it. */
+const movePlan = async (planId, gymId, transaction) => {
+  const where = { membership_plan_id: planId };
+  await RevenueRollup.update({ gym_id: gymId }, { where, transaction });
+  await MembershipRollup.update({ gym_id: gymId }, { where, transaction });
+};
+
+/** Drop the rollups of a deleted gym. */
+const removeGym = async (gymId, transaction) => {
+  const where = { gym_id: gymId };
+  await RevenueRollup.destroy({ where, transaction });
+  await MembershipRollup.destroy({ where, transaction });
+};
+
+const clear = async (transaction) => {
+  await RevenueRollup.destroy({ where: {}, transaction });
+  await MembershipRollup.destroy({ where: {}, transaction });
+};
+
+// -- maintenance ---------------------------------------------------------------
+
+// Call `handle(rows)` for every page of `Model`, in id order
+const eachPage = async (Model, attributes, handle) => {
+  let lastId = 0;
+  for (;;) {
+    const rows = await Model.findAll({
+      where: { id: { [Op.gt]: lastId } },
+      order: [["id", "ASC"]],
+      limit: PAGE_SIZE,
+      attributes,
+      raw: true,
+    });
+    if (rows.length === 0) return;
+    handle(rows);
+    lastId = rows[rows.length - 1].id;
+  }
+};
+
+/**
+ * Recompute both tables from Payments and MembersMemberships. Reads a page
+ * at a time and replaces the tables in one transaction; writes committed
+ * while it reads are not in the result, so run it with the API stopped or
+ * idle. Returns the number of rollup rows written.
+ */
+const rebuild = async () => {
+  const started = Date.now();
+  const plans = await MembershipPlan.findAll({ attributes: ["id", "gym_id"], raw: true });
+  const gyms = new Map(plans.map((plan) => [plan.id, plan.gym_id]));
+
+  const revenue = new Map();
+  await eachPage(Payments, ["id", "membership_plan_id", "payment_date", "total_amount"], (rows) =>
+    addPayments(revenue, rows, 1, gyms)
+  );
+  const deltas = new Map();
+  const foldBefore = today();
+  await eachPage(MembersMembership, ["id", "membership_plan_id", "start_date", "end_date"], (rows) =>
+    addMemberships(deltas, rows, 1, gyms, foldBefore)
+  );
+
+  const revenueRowsToWrite = revenueRows(revenue);
+  const membershipRowsToWrite = membershipRows(deltas);
+  await sequelize.transaction(async (transaction) => {
+    await clear(transaction);
+    for (let i = 0; i < revenueRowsToWrite.length; i += WRITE_CHUNK) {
+      await RevenueRollup.bulkCreate(revenueRowsToWrite.slice(i, i + WRITE_CHUNK), { transaction });
+    }
+    for (let i = 0; i < membershipRowsToWrite.length; i += WRITE_CHUNK) {
+      await MembershipRollup.bulkCreate(membershipRowsToWrite.slice(i, i + WRITE_CHUNK), { transaction });
+    }
+  });
+
+  stats.rebuilds++;
+  stats.lastRebuildMs = Date.now() - started;
+  return revenueRowsToWrite.length + membershipRowsToWrite.length;
+};
+
+/**
+ * Rebuild when a rollup table is empty but its source table is not, as on
+ * the first start after the rollup tables were added.
+ */
+const ensureBuilt = async () => {
+  const [revenueRow, membershipRow, payment, membership] = await Promise.all([
+    RevenueRollup.findOne({ attributes: ["membership_plan_id"] }),
+    MembershipRollup.findOne({ attributes: ["membership_plan_id"] }),
+    Payments.findOne({ attributes: ["id"] }),
+    MembersMembership.findOne({ attributes: ["id"] }),
+  ]);
+  if ((payment && !revenueRow) || (membership && !membershipRow)) {
+    await rebuild();
+  }
+};
+
+/**
+ * Fold the membership deltas of the days before today into one row per plan
+ * on today. Sums up to today or later are unchanged; the rows are locked so
+ * concurrent writes to them wait for the fold.
+ */
+const compact = async () => {
+  const cutoff = today();
+  await sequelize.transaction(async (transaction) => {
+    const where = { day: { [Op.lt]: cutoff } };
+    const rows = await MembershipRollup.findAll({ where, lock: transaction.LOCK.UPDATE, transaction, raw: true });
+    if (rows.length === 0) return;
+    const folded = new Map();
+    for (const row of rows) {
+      if (!folded.has(row.membership_plan_id)) {
+        folded.set(row.membership_plan_id, {
+          membership_plan_id: row.membership_plan_id,
+          day: cutoff,
+          gym_id: row.gym_id,
+          delta: 0,
+        });
+      }
+      folded.get(row.membership_plan_id).delta += row.delta;
+    }
+    await MembershipRollup.destroy({ where, transaction });
+    await addRows(MembershipRollup, membershipRows(folded), ["delta"], transaction);
+  });
+  stats.compactions++;
+};
+
+// -- reads ---------------------------------------------------------------------
+
+/**
+ * Payments and revenue per gym and month, oldest month first. `gymId` null
+ * means every gym; `from` and `to` ("YYYY-MM", inclusive) are optional.
+ */
+const revenueByMonth = async ({ gymId = null, from = null, to = null }) => {
+  const where = {};
+  if (gymId !== null) where.gym_id = gymId;
+  if (from || to) {
+    where.month = {};
+    if (from) where.month[Op.gte] = from;
+    if (to) where.month[Op.lte] = to;
+  }
+  const rows = await RevenueRollup.findAll({
+    where,
+    attributes: [
+      "gym_id",
+      "month",
+      [sequelize.fn("SUM", sequelize.col("payments")), "payments"],
+      [sequelize.fn("SUM", sequelize.col("revenue")), "revenue"],
+    ],
+    group: ["gym_id", "month"],
+    order: [
+      ["gym_id", "ASC"],
+      ["month", "ASC"],
+    ],
+    raw: true,
+  });
+  return rows
+    .map((row) => ({
+      gym_id: row.gym_id,
+      month: row.month,
+      payments: Number(row.payments),
+      revenue: Number(row.revenue).toFixed(2),
+    }))
+    .filter((row) => row.payments !== 0);
+};
+
+/**
+ * Memberships running today per plan (start on or before today, end after
+ * it), for one gym or (gymId null) all of them.
+ */
+const activeMembersByPlan = async ({ gymId = null }) => {
+  const where = { day: { [Op.lte]: today() } };
+  if (gymId !== null) where.gym_id = gymId;
+  const rows = await MembershipRollup.findAll({
+    where,
+    attributes: ["gym_id", "membership_plan_id", [sequelize.fn("SUM", sequelize.col("delta")), "active"]],
+    group: ["gym_id", "membership_plan_id"],
+    raw: true,
+  });
+  const active = rows.filter((row) => Number(row.active) !== 0);
+  const plans = await MembershipPlan.findAll({
+    where: { id: { [Op.in]: active.map((row) => row.membership_plan_id) } },
+    attributes: ["id", "plan_name"],
+  });
+  const names = new Map(plans.map((plan) => [plan.id, plan.plan_name]));
+  return active
+    .map((row) => ({
+      gym_id: row.gym_id,
+      membership_plan_id: row.membership_plan_id,
+      plan_name: names.get(row.membership_plan_id) || null,
+      active: Number(row.active),
+    }))
+    .sort((a, b) => a.gym_id - b.gym_id || b.active - a.active || a.membership_plan_id - b.membership_plan_id);
+};
+
+const getStats = () => ({ ...stats });
+
+module.exports = {
+  COMPACT_INTERVAL_MS,
+  recordPayments,
+  recordMemberships,
+  movePlan,
+  removeGym,
+  clear,
+  rebuild,
+  ensureBuilt,
+  compact,
+  revenueByMonth,
+  activeMembersByPlan,
+  getStats,
+};
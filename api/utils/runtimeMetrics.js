@@ -0,0 +1,118 @@
+// utils/runtimeMetrics.js
+//
+// Scrape-time collectors exposing the statistics other modules already keep
+// (connection pool, password hasher, caches, scheduler, logger, response
+// compression, process) as Prometheus samples.
+
+const metrics = require("./metrics");
+const dbPool = require("./dbPool");
+const passwordHasher = require("./passwordHasher");
+const userContextCache = require("./userContextCache");
+const countCache = require("./countCache");
+const responseCache = require("./responseCache");
+const priceIndex = require("./priceIndex");
+const expiryBuckets = require("./expiryBuckets");
+const scheduler = require("./scheduler");
+const rollups = require("./rollups");
+const logger = require("./logger");
+const compression = require("../middleware/compression");
+
+const gauge = (name, help, value) => ({ name, help, type: "gauge", value });
+const total = (name, help, value) => ({ name, help, type: "counter", value });
+
+metrics.addCollector(() => {
+  const pool = dbPool.getStats();
+  const histogram = {};
+  for (const [le, count] of Object.entries(pool.acquire.histogram)) {
+    histogram[le === "+Inf" ? le : Number(le) / 1000] = count;
+  }
+  return [
+    gauge("db_pool_max_connections", "Configured maximum of pooled connections.", pool.config.max),
+    gauge("db_pool_connections", "Open pooled connections.", pool.size),
+    gauge("db_pool_connections_in_use", "Pooled connections handed out to queries.", pool.using),
+    gauge("db_pool_waiting_requests", "Queries waiting for a free connection.", pool.waiting),
+    {
+      name: "db_pool_acquire_seconds",
+      help: "Time to acquire a pooled connection.",
+      type: "histogram",
+      histogram,
+      sum: pool.acquire.sumMs / 1000,
+    },
+  ];
+});
+
+metrics.addCollector(() => {
+  const hasher = passwordHasher.getStats();
+  return [
+    gauge("password_hasher_workers", "Password hashing worker threads.", hasher.workers),
+    gauge("password_hasher_busy_workers", "Workers hashing or verifying a password.", hasher.busy),
+    gauge("password_hasher_queued_jobs", "Password jobs waiting for a worker.", hasher.queued),
+    total("password_hasher_completed_total", "Password jobs completed.", hasher.completed),
+    total("password_hasher_rejected_total", "Password jobs rejected with a full queue.", hasher.rejected),
+  ];
+});
+
+metrics.addCollector(() => {
+  const users = userContextCache.getStats();
+  const counts = countCache.getStats();
+  const responses = responseCache.getStats();
+  const prices = priceIndex.getStats();
+  return [
+    total("user_context_cache_hits_total", "Auth context cache hits.", users.hits),
+    total("user_context_cache_misses_total", "Auth context cache misses.", users.misses),
+    gauge("user_context_cache_entries", "Auth context cache entries.", users.size),
+    total("count_cache_hits_total", "List count cache hits.", counts.hits),
+    total("count_cache_misses_total", "List count cache misses.", counts.misses),
+    total("response_cache_hits_total", "Catalog response cache hits.", responses.hits),
+    total("response_cache_misses_total", "Catalog response cache misses.", responses.misses),
+    total("response_cache_not_modified_total", "Cache hits answered with 304 Not Modified.", responses.notModified),
+    gauge("response_cache_entries", "Catalog response cache entries.", responses.entries),
+    total("price_index_hits_total", "Price index lookups of an already loaded plan.", prices.hits),
+    total("price_index_misses_total", "Price index lookups that loaded the plan.", prices.misses),
+    gauge("price_index_plans", "Plans held by the price index.", prices.plans),
+  ];
+});
+
+metrics.addCollector(() => {
+  const expiries = expiryBuckets.getStats();
+  const jobs = Object.values(scheduler.getStats().jobs);
+  const sum = (field) => jobs.reduce((acc, job) => acc + job[field], 0);
+  return [
+    gauge("expiry_buckets_memberships", "Memberships held in the expiry buckets.", expiries.memberships),
+    total("expiry_buckets_rebuilds_total", "Expiry bucket rebuilds from the database.", expiries.rebuilds),
+    gauge("expiry_buckets_last_rebuild_ms", "Duration of the last expiry bucket rebuild.", expiries.lastRebuildMs || 0),
+    total("scheduled_job_runs_total", "Scheduled job runs that succeeded.", sum("runs")),
+    total("scheduled_job_failures_total", "Scheduled job runs that failed.", sum("failures")),
+    total("rollup_rows_recorded_total", "Rows applied to the analytics rollups.", rollups.getStats().recorded),
+  ];
+});
+
+metrics.addCollector(() => {
+  const logs = logger.getStats();
+  return [
+    total("log_lines_suppressed_total", "Log lines skipped by per-key sampling.", logs.suppressed),
+    total("log_lines_dropped_total", "Log lines dropped with a full write buffer.", logs.dropped),
+  ];
+});
+
+metrics.addCollector(() => {
+  const compressed = compression.getStats();
+  return [
+    total("http_responses_compressed_total", "Response bodies sent compressed.", compressed.responses),
+    total("http_response_uncompressed_bytes_total", "Compressed bodies' size before compression.", compressed.bytesIn),
+    total("http_response_compressed_bytes_total", "Compressed bodies' size after compression.", compressed.bytesOut),
+  ];
+});
+
+metrics.addCollector(() => {
+  const memory = process.memoryUsage();
+  const cpu = process.cpuUsage();
+  return [
+    total("process_cpu_seconds_total", "User and system CPU time spent in seconds.", (cpu.user + cpu.system) / 1e6),
+    gauge("process_resident_memory_bytes", "Resident memory size in bytes.", memory.rss),
+    gauge("nodejs_heap_used_bytes", "V8 heap in use in bytes.", memory.heapUsed),
+    gauge("process_uptime_seconds", "Seconds since the process started.", Math.round(process.uptime())),
+  ];
+});
+
+module.exports = metrics;
@@ -0,0 +1,82 @@
+// utils/scheduler.js
+//
+// Periodic background jobs run inside the API process. A job never overlaps
+// itself: a run that is still busy when the next one is due makes that one
+// a no-op. Failures are logged and counted; the job keeps its schedule.
+//
+// Most jobs must run once per deployment, not once per cluster worker (e.g.
+// creating renewals). The primary of utils/cluster.js starts exactly one
+// worker with CLUSTER_SCHEDULER=1; only that worker, or a single process
+// outside cluster mode, runs them. Every worker keeps their timers, so the
+// primary can move the role with grantRole() once the old holder has exited
+// (rolling restarts) and two workers never run them at the same time. Jobs
+// keeping per-process state up to date (caches, indexes) pass `everyProcess`.
+
+const cluster = require("cluster");
+const logger = require("./logger");
+
+// name -> state reported by getStats()
+const jobs = new Map();
+
+let schedulerRole = !cluster.isWorker || process.env.CLUSTER_SCHEDULER === "1";
+// Runs of the `runAtStart` jobs only the scheduler runs, started on grantRole()
+const startRuns = [];
+
+const isSchedulerProcess = () => schedulerRole;
+
+// This worker takes over the once-per-deployment jobs
+const grantRole = () => {
+  if (schedulerRole) return;
+  schedulerRole = true;
+  logger.info("Worker %d took over the scheduled jobs", cluster.worker.id);
+  for (const run of startRuns) setImmediate(run);
+};
+
+/**
+ * Run `job()` (may return a promise) every `intervalMs`; 0 or less disables
+ * it. With `runAtStart` the first run starts right away.
+ */
+const schedule = (name, intervalMs, job, { everyProcess = false, runAtStart = false } = {}) => {
+  if (intervalMs <= 0) return;
+
+  const state = {
+    intervalMs,
+    running: false,
+    runs: 0,
+    failures: 0,
+    lastRunAt: null,
+    lastDurationMs: null,
+    lastError: null,
+  };
+  jobs.set(name, state);
+
+  const run = async () => {
+    if (state.running || (!everyProcess && !schedulerRole)) return;
+    state.running = true;
+    const started = Date.now();
+    try {
+      await job();
+      state.runs++;
+      state.lastError = null;
+    } catch (error) {
+      state.failures++;
+      state.lastError = error.message;
+      logger.error("Scheduled job %s failed: %s", name, error.message);
+    } finally {
+      state.running = false;
+      state.lastRunAt = new Date(started).toISOString();
+      state.lastDurationMs = Date.now() - started;
+    }
+  };
+
+  // Background work alone does not keep the process alive
+  setInterval(run, intervalMs).unref();
+  if (runAtStart) {
+    if (!everyProcess) startRuns.push(run);
+    setImmediate(run);
+  }
+};
+
+const getStats = () => ({ scheduler: isSchedulerProcess(), jobs: Object.fromEntries(jobs) });
+
+module.exports = { schedule, isSchedulerProcess, grantRole, getStats };
@@ -0,0 +1,58 @@
+// utils/search.js
+//
+// Search predicates for the list endpoints, backed by the FULLTEXT indexes
+// declared on the Gym and User models. Every token of the search term must
+// prefix-match a word in one of the indexed columns ("fit mum" finds
+// "Fitness Hub, Mumbai"). Terms too short for the full-text index fall back
+// to an index-friendly prefix LIKE, as does any dialect without FULLTEXT
+// (e.g. the SQLite stand-in used for seeding). Existing databases get the
+// indexes from utils/indexes.js at startup.
+
+const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+
+// InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default)
+const MIN_TOKEN_LENGTH = 3;
+
+const SEARCH_INDEXES = {
+  Gyms: { name: "gyms_search_fulltext", fields: ["name", "city", "contact_person"] },
+  Users: { name: "users_search_fulltext", fields: ["username", "email"] },
+};
+
+const isMySql = () => ["mysql", "mariadb"].includes(sequelize.getDialect());
+
+const tokenize = (term) =>
+  String(term || "")
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}_]+/u)
+    .filter(Boolean);
+
+// "+fit* +mum*": every token required, each as a prefix
+const booleanQuery = (tokens) => tokens.map((token) => `+${token}*`).join(" ");
+
+const escapeLike = (value) => value.replace(/[\\%_]/g, (c) => `\\${c}`);
+
+/**
+ * Where-condition matching `term` against the search index of `Model`,
+ * or null when the term is blank so callers can skip searching entirely.
+ * `alias` qualifies the columns when the model is joined under another name.
+ */
+const searchCondition = (Model, term, alias = Model.name) => {
+  const tokens = tokenize(term);
+  if (!tokens.length) return null;
+  const { fields } = SEARCH_INDEXES[Model.getTableName()];
+
+  if (isMySql() && tokens.every((token) => token.length >= MIN_TOKEN_LENGTH)) {
+    const qi = (name) => sequelize.getQueryInterface().quoteIdentifier(name);
+    const columns = fields.map((field) => `${qi(alias)}.${qi(field)}`).join(", ");
+    const match = sequelize.literal(
+      `MATCH (${columns}) AGAINST (${sequelize.escape(booleanQuery(tokens))} IN BOOLEAN MODE)`
+    );
+    return { [Op.and]: [match] };
+  }
+
+  const prefix = `${escapeLike(String(term).trim())}%`;
+  return { [Op.or]: fields.map((field) => ({ [field]: { [Op.like]: prefix } })) };
+};
+
+module.exports = { SEARCH_INDEXES, searchCondition, tokenize };
@@ -0,0 +1,47 @@
+// utils/tenantScope.js
+//
+// Rows of a member-owned table (memberships, payments, users, ...) that the
+// current user may see, as a single where-condition. A gym admin's scope is a
+// subquery on GymAndGymMembers, so the database resolves the gym's members in
+// the same statement instead of the controller loading every member id and
+// sending them back as an `IN (...)` list. The cost no longer grows with the
+// size of the gym (the subquery is backed by gym_and_gym_members_gym_member).
+
+const { Op } = require("sequelize");
+const sequelize = require("../config/dbConfig");
+const GymAndGymMember = require("../models/gymAndGymMember");
+
+// (SELECT memberId FROM GymAndGymMembers WHERE gymId = <gymId>)
+const gymMemberIds = (gymId) => {
+  const queryInterface = sequelize.getQueryInterface();
+  return sequelize.literal(
+    `(SELECT ${queryInterface.quoteIdentifier("memberId")} ` +
+      `FROM ${queryInterface.quoteTable(GymAndGymMember.getTableName())} ` +
+      `WHERE ${queryInterface.quoteIdentifier("gymId")} = ${sequelize.escape(gymId)})`
+  );
+};
+
+/**
+ * Scope of `user` over a table whose member id is in `column`.
+ *
+ * Returns { where, key }: `where` is {} for admins unless they narrow it to
+ * one gym with `gymId`; `key` names the scope for per-tenant caches (see
+ * utils/countCache.js).
+ */
+const memberScope = (user, column = "gym_member_id", gymId = null) => {
+  if (user.type === "gym_admin") {
+    return {
+      where: { [column]: { [Op.in]: gymMemberIds(user.gym_id) } },
+      key: `gym:${user.gym_id}`,
+    };
+  }
+  if (user.type === "gym_member") {
+    return { where: { [column]: user.id }, key: `member:${user.id}` };
+  }
+  if (gymId !== null && gymId !== undefined && gymId !== "") {
+    return { where: { [column]: { [Op.in]: gymMemberIds(gymId) } }, key: `gym:${gymId}` };
+  }
+  return { where: {}, key: "all" };
+};
+
+module.exports = { gymMemberIds, memberScope };
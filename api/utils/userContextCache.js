@@ -0,0 +1,99 @@
+// utils/userContextCache.js
+//
+// In-process LRU/TTL cache of the req.user context resolved by
+// authMiddleware, keyed by user id and token. Anything that changes a user or
+// their gym links must call invalidateUser() (or clear()) so the next request
+// rebuilds the context from the database.
+//
+// In cluster mode invalidations reach every worker through utils/clusterBus.js.
+//
+// USER_CACHE_TTL_MS (default 60000, 0 disables) and USER_CACHE_MAX
+// (default 10000 entries) tune it.
+
+const clusterBus = require("./clusterBus");
+
+const ttlMs = parseInt(process.env.USER_CACHE_TTL_MS || "60000", 10);
+const maxEntries = parseInt(process.env.USER_CACHE_MAX || "10000", 10);
+
+// Map iteration order is insertion order, so the first key is always the
+// least recently used one once get() re-inserts hits.
+const entries = new Map();
+// userId -> Set of cache keys, so a user can be dropped for every token
+const keysByUser = new Map();
+
+const stats = { hits: 0, misses: 0, invalidations: 0 };
+
+const cacheKey = (userId, token) => `${userId}:${token}`;
+
+const removeKey = (key) => {
+  const entry = entries.get(key);
+  if (!entry) return;
+  entries.delete(key);
+  const keys = keysByUser.get(entry.userId);
+  if (keys) {
+    keys.delete(key);
+    if (keys.size === 0) keysByUser.delete(entry.userId);
+  }
+};
+
+const get = (userId, token) => {
+  const key = cacheKey(userId, token);
+  const entry = entries.get(key);
+  if (!entry || entry.expiresAt <= Date.now()) {
+    if (entry) removeKey(key);
+    stats.misses++;
+    return null;
+  }
+  entries.delete(key);
+  entries.set(key, entry);
+  stats.hits++;
+  return entry.context;
+};
+
+// tokenExpiresAt (ms) caps the entry's lifetime so an expired token never
+// outlives its cache entry.
+const set = (userId, token, context, tokenExpiresAt = Infinity) => {
+  if (ttlMs <= 0 || maxEntries <= 0) return;
+  const key = cacheKey(userId, token);
+  removeKey(key);
+  entries.set(key, {
+    userId: String(userId),
+    context,
+    expiresAt: Math.min(Date.now() + ttlMs, tokenExpiresAt),
+  });
+  if (!keysByUser.has(String(userId))) keysByUser.set(String(userId), new Set());
+  keysByUser.get(String(userId)).add(key);
+  while (entries.size > maxEntries) {
+    removeKey(entries.keys().next().value);
+  }
+};
+
+const dropUser = (userId) => {
+  const keys = keysByUser.get(String(userId));
+  if (!keys) return;
+  for (const key of [...keys]) removeKey(key);
+  stats.invalidations++;
+};
+
+const dropAll = () => {
+  entries.clear();
+  keysByUser.clear();
+  stats.invalidations++;
+};
+
+const invalidateUser = (userId) => {
+  dropUser(userId);
+  clusterBus.publish("userContext:invalidateUser", String(userId));
+};
+
+const clear = () => {
+  dropAll();
+  clusterBus.publish("userContext:clear");
+};
+
+clusterBus.subscribe("userContext:invalidateUser", dropUser);
+clusterBus.subscribe("userContext:clear", dropAll);
+
+const getStats = () => ({ ...stats, size: entries.size, ttlMs, maxEntries });
+
+module.exports = { get, set, invalidateUser, clear, getStats };